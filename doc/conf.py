@@ -311,7 +311,8 @@ MOCK_MODULES = [
     'functools32', 'ndex2', 'ndex2.client', 'ndex2.nice_cx_network',
     'nltk', 'kappy', 'openpyxl', 'reportlab', 'reportlab.lib', 'reportlab.lib.enums',
     'reportlab.lib.pagesizes', 'reportlab.platypus', 'reportlab.lib.styles',
-    'reportlab.lib.units'
+    'reportlab.lib.units', 'pyarrow', 'pyarrow.fs', 'pyarrow.ipc',
+    'pyarrow.dataset', 'pyarrow.parquet'
     ]
 for mod_name in MOCK_MODULES:
     sys.modules[mod_name] = mock.MagicMock()
@@ -5,7 +5,6 @@ import copy
 import json
 import numpy
 import logging
-import networkx
 from os import path, pardir
 from collections import namedtuple
 
@@ -15,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 THIS_DIR = path.dirname(path.abspath(__file__))
 
+# The approximate number of supporting evidences that are scored at once
+# when setting hierarchical belief probabilities
+HIERARCHY_CHUNK_EVIDENCES = 1000000
+
 
 def load_default_probs():
     json_path = path.join(THIS_DIR, pardir, 'resources',
@@ -56,6 +59,32 @@ class BeliefScorer(object):
         raise NotImplementedError('Need to subclass BeliefScorer and '
                                   'implement methods.')
 
+    def score_statements(self, statements, extra_evidence=None):
+        """Computes the prior belief probabilities for a list of Statements.
+
+        By default, this calls `score_statement` for each Statement, but
+        subclasses can override it to score all Statements at once.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement]
+            A list of INDRA Statements whose belief scores are to
+            be calculated.
+        extra_evidence : Optional[list[list[indra.statements.Evidence]]]
+            A list with one list of Evidences for each Statement that are
+            supporting the Statement (that aren't already included in the
+            Statement's own evidence list).
+
+        Returns
+        -------
+        belief_scores : list[float]
+            The computed prior probabilities for the statements
+        """
+        if extra_evidence is None:
+            return [self.score_statement(st) for st in statements]
+        return [self.score_statement(st, ev)
+                for st, ev in zip(statements, extra_evidence)]
+
     def check_prior_probs(self, statements):
         """Make sure the scorer has all the information needed to compute
         belief scores of each statement in the provided list, and raises an
@@ -181,6 +210,105 @@ class SimpleScorer(BeliefScorer):
         all_evidence = st.evidence + extra_evidence
         return self.score_evidence_list(all_evidence)
 
+    def score_statements(self, statements, extra_evidence=None):
+        """Computes the prior belief probabilities for a list of Statements.
+
+        The result is identical to calling `score_statement` on each
+        Statement, however, the evidences of all the Statements are
+        flattened into arrays and the per-source and per-Statement
+        probabilities are calculated with grouped array reductions,
+        which is much faster for large numbers of Statements.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement]
+            A list of INDRA Statements whose belief scores are to
+            be calculated.
+        extra_evidence : Optional[list[list[indra.statements.Evidence]]]
+            A list with one list of Evidences for each Statement that are
+            supporting the Statement (that aren't already included in the
+            Statement's own evidence list).
+
+        Returns
+        -------
+        belief_scores : list[float]
+            The computed prior probabilities for the statements
+        """
+        # If a subclass changes how individual statements are scored, we
+        # can't assume that the batch calculation below is equivalent.
+        if type(self).score_statement is not SimpleScorer.score_statement \
+                or type(self).score_evidence_list is not \
+                SimpleScorer.score_evidence_list:
+            return super(SimpleScorer, self).score_statements(statements,
+                                                              extra_evidence)
+        # We first flatten all the evidences into arrays of the index of
+        # the statement they belong to, whether they are negated, and the
+        # index of their (source, subtype) pair
+        stmt_idx = []
+        negated = []
+        pair_idx = []
+        pairs = {}
+        # The same evidence can appear many times as extra evidence so we
+        # only tag each evidence object once
+        ev_pair_idx = {}
+        for idx, st in enumerate(statements):
+            evidences = st.evidence if extra_evidence is None else \
+                st.evidence + extra_evidence[idx]
+            for ev in evidences:
+                pair_ix = ev_pair_idx.get(id(ev))
+                if pair_ix is None:
+                    pair = tag_evidence_subtype(ev)
+                    pair_ix = pairs.get(pair)
+                    if pair_ix is None:
+                        pair_ix = pairs[pair] = len(pairs)
+                    ev_pair_idx[id(ev)] = pair_ix
+                stmt_idx.append(idx)
+                negated.append(1 if ev.epistemics.get('negated') else 0)
+                pair_idx.append(pair_ix)
+        scores = numpy.zeros(len(statements))
+        if not pairs:
+            return scores.tolist()
+        # Sources are indexed in sorted order so that the product over
+        # sources is taken in the same order as in score_evidence_list
+        sources = sorted({source for source, _ in pairs})
+        source_ix = {source: ix for ix, source in enumerate(sources)}
+        syst_probs = numpy.array([self.prior_probs['syst'][source]
+                                  for source in sources])
+        pair_rand_probs = numpy.zeros(len(pairs))
+        pair_sources = numpy.zeros(len(pairs), dtype=numpy.int64)
+        for pair, ix in pairs.items():
+            pair_rand_probs[ix] = \
+                _subtype_random_noise_prior(pair, self.prior_probs['rand'],
+                                            self.subtype_probs)
+            pair_sources[ix] = source_ix[pair[0]]
+        pair_idx = numpy.array(pair_idx, dtype=numpy.int64)
+        ev_sources = pair_sources[pair_idx]
+        # Each evidence is assigned a group key by statement, polarity and
+        # source. A stable sort keeps the evidences within each group in
+        # their original order so that the products are taken in the same
+        # order as in score_evidence_list.
+        pol_keys = 2 * numpy.array(stmt_idx, dtype=numpy.int64) + \
+            numpy.array(negated, dtype=numpy.int64)
+        ev_keys = pol_keys * len(sources) + ev_sources
+        order = numpy.argsort(ev_keys, kind='stable')
+        ev_keys = ev_keys[order]
+        # The product of random error probabilities per source group
+        group_starts = _get_group_starts(ev_keys)
+        rand_factors = numpy.multiply.reduceat(
+            pair_rand_probs[pair_idx[order]], group_starts)
+        group_keys = ev_keys[group_starts]
+        source_factors = syst_probs[group_keys % len(sources)] + rand_factors
+        # The product of source-specific factors per statement and polarity
+        group_pol_keys = group_keys // len(sources)
+        pol_starts = _get_group_starts(group_pol_keys)
+        neg_probs = numpy.multiply.reduceat(source_factors, pol_starts)
+        probs = numpy.zeros(2 * len(statements))
+        probs[group_pol_keys[pol_starts]] = 1 - neg_probs
+        # Finally, we combine positive and negative evidence the same way
+        # as in score_evidence_list
+        scores = probs[0::2] * (1 - probs[1::2])
+        return scores.tolist()
+
     def check_prior_probs(self, statements):
         """Throw Exception if BeliefEngine parameter is missing.
 
@@ -328,8 +456,9 @@ class BeliefEngine(object):
             by this function.
         """
         self.scorer.check_prior_probs(statements)
-        for st in statements:
-            st.belief = self.scorer.score_statement(st)
+        beliefs = self.scorer.score_statements(statements)
+        for st, belief in zip(statements, beliefs):
+            st.belief = belief
 
     def set_hierarchy_probs(self, statements):
         """Sets hierarchical belief probabilities for INDRA Statements.
@@ -348,56 +477,44 @@ class BeliefEngine(object):
             be calculated. Each Statement object's belief attribute is updated
             by this function.
         """
-        def build_hierarchy_graph(stmts):
-            """Return a DiGraph based on matches keys and Statement supports"""
-            logger.debug('Building hierarchy graph')
-            g = networkx.DiGraph()
-            for st1 in stmts:
-                g.add_node(self.matches_fun(st1), stmt=st1)
-                for st2 in st1.supported_by:
-                    g.add_node(self.matches_fun(st2), stmt=st2)
-                    g.add_edge(self.matches_fun(st2),
-                               self.matches_fun(st1))
-            logger.debug('Finished building hierarchy graph')
-            return g
-
-        def get_ranked_stmts(g):
-            """Return a topological sort of statement matches keys from a graph.
-            """
-            logger.debug('Getting ranked statements')
-            node_ranks = networkx.algorithms.dag.topological_sort(g)
-            node_ranks = reversed(list(node_ranks))
-            stmts = [g.nodes[n]['stmt'] for n in node_ranks]
-            return stmts
-
-        def assert_no_cycle(g):
-            """If the graph has cycles, throws AssertionError."""
-            logger.debug('Looking for cycles in belief graph')
-            try:
-                cyc = networkx.algorithms.cycles.find_cycle(g)
-            except networkx.exception.NetworkXNoCycle:
-                return
-            msg = 'Cycle found in hierarchy graph: %s' % cyc
-            assert False, msg
-
-        g = build_hierarchy_graph(statements)
-        assert_no_cycle(g)
-        ranked_stmts = get_ranked_stmts(g)
+        logger.debug('Building hierarchy index')
+        stmts, ids, targets = _get_hierarchy_index(statements,
+                                                   self.matches_fun)
+        logger.debug('Getting supporting statements')
+        closures = _get_support_closures(stmts, ids, targets,
+                                         self.matches_fun)
         logger.debug('Start belief propagation over ranked statements')
-        for st in ranked_stmts:
-            bps = _get_belief_package(st, self.matches_fun)
+        # The non-negated evidences of each statement, collected only once
+        pos_evidences = {}
+        chunk_stmts = []
+        chunk_evidences = []
+        n_chunk_evidences = 0
+        for idx, target in enumerate(targets):
             supporting_evidences = []
-            # NOTE: the last belief package in the list is this statement's own
-            for bp in bps[:-1]:
-                # Iterate over all the parent evidences and add only
-                # non-negated ones
-                for ev in bp.evidences:
-                    if not ev.epistemics.get('negated'):
-                        supporting_evidences.append(ev)
-            # Now add the Statement's own evidence
-            # Now score all the evidences
-            belief = self.scorer.score_statement(st, supporting_evidences)
-            st.belief = belief
+            # Iterate over all the statements supporting this statement
+            # directly or indirectly and add their non-negated evidences
+            for stmt_id in closures[target].tolist():
+                evs = pos_evidences.get(stmt_id)
+                if evs is None:
+                    evs = pos_evidences[stmt_id] = \
+                        [ev for ev in stmts[stmt_id].evidence
+                         if not ev.epistemics.get('negated')]
+                supporting_evidences += evs
+            chunk_stmts.append(stmts[target])
+            chunk_evidences.append(supporting_evidences)
+            n_chunk_evidences += len(supporting_evidences)
+            # The supporting evidences of all statements can take up a lot
+            # of memory in deep hierarchies so we score them in chunks
+            # together with the Statements' own evidence
+            if n_chunk_evidences >= HIERARCHY_CHUNK_EVIDENCES or \
+                    idx == len(targets) - 1:
+                beliefs = self.scorer.score_statements(chunk_stmts,
+                                                       chunk_evidences)
+                for st, belief in zip(chunk_stmts, beliefs):
+                    st.belief = belief
+                chunk_stmts = []
+                chunk_evidences = []
+                n_chunk_evidences = 0
         logger.debug('Finished belief propagation over ranked statements')
 
     def set_linked_probs(self, linked_statements):
@@ -422,6 +539,116 @@ class BeliefEngine(object):
 BeliefPackage = namedtuple('BeliefPackage', 'statement_key evidences')
 
 
+def _get_hierarchy_index(statements, matches_fun):
+    """Return statements indexed by integer ids and the ids to score.
+
+    Statements with the same matches key share an id. The returned targets
+    are the ids of the given statements and of the statements supporting
+    them directly, in order.
+    """
+    ids = {}
+    stmts = []
+    targets = []
+    target_set = set()
+    for st1 in statements:
+        for st in [st1] + st1.supported_by:
+            key = matches_fun(st)
+            stmt_id = ids.get(key)
+            if stmt_id is None:
+                stmt_id = ids[key] = len(stmts)
+                stmts.append(st)
+            if stmt_id not in target_set:
+                target_set.add(stmt_id)
+                targets.append(stmt_id)
+    return stmts, ids, targets
+
+
+def _get_support_closures(stmts, ids, targets, matches_fun):
+    """Return the ids of all statements supporting each statement.
+
+    The supporting statements of a statement are the ones reachable via
+    the supports attribute, directly or indirectly. These are collected
+    for each statement exactly once, in a depth-first post-order, as the
+    union of the supporting statements of the statements it directly
+    supports. Sets of ids are represented as sorted arrays so that each
+    takes memory proportional to its size rather than to the number of
+    statements.
+
+    Parameters
+    ----------
+    stmts : list[indra.statements.Statement]
+        The statements indexed by id. This is extended with any additional
+        statements that are found to be supporting statements.
+    ids : dict
+        A dict mapping the matches key of each statement to its id, extended
+        the same way as stmts.
+    targets : list[int]
+        The ids of the statements to collect supporting statements for.
+    matches_fun : function
+        A function which takes a Statement object as argument and
+        returns a string key that is used to identify the Statement.
+
+    Returns
+    -------
+    closures : dict[int, numpy.ndarray]
+        A sorted array of the ids of supporting statements for each
+        statement id reachable from the targets.
+    """
+    children = {}
+
+    def get_children(stmt_id):
+        if stmt_id not in children:
+            child_ids = []
+            for st in stmts[stmt_id].supports:
+                key = matches_fun(st)
+                child_id = ids.get(key)
+                if child_id is None:
+                    child_id = ids[key] = len(stmts)
+                    stmts.append(st)
+                child_ids.append(child_id)
+            children[stmt_id] = child_ids
+        return children[stmt_id]
+
+    closures = {}
+    for root in targets:
+        if root in closures:
+            continue
+        stack = [(root, iter(get_children(root)))]
+        on_stack = {root}
+        while stack:
+            stmt_id, child_iter = stack[-1]
+            for child_id in child_iter:
+                if child_id in closures:
+                    continue
+                if child_id in on_stack:
+                    cycle = [stmts[sid] for sid, _ in stack] + \
+                        [stmts[child_id]]
+                    assert False, 'Cycle found in hierarchy graph: %s' % \
+                        cycle
+                on_stack.add(child_id)
+                stack.append((child_id, iter(get_children(child_id))))
+                break
+            else:
+                stack.pop()
+                on_stack.remove(stmt_id)
+                closures[stmt_id] = _get_closure(children[stmt_id],
+                                                 closures)
+    return closures
+
+
+_empty_closure = numpy.array([], dtype=numpy.int32)
+
+
+def _get_closure(child_ids, closures):
+    """Return the union of the given ids and their closures as an array."""
+    if not child_ids:
+        return _empty_closure
+    parts = [numpy.array(child_ids, dtype=numpy.int32)] + \
+        [closures[child_id] for child_id in child_ids
+         if len(closures[child_id])]
+    return numpy.unique(numpy.concatenate(parts))
+
+
 def _get_belief_package(stmt, matches_fun):
     """Return the belief packages of a given statement recursively."""
     # This list will contain the belief packages for the given statement
@@ -441,6 +668,12 @@ def _get_belief_package(stmt, matches_fun):
     return belief_packages
 
 
+def _get_group_starts(sorted_keys):
+    """Return the indices at which new groups start in an array of keys."""
+    return numpy.flatnonzero(numpy.concatenate(
+        ([True], sorted_keys[1:] != sorted_keys[:-1])))
+
+
 def sample_statements(stmts, seed=None):
     """Return statements sampled according to belief.
 
@@ -480,9 +713,14 @@ def evidence_random_noise_prior(evidence, type_probs, subtype_probs):
 
     Otherwise, gives the random-noise prior for the overall rule type.
     """
-    (stype, subtype) = tag_evidence_subtype(evidence)
-    # Get the subtype, if available
+    return _subtype_random_noise_prior(tag_evidence_subtype(evidence),
+                                       type_probs, subtype_probs)
+
 
+def _subtype_random_noise_prior(source_subtype, type_probs, subtype_probs):
+    """Return the random-noise prior probability for a (type, subtype) pair.
+    """
+    (stype, subtype) = source_subtype
     # Return the subtype random noise prior, if available
     if subtype_probs is not None:
         if stype in subtype_probs:
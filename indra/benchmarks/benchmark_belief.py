@@ -0,0 +1,73 @@
+"""Benchmarks for hierarchical belief propagation.
+
+The statements used here form a synthetic deep hierarchy in which each
+statement is supported by a few statements on the level below it so that
+the number of statements supporting a statement grows with its depth.
+
+Usage: python -m indra.benchmarks.benchmark_belief [depth] [width]
+"""
+import sys
+import time
+import random
+from indra.statements import *
+from indra.belief import BeliefEngine, _get_belief_package
+
+
+def get_deep_hierarchy(depth, width, n_supports=2, seed=0):
+    """Return statements in a hierarchy with the given depth and width."""
+    rng = random.Random(seed)
+    sources = ['reach', 'sparser', 'trips', 'biopax', 'signor']
+    levels = []
+    for level in range(depth):
+        stmts = []
+        for idx in range(width):
+            evidence = [Evidence(source_api=rng.choice(sources),
+                                 epistemics={'negated': rng.random() < 0.05})
+                        for _ in range(rng.randint(1, 3))]
+            stmts.append(Phosphorylation(None,
+                                         Agent('A_%d_%d' % (level, idx)),
+                                         evidence=evidence))
+        if levels:
+            for st in levels[-1]:
+                for supporting in rng.sample(stmts, n_supports):
+                    st.supported_by.append(supporting)
+                    supporting.supports.append(st)
+        levels.append(stmts)
+    return [st for stmts in levels for st in stmts]
+
+
+def set_hierarchy_probs_recursive(be, stmts):
+    """Set beliefs based on recursively collected belief packages."""
+    for st in stmts:
+        bps = _get_belief_package(st, be.matches_fun)
+        supporting_evidences = [ev for bp in bps[:-1] for ev in bp.evidences
+                                if not ev.epistemics.get('negated')]
+        st.belief = be.scorer.score_statement(st, supporting_evidences)
+
+
+def run_benchmark(depth, width, max_recursive_depth=12):
+    stmts = get_deep_hierarchy(depth, width)
+    be = BeliefEngine()
+    timings = {}
+    ts = time.time()
+    be.set_hierarchy_probs(stmts)
+    timings['indexed'] = time.time() - ts
+    beliefs = [st.belief for st in stmts]
+    # The recursive approach revisits shared parts of the hierarchy for
+    # each path leading to them so its run time grows exponentially with
+    # depth and we only run it on shallow hierarchies
+    if depth <= max_recursive_depth:
+        ts = time.time()
+        set_hierarchy_probs_recursive(be, stmts)
+        timings['recursive'] = time.time() - ts
+        assert max(abs(b1 - st.belief)
+                   for b1, st in zip(beliefs, stmts)) < 1e-12
+    return timings
+
+
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    timings = run_benchmark(depth, width)
+    for method, duration in timings.items():
+        print('%s: %.2fs' % (method, duration))
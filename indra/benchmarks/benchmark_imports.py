@@ -0,0 +1,74 @@
+"""Benchmarks for the time and memory it takes to import INDRA modules.
+
+Each module is imported in a new Python process so that the modules it
+depends on aren't already imported, and the time it takes to import and the
+maximum resident set size (RSS) of the process are measured. The numbers
+for a process that doesn't import anything are shown for reference.
+
+Usage:
+    python -m indra.benchmarks.benchmark_imports [module ...]
+"""
+import sys
+import subprocess
+
+# Modules that are commonly imported when using INDRA
+entry_points = [
+    'indra.statements',
+    'indra.databases.hgnc_client',
+    'indra.databases.mesh_client',
+    'indra.databases.chebi_client',
+    'indra.databases.go_client',
+    'indra.ontology.bio',
+    'indra.preassembler',
+    'indra.tools.assemble_corpus',
+    'indra.assemblers.pysb',
+]
+
+_measure_code = """
+import sys, time, resource
+ts = time.time()
+%s
+duration = time.time() - ts
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# The maximum RSS is in bytes on macOS and in kilobytes elsewhere
+if sys.platform == 'darwin':
+    max_rss /= 1024
+print(duration, max_rss / 1024)
+"""
+
+
+def measure_import(module, n_runs=3):
+    """Return the import time in seconds and the maximum RSS in MB.
+
+    The import time is the shortest of a number of runs. If the module
+    can't be imported, e.g., because a resource file is missing, None is
+    returned.
+    """
+    code = _measure_code % (('import %s' % module) if module else 'pass')
+    timings = []
+    for _ in range(n_runs):
+        res = subprocess.run([sys.executable, '-c', code],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+        if res.returncode != 0:
+            return None
+        duration, max_rss = res.stdout.split()[-2:]
+        timings.append((float(duration), float(max_rss)))
+    return min(timings)
+
+
+def run_benchmark(modules, n_runs=3):
+    results = {'(nothing)': measure_import(None, n_runs)}
+    for module in modules:
+        results[module] = measure_import(module, n_runs)
+    return results
+
+
+if __name__ == '__main__':
+    modules = sys.argv[1:] if len(sys.argv) > 1 else entry_points
+    results = run_benchmark(modules)
+    for module, result in results.items():
+        if result is None:
+            print('%s: could not be imported' % module)
+        else:
+            print('%s: %.2fs, %.0f MB' % (module, *result))
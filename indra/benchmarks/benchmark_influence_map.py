@@ -0,0 +1,67 @@
+"""Benchmarks for generating, updating and loading cached influence maps.
+
+The model used here is assembled from random statements between a set of
+agents and is then extended with a few more statements, as when a model is
+checked again after adding new findings to it.
+
+Usage:
+    python -m indra.benchmarks.benchmark_influence_map [n_agents] [n_stmts]
+        [n_added]
+"""
+import sys
+import time
+import random
+import tempfile
+from indra.statements import *
+from indra.assemblers.pysb import PysbAssembler
+from indra.explanation.model_checker import PysbModelChecker
+
+
+def get_random_stmts(n_agents, n_stmts, seed=0):
+    """Return random statements between a set of agents."""
+    rng = random.Random(seed)
+    names = ['P%d' % idx for idx in range(n_agents)]
+    stmt_types = [Phosphorylation, Dephosphorylation, Activation, Inhibition,
+                  IncreaseAmount, DecreaseAmount]
+    stmts = []
+    for _ in range(n_stmts):
+        subj, obj = rng.sample(names, 2)
+        stmts.append(rng.choice(stmt_types)(Agent(subj), Agent(obj)))
+    return stmts
+
+
+def run_benchmark(n_agents, n_stmts, n_added):
+    stmts = get_random_stmts(n_agents, n_stmts + n_added)
+    test_stmts = get_random_stmts(n_agents, 10, seed=1)
+    cache_dir = tempfile.mkdtemp()
+    model = PysbAssembler(stmts[:n_stmts]).make_model()
+    timings = {}
+    for label in ['generate', 'load']:
+        mc = PysbModelChecker(model, test_stmts)
+        mc.im_cache_dir = cache_dir
+        mc.incremental_im = True
+        ts = time.time()
+        mc.get_im()
+        timings[label] = time.time() - ts
+    # The model checker that loaded the influence map updates it for the
+    # extended model
+    model = PysbAssembler(stmts).make_model()
+    ts = time.time()
+    im = mc.generate_cached_im(model)
+    timings['update'] = time.time() - ts
+    ts = time.time()
+    full_im = mc.generate_im(model)
+    timings['generate after update'] = time.time() - ts
+    # The updated influence map should be the same as the one generated
+    # from the whole model
+    assert list(im.edges(data=True)) == list(full_im.edges(data=True))
+    return timings
+
+
+if __name__ == '__main__':
+    n_agents = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_stmts = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    n_added = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    timings = run_benchmark(n_agents, n_stmts, n_added)
+    for step, duration in timings.items():
+        print('%s: %.2fs' % (step, duration))
@@ -0,0 +1,68 @@
+"""Benchmarks for checking many statements against a model.
+
+The model used here is a random signed graph and the statements to check
+have random subjects and objects from a small set of targets so that many
+statements share the same object.
+
+Usage:
+    python -m indra.benchmarks.benchmark_model_checker [n_nodes] [n_stmts]
+        [poolsize]
+"""
+import sys
+import time
+import random
+import networkx
+from indra.statements import *
+from indra.explanation.model_checker import SignedGraphModelChecker
+
+
+def get_random_model(n_nodes, n_stmts, n_targets=20, seed=0):
+    """Return a random signed graph and statements to check against it."""
+    rng = random.Random(seed)
+    graph = networkx.MultiDiGraph()
+    names = ['N%d' % idx for idx in range(n_nodes)]
+    for _ in range(n_nodes * 3):
+        source, target = rng.sample(names, 2)
+        graph.add_edge(source, target, sign=rng.choice([0, 1]), belief=1)
+    targets = rng.sample(names, n_targets)
+    stmts = [rng.choice([Activation, Inhibition])(Agent(rng.choice(names)),
+                                                  Agent(rng.choice(targets)))
+             for _ in range(n_stmts)]
+    # We only map the nodes that statements refer to since all other nodes
+    # are ignored when looking up the nodes of statement agents
+    nodes_to_agents = {name: Agent(name) for name in names[:1]}
+    return graph, stmts, nodes_to_agents
+
+
+def run_benchmark(n_nodes, n_stmts, poolsize):
+    graph, stmts, nodes_to_agents = get_random_model(n_nodes, n_stmts)
+    timings = {}
+    results = {}
+    for ps in (None, poolsize):
+        for group_by_target in (False, True):
+            mc = SignedGraphModelChecker(graph, stmts,
+                                         nodes_to_agents=nodes_to_agents)
+            mc.get_graph()
+            ts = time.time()
+            res = mc.check_model(max_paths=1, max_path_length=8,
+                                 poolsize=ps,
+                                 group_by_target=group_by_target)
+            key = (ps if ps else 1, group_by_target)
+            timings[key] = time.time() - ts
+            results[key] = [(r.result_code, len(r.paths)) for _, r in res]
+    # All the ways of checking statements should give the same results
+    assert len({tuple(res) for res in results.values()}) == 1
+    n_found = sum(code == 'PATHS_FOUND' for code, _ in results[(1, False)])
+    return timings, n_found
+
+
+if __name__ == '__main__':
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_stmts = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    poolsize = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    timings, n_found = run_benchmark(n_nodes, n_stmts, poolsize)
+    for (ps, group_by_target), duration in timings.items():
+        print('%d process(es), %s: %.2fs' %
+              (ps, 'grouped by target' if group_by_target else 'ungrouped',
+               duration))
+    print('%d of %d statements have paths' % (n_found, n_stmts))
@@ -0,0 +1,68 @@
+"""Benchmarks for loading a pickled vs a compact ontology graph.
+
+The graph used here is a synthetic graph with named nodes and typed edges
+whose size is comparable to that of the INDRA BioOntology.
+
+Usage: python -m indra.benchmarks.benchmark_ontology_cache [n_nodes]
+"""
+import os
+import sys
+import time
+import pickle
+import random
+import tempfile
+import networkx
+from indra.ontology.compact_graph import CompactGraph
+
+
+def get_random_graph(n_nodes, n_edges_per_node=2, seed=0):
+    """Return a random graph with named nodes and typed edges."""
+    rng = random.Random(seed)
+    graph = networkx.DiGraph()
+    labels = ['NS%d:%d' % (idx % 10, idx) for idx in range(n_nodes)]
+    graph.add_nodes_from((label, {'name': 'entity %d' % idx})
+                         for idx, label in enumerate(labels))
+    edges = []
+    for idx, label in enumerate(labels[1:], 1):
+        for _ in range(n_edges_per_node):
+            edges.append((label, labels[rng.randrange(idx)],
+                          {'type': rng.choice(['isa', 'partof', 'xref'])}))
+    graph.add_edges_from(edges)
+    return graph
+
+
+def run_benchmark(n_nodes):
+    graph = get_random_graph(n_nodes)
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pkl_file = os.path.join(tmp_dir, 'graph.pkl')
+        compact_dir = os.path.join(tmp_dir, 'graph_compact')
+        with open(pkl_file, 'wb') as fh:
+            pickle.dump(graph, fh, pickle.HIGHEST_PROTOCOL)
+        CompactGraph.from_graph(graph).save(compact_dir)
+        del graph
+
+        ts = time.time()
+        with open(pkl_file, 'rb') as fh:
+            graph = pickle.load(fh)
+        timings['pickle load'] = time.time() - ts
+        ts = time.time()
+        names = [graph.nodes[label]['name'] for label in ['NS1:1', 'NS2:2']]
+        timings['pickle lookups'] = time.time() - ts
+        del graph
+
+        ts = time.time()
+        compact_graph = CompactGraph.load(compact_dir)
+        timings['compact load'] = time.time() - ts
+        ts = time.time()
+        assert names == [compact_graph.get_node_property(label, 'name')
+                         for label in ['NS1:1', 'NS2:2']]
+        timings['compact lookups'] = time.time() - ts
+    return timings
+
+
+if __name__ == '__main__':
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    timings = run_benchmark(n_nodes)
+    for step, duration in timings.items():
+        print('%s: %.4fs' % (step, duration))
@@ -0,0 +1,79 @@
+"""Benchmarks for path finding in networkx vs compiled graphs.
+
+The graph used here is a random graph with namespaces on nodes and
+beliefs and weights on edges, similar to an IndraNet unsigned graph.
+
+Usage:
+    python -m indra.benchmarks.benchmark_pathfinding [n_nodes] [n_edges]
+        [n_searches]
+"""
+import sys
+import time
+import random
+import itertools
+import numpy
+import networkx
+from indra.explanation.pathfinding import bfs_search, open_dijkstra_search, \
+    shortest_simple_paths, CompiledGraph
+
+
+def get_random_graph(n_nodes, n_edges, seed=0):
+    """Return a random graph with node namespaces and edge beliefs."""
+    rng = random.Random(seed)
+    graph = networkx.DiGraph()
+    graph.add_nodes_from(('N%d' % idx, {'ns': rng.choice(['HGNC', 'FPLX'])})
+                         for idx in range(n_nodes))
+    edges = {}
+    while len(edges) < n_edges:
+        source = 'N%d' % rng.randrange(n_nodes)
+        target = 'N%d' % rng.randrange(n_nodes)
+        if source != target:
+            belief = rng.random()
+            edges[(source, target)] = {'belief': belief,
+                                       'weight': -numpy.log(belief)}
+    graph.add_edges_from((source, target, data)
+                         for (source, target), data in edges.items())
+    return graph
+
+
+def run_benchmark(n_nodes, n_edges, n_searches):
+    graph = get_random_graph(n_nodes, n_edges)
+    rng = random.Random(1)
+    nodes = list(graph.nodes)
+    pairs = [tuple(rng.sample(nodes, 2)) for _ in range(n_searches)]
+    timings = {}
+    ts = time.time()
+    compiled_graph = CompiledGraph.from_graph(graph)
+    timings['compile'] = time.time() - ts
+    searches = {
+        'bfs_search': lambda g, source, target:
+            list(bfs_search(g, source, reverse=True, depth_limit=4,
+                            path_limit=10000, max_per_node=20,
+                            node_filter=['hgnc', 'fplx'])),
+        'open_dijkstra_search': lambda g, source, target:
+            list(open_dijkstra_search(g, source, weight='weight',
+                                      path_limit=100)),
+        'shortest_simple_paths': lambda g, source, target:
+            list(itertools.islice(shortest_simple_paths(
+                g, source, target, weight='weight'), 5))
+            if networkx.has_path(graph, source, target) else [],
+    }
+    for name, search in searches.items():
+        results = []
+        for label, g in [('networkx', graph), ('compiled', compiled_graph)]:
+            ts = time.time()
+            results.append([search(g, source, target)
+                            for source, target in pairs])
+            timings['%s (%s)' % (name, label)] = time.time() - ts
+        # Searching either graph should give the same paths
+        assert results[0] == results[1]
+    return timings
+
+
+if __name__ == '__main__':
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_edges = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    n_searches = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    timings = run_benchmark(n_nodes, n_edges, n_searches)
+    for step, duration in timings.items():
+        print('%s: %.2fs' % (step, duration))
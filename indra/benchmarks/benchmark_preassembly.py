@@ -0,0 +1,149 @@
+"""Benchmarks for the duplicate and refinement finding steps of preassembly.
+
+The statements used here are generated randomly from the FamPlex part of the
+INDRA BioOntology so that there are many possible refinements to confirm.
+
+Usage:
+    python -m indra.benchmarks.benchmark_preassembly [n_stmts] [poolsize]
+    python -m indra.benchmarks.benchmark_preassembly keys [n_stmts]
+    python -m indra.benchmarks.benchmark_preassembly closure [n_stmts]
+"""
+import sys
+import time
+import random
+import itertools
+from indra.statements import *
+from indra.ontology.bio import bio_ontology
+from indra.preassembler import Preassembler
+
+
+def get_random_agents(ontology, seed=0):
+    """Return Agents for FamPlex families and their members."""
+    ontology.initialize()
+    rng = random.Random(seed)
+    agents = []
+    for node in sorted(ontology.nodes):
+        db_ns, db_id = ontology.get_ns_id(node)
+        if db_ns not in {'FPLX', 'HGNC'}:
+            continue
+        name = ontology.get_name(db_ns, db_id) or db_id
+        agents.append(Agent(name, db_refs={db_ns: db_id}))
+    rng.shuffle(agents)
+    return agents
+
+
+def get_random_stmts(n_stmts, seed=0):
+    """Return a list of random statements with many possible refinements."""
+    rng = random.Random(seed)
+    agents = get_random_agents(bio_ontology, seed)[:200]
+    residues = [None, 'S', 'T', 'Y']
+    positions = [None, '10', '100', '1000']
+    stmts = []
+    for _ in range(n_stmts):
+        enz, sub = rng.sample(agents, 2)
+        stmt_type = rng.choice([Phosphorylation, Dephosphorylation,
+                                Activation, Inhibition])
+        if issubclass(stmt_type, Modification):
+            stmt = stmt_type(enz, sub, rng.choice(residues),
+                             rng.choice(positions))
+        else:
+            stmt = stmt_type(enz, sub)
+        stmts.append(stmt)
+    return stmts
+
+
+def run_benchmark(n_stmts, poolsize):
+    stmts = get_random_stmts(n_stmts)
+    timings = {}
+    for ps in (None, poolsize):
+        pa = Preassembler(bio_ontology, stmts)
+        ts = time.time()
+        pa.combine_related(poolsize=ps)
+        te = time.time()
+        timings[ps if ps else 1] = (te - ts, len(pa.related_stmts),
+                                    pa._comparison_counter)
+    return timings
+
+
+def run_key_benchmark(n_stmts):
+    """Time matches key computations with and without key caching."""
+    stmts = get_random_stmts(n_stmts)
+
+    def get_keys():
+        # This mimics how keys are used during duplicate finding: once
+        # for sorting, once for grouping and once for hashing.
+        sorted_stmts = sorted(stmts, key=lambda x: x.matches_key())
+        groups = itertools.groupby(sorted_stmts, key=lambda x: x.matches_key())
+        n_groups = sum(1 for _ in groups)
+        for stmt in stmts:
+            stmt.get_hash(shallow=True, refresh=True)
+        return n_groups
+
+    timings = {}
+    ts = time.time()
+    n_groups = get_keys()
+    timings['uncached'] = (time.time() - ts, n_groups)
+    with key_caching():
+        ts = time.time()
+        n_groups = get_keys()
+        timings['cached (cold)'] = (time.time() - ts, n_groups)
+        ts = time.time()
+        n_groups = get_keys()
+        timings['cached (warm)'] = (time.time() - ts, n_groups)
+    return timings
+
+
+def run_closure_benchmark(n_stmts, n_queries=200000):
+    """Time ontology queries and refinement finding with and without the
+    transitive closure index."""
+    stmts = get_random_stmts(n_stmts)
+    groundings = [bio_ontology.get_ns_id(node) for node in
+                  sorted(bio_ontology.nodes)]
+    rng = random.Random(0)
+    pairs = [rng.sample(groundings, 2) for _ in range(n_queries)]
+    closure_index = bio_ontology._closure_index
+    timings = {}
+    try:
+        for mode, index in (('graph search', None),
+                            ('closure index', closure_index)):
+            bio_ontology._closure_index = index
+            ts = time.time()
+            n_related = sum(bio_ontology.isa_or_partof(ns1, id1, ns2, id2)
+                            for (ns1, id1), (ns2, id2) in pairs)
+            timings['%s: isa_or_partof x %d' % (mode, n_queries)] = \
+                (time.time() - ts, '%d related' % n_related)
+            ts = time.time()
+            n_parents = sum(len(bio_ontology.get_parents(ns, id))
+                            for ns, id in groundings)
+            timings['%s: get_parents x %d' % (mode, len(groundings))] = \
+                (time.time() - ts, '%d parents' % n_parents)
+            pa = Preassembler(bio_ontology, stmts)
+            ts = time.time()
+            pa.combine_related()
+            timings['%s: combine_related' % mode] = \
+                (time.time() - ts,
+                 '%d top-level statements' % len(pa.related_stmts))
+    finally:
+        bio_ontology._closure_index = closure_index
+    return timings
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'closure':
+        n_stmts = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+        timings = run_closure_benchmark(n_stmts)
+        for mode, (duration, result) in timings.items():
+            print('%s: %.2fs, %s' % (mode, duration, result))
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'keys':
+        n_stmts = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        timings = run_key_benchmark(n_stmts)
+        for mode, (duration, n_groups) in timings.items():
+            print('%s: %.2fs, %d unique keys' % (mode, duration, n_groups))
+        sys.exit(0)
+    n_stmts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    poolsize = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    timings = run_benchmark(n_stmts, poolsize)
+    for ps, (duration, n_top, n_comparisons) in timings.items():
+        print('%d process(es): %.2fs, %d top-level statements, '
+              '%d comparisons' % (ps, duration, n_top, n_comparisons))
@@ -0,0 +1,64 @@
+"""Benchmarks for looking up resource tables in a snapshot vs in dicts.
+
+A snapshot of the tables of a module is built in a temporary file which is
+used instead of the default snapshot. The time per lookup is then measured
+for the table loaded from the resource files as a dict, for the table in
+the snapshot, and for repeated passes over the keys of the table when it
+opts in to being copied into a dict once it's looked up often enough.
+
+Usage:
+    python -m indra.benchmarks.benchmark_resource_snapshot [module table]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import importlib
+from indra.resources import snapshot
+
+
+def time_lookups(table, keys):
+    """Return the time in microseconds per lookup of the given keys."""
+    ts = time.time()
+    for key in keys:
+        table.get(key)
+    return 1e6 * (time.time() - ts) / len(keys)
+
+
+def run_benchmark(module_name, table_name, n_keys=10000, n_passes=5):
+    lazy_tables = importlib.import_module(module_name)._tables
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot.SNAPSHOT_PATH = os.path.join(tmp_dir, 'tables.snapshot')
+        snapshot.build_snapshot(modules=[module_name])
+
+        ts = time.time()
+        table = lazy_tables.load(table_name)[table_name]
+        timings['dict load (s)'] = time.time() - ts
+        keys = random.Random(0).sample(list(table),
+                                       min(n_keys, len(table)))
+        timings['dict lookup (us)'] = time_lookups(table, keys)
+
+        # This is how the functions of the module look up the table
+        timings['snapshot lookup (us)'] = \
+            time_lookups(getattr(lazy_tables, table_name), keys)
+
+        # A separate table that is copied into a dict
+        snapshot_table = snapshot.SnapshotTable(
+            snapshot.get_snapshot(), '%s.%s' % (lazy_tables.name, table_name))
+        snapshot_table.materialize_ratio = snapshot.MATERIALIZE_RATIO
+        for idx in range(n_passes):
+            timings['pass %d lookup (us)' % (idx + 1)] = \
+                time_lookups(snapshot_table, keys)
+        timings['materialized'] = snapshot_table._dict is not None
+    return timings
+
+
+if __name__ == '__main__':
+    module_name, table_name = sys.argv[1:3] if len(sys.argv) > 2 else \
+        ('indra.databases.chebi_client', 'chebi_pubchem')
+    timings = run_benchmark(module_name, table_name)
+    for step, value in timings.items():
+        print('%s: %s' % (step, value if isinstance(value, bool)
+                          else '%.3f' % value))
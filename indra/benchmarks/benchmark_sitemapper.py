@@ -0,0 +1,101 @@
+"""Benchmarks for mapping the sites of many statements with the SiteMapper.
+
+The statements used here are random Phosphorylations between a few kinases
+and substrates, mostly at valid sites and some at sites known to be invalid,
+so that the same sites recur across statements as they do in a large
+corpus.
+
+Usage:
+    python -m indra.benchmarks.benchmark_sitemapper [n_stmts]
+"""
+import sys
+import time
+import random
+from indra.statements import *
+from indra.preassembler.sitemapper import default_mapper, \
+    _valid_position_str
+
+# Proteins with some of their valid and invalid phosphorylation sites
+valid_sites = {
+    ('MAPK1', 'P28482'): [('T', '185'), ('Y', '187')],
+    ('MAP2K1', 'Q02750'): [('S', '218'), ('S', '222')],
+    ('AKT1', 'P31749'): [('S', '473'), ('T', '308')],
+    ('GSK3B', 'P49841'): [('S', '9'), ('Y', '216')],
+    ('RPS6KB1', 'P23443'): [('T', '389'), ('T', '412')],
+}
+invalid_sites = {
+    ('MAPK1', 'P28482'): [('T', '183'), ('Y', '185')],
+    ('MAP2K1', 'Q02750'): [('S', '217'), ('S', '221')],
+    ('AKT1', 'P31749'): [('S', '472')],
+    ('GSK3B', 'P49841'): [('S', '8')],
+    ('RPS6KB1', 'P23443'): [('T', '388')],
+}
+
+
+def get_random_stmts(n_stmts, invalid_fraction=0.05, seed=0):
+    """Return random Phosphorylations between proteins with known sites.
+
+    Each site of the statements is invalid with the given probability.
+    """
+    rng = random.Random(seed)
+    proteins = list(valid_sites)
+
+    def get_site(protein):
+        sites = invalid_sites if rng.random() < invalid_fraction \
+            else valid_sites
+        return rng.choice(sites[protein])
+
+    def get_agent():
+        name, up_id = protein = rng.choice(proteins)
+        mods = [ModCondition('phosphorylation', *get_site(protein))
+                for _ in range(rng.choice([0, 0, 1]))]
+        return Agent(name, mods=mods, db_refs={'UP': up_id})
+
+    stmts = []
+    for _ in range(n_stmts):
+        enz, sub = get_agent(), get_agent()
+        residue, position = get_site((sub.name, sub.db_refs['UP']))
+        stmts.append(Phosphorylation(enz, sub, residue, position))
+    return stmts
+
+
+def map_sites_one_by_one(stmts):
+    """Map the sites of statements one by one, as map_sites used to."""
+    valid_stmts = []
+    mapped_stmts = []
+    for stmt in stmts:
+        if not _valid_position_str(stmt.position):
+            continue
+        mapped_stmt = default_mapper.map_stmt_sites(stmt)
+        if mapped_stmt is not None:
+            mapped_stmts.append(mapped_stmt)
+        else:
+            valid_stmts.append(stmt)
+    return valid_stmts, mapped_stmts
+
+
+def run_benchmark(n_stmts):
+    stmts = get_random_stmts(n_stmts)
+    timings = {}
+    results = {}
+    for label, map_sites in [('one by one', map_sites_one_by_one),
+                             ('batched', default_mapper.map_sites)]:
+        ts = time.time()
+        valid_stmts, mapped_stmts = map_sites(stmts)
+        timings[label] = time.time() - ts
+        results[label] = ([stmt.uuid for stmt in valid_stmts],
+                          [(mapped_stmt.original_stmt.uuid,
+                            [ms.to_list() for ms in mapped_stmt.mapped_mods],
+                            mapped_stmt.mapped_stmt.to_json())
+                           for mapped_stmt in mapped_stmts])
+    # Both ways of mapping sites should give the same results
+    assert results['one by one'] == results['batched']
+    return timings
+
+
+if __name__ == '__main__':
+    n_stmts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    timings = run_benchmark(n_stmts)
+    for label, duration in timings.items():
+        print('%s: %.2fs (%d statements/s)' %
+              (label, duration, n_stmts / duration))
@@ -3,7 +3,7 @@ import logging
 import requests
 from lxml import etree
 from functools import lru_cache, cmp_to_key
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 from indra.databases.obo_client import OboClient
 
 _obo_client = OboClient(prefix='chebi')
@@ -36,7 +36,7 @@ def get_pubchem_id(chebi_id):
         PubChem ID corresponding to the given ChEBI ID. If the lookup fails,
         None is returned.
     """
-    pubchem_id = chebi_pubchem.get(_add_prefix(chebi_id))
+    pubchem_id = _tables.chebi_pubchem.get(_add_prefix(chebi_id))
     return pubchem_id
 
 
@@ -54,7 +54,7 @@ def get_chebi_id_from_pubchem(pubchem_id):
         ChEBI ID corresponding to the given Pubchem ID. If the lookup fails,
         None is returned.
     """
-    chebi_id = pubchem_chebi.get(pubchem_id)
+    chebi_id = _tables.pubchem_chebi.get(pubchem_id)
     return chebi_id
 
 
@@ -72,7 +72,7 @@ def get_chembl_id(chebi_id):
         ChEMBL ID corresponding to the given ChEBI ID. If the lookup fails,
         None is returned.
     """
-    return chebi_chembl.get(_add_prefix(chebi_id))
+    return _tables.chebi_chembl.get(_add_prefix(chebi_id))
 
 
 def get_chebi_id_from_chembl(chembl_id):
@@ -89,7 +89,7 @@ def get_chebi_id_from_chembl(chembl_id):
         ChEBI ID corresponding to the given ChEBML ID. If the lookup fails,
         None is returned.
     """
-    return chembl_chebi.get(chembl_id)
+    return _tables.chembl_chebi.get(chembl_id)
 
 
 def get_chebi_id_from_cas(cas_id):
@@ -106,7 +106,7 @@ def get_chebi_id_from_cas(cas_id):
         The ChEBI ID corresponding to the given CAS ID. If the lookup
         fails, None is returned.
     """
-    return cas_chebi.get(cas_id)
+    return _tables.cas_chebi.get(cas_id)
 
 
 def get_chebi_name_from_id(chebi_id, offline=True):
@@ -297,7 +297,7 @@ def get_chebi_id_from_hmdb(hmdb_id):
         The ChEBI ID that the given HMDB ID maps to or None if no mapping
         was found.
     """
-    return hmdb_chebi.get(hmdb_id)
+    return _tables.hmdb_chebi.get(hmdb_id)
 
 
 # Read resource files into module-level variables
@@ -372,7 +372,19 @@ def _read_resource_csv(fname):
     return csv_reader
 
 
-chebi_pubchem, pubchem_chebi = _read_chebi_to_pubchem()
-chebi_chembl, chembl_chebi = _read_chebi_to_chembl()
-cas_chebi = _read_cas_to_chebi()
-hmdb_chebi = _read_hmdb_to_chebi()
+_tables = LazyTables({
+    ('chebi_pubchem', 'pubchem_chebi'): _read_chebi_to_pubchem,
+    ('chebi_chembl', 'chembl_chebi'): _read_chebi_to_chembl,
+    'cas_chebi': _read_cas_to_chebi,
+    'hmdb_chebi': _read_hmdb_to_chebi,
+}, name=__name__)
+
+
+# The resource tables, e.g., chebi_pubchem, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+chebi_pubchem = LazyTable(_tables, 'chebi_pubchem')
+pubchem_chebi = LazyTable(_tables, 'pubchem_chebi')
+chebi_chembl = LazyTable(_tables, 'chebi_chembl')
+chembl_chebi = LazyTable(_tables, 'chembl_chebi')
+cas_chebi = LazyTable(_tables, 'cas_chebi')
+hmdb_chebi = LazyTable(_tables, 'hmdb_chebi')
@@ -1,11 +1,10 @@
 import os
 import logging
 import requests
-from sympy.physics import units
 from indra.databases import chebi_client, uniprot_client
 from indra.statements import Inhibition, Agent, Evidence
 from collections import defaultdict
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 
 logger = logging.getLogger(__name__)
 
@@ -234,6 +233,8 @@ def get_kinetics(assay):
     except TypeError:
         logger.warning('Invalid assay value: %s' % assay.get('standard_value'))
         return None
+    # SymPy is slow to import so we only import it when needed
+    from sympy.physics import units
     unit = assay.get('standard_units')
     if unit == 'nM':
         unit_sym = 1e-9 * units.mol / units.liter
@@ -365,7 +366,7 @@ def get_chembl_name(chembl_id):
     str or None
         The corresponding ChEBML name or None if not available.
     """
-    return chembl_names.get(chembl_id)
+    return _tables.chembl_names.get(chembl_id)
 
 
 resource_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -382,4 +383,11 @@ def _load_resource():
     return chembl_names
 
 
-chembl_names = _load_resource()
+_tables = LazyTables({
+    'chembl_names': _load_resource,
+}, name=__name__)
+
+
+# The resource tables, e.g., chembl_names, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+chembl_names = LazyTable(_tables, 'chembl_names')
@@ -1,6 +1,6 @@
 """Client for interacting with DrugBank entries."""
 import os
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 
 
 def get_db_mapping(drugbank_id, db_ns):
@@ -18,7 +18,7 @@ def get_db_mapping(drugbank_id, db_ns):
     str or None
         The ID mapped to the given name space or None if not available.
     """
-    return drugbank_to_db.get((drugbank_id, db_ns))
+    return _tables.drugbank_to_db.get((drugbank_id, db_ns))
 
 
 def get_drugbank_id_from_db_id(db_ns, db_id):
@@ -36,7 +36,7 @@ def get_drugbank_id_from_db_id(db_ns, db_id):
     str or None
         The mapped DrugBank ID or None if not available.
     """
-    return db_to_drugbank.get((db_ns, db_id))
+    return _tables.db_to_drugbank.get((db_ns, db_id))
 
 
 def get_chebi_id(drugbank_id):
@@ -117,7 +117,7 @@ def get_drugbank_name(drugbank_id):
         The name corresponding to the given DrugBank ID or None if not
         available.
     """
-    return drugbank_names.get(drugbank_id)
+    return _tables.drugbank_names.get(drugbank_id)
 
 
 mappings_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -156,4 +156,13 @@ def _load_mappings():
     return drugbank_to_db, db_to_drugbank, drugbank_names
 
 
-drugbank_to_db, db_to_drugbank, drugbank_names = _load_mappings()
+_tables = LazyTables({
+    ('drugbank_to_db', 'db_to_drugbank', 'drugbank_names'): _load_mappings,
+}, name=__name__)
+
+
+# The resource tables, e.g., drugbank_to_db, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+drugbank_to_db = LazyTable(_tables, 'drugbank_to_db')
+db_to_drugbank = LazyTable(_tables, 'db_to_drugbank')
+drugbank_names = LazyTable(_tables, 'drugbank_names')
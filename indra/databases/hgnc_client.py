@@ -5,7 +5,8 @@ import requests
 import xml.etree.ElementTree as ET
 from functools import lru_cache
 
-from indra.util import read_unicode_csv, UnicodeXMLTreeBuilder as UTB
+from indra.util import read_unicode_csv, LazyTables, LazyTable, \
+    UnicodeXMLTreeBuilder as UTB
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +28,7 @@ def get_uniprot_id(hgnc_id):
     uniprot_id : str
         The UniProt ID corresponding to the given HGNC ID.
     """
-    uniprot_id = uniprot_ids.get(hgnc_id)
+    uniprot_id = _tables.uniprot_ids.get(hgnc_id)
     # The lookup can yield an empty string. Instead return None.
     if not uniprot_id:
         return None
@@ -48,7 +49,7 @@ def get_entrez_id(hgnc_id):
     entrez_id : str
         The Entrez ID corresponding to the given HGNC ID.
     """
-    entrez_id = entrez_ids.get(hgnc_id)
+    entrez_id = _tables.entrez_ids.get(hgnc_id)
     # The lookup can yield an empty string. Instead return None.
     if not entrez_id:
         return None
@@ -68,7 +69,7 @@ def get_hgnc_from_entrez(entrez_id):
     hgnc_id : str
         The HGNC ID corresponding to the given Entrez ID.
     """
-    hgnc_id = entrez_ids_reverse.get(entrez_id)
+    hgnc_id = _tables.entrez_ids_reverse.get(entrez_id)
     return hgnc_id
 
 
@@ -86,7 +87,7 @@ def get_ensembl_id(hgnc_id):
     ensembl_id : str
         The Ensembl ID corresponding to the given HGNC ID.
     """
-    return ensembl_ids.get(hgnc_id)
+    return _tables.ensembl_ids.get(hgnc_id)
 
 
 def get_hgnc_from_ensembl(ensembl_id):
@@ -102,7 +103,7 @@ def get_hgnc_from_ensembl(ensembl_id):
     hgnc_id : str
         The HGNC ID corresponding to the given Ensembl ID.
     """
-    return ensembl_ids_reverse.get(ensembl_id)
+    return _tables.ensembl_ids_reverse.get(ensembl_id)
 
 
 def get_hgnc_name(hgnc_id):
@@ -119,7 +120,7 @@ def get_hgnc_name(hgnc_id):
         The HGNC symbol corresponding to the given HGNC ID.
     """
     try:
-        hgnc_name = hgnc_names[hgnc_id]
+        hgnc_name = _tables.hgnc_names[hgnc_id]
     except KeyError:
         xml_tree = get_hgnc_entry(hgnc_id)
         if xml_tree is None:
@@ -145,7 +146,7 @@ def get_hgnc_id(hgnc_name):
     hgnc_id : str
         The HGNC ID corresponding to the given HGNC symbol.
     """
-    return hgnc_ids.get(hgnc_name)
+    return _tables.hgnc_ids.get(hgnc_name)
 
 
 def get_current_hgnc_id(hgnc_name):
@@ -168,7 +169,7 @@ def get_current_hgnc_id(hgnc_name):
     hgnc_id = get_hgnc_id(hgnc_name)
     if hgnc_id:
         return hgnc_id
-    hgnc_id = prev_sym_map.get(hgnc_name)
+    hgnc_id = _tables.prev_sym_map.get(hgnc_name)
     return hgnc_id
 
 
@@ -187,7 +188,7 @@ def get_hgnc_from_mouse(mgi_id):
     """
     if mgi_id.startswith('MGI:'):
         mgi_id = mgi_id[4:]
-    return mouse_map.get(mgi_id)
+    return _tables.mouse_map.get(mgi_id)
 
 
 def get_hgnc_from_rat(rgd_id):
@@ -205,7 +206,7 @@ def get_hgnc_from_rat(rgd_id):
     """
     if rgd_id.startswith('RGD:'):
         rgd_id = rgd_id[4:]
-    return rat_map.get(rgd_id)
+    return _tables.rat_map.get(rgd_id)
 
 
 def get_rat_id(hgnc_id):
@@ -221,7 +222,7 @@ def get_rat_id(hgnc_id):
     rgd_id : str
         The RGD ID corresponding to the given HGNC ID.
     """
-    for k, v in rat_map.items():
+    for k, v in _tables.rat_map.items():
         if v == hgnc_id:
             return k
 
@@ -239,7 +240,7 @@ def get_mouse_id(hgnc_id):
     mgi_id : str
         The MGI ID corresponding to the given HGNC ID.
     """
-    for k, v in mouse_map.items():
+    for k, v in _tables.mouse_map.items():
         if v == hgnc_id:
             return k
 
@@ -281,7 +282,7 @@ def is_kinase(gene_name):
     bool
         True if the given gene name corresponds to a kinase, False otherwise.
     """
-    return gene_name in kinases
+    return gene_name in _tables.kinases
 
 
 def is_transcription_factor(gene_name):
@@ -298,7 +299,7 @@ def is_transcription_factor(gene_name):
         True if the given gene name corresponds to a transcription factor,
         False otherwise.
     """
-    return gene_name in tfs
+    return gene_name in _tables.tfs
 
 
 def is_phosphatase(gene_name):
@@ -315,7 +316,7 @@ def is_phosphatase(gene_name):
         True if the given gene name corresponds to a phosphatase,
         False otherwise.
     """
-    return gene_name in phosphatases
+    return gene_name in _tables.phosphatases
 
 
 def _read_hgnc_maps():
@@ -408,11 +409,6 @@ def _read_hgnc_maps():
             prev_sym_map, ensembl_ids, ensembl_ids_reverse)
 
 
-(hgnc_names, hgnc_ids, hgnc_withdrawn, uniprot_ids, entrez_ids,
- entrez_ids_reverse, mouse_map, rat_map, prev_sym_map, ensembl_ids,
- ensembl_ids_reverse) = _read_hgnc_maps()
-
-
 def _read_kinases():
     fname = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
                          'resources', 'kinases.tsv')
@@ -439,4 +435,29 @@ def _read_tfs():
     return gene_names
 
 
-kinases, phosphatases, tfs = _read_kinases(), _read_phosphatases(), _read_tfs()
+_tables = LazyTables({
+    ('hgnc_names', 'hgnc_ids', 'hgnc_withdrawn', 'uniprot_ids', 'entrez_ids',
+     'entrez_ids_reverse', 'mouse_map', 'rat_map', 'prev_sym_map',
+     'ensembl_ids', 'ensembl_ids_reverse'): _read_hgnc_maps,
+    'kinases': _read_kinases,
+    'phosphatases': _read_phosphatases,
+    'tfs': _read_tfs,
+}, name=__name__)
+
+
+# The resource tables, e.g., hgnc_names, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+hgnc_names = LazyTable(_tables, 'hgnc_names')
+hgnc_ids = LazyTable(_tables, 'hgnc_ids')
+hgnc_withdrawn = LazyTable(_tables, 'hgnc_withdrawn')
+uniprot_ids = LazyTable(_tables, 'uniprot_ids')
+entrez_ids = LazyTable(_tables, 'entrez_ids')
+entrez_ids_reverse = LazyTable(_tables, 'entrez_ids_reverse')
+mouse_map = LazyTable(_tables, 'mouse_map')
+rat_map = LazyTable(_tables, 'rat_map')
+prev_sym_map = LazyTable(_tables, 'prev_sym_map')
+ensembl_ids = LazyTable(_tables, 'ensembl_ids')
+ensembl_ids_reverse = LazyTable(_tables, 'ensembl_ids_reverse')
+kinases = LazyTable(_tables, 'kinases')
+phosphatases = LazyTable(_tables, 'phosphatases')
+tfs = LazyTable(_tables, 'tfs')
@@ -5,7 +5,7 @@ import requests
 import itertools
 from functools import lru_cache
 from os.path import abspath, dirname, join, pardir
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 
 MESH_URL = 'https://id.nlm.nih.gov/mesh/'
 HERE = dirname(abspath(__file__))
@@ -15,31 +15,29 @@ MESH_SUPP_FILE = join(RESOURCES, 'mesh_supp_id_label_mappings.tsv')
 DB_MAPPINGS = join(RESOURCES, 'mesh_mappings.tsv')
 
 
-mesh_id_to_name = {}
-mesh_name_to_id = {}
-mesh_name_to_id_name = {}
-mesh_id_to_tree_numbers = {}
-
-
-def _load_mesh_file(path):
-    it = read_unicode_csv(path, delimiter='\t')
-    for terms in it:
-        if len(terms) == 3:
-            mesh_id, mesh_label, mesh_terms_str = terms
-        else:
-            mesh_id, mesh_label, mesh_terms_str, tree_number_str = terms
-            mesh_id_to_tree_numbers[mesh_id] = tree_number_str.split('|')
-        mesh_terms = mesh_terms_str.split('|') if mesh_terms_str else []
-        mesh_id_to_name[mesh_id] = mesh_label
-        mesh_name_to_id[mesh_label] = mesh_id
-        for term in mesh_terms:
-            mesh_name_to_id_name[term] = [mesh_id, mesh_label]
-
-
-_load_mesh_file(MESH_FILE)
-if os.path.exists(MESH_SUPP_FILE):
-    _load_mesh_file(MESH_SUPP_FILE)
 
+def _load_mesh_files():
+    mesh_id_to_name = {}
+    mesh_name_to_id = {}
+    mesh_name_to_id_name = {}
+    mesh_id_to_tree_numbers = {}
+    paths = [MESH_FILE]
+    if os.path.exists(MESH_SUPP_FILE):
+        paths.append(MESH_SUPP_FILE)
+    for path in paths:
+        for terms in read_unicode_csv(path, delimiter='\t'):
+            if len(terms) == 3:
+                mesh_id, mesh_label, mesh_terms_str = terms
+            else:
+                mesh_id, mesh_label, mesh_terms_str, tree_number_str = terms
+                mesh_id_to_tree_numbers[mesh_id] = tree_number_str.split('|')
+            mesh_terms = mesh_terms_str.split('|') if mesh_terms_str else []
+            mesh_id_to_name[mesh_id] = mesh_label
+            mesh_name_to_id[mesh_label] = mesh_id
+            for term in mesh_terms:
+                mesh_name_to_id_name[term] = [mesh_id, mesh_label]
+    return (mesh_id_to_name, mesh_name_to_id, mesh_name_to_id_name,
+            mesh_id_to_tree_numbers)
 
 def _load_db_mappings(path):
     mesh_to_db = {}
@@ -63,7 +61,21 @@ def _load_db_mappings(path):
     return mesh_to_db, db_to_mesh
 
 
-mesh_to_db, db_to_mesh = _load_db_mappings(DB_MAPPINGS)
+_tables = LazyTables({
+    ('mesh_id_to_name', 'mesh_name_to_id', 'mesh_name_to_id_name',
+     'mesh_id_to_tree_numbers'): _load_mesh_files,
+    ('mesh_to_db', 'db_to_mesh'): lambda: _load_db_mappings(DB_MAPPINGS),
+}, name=__name__)
+
+
+# The resource tables, e.g., mesh_id_to_name, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+mesh_id_to_name = LazyTable(_tables, 'mesh_id_to_name')
+mesh_name_to_id = LazyTable(_tables, 'mesh_name_to_id')
+mesh_name_to_id_name = LazyTable(_tables, 'mesh_name_to_id_name')
+mesh_id_to_tree_numbers = LazyTable(_tables, 'mesh_id_to_tree_numbers')
+mesh_to_db = LazyTable(_tables, 'mesh_to_db')
+db_to_mesh = LazyTable(_tables, 'db_to_mesh')
 
 
 @lru_cache(maxsize=1000)
@@ -114,7 +126,7 @@ def get_mesh_name(mesh_id, offline=False):
         Label for the MESH ID, or None if the query failed or no label was
         found.
     """
-    indra_mesh_mapping = mesh_id_to_name.get(mesh_id)
+    indra_mesh_mapping = _tables.mesh_id_to_name.get(mesh_id)
     if offline or indra_mesh_mapping is not None:
         return indra_mesh_mapping
     # Look up the MESH mapping from NLM if we don't have it locally
@@ -148,12 +160,12 @@ def get_mesh_id_name(mesh_term, offline=False):
     if not mesh_term:
         return None, None
 
-    indra_mesh_id = mesh_name_to_id.get(mesh_term)
+    indra_mesh_id = _tables.mesh_name_to_id.get(mesh_term)
     if indra_mesh_id is not None:
         return indra_mesh_id, mesh_term
 
     indra_mesh_id, new_term = \
-        mesh_name_to_id_name.get(mesh_term, (None, None))
+        _tables.mesh_name_to_id_name.get(mesh_term, (None, None))
     if indra_mesh_id is not None:
         return indra_mesh_id, new_term
 
@@ -274,7 +286,7 @@ def get_mesh_tree_numbers(mesh_id):
     list[str]
         A list of MeSH tree IDs.
     """
-    return mesh_id_to_tree_numbers.get(mesh_id, [])
+    return _tables.mesh_id_to_tree_numbers.get(mesh_id, [])
 
 
 def get_mesh_tree_numbers_from_web(mesh_id):
@@ -389,7 +401,7 @@ def get_db_mapping(mesh_id):
         A tuple consisting of a DB namespace and ID for the mapping or None
         if not available.
     """
-    return mesh_to_db.get(mesh_id)
+    return _tables.mesh_to_db.get(mesh_id)
 
 
 def get_mesh_id_from_db_id(db_ns, db_id):
@@ -408,7 +420,7 @@ def get_mesh_id_from_db_id(db_ns, db_id):
         The MeSH ID corresponding to the given namespace and ID if available,
         otherwise None.
     """
-    return db_to_mesh.get((db_ns, db_id))
+    return _tables.db_to_mesh.get((db_ns, db_id))
 
 
 mesh_rdf_prefixes = """
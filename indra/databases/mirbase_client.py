@@ -1,6 +1,7 @@
 """A client to miRBase."""
 
 import os
+from indra.util import LazyTables
 
 __all__ = [
     'get_mirbase_id_from_mirbase_name',
@@ -27,7 +28,7 @@ def get_mirbase_name_from_mirbase_id(mirbase_id):
     mirbase_name : str
         The miRBase name corresponding to the given miRBase ID.
     """
-    return _mirbase_id_to_name.get(mirbase_id)
+    return _tables.mirbase_id_to_name.get(mirbase_id)
 
 
 def get_mirbase_id_from_mirbase_name(mirbase_name):
@@ -43,7 +44,7 @@ def get_mirbase_id_from_mirbase_name(mirbase_name):
     mirbase_id : str
         The miRBase ID corresponding to the given miRBase name.
     """
-    return _mirbase_name_to_id.get(mirbase_name)
+    return _tables.mirbase_name_to_id.get(mirbase_name)
 
 
 def get_hgnc_id_from_mirbase_id(mirbase_id):
@@ -59,7 +60,7 @@ def get_hgnc_id_from_mirbase_id(mirbase_id):
     hgnc_id : str
         The HGNC ID corresponding to the given miRBase ID.
     """
-    return _mirbase_id_to_hgnc_id.get(mirbase_id)
+    return _tables.mirbase_id_to_hgnc_id.get(mirbase_id)
 
 
 def get_mirbase_id_from_hgnc_id(hgnc_id):
@@ -76,7 +77,7 @@ def get_mirbase_id_from_hgnc_id(hgnc_id):
     mirbase_id : str
         The miRBase ID corresponding to the given HGNC ID.
     """
-    return _hgnc_id_to_mirbase_id.get(hgnc_id)
+    return _tables.hgnc_id_to_mirbase_id.get(hgnc_id)
 
 
 def get_mirbase_id_from_hgnc_symbol(hgnc_symbol):
@@ -93,7 +94,7 @@ def get_mirbase_id_from_hgnc_symbol(hgnc_symbol):
     mirbase_id : str
         The miRBase ID corresponding to the given HGNC gene symbol.
     """
-    return _hgnc_symbol_to_mirbase_id.get(hgnc_symbol)
+    return _tables.hgnc_symbol_to_mirbase_id.get(hgnc_symbol)
 
 
 def _read():
@@ -133,11 +134,8 @@ def _read():
     )
 
 
-(
-    _mirbase_id_to_name,
-    _mirbase_name_to_id,
-    _hgnc_id_to_mirbase_id,
-    _mirbase_id_to_hgnc_id,
-    _hgnc_symbol_to_mirbase_id,
-    _mirbase_id_to_hgnc_symbol,
-) = _read()
+_tables = LazyTables({
+    ('mirbase_id_to_name', 'mirbase_name_to_id', 'hgnc_id_to_mirbase_id',
+     'mirbase_id_to_hgnc_id', 'hgnc_symbol_to_mirbase_id',
+     'mirbase_id_to_hgnc_symbol'): _read,
+}, name=__name__)
@@ -28,47 +28,63 @@ class OboClient:
     """A base client for data that's been grabbed via OBO"""
 
     def __init__(self, prefix, *, directory=RESOURCES):
-        """Read the OBO file export at the given path."""
+        """Set up reading the OBO file export at the given path.
+
+        The file is only read when the entries or mappings of the client are
+        first accessed.
+        """
         self.prefix = prefix
         self.directory = directory
         self.mapping_path = _make_resource_path(self.directory, self.prefix)
 
-        self.entries = {}
-        self.alt_to_id = {}
-        self.name_to_id = {}
-        self.synonym_to_id = {}
+    def __getattr__(self, name):
+        # This is only called for attributes that aren't set, i.e., if
+        # the entries haven't been loaded yet
+        if name in {'entries', 'alt_to_id', 'name_to_id', 'synonym_to_id'}:
+            self._load_entries()
+            return self.__dict__[name]
+        raise AttributeError(name)
 
+    def _load_entries(self):
         with open(self.mapping_path) as file:
             entries = json.load(file)
 
-        self.entries = {entry['id']: entry for entry in entries}
+        entries = {entry['id']: entry for entry in entries}
+        alt_to_id = {}
+        name_to_id = {}
+        synonym_to_id = {}
 
         ambig_synonyms = set()
-        for db_id, entry in self.entries.items():
+        for db_id, entry in entries.items():
             xrs = defaultdict(list)
             for xref in entry.get('xrefs', []):
                 xrs[xref['namespace']].append(xref['id'])
             entry['xrefs'] = dict(xrs)
 
-            self.name_to_id[entry['name']] = db_id
+            name_to_id[entry['name']] = db_id
             for synonym in entry.get('synonyms', []):
                 # Make a note of this is an ambiguous synonym so that we can
                 # get rid of it after the loop, e.g., "multiciliation"
-                if synonym in self.synonym_to_id:
+                if synonym in synonym_to_id:
                     ambig_synonyms.add(synonym)
-                self.synonym_to_id[synonym] = db_id
+                synonym_to_id[synonym] = db_id
 
             for db_alt_id in entry.get('alt_ids', []):
-                if db_alt_id in self.entries:
+                if db_alt_id in entries:
                     raise ValueError(
                         'Problem with integrity of {}:{}'.format(
                             self.prefix, db_alt_id
                         )
                     )
-                self.alt_to_id[db_alt_id] = db_id
+                alt_to_id[db_alt_id] = db_id
         # Remove all ambiguous synonyms
-        self.synonym_to_id = {k: v for k, v in self.synonym_to_id.items()
-                              if k not in ambig_synonyms}
+        synonym_to_id = {k: v for k, v in synonym_to_id.items()
+                         if k not in ambig_synonyms}
+        # The attributes are only set once all of them are loaded
+        self.entries = entries
+        self.alt_to_id = alt_to_id
+        self.name_to_id = name_to_id
+        self.synonym_to_id = synonym_to_id
 
     @staticmethod
     def entries_from_graph(obo_graph, prefix, remove_prefix=False,
@@ -1,11 +1,14 @@
 import logging
 import textwrap
+import multiprocessing
 from copy import deepcopy
+from collections import defaultdict
 
 import numpy as np
 import networkx as nx
 
-from indra.explanation.pathfinding import get_path_iter, find_sources
+from indra.explanation.pathfinding import get_path_iter, find_sources, \
+    SourcesCache
 
 try:
     import paths_graph as pg
@@ -204,7 +207,17 @@ class ModelChecker(object):
     ----------
     graph : nx.Digraph
         A DiGraph with signed nodes to find paths in.
+    sources_cache_size : int
+        The number of targets for which the sources found upstream of them
+        are cached so that checking further statements with the same target
+        doesn't require searching the graph again. Each cached target
+        holds an index of all the nodes upstream of it, which can be large
+        for large graphs. Sources are not cached if this is 0, except for
+        the most recent target when statements are grouped by target.
+        Default: 0
     """
+    sources_cache_size = 0
+
     def __init__(self, model, statements=None, do_sampling=False, seed=None,
                  nodes_to_agents=None):
         self.model = model
@@ -218,6 +231,13 @@ class ModelChecker(object):
         # Whether to do sampling
         self.do_sampling = do_sampling
         self.graph = None
+        self._sources_cache = None
+
+    def __getstate__(self):
+        # The cached sources can be large and are easy to recompute
+        state = self.__dict__.copy()
+        state['_sources_cache'] = None
+        return state
 
     def add_statements(self, stmts):
         """Add to the list of statements to check against the model.
@@ -230,7 +250,8 @@ class ModelChecker(object):
         self.statements += stmts
 
     def check_model(self, max_paths=1, max_path_length=5,
-                    agent_filter_func=None):
+                    agent_filter_func=None, poolsize=None,
+                    group_by_target=False):
         """Check all the statements added to the ModelChecker.
 
         Parameters
@@ -244,6 +265,18 @@ class ModelChecker(object):
             A function to constrain the intermediate nodes in the path. A
             function should take an agent as a parameter and return True if the
             agent is allowed to be in a path and False otherwise.
+        poolsize : Optional[int]
+            The number of worker processes to check statements with. If
+            None or 1, statements are checked in the current process.
+            Worker processes are forked so that they inherit the model
+            checker and the filter function, which therefore don't need to
+            be picklable. On platforms that can't fork, statements are
+            checked in the current process. Default: None
+        group_by_target : Optional[bool]
+            If True, statements with the same object are checked one after
+            the other (and by the same process) so that the upstream search
+            from the object is done only once for all of them, regardless of
+            how many objects there are. Default: False
 
         Returns
         -------
@@ -251,17 +284,127 @@ class ModelChecker(object):
             Each tuple contains the Statement checked against the model and
             a PathResult object describing the results of model checking.
         """
-        results = []
+        results = [None] * len(self.statements)
+        for idx, result in self._check_model(max_paths, max_path_length,
+                                             agent_filter_func, poolsize,
+                                             group_by_target):
+            results[idx] = (self.statements[idx], result)
+        return results
+
+    def iter_check_model(self, max_paths=1, max_path_length=5,
+                         agent_filter_func=None, poolsize=None,
+                         group_by_target=False):
+        """Check all the statements, yielding results as they are obtained.
+
+        This takes the same arguments as :py:meth:`check_model`. If
+        statements are checked by multiple processes or grouped by target,
+        results are not yielded in the order of the statements.
+
+        Yields
+        ------
+        tuple(Statement, PathResult)
+            The Statement checked against the model and a PathResult object
+            describing the results of model checking.
+        """
+        for idx, result in self._check_model(max_paths, max_path_length,
+                                             agent_filter_func, poolsize,
+                                             group_by_target):
+            yield self.statements[idx], result
+
+    def _check_model(self, max_paths, max_path_length, agent_filter_func,
+                     poolsize, group_by_target):
+        """Yield the index of each statement with the result of checking it."""
         # Convert agent filter function to node filter function once here
         node_filter_func = self.update_filter_func(agent_filter_func)
-        for idx, stmt in enumerate(self.statements):
-            logger.info('---')
-            logger.info('Checking statement (%d/%d): %s' %
-                        (idx + 1, len(self.statements), stmt))
-            result = self.check_statement(stmt, max_paths, max_path_length,
-                                          node_filter_func=node_filter_func)
-            results.append((stmt, result))
-        return results
+        # Each item is the index of a statement and, if it was already
+        # processed, the result of processing it
+        items = [(idx, None) for idx in range(len(self.statements))]
+        if poolsize is not None and poolsize > 1 and \
+                'fork' not in multiprocessing.get_all_start_methods():
+            logger.warning('Checking statements in the current process '
+                           'since worker processes can\'t be forked on this '
+                           'platform')
+            poolsize = None
+        if poolsize is None or poolsize <= 1:
+            if group_by_target:
+                items = [item for group in self._group_by_target(
+                    self._process_statements(items)) for item in group]
+            yield from self._check_statements(items, max_paths,
+                                              max_path_length,
+                                              node_filter_func,
+                                              group_by_target)
+            return
+        # We build the graph before forking the workers so that they share
+        # it with this process rather than each building it
+        self.get_graph()
+        chunk_size = max(1, len(items) // (poolsize * 4))
+        chunks = [items[start:start + chunk_size]
+                  for start in range(0, len(items), chunk_size)]
+        with multiprocessing.get_context('fork').Pool(
+                poolsize, initializer=_init_model_checker_worker,
+                initargs=(self, max_paths, max_path_length,
+                          node_filter_func, group_by_target)) as pool:
+            if group_by_target:
+                # Statements are processed by the workers, then grouped
+                # here and statements with the same target are sent to
+                # the same worker
+                items = [item for chunk_items in
+                         pool.imap(_process_statements_worker, chunks)
+                         for item in chunk_items]
+                chunks = [[]]
+                for group in self._group_by_target(items):
+                    if len(chunks[-1]) >= chunk_size:
+                        chunks.append([])
+                    chunks[-1] += group
+            logger.info('Checking %d statements in %d chunks using %d '
+                        'processes' % (len(items), len(chunks), poolsize))
+            for chunk_results in pool.imap_unordered(_check_statements_worker,
+                                                     chunks):
+                yield from chunk_results
+
+    def _process_statements(self, items):
+        """Return items of statement indices with processed statements."""
+        self.get_graph()
+        return [(idx, self.process_statement(self.statements[idx]))
+                for idx, _ in items]
+
+    @staticmethod
+    def _group_by_target(items):
+        """Return processed statements grouped by the target of their paths.
+        """
+        groups = defaultdict(list)
+        for idx, processed in items:
+            subj_nodes, obj_nodes, result_code = processed
+            key = None if result_code else \
+                _get_target_key(subj_nodes, obj_nodes)
+            groups[key].append((idx, processed))
+        return list(groups.values())
+
+    def _check_statements(self, items, max_paths, max_path_length,
+                          node_filter_func, group_by_target=False):
+        """Yield the index of each given statement with its result."""
+        # Statements grouped by target are checked one after the other so
+        # we cache the sources of the most recent target even if sources
+        # are otherwise not cached
+        temp_cache = group_by_target and not self.sources_cache_size
+        if temp_cache:
+            self._sources_cache = SourcesCache(self.get_graph(), 1)
+        try:
+            for idx, processed in items:
+                stmt = self.statements[idx]
+                logger.info('---')
+                logger.info('Checking statement (%d/%d): %s' %
+                            (idx + 1, len(self.statements), stmt))
+                if processed is None:
+                    self.get_graph()
+                    processed = self.process_statement(stmt)
+                result = self._check_processed_statement(
+                    stmt, processed, max_paths, max_path_length,
+                    node_filter_func)
+                yield idx, result
+        finally:
+            if temp_cache:
+                self._sources_cache = None
 
     def check_statement(self, stmt, max_paths=1, max_path_length=5,
                         agent_filter_func=None, node_filter_func=None):
@@ -291,7 +434,18 @@ class ModelChecker(object):
             A PathResult object containing the result of a test.
         """
         self.get_graph()
-        subj_nodes, obj_nodes, result_code = self.process_statement(stmt)
+        processed = self.process_statement(stmt)
+        # Convert agent filter function to node filter function
+        if agent_filter_func and not node_filter_func:
+            node_filter_func = self.update_filter_func(agent_filter_func)
+        return self._check_processed_statement(stmt, processed, max_paths,
+                                               max_path_length,
+                                               node_filter_func)
+
+    def _check_processed_statement(self, stmt, processed, max_paths,
+                                   max_path_length, node_filter_func):
+        """Check a Statement given the result of processing it."""
+        subj_nodes, obj_nodes, result_code = processed
         if result_code:
             return self.make_false_result(result_code, max_paths,
                                           max_path_length)
@@ -301,9 +455,6 @@ class ModelChecker(object):
                 and (subj_nodes.all_nodes[0] == obj_nodes.all_nodes[0])):
             loop = True
 
-        # Convert agent filter function to node filter function
-        if agent_filter_func and not node_filter_func:
-            node_filter_func = self.update_filter_func(agent_filter_func)
         # If we have several objects in obj_list or we have a loop, we add a
         # dummy target node as a child to all nodes in obj_list
         common_target = None
@@ -377,14 +528,15 @@ class ModelChecker(object):
         path_lengths = []
         path_metrics = []
         sources = []
+        found_sources = set()
         if obj.common_target:
             target = obj.common_target
             dummy_target = True
         else:
             target = obj.all_nodes[0]
             dummy_target = False
-        for source, path_length in find_sources(self.graph, target,
-                                                subj.all_nodes, filter_func):
+        for source, path_length in self._find_sources(target, subj, obj,
+                                                      loop, filter_func):
             # If a dummy target is used, we need to subtract one edge.
             # In case of loops, we are already missing one edge, there's no
             # need to subtract one more.
@@ -399,7 +551,8 @@ class ModelChecker(object):
                 path_metrics.append(pm)
                 path_lengths.append(path_length)
                 # Keep unique sources but use a list, not set to preserve order
-                if source not in sources:
+                if source not in found_sources:
+                    found_sources.add(source)
                     sources.append(source)
         # Now, look for paths
         if path_metrics and max_paths == 0:
@@ -452,6 +605,29 @@ class ModelChecker(object):
             return PathResult(False, 'NO_PATHS_FOUND',
                               max_paths, max_path_length)
 
+    def _find_sources(self, target, subj, obj, loop, filter_func):
+        """Return the sources with paths to a target and their path lengths.
+
+        The sources upstream of each target are cached so that statements
+        with the same target are checked without searching the graph again.
+        Sources are not cached if a filter function is given since the
+        nodes that are exempt from the filter, and so the nodes that are
+        visited, depend on the sources.
+        """
+        if filter_func is not None:
+            return find_sources(self.graph, target, subj.all_nodes,
+                                filter_func)
+        if self._sources_cache is None or \
+                self._sources_cache.graph is not self.graph:
+            if not self.sources_cache_size:
+                return find_sources(self.graph, target, subj.all_nodes)
+            self._sources_cache = SourcesCache(self.graph,
+                                               self.sources_cache_size)
+        # The target may be a common target node whose edges depend on the
+        # statement so we cache sources by the nodes it stands for
+        return self._sources_cache.find_sources(
+            target, subj.all_nodes, key=_get_target_key(subj, obj))
+
     def get_ref(self, ag, node, rel):
         """Create a refinement edge."""
         ref_ag = self.nodes_to_agents[node[0]]
@@ -545,6 +721,40 @@ class ModelChecker(object):
         raise NotImplementedError("Method must be implemented in child class.")
 
 
+def _get_target_key(subj_nodes, obj_nodes):
+    """Return a key for the target of the paths checked for a statement."""
+    # The same condition as used in check_statement
+    loop = (subj_nodes.get_total_nodes() == obj_nodes.get_total_nodes() == 1
+            and subj_nodes.all_nodes[0] == obj_nodes.all_nodes[0])
+    all_nodes = obj_nodes.all_nodes
+    return tuple(all_nodes) if all_nodes is not None else None, loop
+
+
+# The state of each model checking worker process, which is set by
+# _init_model_checker_worker when each worker process starts. Workers are
+# forked so the model checker and the node filter function, which may be a
+# closure, are inherited rather than pickled.
+_model_checker_worker_state = {}
+
+
+def _init_model_checker_worker(model_checker, max_paths, max_path_length,
+                               node_filter_func, group_by_target):
+    _model_checker_worker_state['model_checker'] = model_checker
+    _model_checker_worker_state['args'] = \
+        (max_paths, max_path_length, node_filter_func, group_by_target)
+
+
+def _process_statements_worker(items):
+    model_checker = _model_checker_worker_state['model_checker']
+    return model_checker._process_statements(items)
+
+
+def _check_statements_worker(items):
+    model_checker = _model_checker_worker_state['model_checker']
+    return list(model_checker._check_statements(
+        items, *_model_checker_worker_state['args']))
+
+
 def signed_edges_to_signed_nodes(graph, prune_nodes=True,
                                  edge_signs={'pos': 0, 'neg': 1},
                                  copy_edge_data=False):
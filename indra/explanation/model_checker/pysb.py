@@ -1,4 +1,7 @@
+import os
+import pickle
 import numbers
+import hashlib
 import logging
 from copy import deepcopy
 from collections import Counter
@@ -8,7 +11,7 @@ import kappy
 import itertools
 import numpy as np
 import networkx as nx
-from pysb import WILD, export, Observable, ComponentSet, Annotation
+from pysb import WILD, export, Observable, ComponentSet, Annotation, Model
 from pysb.core import as_complex_pattern, ComponentDuplicateNameError
 from pysb.pattern import RulePatternMatcher
 from indra.explanation.reporting import stmt_from_rule, agent_from_obs
@@ -17,6 +20,8 @@ from indra.assemblers.pysb import assembler as pa
 from indra.assemblers.pysb.kappa_util import im_json_to_graph
 from indra.statements.agent import default_ns_order
 from indra.ontology.bio import bio_ontology
+from indra.config import get_config
+from indra.util import atomic_replace
 
 from . import ModelChecker, PathResult, NodesContainer
 from .model_checker import signed_edges_to_signed_nodes
@@ -32,6 +37,11 @@ except ImportError:
     logger.warning('PathsGraph is not available')
 
 
+IM_CACHE_DIR = os.path.join((get_config('INDRA_RESOURCES') or
+                             os.path.join(os.path.expanduser('~'), '.indra')),
+                            'influence_maps')
+
+
 class PysbModelChecker(ModelChecker):
     """Check a PySB model against a set of INDRA statements.
 
@@ -58,7 +68,29 @@ class PysbModelChecker(ModelChecker):
     ----------
     graph : nx.Digraph
         A DiGraph with signed nodes to find paths in.
+    im_cache_dir : str
+        The directory in which influence maps are saved, keyed by a hash of
+        the exported Kappa model, so that checking the same model again
+        doesn't require generating its influence map. Influence maps are
+        not saved if this is None, and saved maps are never removed, so
+        the directory should be cleaned up by the user. IM_CACHE_DIR, i.e.,
+        ~/.indra/influence_maps or influence_maps in the INDRA_RESOURCES
+        directory if configured, can be used. Default: None
+    incremental_im : bool
+        Whether the influence map of a model that wasn't seen before is
+        updated from the last influence map generated or loaded by this
+        model checker, by only generating the influences of rules and
+        observables that were added or changed. Otherwise, the influence
+        map of the whole model is generated. Default: False
+    max_im_update_fraction : float
+        The largest fraction of the rules of a model whose influences are
+        generated when updating an influence map. If more rules are
+        affected by the changes, the influence map of the whole model is
+        generated instead. Default: 0.5
     """
+    im_cache_dir = None
+    incremental_im = False
+    max_im_update_fraction = 0.5
 
     def __init__(self, model, statements=None, agent_obs=None,
                  do_sampling=False, seed=None, model_stmts=None,
@@ -75,6 +107,9 @@ class PysbModelChecker(ModelChecker):
         self.model_stmts = model_stmts if model_stmts else []
         # Influence map
         self._im = None
+        # The last influence map generated before pruning and the
+        # signatures of the model it was generated for
+        self._im_base = None
         # Map from statements to associated observables
         self.stmt_to_obs = {}
         # Map from agents to associated observables
@@ -97,13 +132,62 @@ class PysbModelChecker(ModelChecker):
         graph : networkx.MultiDiGraph
             A MultiDiGraph representing the influence map
         """
-        kappa = kappy.KappaStd()
+        return _run_kappa_im(export.export(model, 'kappa'))
+
+    def generate_cached_im(self, model):
+        """Return the influence map of a model using cached influence maps.
+
+        The influence map of a model is looked up by a hash of the exported
+        Kappa model, first in memory and then in `im_cache_dir`. If it
+        isn't found and `incremental_im` is True, the last influence map
+        generated or loaded by this model checker, e.g., for an earlier
+        version of the model, is updated by removing the rules that are no
+        longer in the model and generating the influences of rules and
+        observables that were added or changed. These are generated from a
+        model that contains all the observables of the model and only the
+        rules that share a monomer with an added or changed rule or
+        observable, since other rules can't influence or be influenced by
+        them. Note that Kappa's medium accuracy influence map takes the
+        contact map of the model into account so in rare cases, an updated
+        influence map may differ from the one generated from the whole
+        model, which is why `incremental_im` is False by default. Influence
+        maps, whole or of the sub-model, are generated by `generate_im`.
+
+        Parameters
+        ----------
+        model : pysb.Model
+            The PySB model whose influence map is to be generated
+
+        Returns
+        -------
+        graph : networkx.MultiDiGraph
+            A MultiDiGraph representing the influence map. The graph is a
+            copy of the cached one and can be modified.
+        """
         model_str = export.export(model, 'kappa')
-        kappa.add_model_string(model_str)
-        kappa.project_parse()
-        imap = kappa.analyses_influence_map(accuracy='medium')
-        graph = im_json_to_graph(imap)
-        return graph
+        key = hashlib.sha256(model_str.encode('utf-8')).hexdigest()
+        if self._im_base is not None and self._im_base['key'] == key:
+            return self._im_base['im'].copy()
+        im_base = _load_im(self.im_cache_dir, key)
+        if im_base is None:
+            signatures = _get_im_signatures(model)
+            im = None
+            # We only update influence maps generated or loaded by this
+            # model checker since ones saved by others may belong to an
+            # unrelated model
+            if self.incremental_im and self._im_base is not None:
+                im = _update_im(self._im_base, model, signatures,
+                                self.max_im_update_fraction,
+                                self.generate_im)
+            if im is None:
+                logger.info('Generating influence map of the whole model')
+                im = self.generate_im(model)
+            im_base = {'key': key, 'signatures': signatures, 'im': im}
+            _save_im(self.im_cache_dir, im_base)
+        else:
+            logger.info('Loaded influence map from %s' % self.im_cache_dir)
+        self._im_base = im_base
+        return im_base['im'].copy()
 
     def draw_im(self, fname):
         """Draw and save the influence map in a file.
@@ -243,7 +327,7 @@ class PysbModelChecker(ModelChecker):
             self.agent_to_obs[ag] = obs_nodes
 
         logger.info("Generating influence map")
-        self._im = self.generate_im(self.model)
+        self._im = self.generate_cached_im(self.model)
         # self._im.is_multigraph = lambda: False
         # Now, for every rule in the model, check if there are any observables
         # downstream; alternatively, for every observable in the model, get a
@@ -817,6 +901,153 @@ def _find_sources_sample(im, target, sources, polarity, rule_obs_dict,
         preds.append(pred[0])
 
 
+def _run_kappa_im(model_str):
+    """Return the influence map of a model given as a Kappa string."""
+    kappa = kappy.KappaStd()
+    kappa.add_model_string(model_str)
+    kappa.project_parse()
+    imap = kappa.analyses_influence_map(accuracy='medium')
+    graph = im_json_to_graph(imap)
+    return graph
+
+
+def _get_rule_monomers(rule):
+    """Return the names of the monomers a rule refers to."""
+    rule_exp = rule.rule_expression
+    return {mp.monomer.name
+            for cp in (rule_exp.reactant_pattern.complex_patterns +
+                       rule_exp.product_pattern.complex_patterns)
+            if cp is not None for mp in cp.monomer_patterns}
+
+
+def _get_obs_monomers(obs):
+    """Return the names of the monomers an observable refers to."""
+    return {mp.monomer.name for cp in obs.reaction_pattern.complex_patterns
+            for mp in cp.monomer_patterns}
+
+
+def _get_im_signatures(model):
+    """Return the signatures of the rules and observables of a model.
+
+    The influences of a rule or an observable only change if its signature,
+    made of its own definition and that of the monomers it refers to, does.
+    """
+    monomers = {mon.name: repr(mon) for mon in model.monomers}
+
+    def get_signature(component, monomer_names):
+        return repr(component) + ''.join(monomers[name]
+                                         for name in sorted(monomer_names))
+    return {
+        'rules': {rule.name: get_signature(rule, _get_rule_monomers(rule))
+                  for rule in model.rules},
+        'observables': {obs.name: get_signature(obs, _get_obs_monomers(obs))
+                        for obs in model.observables}
+    }
+
+
+def _update_im(im_base, model, signatures, max_update_fraction,
+               generate_im):
+    """Return an influence map updated for the changes of a model.
+
+    The influence map of the sub-model made of the affected rules is
+    generated by the given generate_im function.
+
+    Returns None if the changes affect too many rules of the model for
+    updating the influence map to be faster than generating it again.
+    """
+    base_rules = im_base['signatures']['rules']
+    base_obs = im_base['signatures']['observables']
+    changed_rules = {name for name, sig in signatures['rules'].items()
+                     if base_rules.get(name) != sig}
+    changed_obs = {name for name, sig in signatures['observables'].items()
+                   if base_obs.get(name) != sig}
+    changed_monomers = set()
+    for rule in model.rules:
+        if rule.name in changed_rules:
+            changed_monomers |= _get_rule_monomers(rule)
+    for obs in model.observables:
+        if obs.name in changed_obs:
+            changed_monomers |= _get_obs_monomers(obs)
+    # Only rules sharing a monomer with a changed rule or observable can
+    # influence or be influenced by it
+    affected_rules = [rule for rule in model.rules
+                      if rule.name in changed_rules or
+                      _get_rule_monomers(rule) & changed_monomers]
+    if len(affected_rules) > max_update_fraction * len(model.rules):
+        return None
+    logger.info('Updating influence map for %d changed rules and %d '
+                'changed observables' % (len(changed_rules),
+                                         len(changed_obs)))
+    base_im = im_base['im']
+    # The variables of the model are taken from the influence map of the
+    # sub-model so we generate it even if no rules are affected
+    sub_model = Model(_export=False)
+    for component in itertools.chain(model.compartments, model.monomers,
+                                     model.parameters, model.expressions,
+                                     model.observables, affected_rules):
+        sub_model.add_component(component)
+    # The initials of the model are known to be distinct so we don't add
+    # them one by one, which compares each with all others
+    sub_model.initials = list(model.initials)
+    sub_im = generate_im(sub_model)
+    changed = changed_rules | changed_obs
+    # Nodes are added in the order of a generated influence map, rules
+    # first and variables next, and so are the edges of each node, positive
+    # edges first and negative edges next.
+    nodes = []
+    for rule in model.rules:
+        im = sub_im if rule.name in sub_im else base_im
+        nodes.append((rule.name, im.nodes[rule.name]))
+    nodes += [(node, data) for node, data in sub_im.nodes(data=True)
+              if data['node_type'] != 'rule']
+    order = {node: idx for idx, (node, _) in enumerate(nodes)}
+    edges = [(u, v, data) for u, v, data in sub_im.edges(data=True)
+             if u in changed or v in changed]
+    edges += [(u, v, data) for u, v, data in base_im.edges(data=True)
+              if u in order and v in order and
+              u not in changed and v not in changed]
+    edges = sorted(edges, key=lambda edge: (order[edge[0]], -edge[2]['sign'],
+                                            order[edge[1]]))
+    im = nx.MultiDiGraph()
+    im.add_nodes_from(nodes)
+    im.add_edges_from(edges)
+    return im
+
+
+def _load_im(cache_dir, key):
+    """Return a cached influence map and the signatures of its model.
+
+    Returns None if there is no influence map with the given key.
+    """
+    if not cache_dir:
+        return None
+    fname = os.path.join(cache_dir, '%s.pkl' % key)
+    if not os.path.exists(fname):
+        return None
+    try:
+        with open(fname, 'rb') as fh:
+            return pickle.load(fh)
+    except Exception as e:
+        logger.warning('Could not load influence map from %s: %s'
+                       % (fname, e))
+        return None
+
+
+def _save_im(cache_dir, im_base):
+    """Save an influence map and the signatures of its model."""
+    if not cache_dir:
+        return
+    fname = os.path.join(cache_dir, '%s.pkl' % im_base['key'])
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with atomic_replace(fname) as tmp_fname:
+            with open(tmp_fname, 'wb') as fh:
+                pickle.dump(im_base, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logger.warning('Could not save influence map to %s: %s'
+                       % (cache_dir, e))
+
+
 def remove_im_params(model, im):
     """Remove parameter nodes from the influence map.
 
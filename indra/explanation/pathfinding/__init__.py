@@ -1,2 +1,4 @@
 from .pathfinding import *
-from .util import *
\ No newline at end of file
+from .util import *
+from .compiled_graph import *
+from .edge_filter import *
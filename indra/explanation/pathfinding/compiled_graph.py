@@ -0,0 +1,306 @@
+"""A compiled, array-based representation of graphs used for path finding.
+
+Searching networkx graphs spends most of its time on networkx internals,
+for instance, on looking up the belief of each edge to sort the neighbors
+of every node that is expanded. A :py:class:`CompiledGraph` is built once
+from a networkx DiGraph (e.g., an IndraNet signed or unsigned graph) and
+stores the graph with integer node ids, successors and predecessors in
+compressed sparse row (CSR) format, both in the order of the original graph
+and pre-sorted by belief, and edge attributes and node namespaces in
+NumPy arrays. The search functions in
+:py:mod:`indra.explanation.pathfinding.pathfinding` accept a compiled graph
+in place of the networkx graph and return paths of the same node labels.
+"""
+__all__ = ['CompiledGraph']
+
+import logging
+import numpy
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraph(object):
+    """A directed graph with integer node ids and CSR adjacency arrays.
+
+    Nodes are identified by their position in `labels`, the list of
+    nodes of the original graph. Methods that take or return nodes, other
+    than `__contains__` and `get_node_id`, use these integer ids.
+
+    Parameters
+    ----------
+    labels : list
+        The nodes of the original graph, the position of each node being
+        its id.
+    succ : tuple(numpy.array, numpy.array)
+        The indptr and indices arrays of the successors of each node in the
+        order of the original graph. The position of each successor in the
+        indices array is the id of the corresponding edge.
+    pred : tuple(numpy.array, numpy.array, numpy.array)
+        The indptr and indices arrays of the predecessors of each node in
+        the order of the original graph, and the ids of the corresponding
+        edges.
+    edge_attributes : dict
+        A dict of edge attribute names and arrays of their values by edge
+        id.
+    node_ns : numpy.array
+        The index of the (lower case) namespace of each node in
+        `namespaces`, or -1 if the node has no namespace.
+    namespaces : list[str]
+        The lower case namespaces of nodes.
+    graph_attributes : Optional[dict]
+        The attributes of the original graph, e.g., `hashes`.
+    """
+    def __init__(self, labels, succ, pred, edge_attributes, node_ns,
+                 namespaces, graph_attributes=None):
+        self.labels = labels
+        self.node_ids = {label: idx for idx, label in enumerate(labels)}
+        self.succ_indptr, self.succ_indices = succ
+        self.pred_indptr, self.pred_indices, self.pred_edges = pred
+        self.edge_attributes = edge_attributes
+        self.node_ns = node_ns
+        self.namespaces = namespaces
+        self.graph = graph_attributes if graph_attributes is not None \
+            else {}
+        # Neighbors sorted by descending belief, in the same order as
+        # util.get_sorted_neighbors returns them for the original graph
+        belief = edge_attributes.get('belief')
+        if belief is None:
+            belief = numpy.zeros(len(self.succ_indices))
+        self.succ_sorted = \
+            _sort_rows(self.succ_indptr, self.succ_indices, belief)
+        self.pred_sorted = \
+            _sort_rows(self.pred_indptr, self.pred_indices,
+                       belief[self.pred_edges])
+        self._lists = {}
+
+    @classmethod
+    def from_graph(cls, graph, edge_attributes=('belief', 'weight')):
+        """Return a compiled graph built from a networkx DiGraph.
+
+        Parameters
+        ----------
+        graph : networkx.DiGraph
+            The graph to compile. If nodes have an `ns` attribute, it is
+            used as their namespace.
+        edge_attributes : Optional[list[str]]
+            The numerical edge attributes to keep. Edges without a value
+            for `belief` get 0 and edges without a value for any other
+            attribute get 1, the defaults the search functions use for
+            networkx graphs. Default: ('belief', 'weight')
+
+        Returns
+        -------
+        CompiledGraph
+            The compiled graph.
+        """
+        if graph.is_multigraph():
+            raise ValueError('Only DiGraphs can be compiled, not '
+                             'MultiDiGraphs.')
+        labels = list(graph.nodes)
+        node_ids = {label: idx for idx, label in enumerate(labels)}
+        n_nodes = len(labels)
+        n_edges = graph.number_of_edges()
+
+        succ_indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+        succ_indices = numpy.empty(n_edges, dtype=numpy.int32)
+        values = {attr: numpy.empty(n_edges) for attr in edge_attributes}
+        defaults = {attr: 0 if attr == 'belief' else 1
+                    for attr in edge_attributes}
+        edge_id = 0
+        for idx, label in enumerate(labels):
+            for succ, data in graph.succ[label].items():
+                succ_indices[edge_id] = node_ids[succ]
+                for attr, attr_values in values.items():
+                    attr_values[edge_id] = data.get(attr, defaults[attr])
+                edge_id += 1
+            succ_indptr[idx + 1] = edge_id
+
+        pred_indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+        pred_indices = numpy.empty(n_edges, dtype=numpy.int32)
+        pos = 0
+        for idx, label in enumerate(labels):
+            for pred in graph.pred[label]:
+                pred_indices[pos] = node_ids[pred]
+                pos += 1
+            pred_indptr[idx + 1] = pos
+        # The id of each edge from a predecessor is found by looking up its
+        # (source, target) key among the keys of edges sorted by source and
+        # target
+        edge_keys = _get_rows(succ_indptr) * n_nodes + succ_indices
+        key_order = numpy.argsort(edge_keys, kind='stable')
+        pred_keys = \
+            pred_indices.astype(numpy.int64) * n_nodes + _get_rows(pred_indptr)
+        pred_edges = key_order[numpy.searchsorted(edge_keys[key_order],
+                                                  pred_keys)]
+
+        namespaces = []
+        ns_ids = {}
+        node_ns = numpy.full(n_nodes, -1, dtype=numpy.int32)
+        for idx, (_, ns) in enumerate(graph.nodes(data='ns')):
+            if ns is None:
+                continue
+            ns = ns.lower()
+            if ns not in ns_ids:
+                ns_ids[ns] = len(namespaces)
+                namespaces.append(ns)
+            node_ns[idx] = ns_ids[ns]
+        logger.info('Compiled graph with %d nodes and %d edges'
+                    % (n_nodes, n_edges))
+        return cls(labels, (succ_indptr, succ_indices),
+                   (pred_indptr, pred_indices, pred_edges.astype(numpy.int64)),
+                   values, node_ns, namespaces, dict(graph.graph))
+
+    def __contains__(self, label):
+        return label in self.node_ids
+
+    def __len__(self):
+        return len(self.labels)
+
+    def number_of_nodes(self):
+        """Return the number of nodes in the graph."""
+        return len(self.labels)
+
+    def number_of_edges(self):
+        """Return the number of edges in the graph."""
+        return len(self.succ_indices)
+
+    def is_directed(self):
+        """Return True, compiled graphs being directed."""
+        return True
+
+    def get_node_id(self, label):
+        """Return the id of a node given its label, None if not in graph."""
+        return self.node_ids.get(label)
+
+    def get_labels(self, node_ids):
+        """Return the labels of a sequence of node ids as a list."""
+        labels = self.labels
+        return [labels[idx] for idx in node_ids]
+
+    def successors(self, node_id):
+        """Return the ids of the successors of a node in original order."""
+        indptr = self._get_list('succ_indptr')
+        return self._get_list('succ_indices')[indptr[node_id]:
+                                              indptr[node_id + 1]]
+
+    def predecessors(self, node_id):
+        """Return the ids of the predecessors of a node in original order."""
+        indptr = self._get_list('pred_indptr')
+        return self._get_list('pred_indices')[indptr[node_id]:
+                                              indptr[node_id + 1]]
+
+    def get_sorted_neighbors(self, node_id, reverse=False):
+        """Return the ids of the neighbors of a node by descending belief.
+
+        Parameters
+        ----------
+        node_id : int
+            The id of the node.
+        reverse : Optional[bool]
+            If True, predecessors are returned, otherwise successors.
+            Default: False
+
+        Returns
+        -------
+        list[int]
+            The ids of the neighbors of the node sorted by the belief of the
+            edges connecting them in descending order.
+        """
+        if reverse:
+            indptr = self._get_list('pred_indptr')
+            start, end = indptr[node_id], indptr[node_id + 1]
+            return self._get_list('pred_sorted')[start:end]
+        indptr = self._get_list('succ_indptr')
+        start, end = indptr[node_id], indptr[node_id + 1]
+        return self._get_list('succ_sorted')[start:end]
+
+    def get_weighted_neighbors(self, node_id, weight, reverse=False):
+        """Return the ids of the neighbors of a node and the edge weights.
+
+        Parameters
+        ----------
+        node_id : int
+            The id of the node.
+        weight : str
+            The name of the edge attribute used as weight.
+        reverse : Optional[bool]
+            If True, predecessors are returned, otherwise successors.
+            Default: False
+
+        Returns
+        -------
+        neighbors : list[int]
+            The ids of the neighbors of the node in the order of the
+            original graph.
+        weights : list[float]
+            The weights of the edges connecting the node and its neighbors.
+        """
+        direction = 'pred' if reverse else 'succ'
+        indptr = self._get_list(direction + '_indptr')
+        start, end = indptr[node_id], indptr[node_id + 1]
+        return self._get_list(direction + '_indices')[start:end], \
+            self._get_list((direction, weight))[start:end]
+
+    def get_edge_id(self, source_id, target_id):
+        """Return the id of an edge given the ids of its nodes.
+
+        Raises a KeyError if the nodes aren't connected by an edge.
+        """
+        start, end = self.succ_indptr[source_id:source_id + 2]
+        matches = numpy.flatnonzero(
+            self.succ_indices[start:end] == target_id)
+        if not len(matches):
+            raise KeyError((source_id, target_id))
+        return start + int(matches[0])
+
+    def get_edge_values(self, attribute):
+        """Return the values of an edge attribute as a list by edge id.
+
+        If the attribute wasn't kept when compiling the graph, each edge
+        has the value 1, just like the default weight of networkx edges.
+        """
+        return self._get_list(('succ', attribute))
+
+    def get_node_namespaces(self):
+        """Return the lower case namespace of each node as a list by id."""
+        if 'ns' not in self._lists:
+            namespaces = self.namespaces + [None]
+            self._lists['ns'] = [namespaces[ns]
+                                 for ns in self.node_ns.tolist()]
+        return self._lists['ns']
+
+    def _get_list(self, name):
+        # Searches access arrays one element or row at a time which is
+        # much faster with Python lists than with NumPy arrays so we convert
+        # arrays into lists on first access
+        values = self._lists.get(name)
+        if values is None:
+            if isinstance(name, tuple):
+                # The values of an edge attribute aligned with the
+                # successors or predecessors of nodes
+                direction, attribute = name
+                array = self.edge_attributes.get(attribute)
+                if array is None:
+                    array = numpy.ones(self.number_of_edges())
+                if direction == 'pred':
+                    array = array[self.pred_edges]
+            else:
+                array = getattr(self, name)
+            values = self._lists[name] = array.tolist()
+        return values
+
+
+def _get_rows(indptr):
+    """Return the row of each element of a CSR matrix given its indptr."""
+    return numpy.repeat(numpy.arange(len(indptr) - 1, dtype=numpy.int64),
+                        numpy.diff(indptr))
+
+
+def _sort_rows(indptr, indices, values):
+    """Return the indices of each row sorted by descending values.
+
+    Sorting is stable so that elements with equal values keep their order.
+    """
+    order = numpy.lexsort((numpy.arange(len(indices)), -values,
+                           _get_rows(indptr)))
+    return indices[order]
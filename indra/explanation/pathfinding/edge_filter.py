@@ -0,0 +1,174 @@
+"""An index of graph edges by the statements and MeSH ids supporting them.
+
+Path searches constrained to a context, given as a set of statement hashes
+(e.g., those of statements whose evidence is annotated with given MeSH
+ids), need to know which edges of the graph are supported by any of these
+statements and by how many. An :py:class:`EdgeFilterIndex` is built once
+per graph and answers this for each query by looking up the query's hashes
+in sorted arrays instead of scanning every edge of the graph, and without
+modifying the data of the graph's edges.
+"""
+__all__ = ['EdgeFilterIndex']
+
+import logging
+import numpy
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+
+class EdgeFilterIndex(object):
+    """The edges of a graph indexed by the hashes of their statements.
+
+    Parameters
+    ----------
+    edges : list[tuple]
+        The edges of the graph, the position of each edge being its id.
+    hashes : numpy.array
+        Sorted statement hashes.
+    hash_edges : numpy.array
+        The id of the edge each statement hash in `hashes` supports.
+    mesh_hashes : Optional[dict]
+        A dict of MeSH ids and the hashes of the statements whose evidence
+        is annotated with them.
+    """
+    def __init__(self, edges, hashes, hash_edges, mesh_hashes=None):
+        self.edges = edges
+        self.hashes = hashes
+        self.hash_edges = hash_edges
+        self.mesh_hashes = mesh_hashes if mesh_hashes is not None else {}
+        # The total number of statements supporting each edge
+        self.edge_totals = numpy.bincount(hash_edges, minlength=len(edges))
+        self._edge_ids = None
+
+    @classmethod
+    def from_graph(cls, graph, mesh_hashes=None):
+        """Return the index of the edges of a graph.
+
+        Parameters
+        ----------
+        graph : nx.DiGraph
+            The graph whose edges are indexed. If the graph has a `hashes`
+            attribute, it is taken to be a dict of edges and the hashes of
+            their statements. Otherwise, the hashes are taken from the
+            `stmt_hash` of the statement data in the `statements` attribute
+            of each edge, as in graphs made by IndraNet.
+        mesh_hashes : Optional[dict]
+            A dict of MeSH ids and the hashes of the statements whose
+            evidence is annotated with them.
+
+        Returns
+        -------
+        EdgeFilterIndex
+            The index of the edges of the graph.
+        """
+        edge_hashes = graph.graph.get('hashes')
+        edges = []
+        hashes = []
+        hash_edges = []
+        for u, v, data in graph.edges(data=True):
+            if edge_hashes is not None:
+                stmt_hashes = edge_hashes.get((u, v), [])
+            else:
+                stmt_hashes = [stmt['stmt_hash']
+                               for stmt in data.get('statements', [])]
+            hashes += stmt_hashes
+            hash_edges += [len(edges)] * len(stmt_hashes)
+            edges.append((u, v))
+        hashes = numpy.array(hashes, dtype=numpy.int64)
+        hash_edges = numpy.array(hash_edges, dtype=numpy.int64)
+        order = numpy.argsort(hashes, kind='stable')
+        logger.info('Indexed %d edges by %d statement hashes'
+                    % (len(edges), len(hashes)))
+        return cls(edges, hashes[order], hash_edges[order], mesh_hashes)
+
+    def get_hashes(self, mesh_ids):
+        """Return the hashes of statements annotated with given MeSH ids.
+
+        Parameters
+        ----------
+        mesh_ids : list[str]
+            A list of MeSH ids.
+
+        Returns
+        -------
+        set[int]
+            The hashes of statements annotated with any of the MeSH ids.
+        """
+        return {stmt_hash for mesh_id in mesh_ids
+                for stmt_hash in self.mesh_hashes.get(mesh_id, [])}
+
+    def _get_edge_ids(self, hashes):
+        """Return the ids of edges supported by each of a set of hashes."""
+        hashes = numpy.unique(numpy.fromiter(hashes, dtype=numpy.int64))
+        if not len(hashes):
+            return numpy.array([], dtype=numpy.int64)
+        starts = numpy.searchsorted(self.hashes, hashes, side='left')
+        ends = numpy.searchsorted(self.hashes, hashes, side='right')
+        return numpy.concatenate([self.hash_edges[start:end] for start, end
+                                  in zip(starts.tolist(), ends.tolist())])
+
+    def get_ref_counts(self, hashes):
+        """Return the number of given statements supporting each edge.
+
+        Parameters
+        ----------
+        hashes : iterable[int]
+            The hashes of statements.
+
+        Returns
+        -------
+        dict
+            A dict of the edges supported by any of the statements and the
+            number of these statements supporting them.
+        """
+        edge_ids, counts = numpy.unique(self._get_edge_ids(hashes),
+                                        return_counts=True)
+        return {self.edges[edge_id]: count for edge_id, count
+                in zip(edge_ids.tolist(), counts.tolist())}
+
+    def get_allowed_edges(self, hashes):
+        """Return the set of edges supported by any of given statements."""
+        return {self.edges[edge_id] for edge_id
+                in numpy.unique(self._get_edge_ids(hashes)).tolist()}
+
+    def get_ref_counts_function(self, hashes):
+        """Return a function counting the given statements supporting edges.
+
+        The returned function can be passed as `ref_counts_function` to the
+        path finding functions. For each edge, it returns the number of the
+        given statements that support the edge and the total number of
+        statements supporting the edge.
+        """
+        ref_counts = self.get_ref_counts(hashes)
+        if self._edge_ids is None:
+            self._edge_ids = {edge: idx for idx, edge
+                              in enumerate(self.edges)}
+
+        def ref_counts_function(G, u, v):
+            edge_id = self._edge_ids.get((u, v))
+            total = int(self.edge_totals[edge_id]) \
+                if edge_id is not None else 0
+            return ref_counts.get((u, v), 0), total
+        return ref_counts_function
+
+    def get_filtered_view(self, graph, hashes):
+        """Return a view of a graph with only edges supported by statements.
+
+        Parameters
+        ----------
+        graph : nx.DiGraph
+            The graph the index was built from.
+        hashes : iterable[int]
+            The hashes of statements.
+
+        Returns
+        -------
+        nx.DiGraph
+            A read-only view of the graph including only the edges supported
+            by any of the given statements. The graph isn't copied.
+        """
+        allowed_edges = self.get_allowed_edges(hashes)
+        return nx.subgraph_view(
+            graph, filter_edge=lambda u, v: (u, v) in allowed_edges)
+
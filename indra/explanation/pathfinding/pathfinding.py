@@ -1,10 +1,13 @@
 __all__ = ['shortest_simple_paths', 'bfs_search', 'find_sources',
-           'get_path_iter', 'bfs_search_multiple_nodes',
+           'SourcesCache', 'get_path_iter', 'bfs_search_multiple_nodes',
            '_bidirectional_shortest_path', '_bidirectional_pred_succ',
            'open_dijkstra_search']
 import sys
 import logging
-from collections import deque, OrderedDict
+from array import array
+from heapq import heappush, heappop
+from itertools import count
+from collections import deque, OrderedDict, defaultdict
 from copy import deepcopy
 
 import networkx as nx
@@ -13,18 +16,23 @@ import networkx.algorithms.simple_paths as simple_paths
 from numpy import log as ln
 
 from .util import get_sorted_neighbors
+from .compiled_graph import CompiledGraph
 
 
 logger = logging.getLogger(__name__)
 
 
+_INT_PLUS = 0
+_INT_MINUS = 1
+
+
 # Copy from networkx.algorithms.simple_paths
 # Added ignore_nodes and ignore_edges arguments
 def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
                           ignore_edges=None, hashes=None,
                           ref_counts_function=None,
                           strict_mesh_id_filtering=False,
-                          const_c=1, const_tk=10):
+                          const_c=1, const_tk=10, edge_filter=None):
     """Generate all simple paths in the graph G from source to target,
        starting from shortest ones.
 
@@ -35,7 +43,9 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
 
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or CompiledGraph
+       The graph to search in. A graph compiled into a CompiledGraph
+       doesn't support weighting or filtering edges by hashes.
     source : node
        Starting node for path
     target : node
@@ -58,6 +68,11 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
         Constant used in MeSH IDs-based weight calculation
     const_tk : int
         Constant used in MeSH IDs-based weight calculation
+    edge_filter : Optional[EdgeFilterIndex]
+        An index of the edges of G by the hashes of their statements. If
+        given, it is used instead of ref_counts_function to find the
+        edges relevant to the hashes without going through all the edges
+        of G.
 
     Returns
     -------
@@ -121,17 +136,49 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
         raise nx.NodeNotFound('target node %s not in graph' % t)
 
     allowed_edges = []
-    if hashes:
+    compiled = isinstance(G, CompiledGraph)
+    if compiled:
+        # We search the graph by node ids and translate the paths into
+        # labels, as well as the ignore values sent back, on the fly
+        if hashes:
+            raise ValueError('Weighting or filtering edges by hashes is '
+                             'not supported for compiled graphs.')
         if strict_mesh_id_filtering:
+            return []
+        source = G.node_ids[source]
+        target = G.node_ids[target]
+        if ignore_nodes is not None or ignore_edges is not None:
+            ignore_nodes, ignore_edges = \
+                _get_ignore_ids(G, (ignore_nodes or [], ignore_edges or []))
+        if weight is None:
             length_func = len
             shortest_path_func = _bidirectional_shortest_path
-            for u, v in G.edges():
-                if ref_counts_function(G, u, v)[0]:
-                    allowed_edges.append((u, v))
         else:
-            weight = 'context_weight'
+            weights = G.get_edge_values(weight)
+
             def length_func(path):
-                return sum(G.adj[u][v][weight]
+                return sum(weights[G.get_edge_id(u, v)]
+                           for (u, v) in zip(path, path[1:]))
+            shortest_path_func = _bidirectional_dijkstra_compiled
+    elif hashes:
+        if strict_mesh_id_filtering:
+            length_func = len
+            shortest_path_func = _bidirectional_shortest_path
+            if edge_filter is not None:
+                allowed_edges = edge_filter.get_allowed_edges(hashes)
+            else:
+                allowed_edges = {(u, v) for u, v in G.edges()
+                                 if ref_counts_function(G, u, v)[0]}
+            if not allowed_edges:
+                return []
+        else:
+            if edge_filter is not None:
+                ref_counts_function = \
+                    edge_filter.get_ref_counts_function(hashes)
+            weight = _get_context_weight_function(G, ref_counts_function,
+                                                  const_c, const_tk)
+            def length_func(path):
+                return sum(weight(u, v, G.adj[u][v])
                            for (u, v) in zip(path, path[1:]))
             def shortest_path_func(G, source, target, weight, ignore_nodes,
                                    ignore_edges, force_edges):
@@ -139,13 +186,6 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
                                                             weight,
                                                             ignore_nodes,
                                                             ignore_edges)
-            for u, v, data, in G.edges(data=True):
-                ref_counts, total = \
-                    ref_counts_function(G, u, v)
-                if not ref_counts:
-                    ref_counts = 1e-15
-                data['context_weight'] = \
-                    -const_c * ln(ref_counts / (total + const_tk))
     else:
         if strict_mesh_id_filtering:
             return []
@@ -198,8 +238,12 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
                 cur_ignore_nodes.add(root[-1])
         if listB:
             path = listB.pop()
-            rcvd_ignore_values = yield path
+            rcvd_ignore_values = yield G.get_labels(path) if compiled \
+                else path
             if rcvd_ignore_values is not None:
+                if compiled:
+                    rcvd_ignore_values = \
+                        _get_ignore_ids(G, rcvd_ignore_values)
                 culled_ignored_nodes = culled_ignored_nodes.union(
                     rcvd_ignore_values[0])
                 culled_ignored_edges = culled_ignored_edges.union(
@@ -215,15 +259,17 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
 def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
                max_per_node=5, node_filter=None, node_blacklist=None,
                terminal_ns=None, sign=None, max_memory=int(2**29), hashes=None,
-               allow_edge=None, strict_mesh_id_filtering=False, **kwargs):
+               allow_edge=None, strict_mesh_id_filtering=False,
+               edge_filter=None, **kwargs):
     """Do breadth first search from a given node and yield paths
 
     Parameters
     ----------
-    g : nx.Digraph
+    g : nx.Digraph or CompiledGraph
         An nx.DiGraph to search in. Can also be a signed node graph. It is
         required that node data contains 'ns' (namespace) and edge data
-        contains 'belief'.
+        contains 'belief'. The graph can also be compiled into a
+        CompiledGraph beforehand, which makes searching it faster.
     source_node : node
         Node in the graph to start from.
     reverse : bool
@@ -249,77 +295,176 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
     sign : int
         If set, defines the search to be a signed search. Default: None.
     max_memory : int
-        The maximum memory usage in bytes allowed for the variables queue
-        and visited. Default: 1073741824 bytes (== 1 GiB).
+        The maximum memory in bytes that the search can use to store the
+        paths to extend and the visited nodes. The search stops once this
+        is exceeded. Default: 536870912 bytes (== 512 MiB).
     hashes : list
         List of hashes used (if not empty) to select edges for path finding
     allow_edge : function(str, str): bool
         Function telling the edge must be omitted
     strict_mesh_id_filtering : bool
         If true, exclude all edges not relevant to provided hashes
+    edge_filter : Optional[EdgeFilterIndex]
+        An index of the edges of g by the hashes of their statements. If
+        given, it is used instead of allow_edge to find the edges relevant
+        to the hashes without going through all the edges of g.
 
     Yields
     ------
     path : tuple(node)
         Paths in the bfs search starting from `source`.
     """
-    int_plus = 0
-    int_minus = 1
-
     if strict_mesh_id_filtering:
-        if hashes:
-            allowed_edges = [(u, v) for u, v in g.edges() if allow_edge(u, v)]
+        if not hashes:
+            return []
+        if edge_filter is not None:
+            allowed_edges = edge_filter.get_allowed_edges(hashes)
+        else:
+            allowed_edges = {(u, v) for u, v in _get_edges(g)
+                             if allow_edge(u, v)}
+        if not allowed_edges:
             logger.warning('No edges were allowed in strict mesh id '
                            'filtering')
-            if not allowed_edges:
-                return []
-        else:
             return []
     else:
-        allowed_edges = []
+        allowed_edges = set()
+
+    if isinstance(g, CompiledGraph):
+        # We search the graph by node ids and translate the paths into
+        # labels, as well as the ignore values sent back, on the fly
+        node_ids = g.node_ids
+        namespaces = g.get_node_namespaces()
+        labels = g.labels
+        allowed_edges = {(node_ids[u], node_ids[v]) for u, v in allowed_edges}
+
+        def get_neighbors(node):
+            neighbors = g.get_sorted_neighbors(node, reverse)
+            if allowed_edges:
+                neighbors = [n for n in neighbors
+                             if ((n, node) if reverse else (node, n))
+                             in allowed_edges]
+            return neighbors
+
+        def get_ns(node):
+            return namespaces[node]
+
+        def get_sign(node):
+            return labels[node][1]
+
+        def has_node_name(node, path):
+            label = labels[node]
+            name = label[0] if isinstance(label, tuple) else label
+            return node_ids.get((name, _INT_MINUS)) in path or \
+                node_ids.get((name, _INT_PLUS)) in path
+
+        blacklist = {node_ids[n] for n in node_blacklist if n in node_ids} \
+            if node_blacklist else None
+        paths = _bfs_search(node_ids[source_node], get_neighbors, get_ns,
+                            get_sign, has_node_name, reverse, depth_limit,
+                            path_limit, max_per_node, node_filter, blacklist,
+                            terminal_ns, sign, max_memory)
+        ign_vals = None
+        while True:
+            try:
+                path = paths.send(ign_vals)
+            except StopIteration:
+                return
+            ign_vals = yield tuple(labels[n] for n in path)
+            if ign_vals is not None:
+                ign_vals = _get_ignore_ids(g, ign_vals)
 
-    queue = deque([(source_node,)])
+    def get_neighbors(node):
+        return get_sorted_neighbors(G=g, node=node, reverse=reverse,
+                                    force_edges=allowed_edges)
+
+    def get_ns(node):
+        return g.nodes[node]['ns'].lower()
+
+    def get_sign(node):
+        return node[1]
+
+    def has_node_name(node, path):
+        name = node[0] if isinstance(node, tuple) else node
+        return (name, _INT_MINUS) in path or (name, _INT_PLUS) in path
+
+    yield from _bfs_search(source_node, get_neighbors, get_ns, get_sign,
+                           has_node_name, reverse, depth_limit, path_limit,
+                           max_per_node, node_filter, node_blacklist,
+                           terminal_ns, sign, max_memory)
+
+
+def _bfs_search(source_node, get_neighbors, get_ns, get_sign, has_node_name,
+                reverse, depth_limit, path_limit, max_per_node, node_filter,
+                node_blacklist, terminal_ns, sign, max_memory):
+    """Do breadth first search given functions to access the graph.
+
+    Nodes can be of any type that the functions accept, for instance,
+    nodes of a networkx graph or ids of nodes of a compiled graph.
+
+    Rather than a tuple per path, paths are stored as entries in parent
+    pointer arrays: entry i stands for the path that ends at path_nodes[i]
+    and continues backwards with the path of entry path_parents[i]. Storing
+    a path thus takes a fixed number of bytes regardless of its length and
+    the size of the arrays, the queue of entries and the set of visited
+    nodes is the memory the search uses. The search stops once that exceeds
+    max_memory.
+    """
+    int_minus = _INT_MINUS
+    path_nodes = [source_node]
+    path_parents = array('q', [-1])
+    path_depths = array('H', [0])
+    queue = deque([0])
     visited = ({source_node}).union(node_blacklist) \
         if node_blacklist else {source_node}
+
+    def get_path(entry):
+        path = []
+        while entry >= 0:
+            path.append(path_nodes[entry])
+            entry = path_parents[entry]
+        return tuple(reversed(path))
+
+    def get_memory():
+        return sum(sys.getsizeof(container) for container in
+                   (path_nodes, path_parents, path_depths, queue, visited))
+
     yielded_paths = 0
     while queue:
-        cur_path = queue.popleft()
+        cur_entry = queue.popleft()
+        cur_path = get_path(cur_entry)
         last_node = cur_path[-1]
+        # Paths that can be extended with one more edge are stored
+        extendable = path_depths[cur_entry] + 1 < depth_limit
 
         # if last node is in terminal_ns, continue to next path
-        if terminal_ns and g.nodes[last_node]['ns'].lower() in terminal_ns \
+        if terminal_ns and get_ns(last_node) in terminal_ns \
                 and source_node != last_node:
             continue
 
-        sorted_neighbors = get_sorted_neighbors(G=g, node=last_node,
-                                                reverse=reverse, 
-                                                force_edges=allowed_edges)
+        sorted_neighbors = get_neighbors(last_node)
         yielded_neighbors = 0
         # for neighb in neighbors:
         for neighb in sorted_neighbors:
-            neig_name = neighb[0] if isinstance(neighb, tuple) else neighb
-
             # Check cycles
             if sign is not None:
                 # Avoid signed paths ending up on the opposite sign of the
                 # same node
-                if (neig_name, int_minus) in cur_path or \
-                        (neig_name, int_plus) in cur_path:
+                if has_node_name(neighb, cur_path):
                     continue
             elif neighb in visited:
                 continue
 
             # Check namespace
             if node_filter and len(node_filter) > 0:
-                if g.nodes[neighb]['ns'].lower() not in node_filter:
+                if get_ns(neighb) not in node_filter:
                     continue
 
-            # Add to visited nodes and create new path
+            # Add to visited nodes, the new path is only created if it is
+            # yielded
             visited.add(neighb)
-            new_path = cur_path + (neighb,)
 
             # Check yield and break conditions
-            if len(new_path) > depth_limit + 1:
+            if path_depths[cur_entry] >= depth_limit:
                 continue
             elif not terminal_ns:
                 # Yield newest path and receive new ignore values
@@ -329,28 +474,28 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
                     if reverse:
                         # Upstream signed search should not end in negative
                         # node
-                        if new_path[-1][1] == int_minus:
+                        if get_sign(neighb) == int_minus:
                             ign_vals = None
                             pass
                         else:
-                            ign_vals = yield new_path
+                            ign_vals = yield cur_path + (neighb,)
                             yielded_paths += 1
                             yielded_neighbors += 1
 
                     else:
                         # Downstream signed search has to end on node with
                         # requested sign
-                        if new_path[-1][1] != sign:
+                        if get_sign(neighb) != sign:
                             ign_vals = None
                             pass
                         else:
-                            ign_vals = yield new_path
+                            ign_vals = yield cur_path + (neighb,)
                             yielded_paths += 1
                             yielded_neighbors += 1
 
                 # Unsigned search
                 else:
-                    ign_vals = yield new_path
+                    ign_vals = yield cur_path + (neighb,)
                     yielded_paths += 1
                     yielded_neighbors += 1
 
@@ -358,21 +503,21 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
             # teminal_ns
             else:
                 # If terminal_ns
-                if g.nodes[neighb]['ns'].lower() in terminal_ns:
+                if get_ns(neighb) in terminal_ns:
                     # If signed, reverse, negative start node OR
                     #    signed, not reverse, wrong sign:
                     # don't yield this path
                     if sign is not None and \
                             reverse and \
-                            new_path[-1][1] == int_minus \
+                            get_sign(neighb) == int_minus \
                             or \
                             sign is not None and \
                             not reverse and \
-                            new_path[-1][1] != sign:
+                            get_sign(neighb) != sign:
                         ign_vals = None
                         pass
                     else:
-                        ign_vals = yield new_path
+                        ign_vals = yield cur_path + (neighb,)
                         yielded_paths += 1
                         yielded_neighbors += 1
                 else:
@@ -388,14 +533,19 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
             if path_limit and yielded_paths >= path_limit:
                 break
 
-            # Append yielded path
-            queue.append(new_path)
+            # Append yielded path, unless it's as long as paths can be
+            # since extending it would only lead to longer paths
+            if extendable:
+                path_nodes.append(neighb)
+                path_parents.append(cur_entry)
+                path_depths.append(path_depths[cur_entry] + 1)
+                queue.append(len(path_nodes) - 1)
 
-            # Check for memory
-            if sys.getsizeof(queue) + sys.getsizeof(visited) > max_memory:
-                logger.warning('Memory overflow reached: %d' %
-                               (sys.getsizeof(queue) + sys.getsizeof(visited)))
-                raise StopIteration('Reached maximum allowed memory usage')
+                # Check for memory
+                memory = get_memory()
+                if memory > max_memory:
+                    logger.warning('Memory overflow reached: %d' % memory)
+                    return
 
             # Check if we've visited enough neighbors
             # Todo: add all neighbors to 'visited' and add all skipped
@@ -409,6 +559,68 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
             break
 
 
+def _get_context_weight_function(G, ref_counts_function, const_c=1,
+                                 const_tk=10, reverse=False):
+    """Return a function weighting edges by their relevance to a context.
+
+    The weight of an edge is -const_c * ln(ref_counts / (total + const_tk))
+    where ref_counts and total are returned by ref_counts_function for the
+    edge. Weights are computed for edges as they are first needed instead of
+    being set as an attribute of every edge of the graph, which is shared
+    between searches.
+
+    Parameters
+    ----------
+    G : nx.DiGraph
+        The graph whose edges are weighted.
+    ref_counts_function : function
+        Function counting references and PMIDs of an edge from its
+        statement hashes
+    const_c : int
+        Constant used in MeSH IDs-based weight calculation
+    const_tk : int
+        Constant used in MeSH IDs-based weight calculation
+    reverse : bool
+        If True, the function weighs the edges of the reverse of G.
+
+    Returns
+    -------
+    function(u, v, data): float
+        A function returning the weight of an edge that can be used as the
+        weight of networkx's shortest path functions.
+    """
+    weights = {}
+
+    def context_weight(u, v, data):
+        edge = (v, u) if reverse else (u, v)
+        weight = weights.get(edge)
+        if weight is None:
+            ref_counts, total = ref_counts_function(G, *edge)
+            if not ref_counts:
+                ref_counts = 1e-15
+            weight = weights[edge] = \
+                -const_c * ln(ref_counts / (total + const_tk))
+        return weight
+    return context_weight
+
+
+def _get_ignore_ids(g, ignore_values):
+    """Return nodes and edges to ignore given by label as node ids."""
+    node_ids = g.node_ids
+    ignore_nodes, ignore_edges = ignore_values
+    return {node_ids[n] for n in ignore_nodes if n in node_ids}, \
+        {(node_ids[u], node_ids[v]) for u, v in ignore_edges
+         if u in node_ids and v in node_ids}
+
+
+def _get_edges(g):
+    """Return the edges of a networkx or compiled graph as label pairs."""
+    if isinstance(g, CompiledGraph):
+        return ((g.labels[u], g.labels[v]) for u in range(len(g))
+                for v in g.successors(u))
+    return g.edges()
+
+
 def bfs_search_multiple_nodes(g, source_nodes, path_limit=None, **kwargs):
     """Do breadth first search from each of given nodes and yield paths
     until path limit is met.
@@ -522,6 +734,8 @@ def find_sources(graph, target, sources, filter_func=None):
     """
     # Update filter function to not filter the sources
     if sources is not None:
+        # We look up sources for every node visited so we use a set
+        sources = set(sources)
         filter_func = filter_except(filter_func, sources)
     # First, create a list of visited nodes
     # Adapted from
@@ -567,6 +781,81 @@ def find_sources(graph, target, sources, filter_func=None):
     return
 
 
+class SourcesCache(object):
+    """A cache of the sources found upstream of targets in a graph.
+
+    The first time sources are looked up for a target, a breadth-first
+    search is done upstream from the target as in :py:func:`find_sources`,
+    and each source found is indexed with the lengths of its paths to the
+    target and the order in which they were found. Later lookups for the
+    same target, for any set of sources, are answered from this index
+    without traversing the graph again. Only the indices of the most
+    recently used targets are kept.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        A DiGraph with signed nodes to find sources in. The graph is
+        assumed not to change while the cache is used.
+    max_targets : Optional[int]
+        The maximum number of targets whose sources are kept.
+        Default: 16
+    """
+    def __init__(self, graph, max_targets=16):
+        self.graph = graph
+        self.max_targets = max_targets
+        self._target_sources = OrderedDict()
+
+    def find_sources(self, target, sources, key=None):
+        """Return the sources with paths to the target.
+
+        Parameters
+        ----------
+        target : node
+            The signed node in the graph to look upstream of.
+        sources : list[node] or None
+            Signed nodes to look for, or None to return all positive
+            sources.
+        key : Optional[hashable]
+            The key under which the sources of the target are cached. This
+            needs to be given if the upstream graph of the target can differ
+            between lookups, e.g., if the target is a temporary node whose
+            edges change. By default, the target is used as the key.
+
+        Returns
+        -------
+        list of (source, path_length)
+            The sources and path lengths in the same order in which
+            :py:func:`find_sources` would yield them.
+        """
+        key = target if key is None else key
+        target_sources = self._target_sources.get(key)
+        if target_sources is None:
+            target_sources = defaultdict(list)
+            for order, (source, path_length) in \
+                    enumerate(find_sources(self.graph, target, None)):
+                target_sources[source].append((order, path_length))
+            self._target_sources[key] = target_sources
+            if len(self._target_sources) > self.max_targets:
+                self._target_sources.popitem(last=False)
+        else:
+            self._target_sources.move_to_end(key)
+        if sources is None:
+            found = [(order, source, path_length)
+                     for source, paths in target_sources.items()
+                     for order, path_length in paths]
+        else:
+            found = [(order, source, path_length)
+                     for source in set(sources)
+                     for order, path_length in target_sources.get(source, [])]
+        return [(source, path_length) for _, source, path_length
+                in sorted(found, key=lambda x: x[0])]
+
+    def clear(self):
+        """Remove the sources of all targets from the cache."""
+        self._target_sources.clear()
+
+
 def _bidirectional_shortest_path(G, source, target,
                                  ignore_nodes=None,
                                  ignore_edges=None,
@@ -593,8 +882,8 @@ def _bidirectional_shortest_path(G, source, target,
     weight : None
        This function accepts a weight argument for convenience of
        shortest_simple_paths function. It will be ignored.
-    force_edges : list
-        list specifying (if not empty) allowed edges
+    force_edges : set
+        set specifying (if not empty) allowed edges
 
     Returns
     -------
@@ -752,18 +1041,122 @@ def _bidirectional_pred_succ(G, source, target, ignore_nodes=None,
     raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
 
 
+def _bidirectional_dijkstra_compiled(G, source, target, weight,
+                                     ignore_nodes=None, ignore_edges=None,
+                                     force_edges=None):
+    """Return the shortest weighted path between nodes of a compiled graph.
+
+    This follows networkx.algorithms.simple_paths._bidirectional_dijkstra
+    step by step on node ids so that it finds the same paths, with
+    edge weights looked up by edge id.
+    """
+    if ignore_nodes and (source in ignore_nodes or target in ignore_nodes):
+        raise nx.NetworkXNoPath("No path between %s and %s."
+                                % (source, target))
+    if source == target:
+        return 0, [source]
+    def get_neighbors(v, reverse):
+        neighbors = zip(*G.get_weighted_neighbors(v, weight, reverse))
+        if not ignore_nodes and not ignore_edges:
+            return neighbors
+        return [(w, edge_weight) for w, edge_weight in neighbors
+                if not (ignore_nodes and w in ignore_nodes)
+                and not (ignore_edges and
+                         ((w, v) if reverse else (v, w)) in ignore_edges)]
+
+    dists = [{}, {}]
+    paths = [{source: [source]}, {target: [target]}]
+    fringe = [[], []]
+    seen = [{source: 0}, {target: 0}]
+    c = count()
+    heappush(fringe[0], (0, next(c), source))
+    heappush(fringe[1], (0, next(c), target))
+    finalpath = []
+    finaldist = None
+    dir = 1
+    while fringe[0] and fringe[1]:
+        # dir == 0 is the forward direction and dir == 1 is backward
+        dir = 1 - dir
+        dist, _, v = heappop(fringe[dir])
+        if v in dists[dir]:
+            continue
+        dists[dir][v] = dist
+        if v in dists[1 - dir]:
+            return finaldist, finalpath
+        for w, edge_weight in get_neighbors(v, dir == 1):
+            vw_length = dists[dir][v] + edge_weight
+            if w in dists[dir]:
+                if vw_length < dists[dir][w]:
+                    raise ValueError('Contradictory paths found: '
+                                     'negative weights?')
+            elif w not in seen[dir] or vw_length < seen[dir][w]:
+                seen[dir][w] = vw_length
+                heappush(fringe[dir], (vw_length, next(c), w))
+                paths[dir][w] = paths[dir][v] + [w]
+                if w in seen[0] and w in seen[1]:
+                    totaldist = seen[0][w] + seen[1][w]
+                    if finalpath == [] or finaldist > totaldist:
+                        finaldist = totaldist
+                        revpath = paths[1][w][:]
+                        revpath.reverse()
+                        finalpath = paths[0][w] + revpath[1:]
+    raise nx.NetworkXNoPath("No path between %s and %s." % (source, target))
+
+
+def _dijkstra_paths_compiled(g, start, reverse, weight):
+    """Generate the shortest weighted paths from a node of a compiled graph.
+
+    Paths to all reachable nodes are found the same way as by
+    networkx.single_source_dijkstra_path and generated as lists of labels
+    sorted by their length. Instead of copying the path to each node
+    that is reached, we keep the predecessor of each node on its path and
+    only build the paths that are generated.
+    """
+    source = g.node_ids[start]
+    dist = {}
+    seen = {source: 0}
+    pred = {source: None}
+    c = count()
+    fringe = [(0, next(c), source)]
+    while fringe:
+        d, _, v = heappop(fringe)
+        if v in dist:
+            continue
+        dist[v] = d
+        for u, cost in zip(*g.get_weighted_neighbors(v, weight, reverse)):
+            vu_dist = d + cost
+            if u in dist:
+                if vu_dist < dist[u]:
+                    raise ValueError('Contradictory paths found: '
+                                     'negative weights?')
+            elif u not in seen or vu_dist < seen[u]:
+                seen[u] = vu_dist
+                heappush(fringe, (vu_dist, next(c), u))
+                pred[u] = v
+    # Nodes are sorted in the order networkx adds paths to them, i.e., the
+    # order in which they were first reached, before sorting by length
+    del pred[source]
+    for node in sorted(pred, key=lambda node: dist[node]):
+        path = [node]
+        while node != source:
+            node = pred[node]
+            path.append(node)
+        yield g.get_labels(reversed(path))
+
+
 def open_dijkstra_search(g, start, reverse=False, path_limit=None,
                          node_filter=None, hashes=None,
                          ignore_nodes=None, ignore_edges=None, 
                          terminal_ns=None, weight=None,
                          ref_counts_function=None, const_c=1,
-                         const_tk=10):
+                         const_tk=10, edge_filter=None):
     """Do Dijkstra search from a given node and yield paths
 
     Parameters
     ----------
-    g : nx.Digraph
-        An nx.DiGraph to search in.
+    g : nx.Digraph or CompiledGraph
+        An nx.DiGraph to search in, or the graph compiled into a
+        CompiledGraph, which doesn't support weighting edges by hashes.
     start : node
         Node in the graph to start from.
     reverse : bool
@@ -785,7 +1178,8 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
         are encountered and only yield paths that terminate at these
         namepsaces
     weight : str
-        Name of edge's attribute used as its weight
+        Name of edge's attribute used as its weight. If hashes are given,
+        edges are weighted by their relevance to the hashes instead.
     ref_counts_function : function
         function counting references and PMIDs of an edge from its
         statement hashes
@@ -793,27 +1187,53 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
         Constant used in MeSH IDs-based weight calculation
     const_tk : int
         Constant used in MeSH IDs-based weight calculation
-
+    edge_filter : Optional[EdgeFilterIndex]
+        An index of the edges of g by the hashes of their statements. If
+        given, it is used instead of ref_counts_function to count the
+        statements of edges relevant to the hashes.
 
     Yields
     ------
     path : tuple(node)
         Paths in the bfs search starting from `source`.
     """
-    def weights_sum(path):
-        return sum(g[u][v][weight]
-                   for u, v in zip(path[:-1], path[1:]))
+    if isinstance(g, CompiledGraph):
+        if hashes:
+            raise ValueError('Weighting edges by hashes is not supported '
+                             'for compiled graphs.')
+        namespaces = g.get_node_namespaces()
+        node_ids = g.node_ids
 
-    if hashes:
-        for u, v, data in g.edges(data=True):
-            ref_counts, total = ref_counts_function(g, u, v)
-            if not ref_counts:
-                ref_counts = 1e-15
-            data[weight] = \
-                -const_c * ln(ref_counts / (total + const_tk))
+        def get_ns(node):
+            return namespaces[node_ids[node]]
+
+        paths = _dijkstra_paths_compiled(g, start, reverse, weight)
+    else:
+        if hashes:
+            if edge_filter is not None:
+                ref_counts_function = \
+                    edge_filter.get_ref_counts_function(hashes)
+            weight = _get_context_weight_function(g, ref_counts_function,
+                                                  const_c, const_tk,
+                                                  reverse=reverse)
+
+            def weights_sum(path):
+                return sum(weight(u, v, g[u][v])
+                           for u, v in zip(path[:-1], path[1:]))
+        else:
+            def weights_sum(path):
+                return sum(g[u][v][weight]
+                           for u, v in zip(path[:-1], path[1:]))
+
+        if reverse:
+            g = g.reverse(copy=False)
+
+        def get_ns(node):
+            return g.nodes[node]['ns'].lower()
 
-    if reverse:
-        g = g.reverse(copy=False)
+        paths = list(nx.single_source_dijkstra_path(
+            g, start, weight=weight).values())[1:]
+        paths.sort(key=lambda x: weights_sum(x))
 
     proper_nodes =\
         (lambda p: not set(p).intersection(set(ignore_nodes)))\
@@ -826,19 +1246,16 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
     if terminal_ns:  # If not set, terminal_ns will be an empty list []
         def proper_path(path):
             if not proper_nodes(path) or not proper_edges(path)\
-                    or g.nodes[path[-1]]['ns'].lower() not in terminal_ns:
+                    or get_ns(path[-1]) not in terminal_ns:
                 return False
             for u in path[:-1]:
-                if g.nodes[u]['ns'].lower() in terminal_ns:
+                if get_ns(u) in terminal_ns:
                     return False
             return True
     else:
         def proper_path(path):
             return proper_nodes(path) and proper_edges(path) 
 
-    paths = list(nx.single_source_dijkstra_path(g, start,
-                                                weight=weight).values())[1:]
-    paths.sort(key=lambda x: weights_sum(x))
     if path_limit is not None:
         for p in paths:
             path_limit -= 1
@@ -3,6 +3,7 @@ import pickle
 import logging
 from indra.config import get_config
 from ..ontology_graph import IndraOntology
+from ..compact_graph import CompactGraph
 from indra.util import read_unicode_csv
 from indra.statements import modtype_conditions
 from indra.resources import get_resource_path
@@ -25,7 +26,10 @@ class BioOntology(IndraOntology):
         super().__init__()
 
     def initialize(self, rebuild=False):
-        if rebuild or not os.path.exists(CACHE_FILE):
+        if not rebuild and self._load_compact_cache():
+            logger.info('Loaded INDRA bio ontology from compact cache at %s'
+                        % COMPACT_CACHE_DIR)
+        elif rebuild or not os.path.exists(CACHE_FILE):
             logger.info('Initializing INDRA bio ontology for the first time, '
                         'this may take a few minutes...')
             self._build()
@@ -42,11 +46,68 @@ class BioOntology(IndraOntology):
                     pickle.dump(self, fh, pickle.HIGHEST_PROTOCOL)
             except Exception:
                 logger.warning('Failed to cache ontology at %s.' % CACHE_FILE)
+            self._dump_compact_cache()
         else:
             logger.info(
                 'Loading INDRA bio ontology from cache at %s' % CACHE_FILE)
             with open(CACHE_FILE, 'rb') as fh:
                 self.__dict__.update(pickle.load(fh).__dict__)
+            # We also cache the ontology in compact form so that it
+            # loads faster next time
+            self._dump_compact_cache()
+        # The transitive closure is cached separately since it is
+        # derived from the graph
+        self._build_transitive_closure(CLOSURE_CACHE_FILE, rebuild=rebuild)
+
+    def _load_compact_cache(self):
+        """Load the ontology from its compact cache if available.
+
+        The compact cache is memory-mapped so that it loads in well
+        under a second and is shared by all the processes that load it.
+        The networkx graph is only built from it if networkx APIs are
+        used on the ontology. The compact cache is only used if it was
+        saved for the same version of the ontology and from the same
+        pickle cache as the one that exists now.
+
+        Returns
+        -------
+        bool
+            True if the ontology was loaded, False otherwise.
+        """
+        if not os.path.exists(COMPACT_CACHE_DIR):
+            return False
+        try:
+            compact_graph = CompactGraph.load(COMPACT_CACHE_DIR)
+        except Exception as e:
+            logger.warning('Could not load compact ontology from %s: %s'
+                           % (COMPACT_CACHE_DIR, e))
+            return False
+        if compact_graph.metadata != self._get_compact_cache_metadata():
+            logger.info('The compact ontology at %s is out of date and is '
+                        'not used' % COMPACT_CACHE_DIR)
+            return False
+        self._set_compact_graph(compact_graph)
+        return True
+
+    def _get_compact_cache_metadata(self):
+        # The compact cache is built from the same graph as the pickle
+        # cache, which we identify by its size and modification time
+        metadata = {'version': self.version}
+        if os.path.exists(CACHE_FILE):
+            stat = os.stat(CACHE_FILE)
+            metadata['pickle'] = [stat.st_size, stat.st_mtime_ns]
+        return metadata
+
+    def _dump_compact_cache(self):
+        try:
+            logger.info('Caching compact INDRA bio ontology at %s'
+                        % COMPACT_CACHE_DIR)
+            compact_graph = CompactGraph.from_graph(self)
+            compact_graph.metadata = self._get_compact_cache_metadata()
+            compact_graph.save(COMPACT_CACHE_DIR)
+        except Exception:
+            logger.warning('Failed to cache compact ontology at %s.'
+                           % COMPACT_CACHE_DIR)
 
     def _build(self):
         # Add all nodes with annotations
@@ -344,7 +405,8 @@ class BioOntology(IndraOntology):
     def add_mirbase_nodes(self):
         from indra.databases import mirbase_client
         nodes = []
-        for mirbase_id, name in mirbase_client._mirbase_id_to_name.items():
+        for mirbase_id, name in \
+                mirbase_client._tables.mirbase_id_to_name.items():
             nodes.append((self.label('MIRBASE', mirbase_id),
                           {'name': name}))
         self.add_nodes_from(nodes)
@@ -353,12 +415,12 @@ class BioOntology(IndraOntology):
         from indra.databases import mirbase_client
         edges = []
         for mirbase_id, hgnc_id in \
-                mirbase_client._mirbase_id_to_hgnc_id.items():
+                mirbase_client._tables.mirbase_id_to_hgnc_id.items():
             edges.append((self.label('MIRBASE', mirbase_id),
                           self.label('HGNC', hgnc_id),
                           {'type': 'xref', 'source': 'mirbase'}))
         for hgnc_id, mirbase_id in \
-                mirbase_client._hgnc_id_to_mirbase_id.items():
+                mirbase_client._tables.hgnc_id_to_mirbase_id.items():
             edges.append((self.label('HGNC', hgnc_id),
                           self.label('MIRBASE', mirbase_id),
                           {'type': 'xref', 'source': 'mirbase'}))
@@ -472,3 +534,5 @@ CACHE_DIR = os.path.join((get_config('INDRA_RESOURCES') or
                          '%s_ontology' % BioOntology.name,
                          BioOntology.version)
 CACHE_FILE = os.path.join(CACHE_DIR, 'bio_ontology.pkl')
+CLOSURE_CACHE_FILE = os.path.join(CACHE_DIR, 'bio_ontology_closure.npz')
+COMPACT_CACHE_DIR = os.path.join(CACHE_DIR, 'bio_ontology_compact')
@@ -0,0 +1,431 @@
+"""A compact, memory-mappable representation of an ontology graph.
+
+The nodes of the graph are stored as a sorted table of labels in which the
+position of each label is the id of the node. Edges are stored in
+compressed sparse row (CSR) format, both in the direction of edges and in
+reverse, with the attributes of each edge (e.g., its type) stored as
+integer codes into a list of distinct values. Node attributes (e.g., the
+name of each node) are stored as string columns.
+
+Each array is saved as a separate .npy file in a directory so that it can
+be memory-mapped when the graph is loaded. This makes loading the graph
+take a fraction of a second regardless of its size, and since the arrays
+are only read, the memory holding them is shared by all the processes
+which load the same graph.
+"""
+__all__ = ['CompactGraph']
+
+import os
+import json
+import bisect
+import logging
+import numpy
+from indra.util import atomic_replace
+
+logger = logging.getLogger(__name__)
+
+
+class CompactGraph(object):
+    """A read-only directed graph with node and edge attributes.
+
+    This implements the parts of the networkx.DiGraph API needed to
+    query an ontology graph and to materialize it as a networkx.DiGraph.
+
+    Parameters
+    ----------
+    labels : StringColumn
+        The sorted labels of the nodes, the position of each label being
+        the id of the node.
+    arrays : dict
+        A dict of the CSR arrays of the graph with keys out_indptr,
+        out_indices, in_indptr, in_indices and in_edges. The edges of
+        the graph are numbered in the order they appear in out_indices and
+        in_edges gives the number of each edge in in_indices.
+    node_properties : dict
+        A dict whose keys are the names of node attributes and whose values
+        are StringColumns of the values of the attribute of each node.
+    edge_properties : dict
+        A dict whose keys are the names of edge attributes and whose values
+        are tuples of an array with a code for each edge and the list of
+        values that codes refer to. Edges that don't have an attribute
+        have the code -1.
+    metadata : Optional[dict]
+        JSON serializable information about the graph that is saved with
+        it, e.g., to check if a saved graph is up to date.
+    """
+    def __init__(self, labels, arrays, node_properties, edge_properties,
+                 metadata=None):
+        self.labels = labels
+        self.arrays = arrays
+        self.node_properties = node_properties
+        self.edge_properties = edge_properties
+        self.metadata = metadata if metadata else {}
+        # The path and mmap setting the graph was loaded with, if any
+        self._source = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Return a compact graph built from a networkx graph.
+
+        Parameters
+        ----------
+        graph : networkx.DiGraph
+            The graph to build the compact graph from.
+
+        Returns
+        -------
+        CompactGraph
+            The compact graph.
+        """
+        labels = sorted(graph.nodes)
+        node_ids = {label: idx for idx, label in enumerate(labels)}
+        node_props = {}
+        for node, data in graph.nodes(data=True):
+            for key, value in data.items():
+                node_props.setdefault(key, {})[node_ids[node]] = value
+        node_properties = {
+            key: StringColumn.from_values([values.get(idx)
+                                           for idx in range(len(labels))])
+            for key, values in node_props.items()}
+
+        edges = sorted((node_ids[source], node_ids[target], data)
+                       for source, target, data in graph.edges(data=True))
+        sources = numpy.array([source for source, _, _ in edges],
+                              dtype=numpy.int32)
+        targets = numpy.array([target for _, target, _ in edges],
+                              dtype=numpy.int32)
+        # Edges sorted by target give the reverse adjacency of each node
+        in_edges = numpy.argsort(targets, kind='stable')
+        arrays = {
+            'out_indptr': _get_indptr(sources, len(labels)),
+            'out_indices': targets,
+            'in_indptr': _get_indptr(targets[in_edges], len(labels)),
+            'in_indices': sources[in_edges],
+            'in_edges': in_edges.astype(numpy.int32),
+        }
+        edge_properties = {}
+        for key in sorted({key for _, _, data in edges for key in data}):
+            values = [data.get(key) for _, _, data in edges]
+            # We keep track of values via their JSON encoding since values
+            # such as lists aren't hashable
+            categories = {}
+            codes = []
+            for value in values:
+                if value is None:
+                    codes.append(-1)
+                    continue
+                encoded = json.dumps(value, sort_keys=True)
+                if encoded not in categories:
+                    categories[encoded] = len(categories)
+                codes.append(categories[encoded])
+            edge_properties[key] = \
+                (numpy.array(codes, dtype=numpy.int32),
+                 [json.loads(encoded) for encoded in categories])
+        return cls(StringColumn.from_values(labels), arrays, node_properties,
+                   edge_properties)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Return a compact graph loaded from a directory.
+
+        Parameters
+        ----------
+        path : str
+            The path to a directory into which a graph was saved with
+            `save`.
+        mmap : Optional[bool]
+            If True, the arrays of the graph are memory-mapped rather than
+            read into memory. Default: True
+
+        Returns
+        -------
+        CompactGraph
+            The compact graph.
+        """
+        with open(os.path.join(path, 'meta.json'), 'r') as fh:
+            meta = json.load(fh)
+        mmap_mode = 'r' if mmap else None
+
+        def load_array(name):
+            return numpy.load(os.path.join(path, name + '.npy'),
+                              mmap_mode=mmap_mode)
+
+        def load_column(name):
+            column_meta = meta['columns'][name]
+            return StringColumn(load_array(name + '.data'),
+                                load_array(name + '.offsets'),
+                                load_array(name + '.mask')
+                                if column_meta['mask'] else None,
+                                column_meta['json'])
+
+        labels = load_column('labels')
+        arrays = {name: load_array(name) for name in
+                  ['out_indptr', 'out_indices', 'in_indptr', 'in_indices',
+                   'in_edges']}
+        node_properties = {key: load_column('node.' + key)
+                           for key in meta['node_properties']}
+        edge_properties = {key: (load_array('edge.' + key), categories)
+                           for key, categories
+                           in meta['edge_properties'].items()}
+        graph = cls(labels, arrays, node_properties, edge_properties,
+                    meta.get('metadata'))
+        graph._source = (path, mmap)
+        return graph
+
+    def save(self, path):
+        """Save the compact graph into a directory.
+
+        The directory is first written under a temporary name and then
+        renamed so that other processes never load a partially written
+        graph.
+
+        Parameters
+        ----------
+        path : str
+            The path to the directory, which is replaced if it exists.
+        """
+        columns = {'labels': self.labels}
+        columns.update({'node.' + key: column
+                        for key, column in self.node_properties.items()})
+        arrays = dict(self.arrays)
+        for name, column in columns.items():
+            arrays[name + '.data'] = column.data
+            arrays[name + '.offsets'] = column.offsets
+            if column.mask is not None:
+                arrays[name + '.mask'] = column.mask
+        for key, (codes, _) in self.edge_properties.items():
+            arrays['edge.' + key] = codes
+        meta = {'columns': {name: {'json': column.json,
+                                   'mask': column.mask is not None}
+                            for name, column in columns.items()},
+                'node_properties': sorted(self.node_properties),
+                'edge_properties': {key: categories for key, (_, categories)
+                                    in self.edge_properties.items()},
+                'metadata': self.metadata}
+        with atomic_replace(path) as tmp_path:
+            os.makedirs(tmp_path)
+            for name, array in arrays.items():
+                numpy.save(os.path.join(tmp_path, name + '.npy'), array)
+            with open(os.path.join(tmp_path, 'meta.json'), 'w') as fh:
+                json.dump(meta, fh)
+
+    def __getstate__(self):
+        # A graph loaded from disk is pickled as its path so that other
+        # processes load (and share) the same files
+        if self._source is not None:
+            return {'_source': self._source}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if set(state) == {'_source'}:
+            state = CompactGraph.load(*state['_source']).__dict__
+        self.__dict__.update(state)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return self.get_node_id(label) is not None
+
+    def number_of_nodes(self):
+        """Return the number of nodes in the graph."""
+        return len(self.labels)
+
+    def number_of_edges(self):
+        """Return the number of edges in the graph."""
+        return len(self.arrays['out_indices'])
+
+    def get_node_id(self, label):
+        """Return the integer id of a node or None if it isn't in the graph.
+        """
+        idx = bisect.bisect_left(self.labels, label)
+        if idx < len(self.labels) and self.labels[idx] == label:
+            return idx
+        return None
+
+    def get_node_property(self, label, property):
+        """Return an attribute of a node or None if it isn't available."""
+        column = self.node_properties.get(property)
+        if column is None:
+            return None
+        idx = self.get_node_id(label)
+        if idx is None:
+            return None
+        return column[idx]
+
+    def nodes(self, data=False):
+        """Return a list of nodes, optionally with their attributes.
+
+        Parameters
+        ----------
+        data : Optional[bool or str]
+            If False, only node labels are returned. If True, tuples of each
+            label and a dict of node attributes are returned. If the name
+            of an attribute, tuples of each label and the value of the
+            attribute are returned. Default: False
+
+        Returns
+        -------
+        list
+            The nodes of the graph.
+        """
+        labels = self.labels.to_list()
+        if data is False:
+            return labels
+        elif data is True:
+            nodes = [(label, {}) for label in labels]
+            for key, column in self.node_properties.items():
+                for (_, node_data), value in zip(nodes, column.to_list()):
+                    if value is not None:
+                        node_data[key] = value
+            return nodes
+        column = self.node_properties.get(data)
+        values = column.to_list() if column is not None \
+            else [None] * len(labels)
+        return list(zip(labels, values))
+
+    def edges(self, data=False):
+        """Return a list of edges, optionally with their attributes.
+
+        Parameters
+        ----------
+        data : Optional[bool or str]
+            If False, (source, target) tuples are returned. If True, a dict
+            of edge attributes is added to each tuple. If the name of an
+            attribute, the value of the attribute is added to each tuple.
+            Default: False
+
+        Returns
+        -------
+        list
+            The edges of the graph.
+        """
+        labels = self.labels.to_list()
+        indptr = self.arrays['out_indptr']
+        sources = numpy.repeat(numpy.arange(len(labels)),
+                               numpy.diff(indptr)).tolist()
+        targets = self.arrays['out_indices'].tolist()
+        edges = [(labels[source], labels[target])
+                 for source, target in zip(sources, targets)]
+        if data is False:
+            return edges
+        elif data is True:
+            edge_data = [{} for _ in edges]
+            for key in self.edge_properties:
+                for attrs, value in zip(edge_data,
+                                        self._get_edge_values(key)):
+                    if value is not None:
+                        attrs[key] = value
+            return [(source, target, attrs) for (source, target), attrs
+                    in zip(edges, edge_data)]
+        return [(source, target, value) for (source, target), value
+                in zip(edges, self._get_edge_values(data))]
+
+    def successors(self, label, rel_types=None):
+        """Yield the targets of edges from a node, optionally filtered
+        to edges whose type is among the given types."""
+        yield from self._get_neighbors(label, rel_types, reverse=False)
+
+    def predecessors(self, label, rel_types=None):
+        """Yield the sources of edges into a node, optionally filtered
+        to edges whose type is among the given types."""
+        yield from self._get_neighbors(label, rel_types, reverse=True)
+
+    def _get_neighbors(self, label, rel_types, reverse):
+        idx = self.get_node_id(label)
+        if idx is None:
+            return
+        prefix = 'in' if reverse else 'out'
+        indptr = self.arrays[prefix + '_indptr']
+        start, end = indptr[idx], indptr[idx + 1]
+        neighbors = self.arrays[prefix + '_indices'][start:end].tolist()
+        if rel_types is None:
+            yield from (self.labels[nb] for nb in neighbors)
+            return
+        if 'type' not in self.edge_properties:
+            return
+        codes, categories = self.edge_properties['type']
+        type_codes = {code for code, category in enumerate(categories)
+                      if category in rel_types}
+        edge_ids = self.arrays['in_edges'][start:end] if reverse \
+            else numpy.arange(start, end)
+        for neighbor, code in zip(neighbors, codes[edge_ids].tolist()):
+            if code in type_codes:
+                yield self.labels[neighbor]
+
+    def _get_edge_values(self, key):
+        codes, categories = self.edge_properties[key]
+        return [categories[code] if code >= 0 else None
+                for code in codes.tolist()]
+
+
+class StringColumn(object):
+    """A sequence of strings stored as a UTF-8 encoded array of bytes.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The concatenated UTF-8 encoded values as an array of bytes.
+    offsets : numpy.ndarray
+        The offset of each value in data followed by the length of data.
+    mask : Optional[numpy.ndarray]
+        An array which is 0 for missing values and 1 otherwise. If not
+        given, no values are missing.
+    json : Optional[bool]
+        If True, values are JSON encoded, which is used when not all the
+        values are strings. Default: False
+    """
+    def __init__(self, data, offsets, mask=None, json=False):
+        self.data = data
+        self.offsets = offsets
+        self.mask = mask
+        self.json = json
+
+    @classmethod
+    def from_values(cls, values):
+        """Return a column of the given values, which may contain None."""
+        use_json = any(not isinstance(value, str) for value in values
+                       if value is not None)
+        encoded_values = [b'' if value is None else
+                          (json.dumps(value) if use_json
+                           else value).encode('utf-8')
+                          for value in values]
+        offsets = numpy.zeros(len(values) + 1, dtype=numpy.int64)
+        offsets[1:] = numpy.cumsum([len(value) for value in encoded_values])
+        data = numpy.frombuffer(b''.join(encoded_values), dtype=numpy.uint8)
+        mask = None
+        if any(value is None for value in values):
+            mask = numpy.array([value is not None for value in values],
+                               dtype=numpy.uint8)
+        return cls(data, offsets, mask, use_json)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        if self.mask is not None and not self.mask[idx]:
+            return None
+        value = self.data[self.offsets[idx]:self.offsets[idx + 1]]
+        return self._decode(value.tobytes())
+
+    def _decode(self, value):
+        value = value.decode('utf-8')
+        return json.loads(value) if self.json else value
+
+    def to_list(self):
+        """Return all the values of the column as a list."""
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        values = [self._decode(data[start:end]) for start, end
+                  in zip(offsets[:-1], offsets[1:])]
+        if self.mask is not None:
+            values = [value if present else None for value, present
+                      in zip(values, self.mask.tolist())]
+        return values
+
+
+def _get_indptr(sorted_rows, n_rows):
+    indptr = numpy.zeros(n_rows + 1, dtype=numpy.int64)
+    indptr[1:] = numpy.cumsum(numpy.bincount(sorted_rows,
+                                             minlength=n_rows))
+    return indptr
@@ -1,7 +1,10 @@
+import os
+import inspect
 import logging
 import networkx
 import functools
 from collections import deque
+from .transitive_closure import TransitiveClosureIndex, get_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,48 @@ def with_initialize(func):
     return wrapper
 
 
+def _invalidates_closure(method):
+    """Wrap a method changing a graph to drop its transitive closure."""
+    @functools.wraps(method)
+    def wrapper(obj, *args, **kwargs):
+        obj._closure_index = None
+        return method(obj, *args, **kwargs)
+    return wrapper
+
+
+def _with_networkx_graph(method):
+    """Wrap a networkx method to first build the graph of an ontology that
+    was loaded from a compact graph, see IndraOntology._set_compact_graph.
+    """
+    @functools.wraps(method)
+    def wrapper(obj, *args, **kwargs):
+        if obj._compact_graph is not None:
+            obj._materialize_graph()
+        return method(obj, *args, **kwargs)
+    return wrapper
+
+
+def _wrap_networkx_api(cls):
+    """Wrap the public methods and properties of networkx.DiGraph in a
+    subclass with _with_networkx_graph."""
+    names = [name for name in dir(networkx.DiGraph)
+             if not name.startswith('_')] + \
+        ['__contains__', '__iter__', '__len__', '__getitem__']
+    for name in names:
+        attr = inspect.getattr_static(cls, name)
+        if inspect.isfunction(attr):
+            setattr(cls, name, _with_networkx_graph(attr))
+        elif isinstance(attr, property) or \
+                type(attr).__name__ == 'cached_property':
+            # The views of the graph, e.g., nodes, are cached properties
+            # which we turn into properties that get the cached value
+            def get_view(obj, view=attr):
+                return view.__get__(obj, type(obj))
+            setattr(cls, name, property(_with_networkx_graph(get_view)))
+    return cls
+
+
+@_wrap_networkx_api
 class IndraOntology(networkx.DiGraph):
     """A directed graph representing entities and their properties
     as nodes  and ontological relationships between the entities as
@@ -29,12 +74,34 @@ class IndraOntology(networkx.DiGraph):
     """
     version = None
     name = None
+    # These are defined here for ontologies pickled without them
+    _compact_graph = None
+    _closure_index = None
+    # Changing the edges of the graph invalidates its transitive closure
+    # index, which is rebuilt by _build_transitive_closure. Note that
+    # changes to the attributes of existing edges aren't tracked.
+    add_edge = _invalidates_closure(networkx.DiGraph.add_edge)
+    add_edges_from = _invalidates_closure(networkx.DiGraph.add_edges_from)
+    add_weighted_edges_from = \
+        _invalidates_closure(networkx.DiGraph.add_weighted_edges_from)
+    remove_edge = _invalidates_closure(networkx.DiGraph.remove_edge)
+    remove_edges_from = \
+        _invalidates_closure(networkx.DiGraph.remove_edges_from)
+    remove_node = _invalidates_closure(networkx.DiGraph.remove_node)
+    remove_nodes_from = \
+        _invalidates_closure(networkx.DiGraph.remove_nodes_from)
+    update = _invalidates_closure(networkx.DiGraph.update)
+    clear = _invalidates_closure(networkx.DiGraph.clear)
+    # This was added in networkx 2.4
+    if hasattr(networkx.DiGraph, 'clear_edges'):
+        clear_edges = _invalidates_closure(networkx.DiGraph.clear_edges)
 
     def __init__(self):
         super().__init__()
         self._initialized = False
         self.name_to_grounding = {}
-        self.transitive_closure = set()
+        self._closure_index = None
+        self._compact_graph = None
         self._isa_counter = 0
         self._isrel_counter = 0
 
@@ -53,6 +120,12 @@ class IndraOntology(networkx.DiGraph):
 
     @with_initialize
     def _check_path(self, ns1, id1, ns2, id2, edge_types):
+        if self._closure_index is not None:
+            is_related = self._closure_index.has_path(self.label(ns1, id1),
+                                                      self.label(ns2, id2),
+                                                      edge_types)
+            if is_related is not None:
+                return is_related
         try:
             target = (ns2, id2)
             if target in self._transitive_rel(ns1, id1, self.child_rel,
@@ -214,9 +287,6 @@ class IndraOntology(networkx.DiGraph):
             Otherwise False.
         """
         self._isa_counter += 1
-        if self.transitive_closure:
-            return (self.label(ns1, id1),
-                    self.label(ns2, id2)) in self.transitive_closure
         return self.isrel(ns1, id1, ns2, id2, rels={'isa', 'partof'})
 
     @with_initialize
@@ -302,15 +372,30 @@ class IndraOntology(networkx.DiGraph):
 
     @with_initialize
     def descendants_rel(self, ns, id, rel_types):
+        if self._closure_index is not None:
+            labels = self._closure_index.get_reachable(self.label(ns, id),
+                                                       rel_types)
+            if labels is not None:
+                return [self.get_ns_id(label) for label in labels]
         return self._transitive_rel(ns, id, self.child_rel, rel_types)
 
     @with_initialize
     def ancestors_rel(self, ns, id, rel_types):
+        if self._closure_index is not None:
+            labels = self._closure_index.get_reachable(self.label(ns, id),
+                                                       rel_types,
+                                                       reverse=True)
+            if labels is not None:
+                return [self.get_ns_id(label) for label in labels]
         return self._transitive_rel(ns, id, self.parent_rel, rel_types)
 
     @with_initialize
     def child_rel(self, ns, id, rel_types):
         source = self.label(ns, id)
+        if self._compact_graph is not None:
+            for target in self._compact_graph.successors(source, rel_types):
+                yield self.get_ns_id(target)
+            return
         # This is to handle the case where the node is not in the
         # graph
         try:
@@ -324,6 +409,11 @@ class IndraOntology(networkx.DiGraph):
     @with_initialize
     def parent_rel(self, ns, id, rel_types):
         target = self.label(ns, id)
+        if self._compact_graph is not None:
+            for source in self._compact_graph.predecessors(target,
+                                                           rel_types):
+                yield self.get_ns_id(source)
+            return
         # This is to handle the case where the node is not in the
         # graph
         try:
@@ -494,6 +584,9 @@ class IndraOntology(networkx.DiGraph):
             if the node is not in the ontology or doesn't
             have the given property.
         """
+        if self._compact_graph is not None:
+            return self._compact_graph.get_node_property(self.label(ns, id),
+                                                         property)
         try:
             return self.nodes[self.label(ns, id)][property]
         except KeyError:
@@ -549,10 +642,17 @@ class IndraOntology(networkx.DiGraph):
 
     @with_initialize
     def _build_name_lookup(self):
+        if self._compact_graph is not None:
+            names = [(node, name) for node, name
+                     in self._compact_graph.nodes(data='name')
+                     if name is not None]
+        else:
+            names = [(node, data['name'])
+                     for node, data in self.nodes(data=True)
+                     if 'name' in data]
         self.name_to_grounding = {
-            (self.get_ns(node), data['name']): self.get_ns_id(node)
-            for node, data in self.nodes(data=True)
-            if 'name' in data
+            (self.get_ns(node), name): self.get_ns_id(node)
+            for node, name in names
         }
 
     @with_initialize
@@ -572,7 +672,9 @@ class IndraOntology(networkx.DiGraph):
         list
             A list of node labels that have the given suffix.
         """
-        return [node for node in self.nodes
+        nodes = self._compact_graph.nodes() \
+            if self._compact_graph is not None else self.nodes
+        return [node for node in nodes
                 if node.endswith(suffix)]
 
     @staticmethod
@@ -619,19 +721,78 @@ class IndraOntology(networkx.DiGraph):
         """
         return tuple(label.split(':', maxsplit=1))
 
-    def _build_transitive_closure(self):
-        if self.transitive_closure:
+    def _build_transitive_closure(self, cache_file=None, rebuild=False):
+        """Build the transitive closure index used for isa/partof lookups.
+
+        Parameters
+        ----------
+        cache_file : Optional[str]
+            The path to an .npz file from which the index is loaded if
+            it exists and is up to date with the graph, and into which the
+            index is saved otherwise.
+        rebuild : Optional[bool]
+            If True, the index is rebuilt even if an index that is up to
+            date with the graph is available. Default: False
+        """
+        # We avoid materializing the graph if it was loaded in compact form
+        graph = self._compact_graph if self._compact_graph is not None \
+            else self
+        fingerprint = get_fingerprint(graph)
+        if not rebuild and self._closure_index is not None and \
+                self._closure_index.fingerprint == fingerprint:
             return
+        self._closure_index = None
+        if not rebuild and cache_file and os.path.exists(cache_file):
+            try:
+                index = TransitiveClosureIndex.load(cache_file)
+                if index.fingerprint == fingerprint:
+                    self._closure_index = index
+                    return
+            except Exception as e:
+                logger.warning('Could not load transitive closure from '
+                               '%s: %s' % (cache_file, e))
         logger.info('Building transitive closure for faster '
                     'isa/partof lookups...')
-        self.transitive_closure = set()
-        for node in self.nodes():
-            ns, id = self.get_ns_id(node)
-            for pns, pid in self.descendants_rel(ns, id,
-                                                 rel_types={'isa',
-                                                            'partof'}):
-                self.transitive_closure.add((self.label(ns, id),
-                                             self.label(pns, pid)))
+        self._closure_index = TransitiveClosureIndex.from_graph(graph)
+        if cache_file:
+            try:
+                self._closure_index.save(cache_file)
+            except Exception:
+                logger.warning('Failed to cache transitive closure at %s.'
+                               % cache_file)
+
+    def _set_compact_graph(self, compact_graph):
+        """Set the contents of the ontology to those of a compact graph.
+
+        Lookups implemented by this class are answered using the compact
+        graph, and the networkx graph of the ontology is left empty. It is
+        built from the compact graph (see :py:meth:`_materialize_graph`)
+        the first time a public networkx method or property is used on the
+        ontology, all of which are wrapped to do so.
+
+        Parameters
+        ----------
+        compact_graph : indra.ontology.compact_graph.CompactGraph
+            The compact graph to use.
+        """
+        # We drop any previous compact graph first so that it isn't
+        # materialized when clearing the graph
+        self._compact_graph = None
+        self.clear()
+        self._compact_graph = compact_graph
+        self.name_to_grounding = {}
+        self._initialized = True
+
+    def _materialize_graph(self):
+        """Build the networkx graph of the ontology from its compact graph.
+        """
+        compact_graph = self._compact_graph
+        self._compact_graph = None
+        logger.info('Materializing ontology graph with %d nodes from its '
+                    'compact form' % compact_graph.number_of_nodes())
+        # The edges don't change so the closure index remains valid
+        networkx.DiGraph.add_nodes_from(self, compact_graph.nodes(data=True))
+        networkx.DiGraph.add_edges_from(self, compact_graph.edges(data=True))
 
     @with_initialize
     def print_stats(self):
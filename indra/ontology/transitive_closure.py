@@ -0,0 +1,249 @@
+"""An integer-indexed transitive closure of ontology relations.
+
+Each node of an ontology graph that takes part in a hierarchical (`isa` or
+`partof`) relation gets an integer id, and the ids of all the nodes that can
+be reached from each node via edges of a given set of types are stored as
+sorted integer arrays in compressed sparse row (CSR) format. This makes
+checking whether two entities are related a set lookup, and getting all
+the parents or children of an entity a slice of an array.
+"""
+__all__ = ['TransitiveClosureIndex', 'get_fingerprint']
+
+import logging
+import hashlib
+import numpy
+import networkx
+
+logger = logging.getLogger(__name__)
+
+
+class TransitiveClosureIndex(object):
+    """The transitive closures of hierarchical relations in an ontology.
+
+    Closures are indexed for paths consisting of `isa` edges only, of
+    `partof` edges only, and of both types of edges, in the direction of
+    the edges (i.e., towards parents) and, for paths consisting of both
+    types of edges, also in the reverse direction (i.e., towards children).
+
+    Parameters
+    ----------
+    labels : list[str]
+        The labels of the indexed nodes, the position of each label being
+        the id of the node.
+    closures : dict
+        A dict whose keys are the names of indexed closures (see
+        `indexed_closures`) and whose values are tuples of the indptr and
+        indices arrays of the closure in CSR format.
+    fingerprint : str
+        The fingerprint of the hierarchical edges of the graph the index
+        was built from (see :py:func:`get_fingerprint`), which is used to
+        check if the index is out of date.
+    """
+    # The name of each closure with the edge types it consists of and
+    # whether it follows edges in reverse
+    indexed_closures = {
+        'isa': (frozenset({'isa'}), False),
+        'partof': (frozenset({'partof'}), False),
+        'isa_partof': (frozenset({'isa', 'partof'}), False),
+        'isa_partof_reverse': (frozenset({'isa', 'partof'}), True),
+    }
+
+    def __init__(self, labels, closures, fingerprint):
+        self.labels = labels
+        self.node_ids = {label: idx for idx, label in enumerate(labels)}
+        self.closures = closures
+        self.fingerprint = fingerprint
+        self._closure_names = {spec: name for name, spec
+                               in self.indexed_closures.items()}
+        # Rows of closures converted into sets on first lookup, since
+        # set membership is cheaper than a binary search on a numpy array
+        self._row_sets = {name: {} for name in closures}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Return a closure index built from an ontology graph.
+
+        Parameters
+        ----------
+        graph : networkx.DiGraph
+            An ontology graph whose edges have a `type` attribute.
+
+        Returns
+        -------
+        TransitiveClosureIndex
+            The closure index of the graph.
+        """
+        edges = _get_indexed_edges(graph)
+        labels = sorted({node for source, target, _ in edges
+                         for node in (source, target)})
+        node_ids = {label: idx for idx, label in enumerate(labels)}
+        closures = {}
+        for name, (rel_types, reverse) in cls.indexed_closures.items():
+            rel_edges = [(node_ids[source], node_ids[target])
+                         for source, target, edge_type in edges
+                         if edge_type in rel_types]
+            if reverse:
+                rel_edges = [(target, source) for source, target in rel_edges]
+            closures[name] = _get_csr_closure(len(labels), rel_edges)
+        logger.info('Built transitive closure index for %d nodes'
+                    % len(labels))
+        return cls(labels, closures, _get_edges_fingerprint(edges))
+
+    @classmethod
+    def load(cls, fname):
+        """Return a closure index loaded from a file saved with `save`."""
+        with numpy.load(fname) as arrays:
+            labels = arrays['labels'].tobytes().decode('utf-8').split('\n') \
+                if arrays['labels'].size else []
+            closures = {name: (arrays[name + '_indptr'],
+                               arrays[name + '_indices'])
+                        for name in cls.indexed_closures}
+            return cls(labels, closures, str(arrays['fingerprint']))
+
+    def save(self, fname):
+        """Save the closure index into a file.
+
+        Parameters
+        ----------
+        fname : str
+            The path to the file, which needs to end with .npz.
+        """
+        labels = '\n'.join(self.labels).encode('utf-8')
+        arrays = {'labels': numpy.frombuffer(labels, dtype=numpy.uint8),
+                  'fingerprint': numpy.array(self.fingerprint)}
+        for name, (indptr, indices) in self.closures.items():
+            arrays[name + '_indptr'] = indptr
+            arrays[name + '_indices'] = indices
+        numpy.savez(fname, **arrays)
+
+    def _get_closure_name(self, rel_types, reverse):
+        return self._closure_names.get((frozenset(rel_types), reverse))
+
+    def has_path(self, source, target, rel_types):
+        """Return whether there is a path of given edge types between nodes.
+
+        Parameters
+        ----------
+        source : str
+            The label of the node the path starts from.
+        target : str
+            The label of the node the path ends at.
+        rel_types : iterable[str]
+            The types of edges that the path can consist of.
+
+        Returns
+        -------
+        bool or None
+            True if there is a path from the source to the target consisting
+            of edges with the given types, False otherwise. A node has a
+            path to itself only if it is in a cycle. None if paths with the
+            given edge types aren't indexed.
+        """
+        name = self._get_closure_name(rel_types, False)
+        if name is None:
+            return None
+        source_id = self.node_ids.get(source)
+        target_id = self.node_ids.get(target)
+        if source_id is None or target_id is None:
+            return False
+        row_sets = self._row_sets[name]
+        row = row_sets.get(source_id)
+        if row is None:
+            indptr, indices = self.closures[name]
+            row = row_sets[source_id] = \
+                frozenset(indices[indptr[source_id]:
+                                  indptr[source_id + 1]].tolist())
+        return target_id in row
+
+    def get_reachable(self, source, rel_types, reverse=False):
+        """Return the labels of nodes reachable from a given node.
+
+        Parameters
+        ----------
+        source : str
+            The label of the node to start from.
+        rel_types : iterable[str]
+            The types of edges that paths can consist of.
+        reverse : Optional[bool]
+            If True, edges are followed in reverse. Default: False
+
+        Returns
+        -------
+        list[str] or None
+            The labels of all the nodes that are reachable from the source
+            node via edges of the given types, not including the source node
+            itself. None if paths with the given edge types aren't indexed.
+        """
+        name = self._get_closure_name(rel_types, reverse)
+        if name is None:
+            return None
+        source_id = self.node_ids.get(source)
+        if source_id is None:
+            return []
+        indptr, indices = self.closures[name]
+        return [self.labels[idx] for idx in
+                indices[indptr[source_id]:indptr[source_id + 1]].tolist()
+                if idx != source_id]
+
+
+def get_fingerprint(graph):
+    """Return a fingerprint of the hierarchical edges of a graph.
+
+    The fingerprint is a hash of the sorted edges that are indexed by
+    :py:class:`TransitiveClosureIndex`, along with their types, so it
+    changes whenever an edit of the graph changes any transitive closure.
+
+    Parameters
+    ----------
+    graph : networkx.DiGraph
+        An ontology graph whose edges have a `type` attribute.
+
+    Returns
+    -------
+    str
+        The fingerprint of the graph.
+    """
+    return _get_edges_fingerprint(_get_indexed_edges(graph))
+
+
+def _get_indexed_edges(graph):
+    indexed_closures = TransitiveClosureIndex.indexed_closures
+    all_types = set.union(*[set(rel_types) for rel_types, _
+                            in indexed_closures.values()])
+    return [(source, target, edge_type) for source, target, edge_type
+            in graph.edges(data='type') if edge_type in all_types]
+
+
+def _get_edges_fingerprint(edges):
+    edges_str = '\n'.join('\t'.join(edge) for edge in sorted(edges))
+    return hashlib.md5(edges_str.encode('utf-8')).hexdigest()
+
+
+def _get_csr_closure(n_nodes, edges):
+    """Return the transitive closure of a graph as indptr, indices arrays."""
+    graph = networkx.DiGraph()
+    graph.add_nodes_from(range(n_nodes))
+    graph.add_edges_from(edges)
+    # We collapse cycles, if any, into single nodes to get a DAG in which
+    # the closure of each node can be computed from those of its successors
+    dag = networkx.condensation(graph)
+    members = {comp: numpy.array(sorted(data['members']), dtype=numpy.int32)
+               for comp, data in dag.nodes(data=True)}
+    # Nodes in cycles, including self loops, can reach themselves
+    self_loops = {dag.graph['mapping'][node]
+                  for node in networkx.nodes_with_selfloops(graph)}
+    empty = numpy.array([], dtype=numpy.int32)
+    comp_closures = {}
+    for comp in reversed(list(networkx.topological_sort(dag))):
+        parts = [members[comp]] \
+            if len(members[comp]) > 1 or comp in self_loops else []
+        for succ in dag.successors(comp):
+            parts += [members[succ], comp_closures[succ]]
+        comp_closures[comp] = numpy.unique(numpy.concatenate(parts)) \
+            if parts else empty
+    closures = [comp_closures[dag.graph['mapping'][node]]
+                for node in range(n_nodes)]
+    indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+    indptr[1:] = numpy.cumsum([len(closure) for closure in closures])
+    indices = numpy.concatenate(closures) if closures else empty
+    return indptr, indices.astype(numpy.int32)
@@ -180,6 +180,7 @@ class WorldOntology(IndraOntology):
                     matched_node = root[-1][part]
             root = matched_node
         self._load_yml(self.yml)
+        self._build_transitive_closure(rebuild=True)
 
 
 @register_pipeline
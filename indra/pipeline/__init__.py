@@ -1,2 +1,3 @@
 from .pipeline import AssemblyPipeline, RunnableArgument
-from .decorators import register_pipeline, pipeline_functions
+from .decorators import register_pipeline, pipeline_functions, streamable
+from .cache import StepCache
@@ -0,0 +1,182 @@
+"""A content-addressed cache of the results of assembly pipeline steps.
+
+The result of each step of a pipeline is keyed on a hash of the key of
+the step's input, the function of the step with its args and kwargs (as
+they appear in the JSON of the pipeline), and the INDRA version. The key
+of the input of the first step is a fingerprint of the statements the
+pipeline is run on. This way, a pipeline that is run again on the same
+statements, possibly after steps were changed or added at the end, can
+resume from the result of the longest prefix of its steps that is
+cached.
+"""
+import os
+import glob
+import json
+import pickle
+import hashlib
+import logging
+from indra import __version__
+from indra.config import get_config
+from indra.statements import make_hash
+from indra.util import atomic_replace
+
+logger = logging.getLogger(__name__)
+
+
+STEP_CACHE_DIR = os.path.join((get_config('INDRA_RESOURCES') or
+                               os.path.join(os.path.expanduser('~'),
+                                            '.indra')),
+                              'pipeline_cache')
+
+
+class StepCache(object):
+    """A cache of the results of pipeline steps stored in a directory.
+
+    Each result is pickled into its own file named after its key. When the
+    total size of the files exceeds `max_size`, the least recently used
+    results are removed.
+
+    Parameters
+    ----------
+    cache_dir : Optional[str]
+        The directory in which results are stored. By default, this is
+        pipeline_cache in the INDRA_RESOURCES directory if configured,
+        otherwise in ~/.indra.
+    max_size : Optional[int]
+        The maximum total size of the stored results in bytes.
+        Default: 10 GB
+    """
+    def __init__(self, cache_dir=None, max_size=10 * 1024 ** 3):
+        self.cache_dir = cache_dir if cache_dir else STEP_CACHE_DIR
+        self.max_size = max_size
+
+    def get_path(self, key):
+        """Return the path of the file in which a result is stored."""
+        return os.path.join(self.cache_dir, '%s.pkl' % key)
+
+    def __contains__(self, key):
+        return os.path.exists(self.get_path(key))
+
+    def load(self, key):
+        """Return the result with a given key or None if it isn't cached."""
+        fname = self.get_path(key)
+        if not os.path.exists(fname):
+            return None
+        try:
+            with open(fname, 'rb') as fh:
+                result = pickle.load(fh)
+        except Exception as e:
+            logger.warning('Could not load step result from %s: %s'
+                           % (fname, e))
+            return None
+        # We update the modification time which is used as the time of
+        # last use when evicting results
+        os.utime(fname)
+        return result
+
+    def save(self, key, result):
+        """Store a result with a given key and evict old results if needed."""
+        fname = self.get_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_replace(fname) as tmp_fname:
+                with open(tmp_fname, 'wb') as fh:
+                    pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning('Could not save step result to %s: %s'
+                           % (self.cache_dir, e))
+            return
+        self.evict(keep=fname)
+
+    def evict(self, keep=None):
+        """Remove least recently used results until the cache is small enough.
+
+        Parameters
+        ----------
+        keep : Optional[str]
+            The path of a file that is never removed, e.g., the result that
+            was just saved.
+        """
+        entries = []
+        for fname in glob.glob(os.path.join(self.cache_dir, '*.pkl')):
+            try:
+                stat = os.stat(fname)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, fname))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, fname in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if fname == keep:
+                continue
+            try:
+                os.remove(fname)
+                total_size -= size
+                logger.info('Removed %s from the step cache' % fname)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all results from the cache."""
+        for fname in glob.glob(os.path.join(self.cache_dir, '*.pkl')):
+            os.remove(fname)
+
+
+def get_statements_fingerprint(statements):
+    """Return a hash of the content of a list of statements.
+
+    The content of each statement is its JSON serialization, without its
+    UUID, and with the statements it supports or is supported by given by
+    their (shallow) hashes instead of their UUIDs. These hashes are
+    computed from the matches keys of the statements without updating the
+    hashes cached in the statements. The same statements built again,
+    e.g., by processing the same reader output, therefore have the same
+    fingerprint. This also means that statements loaded from the cache
+    may have different UUIDs than the given ones.
+
+    Parameters
+    ----------
+    statements : list[indra.statements.Statement]
+        A list of statements.
+
+    Returns
+    -------
+    str
+        The hex digest of the hash of the serialized statements.
+    """
+    hasher = hashlib.sha256()
+    for stmt in statements:
+        stmt_json = stmt.to_json()
+        stmt_json.pop('id', None)
+        for attr in ['supports', 'supported_by']:
+            if attr in stmt_json:
+                stmt_json[attr] = [make_hash(st.matches_key(), 14)
+                                   for st in getattr(stmt, attr)]
+        hasher.update(json.dumps(stmt_json, sort_keys=True,
+                                 default=str).encode('utf-8'))
+        hasher.update(b'\n')
+    return hasher.hexdigest()
+
+
+def get_step_key(input_key, step):
+    """Return the key of the result of a pipeline step.
+
+    Parameters
+    ----------
+    input_key : str
+        The key of the input of the step, i.e., the fingerprint of the
+        statements or the key of the previous step.
+    step : dict
+        The JSON of the step with its function, args and kwargs.
+
+    Returns
+    -------
+    str
+        The hex digest of the hash of the input key, the step and the INDRA
+        version.
+    """
+    step_json = json.dumps(step, sort_keys=True, default=str)
+    return hashlib.sha256(('%s\n%s\n%s' % (input_key, step_json,
+                                           __version__)).encode('utf-8')) \
+        .hexdigest()
@@ -1,4 +1,10 @@
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
 pipeline_functions = {}
+streamable_functions = set()
 
 
 def register_pipeline(function):
@@ -11,5 +17,58 @@ def register_pipeline(function):
     return function
 
 
+def streamable(function=None, in_place=False):
+    """Decorator to mark a pipeline function as processing each statement
+    on its own.
+
+    Applying such a function to consecutive chunks of a list of statements
+    and concatenating the results is the same as applying it to the whole
+    list, which allows the assembly pipeline to run consecutive streamable
+    steps in a single pass over the statements. It also allows running the
+    function on chunks of statements in parallel, for which the decorated
+    function takes two additional kwargs: n_jobs, the number of worker
+    processes, and chunk_size, the number of statements in each chunk,
+    see :py:func:`indra.pipeline.parallel.select_chunks`.
+
+    Parameters
+    ----------
+    function : function
+        The function to decorate.
+    in_place : Optional[bool or str]
+        Whether the function changes the given statements in place, or the
+        name of the kwarg of the function that makes it do so when true.
+        Such a function is always run in the current process since worker
+        processes would only change copies of the given statements.
+        Default: False
+    """
+    if function is None:
+        return functools.partial(streamable, in_place=in_place)
+    streamable_functions.add(function.__name__)
+
+    @functools.wraps(function)
+    def wrapper(stmts_in, *args, n_jobs=None, chunk_size=None, **kwargs):
+        if n_jobs is None or n_jobs <= 1:
+            return function(stmts_in, *args, **kwargs)
+        if in_place is True or \
+                (isinstance(in_place, str) and kwargs.get(in_place)):
+            logger.warning('%s changes statements in place so it is run in '
+                           'the current process rather than by %d worker '
+                           'processes' % (function.__name__, n_jobs))
+            return function(stmts_in, *args, **kwargs)
+        from .parallel import select_chunks
+        # The results are saved once they are put together rather than by
+        # each worker
+        save = kwargs.pop('save', None)
+        # The workers call the decorated function which, without n_jobs,
+        # processes each chunk in the worker process
+        stmts_out = select_chunks(wrapper, stmts_in, args, kwargs,
+                                  n_jobs=n_jobs, chunk_size=chunk_size)
+        if save:
+            from indra.tools.assemble_corpus import dump_statements
+            dump_statements(stmts_out, save)
+        return stmts_out
+    return wrapper
+
+
 class ExistingFunctionError(Exception):
     pass
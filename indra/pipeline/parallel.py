@@ -0,0 +1,179 @@
+"""A chunked process pool executor for assembly pipeline functions.
+
+Many pipeline functions, e.g., most filters and the mapping of
+groundings and sites, process each statement on its own so they can be
+run on chunks of statements in parallel. Here, the function and its
+arguments are passed to each worker process once when it starts, so that
+objects such as mappers or ontologies used by the function (and the
+resource tables they load) are set up once per worker rather than once
+per chunk. On platforms that fork, objects already loaded in the parent
+process are shared with the workers without being pickled.
+"""
+import logging
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+
+def map_chunks(func, stmts, args=None, kwargs=None, n_jobs=None,
+               chunk_size=None, initializer=None, initargs=()):
+    """Return the results of a function applied to chunks of statements.
+
+    Parameters
+    ----------
+    func : function
+        A module level function that takes a list of statements as its
+        first argument.
+    stmts : list[indra.statements.Statement]
+        The statements to apply the function to.
+    args : Optional[list]
+        Additional args passed to the function with each chunk.
+    kwargs : Optional[dict]
+        Kwargs passed to the function with each chunk.
+    n_jobs : Optional[int]
+        The number of worker processes. If None or 1 (default), the
+        function is applied to all the statements in the current process.
+    chunk_size : Optional[int]
+        The number of statements in each chunk. By default, the statements
+        are split into four chunks per worker process so that a single
+        expensive chunk doesn't leave the other processes idle at the end.
+    initializer : Optional[function]
+        A function called in each worker process when it starts, e.g., to
+        set up resources that can't be shared between processes.
+    initargs : Optional[tuple]
+        The args of the initializer.
+
+    Returns
+    -------
+    list
+        The results of the function for each chunk, in the order of the
+        chunks. Note that statements returned by worker processes are
+        copies of the given statements.
+    """
+    args = args if args else []
+    kwargs = kwargs if kwargs else {}
+    if n_jobs is None or n_jobs <= 1 or not stmts:
+        return [func(stmts, *args, **kwargs)]
+    chunk_size = _get_chunk_size(stmts, n_jobs, chunk_size)
+    chunks = [stmts[start:start + chunk_size]
+              for start in range(0, len(stmts), chunk_size)]
+    logger.info('Running %s on %d statements in %d chunks using %d '
+                'processes' % (func.__name__, len(stmts), len(chunks),
+                               n_jobs))
+    with multiprocessing.Pool(
+            n_jobs, initializer=_init_chunk_worker,
+            initargs=(func, args, kwargs, initializer, initargs)) as pool:
+        return list(pool.imap(_run_chunk_worker, chunks))
+
+
+def select_chunks(func, stmts, args=None, kwargs=None, n_jobs=None,
+                  chunk_size=None):
+    """Return the statements returned by a function applied to chunks.
+
+    This is like :py:func:`map_chunks` for functions that return a list of
+    statements, typically a subset of the given ones as in the case of
+    filters. Rather than sending copies of the statements back from the
+    worker processes, the workers return the indices of the given
+    statements that the function returned. The given statements are then
+    returned, not copies, so they still refer to each other, e.g., via
+    their supports and supported_by attributes. Statements returned by the
+    function that aren't among the given ones, e.g., copies it made, are
+    returned from the worker processes as they are.
+
+    The worker processes are forked where possible, in which case they
+    inherit the statements and only get the ranges of indices of their
+    chunks. On platforms that can't fork, chunks of statements are sent to
+    the workers instead.
+
+    Note that changes made to the given statements in place by the function
+    are lost, so it can only be used with functions that don't make any.
+
+    Parameters
+    ----------
+    func : function
+        A module level function that takes a list of statements as its
+        first argument and returns a list of statements.
+    stmts : list[indra.statements.Statement]
+        The statements to apply the function to.
+    args : Optional[list]
+        Additional args passed to the function with each chunk.
+    kwargs : Optional[dict]
+        Kwargs passed to the function with each chunk.
+    n_jobs : Optional[int]
+        The number of worker processes. If None or 1 (default), the
+        function is applied to all the statements in the current process.
+    chunk_size : Optional[int]
+        The number of statements in each chunk, see :py:func:`map_chunks`.
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The statements returned by the function for each chunk, in the
+        order of the chunks.
+    """
+    args = args if args else []
+    kwargs = kwargs if kwargs else {}
+    if n_jobs is None or n_jobs <= 1 or not stmts:
+        return func(stmts, *args, **kwargs)
+    chunk_size = _get_chunk_size(stmts, n_jobs, chunk_size)
+    ranges = [(start, min(start + chunk_size, len(stmts)))
+              for start in range(0, len(stmts), chunk_size)]
+    logger.info('Running %s on %d statements in %d chunks using %d '
+                'processes' % (func.__name__, len(stmts), len(ranges),
+                               n_jobs))
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        select_func, select_args = _select_range, [stmts, func, args, kwargs]
+        items = ranges
+    else:
+        # Otherwise the statements passed to the initializer would be
+        # pickled for each worker
+        context = multiprocessing.get_context()
+        select_func, select_args = _select_chunk, [func, args, kwargs]
+        items = [(start, stmts[start:end]) for start, end in ranges]
+    with context.Pool(
+            n_jobs, initializer=_init_chunk_worker,
+            initargs=(select_func, select_args, {}, None, ())) as pool:
+        return [stmts[item] if isinstance(item, int) else item
+                for chunk_out in pool.imap(_run_chunk_worker, items)
+                for item in chunk_out]
+
+
+def _get_chunk_size(stmts, n_jobs, chunk_size):
+    # By default, the statements are split into four chunks per worker
+    return chunk_size if chunk_size else max(1, len(stmts) // (n_jobs * 4))
+
+
+def _select_range(stmt_range, stmts, func, args, kwargs):
+    """Return the indices of the statements a function returns for a range.
+    """
+    start, end = stmt_range
+    return _select_chunk((start, stmts[start:end]), func, args, kwargs)
+
+
+def _select_chunk(start_chunk, func, args, kwargs):
+    """Return the indices of the statements a function returns for a chunk
+    starting at a given index.
+    """
+    start, chunk = start_chunk
+    indices = {id(stmt): start + idx for idx, stmt in enumerate(chunk)}
+    return [indices.get(id(stmt), stmt)
+            for stmt in func(chunk, *args, **kwargs)]
+
+
+# This is the state shared with chunk worker processes, set by
+# _init_chunk_worker when each worker process starts.
+_chunk_worker_state = {}
+
+
+def _init_chunk_worker(func, args, kwargs, initializer, initargs):
+    _chunk_worker_state['func'] = func
+    _chunk_worker_state['args'] = args
+    _chunk_worker_state['kwargs'] = kwargs
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_chunk_worker(stmts):
+    return _chunk_worker_state['func'](stmts, *_chunk_worker_state['args'],
+                                       **_chunk_worker_state['kwargs'])
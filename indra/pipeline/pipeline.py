@@ -1,8 +1,12 @@
 import json
+import time
 import logging
 import inspect
+import itertools
 
-from .decorators import pipeline_functions, register_pipeline
+from .cache import get_statements_fingerprint, get_step_key
+from .decorators import pipeline_functions, register_pipeline, \
+    streamable_functions
 from indra.statements import get_statement_by_name, Statement
 
 
@@ -68,6 +72,30 @@ class AssemblyPipeline():
     >>> assembled_stmts = ap.run(stmts)
     >>> ap.to_json_file('filename.json')
 
+    Steps whose functions process each statement on their own, e.g.,
+    most of the `filter_*` functions, are marked with the @streamable
+    decorator. When running the pipeline with `stream=True`, consecutive
+    streamable steps are fused into a single pass over chunks of the
+    statements instead of each step making its own pass and building its
+    own list of statements. Other steps, e.g., `run_preassembly`, are run
+    on the full list of statements as usual.
+
+    >>> assembled_stmts = ap.run(stmts, stream=True)
+
+    Streamable steps, as well as `map_grounding` and `map_sequence`, can
+    also be run on chunks of statements in a pool of processes by giving
+    them an `n_jobs` kwarg, e.g., {"function": "filter_human_only",
+    "kwargs": {"n_jobs": 4}}.
+
+    The results of steps can be cached with a StepCache so that a pipeline
+    run again on the same statements, e.g., after its last steps were
+    changed, resumes from the results of the longest prefix of its steps
+    that are cached instead of running all the steps again.
+
+    >>> from indra.pipeline import StepCache
+    >>> ap = AssemblyPipeline(steps, cache=StepCache())
+    >>> assembled_stmts = ap.run(stmts)
+
     Parameters
     ----------
     steps : list[dict]
@@ -81,8 +109,22 @@ class AssemblyPipeline():
         contain a key-value pair {'no_run': True}. If an argument is a type
         of a statement, it should be represented as a dictionary {'stmt_type':
         <name of a statement type>}.
+    cache : Optional[indra.pipeline.cache.StepCache]
+        A cache in which the results of the steps are stored and from which
+        they are loaded when the pipeline is run again. Results aren't
+        cached if the pipeline is run with kwargs since these aren't part of
+        the keys of the results. If None (default), results aren't cached.
+
+    Attributes
+    ----------
+    timings : list[dict]
+        The name of the function, the number of statements in and out and
+        the time spent on each step in the last run of the pipeline.
     """
-    def __init__(self, steps=None):
+    # The number of statements in each chunk passed through fused steps
+    stream_chunk_size = 10000
+
+    def __init__(self, steps=None, cache=None):
         # This import is here to avoid circular imports
         # It is enough to import one function to get all registered functions
         from indra.tools.assemble_corpus import filter_grounded_only
@@ -92,14 +134,16 @@ class AssemblyPipeline():
         from indra.belief.wm_scorer import get_eidos_scorer
         from indra.preassembler.custom_preassembly import location_matches
         self.steps = steps if steps else []
+        self.cache = cache
+        self.timings = []
 
     @classmethod
-    def from_json_file(cls, filename):
+    def from_json_file(cls, filename, cache=None):
         """Create an instance of AssemblyPipeline from a JSON file with
         steps."""
         with open(filename, 'r') as f:
             steps = json.load(f)
-        ap = AssemblyPipeline(steps)
+        ap = AssemblyPipeline(steps, cache)
         return ap
 
     def to_json_file(self, filename):
@@ -107,13 +151,19 @@ class AssemblyPipeline():
         with open(filename, 'w') as f:
             json.dump(self.steps, f, indent=1)
 
-    def run(self, statements, **kwargs):
+    def run(self, statements, stream=False, **kwargs):
         """Run all steps of the pipeline.
 
         Parameters
         ----------
         statements : list[indra.statements.Statement]
             A list of INDRA Statements to run the pipeline on.
+        stream : Optional[bool]
+            If True, consecutive steps whose functions are streamable are
+            fused into a single pass over chunks of the statements, see
+            `stream_chunk_size`. Steps saving their results into a file
+            or running in parallel (with n_jobs) are never fused.
+            Default: False
         **kwargs : kwargs
             It is recommended to define all arguments for the steps functions
             in the steps definition, but it is also possible to provide some
@@ -131,10 +181,161 @@ class AssemblyPipeline():
             on the list of input Statements.
         """
         logger.info('Running the pipeline')
-        for step in self.steps:
-            statements = self.run_function(step, statements, **kwargs)
+        self.timings = []
+        keys = None
+        start = 0
+        if self.cache is not None:
+            if kwargs:
+                logger.warning('Not using the step cache since the results '
+                               'depend on the kwargs of the pipeline.')
+            else:
+                statements = list(statements)
+                keys = self.get_cache_keys(statements)
+                # We resume from the result of the longest cached prefix of
+                # the steps
+                for idx in reversed(range(len(self.steps))):
+                    if keys[idx] not in self.cache:
+                        continue
+                    cached_statements = self.cache.load(keys[idx])
+                    if cached_statements is not None:
+                        logger.info('Loaded the results of the first %d '
+                                    'steps from the step cache' % (idx + 1))
+                        statements = cached_statements
+                        start = idx + 1
+                        break
+        # The remaining steps are run in groups, each group being either a
+        # single step or consecutive streamable steps that are fused
+        groups = []
+        for fused, step_idxs in itertools.groupby(
+                range(start, len(self.steps)), key=lambda idx: stream and
+                self.is_streamable(self.steps[idx])):
+            if fused:
+                groups.append((True, list(step_idxs)))
+            else:
+                groups += [(False, [idx]) for idx in step_idxs]
+        for fused, step_idxs in groups:
+            steps = [self.steps[idx] for idx in step_idxs]
+            if fused:
+                statements = self.run_fused_functions(steps, statements,
+                                                      **kwargs)
+            else:
+                n_in = _get_length(statements)
+                ts = time.time()
+                statements = self.run_function(steps[0], statements,
+                                               **kwargs)
+                self._add_timing(steps[0]['function'], n_in,
+                                 _get_length(statements), time.time() - ts)
+            if keys is not None:
+                self.cache.save(keys[step_idxs[-1]], statements)
+        self.log_timings()
         return statements
 
+    def get_cache_keys(self, statements):
+        """Return the keys of the results of the steps in the step cache.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement]
+            The statements the pipeline is run on.
+
+        Returns
+        -------
+        list[str]
+            The key of the result of each step, which depends on the
+            statements and all the steps up to and including the given one.
+        """
+        key = get_statements_fingerprint(statements)
+        keys = []
+        for step in self.steps:
+            key = get_step_key(key, step)
+            keys.append(key)
+        return keys
+
+    def run_fused_functions(self, steps, statements, **kwargs):
+        """Run streamable steps in a single pass over chunks of statements.
+
+        Each chunk of statements goes through all the steps before the next
+        chunk is taken so that no list of all the statements is built in
+        between the steps.
+
+        Parameters
+        ----------
+        steps : list[dict]
+            A list of dicts representing streamable steps.
+        statements : iterable[indra.statements.Statement]
+            The statements to run the steps on.
+        kwargs : kwargs
+            Kwargs that are passed to the functions when calling them, as
+            in `run`.
+
+        Returns
+        -------
+        list[indra.statements.Statement]
+            The statements resulting from running the steps.
+        """
+        logger.info('Running %s fused on chunks of %d statements' %
+                    (', '.join(step['function'] for step in steps),
+                     self.stream_chunk_size))
+        # The arguments of each function are only evaluated once
+        calls = [self.get_function_call(step, **kwargs) for step in steps]
+        timings = [{'function': step['function'], 'n_in': 0, 'n_out': 0,
+                    'time': 0} for step in steps]
+        stmts_out = []
+        statements = iter(statements)
+        while True:
+            chunk = list(itertools.islice(statements,
+                                          self.stream_chunk_size))
+            if not chunk:
+                break
+            for (func, args, func_kwargs), timing in zip(calls, timings):
+                timing['n_in'] += len(chunk)
+                ts = time.time()
+                chunk = self.run_simple_function(func, *args,
+                                                 statements=chunk,
+                                                 **func_kwargs)
+                timing['time'] += time.time() - ts
+                if not chunk:
+                    break
+                timing['n_out'] += len(chunk)
+            else:
+                stmts_out += chunk
+        self.timings += timings
+        return stmts_out
+
+    def is_streamable(self, func_dict):
+        """Return True if a step can be fused with other streamable steps.
+
+        Parameters
+        ----------
+        func_dict : dict
+            A dict representing a step of the pipeline.
+
+        Returns
+        -------
+        bool
+            True if the function of the step is streamable and the step
+            doesn't save its results into a file or run in parallel.
+        """
+        func_name, _, func_kwargs = self.get_function_parameters(func_dict)
+        return func_name in streamable_functions and \
+            not func_kwargs.get('save') and \
+            (func_kwargs.get('n_jobs') or 1) <= 1
+
+    def log_timings(self):
+        """Log the number of statements and time spent on each step."""
+        for timing in self.timings:
+            n_in = timing['n_in']
+            n_out = timing['n_out']
+            logger.info('%s: %s -> %s statements in %.2fs%s' % (
+                timing['function'], '?' if n_in is None else n_in,
+                '?' if n_out is None else n_out, timing['time'],
+                ' (%d statements/s)' % (n_in / timing['time'])
+                if n_in and timing['time'] else ''))
+
+    def _add_timing(self, func_name, n_in, n_out, duration):
+        self.timings.append({'function': func_name, 'n_in': n_in,
+                             'n_out': n_out, 'time': duration})
+
     def append(self, func, *args, **kwargs):
         """Append a step to the end of the pipeline.
 
@@ -305,6 +506,32 @@ class AssemblyPipeline():
         object
             Any value that the given function returns.
         """
+        func, new_args, new_kwargs = self.get_function_call(func_dict,
+                                                            **kwargs)
+        if statements is not None:
+            new_kwargs['statements'] = statements
+        return self.run_simple_function(func, *new_args, **new_kwargs)
+
+    def get_function_call(self, func_dict, **kwargs):
+        """Return a function and the values of its args and kwargs.
+
+        For each of the arguments, if it requires an extra function call,
+        the function is called to get the value of the argument.
+
+        Parameters
+        ----------
+        func_dict : dict
+            A dict representing the function to call, its args and kwargs.
+        kwargs : kwargs
+            Kwargs that are passed to the function when calling it if it
+            expects an argument with the same name.
+
+        Returns
+        -------
+        tuple of function, list and dict
+            A tuple with the following elements: the function, the values
+            of its args, and the values of its kwargs.
+        """
         func_name, func_args, func_kwargs = self.get_function_parameters(
             func_dict)
         func = self.get_function_from_name(func_name)
@@ -317,13 +544,12 @@ class AssemblyPipeline():
         for k, v in func_kwargs.items():
             kwarg_value = self.get_argument_value(v)
             new_kwargs[k] = kwarg_value
-        if statements is not None:
-            new_kwargs['statements'] = statements
         if kwargs:
             for k, v in kwargs.items():
-                if k not in new_kwargs and k in inspect.getargspec(func).args:
+                if k not in new_kwargs and \
+                        k in inspect.signature(func).parameters:
                     new_kwargs[k] = v
-        return self.run_simple_function(func, *new_args, **new_kwargs)
+        return func, new_args, new_kwargs
 
     @staticmethod
     def is_function(argument, keyword='function'):
@@ -413,6 +639,14 @@ class RunnableArgument():
         return json_dict
 
 
+def _get_length(statements):
+    """Return the number of statements or None if it isn't known."""
+    try:
+        return len(statements)
+    except TypeError:
+        return None
+
+
 def jsonify_arg_input(arg):
     """Jsonify user input (in AssemblyPipeline `append` and `insert` methods)
     into a standard step json."""
@@ -3,6 +3,7 @@ import logging
 import itertools
 import functools
 import collections
+import multiprocessing
 import networkx as nx
 from indra.util import fast_deepcopy
 from indra.statements import *
@@ -62,6 +63,7 @@ class Preassembler(object):
             default_refinement_fun
         self.refinement_ns = refinement_ns
         self._comparison_counter = 0
+        self._refinement_index = None
 
     def add_statements(self, stmts):
         """Add to the current list of statements.
@@ -145,61 +147,64 @@ class Preassembler(object):
                 for ev in stmt.evidence:
                     ev_keys.append(ev.matches_key())
             return ev_keys
-        # Iterate over groups of duplicate statements
-        unique_stmts = []
-        for _, duplicates in self._get_stmt_matching_groups(stmts):
-            ev_keys = set()
-            # Get the first statement and add the evidence of all subsequent
-            # Statements to it
-            duplicates = list(duplicates)
-            start_ev_keys = _ev_keys(duplicates)
-            for stmt_ix, stmt in enumerate(duplicates):
-                if stmt_ix == 0:
-                    new_stmt = stmt.make_generic_copy()
-                if len(duplicates) == 1:
-                    new_stmt.uuid = stmt.uuid
-                raw_text = [None if ag is None else ag.db_refs.get('TEXT')
-                            for ag in stmt.agent_list(deep_sorted=True)]
-                raw_grounding = [None if ag is None else ag.db_refs
-                                 for ag in stmt.agent_list(deep_sorted=True)]
-                for ev in stmt.evidence:
-                    ev_key = ev.matches_key() + str(raw_text) + \
-                        str(raw_grounding)
-                    if ev_key not in ev_keys:
-                        # In case there are already agents annotations, we
-                        # just add a new key for raw_text, otherwise create
-                        # a new key
-                        if 'agents' in ev.annotations:
-                            ev.annotations['agents']['raw_text'] = raw_text
-                            ev.annotations['agents']['raw_grounding'] = \
-                                raw_grounding
-                        else:
-                            ev.annotations['agents'] = \
-                                {'raw_text': raw_text,
-                                 'raw_grounding': raw_grounding}
-                        if 'prior_uuids' not in ev.annotations:
-                            ev.annotations['prior_uuids'] = []
-                        ev.annotations['prior_uuids'].append(stmt.uuid)
-                        new_stmt.evidence.append(ev)
-                        ev_keys.add(ev_key)
-            end_ev_keys = _ev_keys([new_stmt])
-            if len(end_ev_keys) != len(start_ev_keys):
-                logger.debug('%d redundant evidences eliminated.' %
-                             (len(start_ev_keys) - len(end_ev_keys)))
-            # This should never be None or anything else
-            assert isinstance(new_stmt, Statement)
-            unique_stmts.append(new_stmt)
-        # At this point, we should do a hash refresh so that the statements
-        # returned don't have stale hashes.
-        for stmt in unique_stmts:
-            for shallow in (True, False):
-                stmt.get_hash(shallow=shallow, refresh=True,
-                              matches_fun=self.matches_fun)
-        return unique_stmts
-
-    # Note that the kwargs here are just there for backwards compatibility
-    # with old code that uses arguments related to multiprocessing.
-    def combine_related(self, return_toplevel=True, filters=None, **kwargs):
+        # Matches keys are computed repeatedly for each statement while
+        # sorting, grouping and hashing so we cache them
+        with key_caching():
+            # Iterate over groups of duplicate statements
+            unique_stmts = []
+            for _, duplicates in self._get_stmt_matching_groups(stmts):
+                ev_keys = set()
+                # Get the first statement and add the evidence of all
+                # subsequent Statements to it
+                duplicates = list(duplicates)
+                start_ev_keys = _ev_keys(duplicates)
+                for stmt_ix, stmt in enumerate(duplicates):
+                    if stmt_ix == 0:
+                        new_stmt = stmt.make_generic_copy()
+                    if len(duplicates) == 1:
+                        new_stmt.uuid = stmt.uuid
+                    raw_text = [None if ag is None else ag.db_refs.get('TEXT')
+                                for ag in stmt.agent_list(deep_sorted=True)]
+                    raw_grounding = \
+                        [None if ag is None else ag.db_refs
+                         for ag in stmt.agent_list(deep_sorted=True)]
+                    for ev in stmt.evidence:
+                        ev_key = ev.matches_key() + str(raw_text) + \
+                            str(raw_grounding)
+                        if ev_key not in ev_keys:
+                            # In case there are already agents annotations, we
+                            # just add a new key for raw_text, otherwise create
+                            # a new key
+                            if 'agents' in ev.annotations:
+                                ev.annotations['agents']['raw_text'] = raw_text
+                                ev.annotations['agents']['raw_grounding'] = \
+                                    raw_grounding
+                            else:
+                                ev.annotations['agents'] = \
+                                    {'raw_text': raw_text,
+                                     'raw_grounding': raw_grounding}
+                            if 'prior_uuids' not in ev.annotations:
+                                ev.annotations['prior_uuids'] = []
+                            ev.annotations['prior_uuids'].append(stmt.uuid)
+                            new_stmt.evidence.append(ev)
+                            ev_keys.add(ev_key)
+                end_ev_keys = _ev_keys([new_stmt])
+                if len(end_ev_keys) != len(start_ev_keys):
+                    logger.debug('%d redundant evidences eliminated.' %
+                                 (len(start_ev_keys) - len(end_ev_keys)))
+                # This should never be None or anything else
+                assert isinstance(new_stmt, Statement)
+                unique_stmts.append(new_stmt)
+            # At this point, we should do a hash refresh so that the statements
+            # returned don't have stale hashes.
+            for stmt in unique_stmts:
+                for shallow in (True, False):
+                    stmt.get_hash(shallow=shallow, refresh=True,
+                                  matches_fun=self.matches_fun)
+            return unique_stmts
+
+    def combine_related(self, return_toplevel=True, filters=None,
+                        poolsize=None, size_cutoff=None, **kwargs):
         """Connect related statements based on their refinement relationships.
 
         This function takes as a starting point the unique statements (with
@@ -263,6 +268,15 @@ class Preassembler(object):
             automatically appended to the list of filters. In this case,
             consider adding the `ontology_refinement_filter` function from this
             module to the filters list.
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None or 1 (default), all comparisons are done
+            in the current process.
+        size_cutoff : Optional[int]
+            Statement types with at least size_cutoff statements to compare
+            are sent to worker processes, while smaller groups are compared
+            in the parent process. Default: 100. Only relevant if poolsize
+            is greater than 1.
 
         Returns
         -------
@@ -306,7 +320,9 @@ class Preassembler(object):
 
         # Generate the index map, linking related statements.
         idx_map = self._generate_id_maps(unique_stmts,
-                                         filters=filters)
+                                         filters=filters,
+                                         poolsize=poolsize,
+                                         size_cutoff=size_cutoff)
 
         # Now iterate over all indices and set supports/supported by
         for ix1, ix2 in idx_map:
@@ -320,10 +336,124 @@ class Preassembler(object):
         else:
             return unique_stmts
 
-    # Note that the kwargs here are just there for backwards compatibility
-    # with old code that uses arguments related to multiprocessing.
+    def combine_related_incremental(self, stmts, return_toplevel=True,
+                                    poolsize=None, size_cutoff=None):
+        """Add new statements to the already assembled statements.
+
+        New statements are first de-duplicated among themselves. The
+        evidence of new statements that are duplicates of existing unique
+        statements is merged into the existing statements. The remaining new
+        statements are added to the refinement index built by
+        :py:meth:`combine_related` and are then compared, in both
+        directions, only with the statements that they can possibly be
+        related to. This way, the cost of adding statements is proportional
+        to the number of new statements rather than the size of the
+        corpus.
+
+        If :py:meth:`combine_related` hasn't been called yet, the
+        statements are added and :py:meth:`combine_related` is called.
+
+        Note that refinements are found with respect to the ontology
+        of the Preassembler, and any custom filters that were used when
+        calling :py:meth:`combine_related` are not applied here.
+
+        Parameters
+        ----------
+        stmts : list of :py:class:`indra.statements.Statement`
+            New statements to add.
+        return_toplevel : Optional[bool]
+            If True only the top level statements are returned.
+            If False, all statements are returned. Default: True
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None or 1 (default), all comparisons are done
+            in the current process.
+        size_cutoff : Optional[int]
+            Statement types with at least size_cutoff statements to compare
+            are sent to worker processes, while smaller groups are compared
+            in the parent process. Default: 100.
+
+        Returns
+        -------
+        list of :py:class:`indra.statement.Statement`
+            The updated list of top-level statements, or all unique
+            statements if return_toplevel is False. The attributes
+            :py:attr:`unique_stmts` and :py:attr:`related_stmts` are
+            also updated.
+        """
+        if self.related_stmts is None:
+            self.add_statements(stmts)
+            return self.combine_related(return_toplevel=return_toplevel,
+                                        poolsize=poolsize,
+                                        size_cutoff=size_cutoff)
+        new_stmts = fast_deepcopy(stmts)
+        self.stmts += new_stmts
+        stmts_by_hash = {stmt.get_hash(matches_fun=self.matches_fun): stmt
+                         for stmt in self.unique_stmts}
+        # If the index is missing, e.g., because custom filters were used,
+        # or is out of sync with the unique statements, we rebuild it
+        if self._refinement_index is None or \
+                len(self._refinement_index) != len(stmts_by_hash) or \
+                not all(sh in self._refinement_index for sh in stmts_by_hash):
+            self._refinement_index = OntologyRefinementIndex(self.ontology)
+            self._refinement_index.add_statements(stmts_by_hash)
+
+        # We merge the evidence of duplicates into existing statements and
+        # collect the ones that are actually new
+        added_stmts_by_hash = {}
+        merged = 0
+        for stmt in self.combine_duplicate_stmts(new_stmts):
+            sh = stmt.get_hash(matches_fun=self.matches_fun)
+            existing_stmt = stmts_by_hash.get(sh)
+            if existing_stmt is None:
+                added_stmts_by_hash[sh] = stmt
+            else:
+                _merge_evidence(existing_stmt, stmt)
+                existing_stmt.get_hash(shallow=False, refresh=True,
+                                       matches_fun=self.matches_fun)
+                merged += 1
+        logger.info('%d new unique statements, %d merged into existing '
+                    'statements' % (len(added_stmts_by_hash), merged))
+        if not added_stmts_by_hash:
+            return self.related_stmts if return_toplevel else \
+                self.unique_stmts
+        stmts_by_hash.update(added_stmts_by_hash)
+        self.unique_stmts += list(added_stmts_by_hash.values())
+        self._refinement_index.add_statements(added_stmts_by_hash)
+
+        # New statements can refine any other statement, and they can
+        # be refined by existing statements. Refinements among new
+        # statements are covered by the first direction.
+        stmts_to_compare = {}
+        for sh in added_stmts_by_hash:
+            stmts_to_compare[sh] = \
+                self._refinement_index.get_less_specifics(sh)
+        for sh in added_stmts_by_hash:
+            for more_specific in \
+                    self._refinement_index.get_more_specifics(sh):
+                if more_specific not in added_stmts_by_hash:
+                    if more_specific not in stmts_to_compare:
+                        stmts_to_compare[more_specific] = set()
+                    stmts_to_compare[more_specific].add(sh)
+        maps = self.confirm_possible_refinements(stmts_by_hash,
+                                                 stmts_to_compare,
+                                                 poolsize=poolsize,
+                                                 size_cutoff=size_cutoff)
+        for refinement, refined in maps:
+            stmts_by_hash[refinement].supported_by.append(
+                stmts_by_hash[refined])
+            stmts_by_hash[refined].supports.append(stmts_by_hash[refinement])
+        self.related_stmts = [st for st in self.unique_stmts
+                              if not st.supports]
+        logger.debug('%d top level' % len(self.related_stmts))
+        if return_toplevel:
+            return self.related_stmts
+        else:
+            return self.unique_stmts
+
     def _generate_id_maps(self, unique_stmts, split_idx=None,
-                          filters=None, **kwargs):
+                          filters=None, poolsize=None, size_cutoff=None,
+                          **kwargs):
         """Return pairs of statement indices representing refinement relations.
 
         Parameters
@@ -341,6 +471,14 @@ class Preassembler(object):
             of possible refinements where the keys are statement hashes
             and the values are sets of statement hashes that the
             key statement possibly refines.
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None or 1 (default), no parallelization
+            is performed.
+        size_cutoff : Optional[int]
+            Statement types with at least size_cutoff statements to compare
+            are sent to worker processes, while smaller groups are compared
+            in the parent process. Default: 100.
 
         Returns
         -------
@@ -369,6 +507,9 @@ class Preassembler(object):
         # potential comparisons before actually making comparisons
         if filters:
             # We apply filter functions sequentially
+            # The refinement index of an earlier run doesn't include these
+            # statements so it can't be used to compare new ones with them
+            self._refinement_index = None
             for filter_fun in filters:
                 logger.debug('Applying filter %s' % filter_fun.__name__)
                 stmts_to_compare = \
@@ -378,10 +519,13 @@ class Preassembler(object):
                 logger.debug('Total comparisons after filter %s: %d' %
                              (filter_fun.__name__, total_comparisons))
         else:
+            # We keep the index around so that new statements can later be
+            # compared against it without rebuilding it from scratch
+            self._refinement_index = OntologyRefinementIndex(self.ontology)
+            self._refinement_index.add_statements(stmts_by_hash)
             stmts_to_compare = \
-                ontology_refinement_filter(stmts_by_hash=stmts_by_hash,
-                                           stmts_to_compare=stmts_to_compare,
-                                           ontology=self.ontology)
+                {sh: self._refinement_index.get_less_specifics(sh)
+                 for sh in stmts_by_hash}
         total_comparisons = sum(len(v) for v in stmts_to_compare.values())
 
         te = time.time()
@@ -405,14 +549,17 @@ class Preassembler(object):
         maps = \
             self.confirm_possible_refinements(stmts_by_hash,
                                               stmts_to_compare,
-                                              split_groups=hash_to_split_group)
+                                              split_groups=hash_to_split_group,
+                                              poolsize=poolsize,
+                                              size_cutoff=size_cutoff)
 
         idx_maps = [(stmt_to_idx[refinement], stmt_to_idx[refined])
                     for refinement, refined in maps]
         return idx_maps
 
     def confirm_possible_refinements(self, stmts_by_hash, stmts_to_compare,
-                                     split_groups=None):
+                                     split_groups=None, poolsize=None,
+                                     size_cutoff=None):
         """Return confirmed pairs of statement refinement relationships.
 
         Parameters
@@ -430,6 +577,14 @@ class Preassembler(object):
             same group aren't compared, only statements in different
             groups are. This can be used to do "bipartite" refinement
             checking across a set of statements.
+        poolsize : Optional[int]
+            The number of worker processes to use for the comparisons. If
+            None or 1 (default), all comparisons are done in the current
+            process.
+        size_cutoff : Optional[int]
+            Statement types with at least size_cutoff statements to compare
+            are sent to worker processes, while smaller groups are compared
+            in the parent process. Default: 100.
 
         Returns
         -------
@@ -438,55 +593,121 @@ class Preassembler(object):
             hash of a statement which refines that statement whose hash
             is the second element of the tuple.
         """
-        maps = []
-        # We again iterate over statements
         ts = time.time()
-        # Given the possible refinements in stmts_to_compare, we confirm each
-        for stmt_hash, possible_refined_hashes in stmts_to_compare.items():
-            # We use the previously constructed set of statements that this one
-            # can possibly refine
-            for possible_refined_hash in possible_refined_hashes:
-                # We handle split groups here to only check refinements between
-                # statements that are in different groups to compare
-                if not split_groups or split_groups[stmt_hash] != \
-                        split_groups[possible_refined_hash]:
-                    # And then do the actual comparison. Here we use
-                    # entities_refined=True which means that we assert that
-                    # the entities, in each role, are already confirmed to
-                    # be "compatible" for refinement, and therefore, we
-                    # don't need to again confirm this (i.e., call "isa") in
-                    # the refinement_of function.
-                    self._comparison_counter += 1
-                    ref = self.refinement_fun(
-                        stmts_by_hash[stmt_hash],
-                        stmts_by_hash[possible_refined_hash],
-                        ontology=self.ontology,
-                        # NOTE: here we assume that the entities at this point
-                        # are definitely refined due to the use of an
-                        # ontology-based pre-filter. If this is not the case
-                        # for some reason then it is the responsibility of the
-                        # user-supplied self.refinement_fun to disregard the
-                        # entities_refined argument.
-                        entities_refined=True)
-                    if ref:
-                        maps.append((stmt_hash, possible_refined_hash))
+        # We handle split groups here to only check refinements between
+        # statements that are in different groups to compare
+        if split_groups:
+            stmts_to_compare = {
+                stmt_hash: [possible_refined_hash for possible_refined_hash
+                             in possible_refined_hashes
+                             if split_groups[stmt_hash] !=
+                             split_groups[possible_refined_hash]]
+                for stmt_hash, possible_refined_hashes
+                in stmts_to_compare.items()
+            }
+        if poolsize is not None and poolsize > 1:
+            confirmed = \
+                self._confirm_refinements_parallel(stmts_by_hash,
+                                                   stmts_to_compare,
+                                                   poolsize, size_cutoff)
+        else:
+            confirmed, comparisons = \
+                _confirm_refinements(stmts_by_hash,
+                                     stmts_to_compare.items(),
+                                     self.refinement_fun, self.ontology)
+            self._comparison_counter += comparisons
+        # We assemble the confirmed pairs in the order in which they appear
+        # in stmts_to_compare so that the result doesn't depend on how the
+        # comparisons were distributed across processes.
+        maps = [(stmt_hash, possible_refined_hash)
+                for stmt_hash, possible_refined_hashes
+                in stmts_to_compare.items()
+                if stmt_hash in confirmed
+                for possible_refined_hash in possible_refined_hashes
+                if possible_refined_hash in confirmed[stmt_hash]]
         te = time.time()
         logger.debug('Confirmed %d refinements in %.2fs' % (len(maps), te-ts))
         return maps
 
-    def find_contradicts(self):
+    def _confirm_refinements_parallel(self, stmts_by_hash, stmts_to_compare,
+                                      poolsize, size_cutoff=None):
+        """Confirm possible refinements using a pool of worker processes."""
+        size_cutoff = size_cutoff if size_cutoff else 100
+        # Possible refinements are only ever found within a given statement
+        # type so we shard the comparisons by type and only send the large
+        # types to worker processes.
+        hashes_by_type = collections.defaultdict(list)
+        for stmt_hash, possible_refined_hashes in stmts_to_compare.items():
+            if possible_refined_hashes:
+                stmt_type = indra_stmt_type(stmts_by_hash[stmt_hash])
+                hashes_by_type[stmt_type].append(stmt_hash)
+        local_items = []
+        remote_items = []
+        for stmt_type, stmt_hashes in hashes_by_type.items():
+            items = [(stmt_hash, list(stmts_to_compare[stmt_hash]))
+                     for stmt_hash in stmt_hashes]
+            if len(stmt_hashes) >= size_cutoff:
+                remote_items += items
+            else:
+                local_items += items
+        chunks = _chunk_refinement_items(remote_items, poolsize)
+        logger.info('Confirming refinements for %d statements in %d chunks '
+                    'using %d processes and %d statements locally' %
+                    (len(remote_items), len(chunks), poolsize,
+                     len(local_items)))
+        confirmed = {}
+        if not chunks:
+            confirmed, comparisons = \
+                _confirm_refinements(stmts_by_hash, local_items,
+                                     self.refinement_fun, self.ontology)
+            self._comparison_counter += comparisons
+            return confirmed
+        # The statements, the refinement function and the ontology are
+        # passed to workers once when they are started rather than with
+        # each chunk. On platforms that fork, this means that they are
+        # shared with the parent process without being pickled.
+        with multiprocessing.Pool(
+                poolsize, initializer=_init_refinement_worker,
+                initargs=(stmts_by_hash, self.refinement_fun,
+                          self.ontology)) as pool:
+            results = pool.imap_unordered(_confirm_refinements_worker, chunks)
+            # We do the small groups here while the workers are busy
+            local_confirmed, comparisons = \
+                _confirm_refinements(stmts_by_hash, local_items,
+                                     self.refinement_fun, self.ontology)
+            confirmed.update(local_confirmed)
+            self._comparison_counter += comparisons
+            for chunk_confirmed, comparisons in results:
+                confirmed.update(chunk_confirmed)
+                self._comparison_counter += comparisons
+        return confirmed
+
+    def find_contradicts(self, poolsize=None):
         """Return pairs of contradicting Statements.
 
+        Only pairs of statements whose agents, in each position, have
+        the same agent key or keys related in the ontology (and, for
+        Influences, opposite keys) are compared, see
+        :py:func:`get_possible_contradicts`.
+
+        Parameters
+        ----------
+        poolsize : Optional[int]
+            The number of worker processes to use for the comparisons. If
+            None or 1 (default), all comparisons are done in the current
+            process.
+
         Returns
         -------
         contradicts : list(tuple(Statement, Statement))
             A list of Statement pairs that are contradicting.
         """
-        # Make a dict of Statement by type
-        stmts_by_type = collections.defaultdict(list)
-        for stmt in self.stmts:
-            stmts_by_type[indra_stmt_type(stmt)].append(stmt)
-        stmts_by_type = dict(stmts_by_type)
+        ts = time.time()
+        # Make a dict of Statement indices by type
+        idxs_by_type = collections.defaultdict(list)
+        for idx, stmt in enumerate(self.stmts):
+            idxs_by_type[indra_stmt_type(stmt)].append(idx)
+        idxs_by_type = dict(idxs_by_type)
 
         # Handle Statements with polarity first
         pos_stmts = AddModification.__subclasses__()
@@ -495,26 +716,39 @@ class Preassembler(object):
         pos_stmts += [Activation, IncreaseAmount]
         neg_stmts += [Inhibition, DecreaseAmount]
 
-        contradicts = []
-        # Handle statements with polarity first
-        # TODO: we could probably do some optimization here
-        # to not have to check statements combinatorially
-        for pst, nst in zip(pos_stmts, neg_stmts):
-            poss = stmts_by_type.get(pst, [])
-            negs = stmts_by_type.get(nst, [])
-
-            for ps, ns in itertools.product(poss, negs):
-                if ps.contradicts(ns, self.ontology):
-                    contradicts.append((ps, ns))
-
-        # Handle neutral Statements next
-        neu_stmts = [Influence, ActiveForm]
-        for stt in neu_stmts:
-            stmts = stmts_by_type.get(stt, [])
-            for st1, st2 in itertools.combinations(stmts, 2):
-                if st1.contradicts(st2, self.ontology):
-                    contradicts.append((st1, st2))
-
+        # Statements with polarity are compared with the Statements of the
+        # opposite type, neutral Statements with Statements of the same type
+        type_pairs = list(zip(pos_stmts, neg_stmts)) + \
+            [(Influence, Influence), (ActiveForm, ActiveForm)]
+        pairs = []
+        key_cache = {}
+        for type1, type2 in type_pairs:
+            idxs1 = idxs_by_type.get(type1, [])
+            idxs2 = idxs_by_type.get(type2, [])
+            if not idxs1 or not idxs2:
+                continue
+            pairs += get_possible_contradicts(self.stmts, idxs1, idxs2,
+                                              self.ontology, key_cache)
+        if poolsize is not None and poolsize > 1 and pairs:
+            chunk_size = max(1, len(pairs) // (poolsize * 4))
+            chunks = [pairs[idx:idx + chunk_size]
+                      for idx in range(0, len(pairs), chunk_size)]
+            logger.info('Confirming %d possible contradictions in %d '
+                        'chunks using %d processes' %
+                        (len(pairs), len(chunks), poolsize))
+            with multiprocessing.Pool(
+                    poolsize, initializer=_init_contradicts_worker,
+                    initargs=(self.stmts, self.ontology)) as pool:
+                confirmed = [confirmed_pair for chunk_confirmed
+                             in pool.imap(_confirm_contradicts_worker, chunks)
+                             for confirmed_pair in chunk_confirmed]
+        else:
+            confirmed = _confirm_contradicts(self.stmts, pairs, self.ontology)
+        contradicts = [(self.stmts[idx1], self.stmts[idx2])
+                       for idx1, idx2 in confirmed]
+        logger.info('Found %d contradictions among %d possible ones in '
+                    '%.2fs' % (len(contradicts), len(pairs),
+                               time.time() - ts))
         return contradicts
 
     def _normalize_relations(self, ns, rank_key, rel_fun, flip_polarity):
@@ -860,6 +1094,257 @@ def default_matches_fun(st):
     return st.matches_key()
 
 
+def _merge_evidence(stmt, duplicate_stmt):
+    """Add the evidence of a duplicate to an already de-duplicated statement.
+
+    Both statements are assumed to have gone through
+    :py:meth:`Preassembler.combine_duplicate_stmts` so that their evidences
+    are already annotated with raw agent texts and groundings.
+    """
+    ev_keys = {_get_merge_ev_key(ev) for ev in stmt.evidence}
+    for ev in duplicate_stmt.evidence:
+        ev_key = _get_merge_ev_key(ev)
+        if ev_key not in ev_keys:
+            stmt.evidence.append(ev)
+            ev_keys.add(ev_key)
+
+
+def _get_merge_ev_key(ev):
+    # The prior UUIDs depend on the statement that the evidence came from,
+    # and the raw agent texts and groundings are already part of the
+    # annotations, so we leave out the former from the key.
+    if 'prior_uuids' not in ev.annotations:
+        return ev.matches_key()
+    # The key is computed from a shallow copy so that the evidence itself
+    # is never changed, e.g., while other threads read it. We don't use
+    # copy.copy since Evidence.__setstate__ would make the copy share the
+    # attribute dict of the evidence.
+    ev_copy = type(ev).__new__(type(ev))
+    ev_copy.__dict__.update(ev.__dict__)
+    ev_copy.annotations = {k: v for k, v in ev.annotations.items()
+                           if k != 'prior_uuids'}
+    return ev_copy.matches_key()
+
+
+def _confirm_refinements(stmts_by_hash, items, refinement_fun, ontology):
+    """Return confirmed refinements for (hash, possible refined hashes) items.
+
+    The confirmed refinements are returned as a dict whose keys are statement
+    hashes and values are sets of hashes of statements that the statement
+    refines, along with the number of comparisons that were made.
+    """
+    confirmed = {}
+    comparisons = 0
+    for stmt_hash, possible_refined_hashes in items:
+        # We use the previously constructed set of statements that this one
+        # can possibly refine
+        for possible_refined_hash in possible_refined_hashes:
+            # And then do the actual comparison. Here we use
+            # entities_refined=True which means that we assert that
+            # the entities, in each role, are already confirmed to
+            # be "compatible" for refinement, and therefore, we
+            # don't need to again confirm this (i.e., call "isa") in
+            # the refinement_of function.
+            comparisons += 1
+            ref = refinement_fun(
+                stmts_by_hash[stmt_hash],
+                stmts_by_hash[possible_refined_hash],
+                ontology=ontology,
+                # NOTE: here we assume that the entities at this point
+                # are definitely refined due to the use of an
+                # ontology-based pre-filter. If this is not the case
+                # for some reason then it is the responsibility of the
+                # user-supplied refinement_fun to disregard the
+                # entities_refined argument.
+                entities_refined=True)
+            if ref:
+                if stmt_hash not in confirmed:
+                    confirmed[stmt_hash] = set()
+                confirmed[stmt_hash].add(possible_refined_hash)
+    return confirmed, comparisons
+
+
+def _chunk_refinement_items(items, poolsize):
+    """Split (hash, possible refined hashes) items into balanced chunks."""
+    total_comparisons = sum(len(refined) for _, refined in items)
+    if not total_comparisons:
+        return []
+    # We aim for a few chunks per process so that a single expensive
+    # chunk doesn't leave the other processes idle at the end.
+    chunk_comparisons = max(1, total_comparisons // (poolsize * 4))
+    chunks = []
+    chunk = []
+    comparisons = 0
+    for item in items:
+        chunk.append(item)
+        comparisons += len(item[1])
+        if comparisons >= chunk_comparisons:
+            chunks.append(chunk)
+            chunk = []
+            comparisons = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+# This is the state shared with refinement worker processes, set by
+# _init_refinement_worker when each worker process starts.
+_refinement_worker_state = {}
+
+
+def _init_refinement_worker(stmts_by_hash, refinement_fun, ontology):
+    _refinement_worker_state['stmts_by_hash'] = stmts_by_hash
+    _refinement_worker_state['refinement_fun'] = refinement_fun
+    _refinement_worker_state['ontology'] = ontology
+
+
+def _confirm_refinements_worker(items):
+    return _confirm_refinements(_refinement_worker_state['stmts_by_hash'],
+                                items,
+                                _refinement_worker_state['refinement_fun'],
+                                _refinement_worker_state['ontology'])
+
+
+def _confirm_contradicts(stmts, pairs, ontology):
+    """Return the (index, index) pairs of Statements that contradict."""
+    return [(idx1, idx2) for idx1, idx2 in pairs
+            if stmts[idx1].contradicts(stmts[idx2], ontology)]
+
+
+# This is the state shared with contradiction worker processes, set by
+# _init_contradicts_worker when each worker process starts.
+_contradicts_worker_state = {}
+
+
+def _init_contradicts_worker(stmts, ontology):
+    _contradicts_worker_state['stmts'] = stmts
+    _contradicts_worker_state['ontology'] = ontology
+
+
+def _confirm_contradicts_worker(pairs):
+    return _confirm_contradicts(_contradicts_worker_state['stmts'], pairs,
+                                _contradicts_worker_state['ontology'])
+
+
+def get_possible_contradicts(stmts, idxs1, idxs2, ontology,
+                             key_cache=None):
+    """Return pairs of Statements that can possibly contradict each other.
+
+    Statements can only contradict if, in each position, their agents have
+    the same agent key or one of the keys is a parent (or, for Influences,
+    an opposite) of the other in the ontology. Statements are also
+    grouped by the site of Modifications and by the activity and agent
+    state of ActiveForms. The Statements in idxs2 are indexed by these
+    keys so that each Statement in idxs1 is only paired with the
+    Statements it can possibly contradict.
+
+    Parameters
+    ----------
+    stmts : list[indra.statements.Statement]
+        A list of Statements.
+    idxs1 : list[int]
+        The indices of Statements of a given type in stmts.
+    idxs2 : list[int]
+        The indices of Statements in stmts that the Statements in idxs1
+        could contradict. If it is the same as idxs1, each pair of
+        Statements is only returned once.
+    ontology : indra.ontology.IndraOntology
+        An IndraOntology instance with respect to which related agent keys
+        are found.
+    key_cache : Optional[dict]
+        A dict of agent keys and their related keys in the ontology, used
+        as a cache across calls.
+
+    Returns
+    -------
+    list[tuple]
+        A sorted list of (index, index) pairs of Statements that can
+        possibly contradict, the first index being from idxs1 and the
+        second from idxs2.
+    """
+    key_cache = key_cache if key_cache is not None else {}
+
+    def get_related_keys(agent_key, opposites):
+        # The agent key along with its parents and, if needed, opposites
+        related_keys = key_cache.get((agent_key, opposites))
+        if related_keys is None:
+            related_keys = {agent_key}
+            if agent_key is not None:
+                related_keys |= set(ontology.get_parents(*agent_key))
+                if opposites:
+                    related_keys |= set(ontology.descendants_rel(
+                        *agent_key, {'is_opposite'}))
+            key_cache[(agent_key, opposites)] = related_keys
+        return related_keys
+
+    keys = {idx: _get_contradiction_keys(stmts[idx]) for idx in
+            set(idxs1) | set(idxs2)}
+    # For each group and agent position, the indices of the Statements
+    # with a given agent key, and with the agent key related to a given key
+    key_to_idx = collections.defaultdict(
+        lambda: collections.defaultdict(set))
+    related_to_idx = collections.defaultdict(
+        lambda: collections.defaultdict(set))
+    for idx in idxs2:
+        if keys[idx] is None:
+            continue
+        group, _, agent_keys, opposites = keys[idx]
+        for position, agent_key in enumerate(agent_keys):
+            key_to_idx[(group, position)][agent_key].add(idx)
+            for related_key in get_related_keys(agent_key, opposites):
+                related_to_idx[(group, position)][related_key].add(idx)
+
+    same_idxs = idxs1 is idxs2 or idxs1 == idxs2
+    pairs = []
+    for idx in idxs1:
+        if keys[idx] is None:
+            continue
+        _, group, agent_keys, opposites = keys[idx]
+        relevants = None
+        for position, agent_key in enumerate(agent_keys):
+            key_to_idx_for_position = key_to_idx.get((group, position), {})
+            position_relevants = set(related_to_idx.get(
+                (group, position), {}).get(agent_key, set()))
+            for related_key in get_related_keys(agent_key, opposites):
+                position_relevants |= \
+                    key_to_idx_for_position.get(related_key, set())
+            relevants = position_relevants if relevants is None \
+                else relevants & position_relevants
+            if not relevants:
+                break
+        if not relevants:
+            continue
+        pairs += [(idx, other_idx) for other_idx in relevants
+                  if not same_idxs or idx < other_idx]
+    return sorted(pairs)
+
+
+def _get_contradiction_keys(stmt):
+    """Return the keys of a Statement used to find possible contradictions.
+
+    None is returned if the Statement can't contradict any other
+    Statement. Otherwise, a tuple of the group the Statement is indexed
+    in, the group of Statements it can contradict, the agent keys of the
+    Statement by position, and whether opposites of the agent keys are
+    related to them.
+    """
+    agents = stmt.agent_list()
+    if isinstance(stmt, Influence):
+        if stmt.overall_polarity() is None:
+            return None
+        return None, None, [get_agent_key(agent) for agent in agents], True
+    elif isinstance(stmt, ActiveForm):
+        group = (stmt.activity, stmt.agent.state_matches_key())
+        return group + (stmt.is_active, ), group + (not stmt.is_active, ), \
+            [get_agent_key(stmt.agent)], False
+    # Statements with polarity that aren't fully specified are skipped
+    if any(agent is None for agent in agents):
+        return None
+    group = (stmt.residue, stmt.position) \
+        if isinstance(stmt, Modification) else None
+    return group, group, [get_agent_key(agent) for agent in agents], False
+
+
 # TODO: we could make the agent key function parameterizable with the
 # preassembler to allow custom agent mappings to the ontology.
 def get_agent_key(agent):
@@ -987,73 +1472,153 @@ def ontology_refinement_filter_by_stmt_type(stmts_by_hash, ontology):
 
     Returns
     -------
-    list of tuple
-        A list of tuples where the first element of each tuple is the
-        hash of a statement which refines that statement whose hash
-        is the second element of the tuple.
+    dict
+        A dict whose keys are statement hashes and values are sets
+        of statement hashes that can potentially be refined by the
+        statement identified by the key.
     """
-    # Step 1. initialize data structures
-    roles = stmts_by_hash[next(iter(stmts_by_hash))]._agent_order
-    # Mapping agent keys to statement hashes
-    agent_key_to_hash = {}
-    # Mapping statement hashes to agent keys
-    hash_to_agent_key = {}
-    # All agent keys for a given agent role
-    all_keys_by_role = {}
-    for role in roles:
-        agent_key_to_hash[role] = collections.defaultdict(set)
-        hash_to_agent_key[role] = collections.defaultdict(set)
-
-    # Step 2. Fill up the initial data structures in preparation
-    # for identifying potential refinements
-    for sh, stmt in stmts_by_hash.items():
-        for role in roles:
-            agents = getattr(stmt, role)
-            # Handle a special case here where a list=like agent
-            # role can be empty, here we will consider anything else
-            # to be a refinement, hence add a None key
-            if isinstance(agents, list) and not agents:
-                agent_keys = {None}
-            # Generally, we take all the agent keys for a single or
-            # list-like agent role.
-            else:
-                agent_keys = {get_agent_key(agent) for agent in
-                              (agents if isinstance(agents, list)
-                               else [agents])}
-            for agent_key in agent_keys:
-                agent_key_to_hash[role][agent_key].add(sh)
-                hash_to_agent_key[role][sh].add(agent_key)
-
-    agent_key_to_hash = dict(agent_key_to_hash)
-    hash_to_agent_key = dict(hash_to_agent_key)
-
-    for role in roles:
-        all_keys_by_role[role] = set(agent_key_to_hash[role].keys())
-
-    # Step 3. Identify all the pairs of statements which can be in a
-    # refinement relationship
-    stmts_to_compare = {}
-    # We iterate over each statement and find all other statements that it
-    # can potentially refine
-    ts = time.time()
-    for sh, stmt in stmts_by_hash.items():
+    refinement_index = OntologyRefinementIndex(ontology)
+    refinement_index.add_statements(stmts_by_hash)
+    return {sh: refinement_index.get_less_specifics(sh)
+            for sh in stmts_by_hash}
+
+
+class OntologyRefinementIndex(object):
+    """An index of statements by agent keys to find possible refinements.
+
+    The index maps the agent keys in each role of each statement type
+    to the hashes of statements in which they appear, and keeps track of
+    the ontology parents of each agent key. It can be extended with new
+    statements, after which possible refinements can be looked up in
+    both directions without rebuilding the index.
+
+    Parameters
+    ----------
+    ontology : indra.ontology.IndraOntology
+        An IndraOntology instance with respect to which possible
+        refinements are found.
+
+    Attributes
+    ----------
+    stmt_types : dict
+        A dict whose keys are the hashes of the indexed statements and
+        values are the types of the statements.
+    agent_key_to_hash : dict
+        A dict keyed by statement type and then by agent role, pointing to
+        dicts mapping agent keys to the set of hashes of statements in which
+        the agent key appears in the given role.
+    hash_to_agent_key : dict
+        A dict keyed by statement type and then by agent role, pointing to
+        dicts mapping statement hashes to the set of agent keys in the
+        given role of the statement.
+    """
+    def __init__(self, ontology):
+        self.ontology = ontology
+        self.stmt_types = {}
+        self.agent_key_to_hash = {}
+        self.hash_to_agent_key = {}
+        # Agent keys with a given key among their parents, by statement
+        # type and role
+        self._children_keys = {}
+        # The ontology parents of each agent key, which don't depend on
+        # statement type or role so they are cached globally
+        self._parents = {}
+
+    def __len__(self):
+        return len(self.stmt_types)
+
+    def __contains__(self, stmt_hash):
+        return stmt_hash in self.stmt_types
+
+    def add_statements(self, stmts_by_hash):
+        """Add statements to the index.
+
+        Parameters
+        ----------
+        stmts_by_hash : dict
+            A dict whose keys are statement hashes that point to the
+            (deduplicated) statement with that hash as a value. Statements
+            whose hash is already in the index are skipped.
+        """
+        for sh, stmt in stmts_by_hash.items():
+            if sh in self.stmt_types:
+                continue
+            stmt_type = indra_stmt_type(stmt)
+            self.stmt_types[sh] = stmt_type
+            if stmt_type not in self.agent_key_to_hash:
+                self.agent_key_to_hash[stmt_type] = {}
+                self.hash_to_agent_key[stmt_type] = {}
+                self._children_keys[stmt_type] = {}
+                for role in stmt._agent_order:
+                    self.agent_key_to_hash[stmt_type][role] = \
+                        collections.defaultdict(set)
+                    self.hash_to_agent_key[stmt_type][role] = {}
+                    self._children_keys[stmt_type][role] = \
+                        collections.defaultdict(set)
+            for role in stmt._agent_order:
+                agents = getattr(stmt, role)
+                # Handle a special case here where a list=like agent
+                # role can be empty, here we will consider anything else
+                # to be a refinement, hence add a None key
+                if isinstance(agents, list) and not agents:
+                    agent_keys = {None}
+                # Generally, we take all the agent keys for a single or
+                # list-like agent role.
+                else:
+                    agent_keys = {get_agent_key(agent) for agent in
+                                  (agents if isinstance(agents, list)
+                                   else [agents])}
+                key_to_hash = self.agent_key_to_hash[stmt_type][role]
+                for agent_key in agent_keys:
+                    # If this is a new key for the role, we register it
+                    # as a child of each of its parents
+                    if agent_key not in key_to_hash:
+                        for parent in self._get_parents(agent_key):
+                            self._children_keys[stmt_type][role][parent].add(
+                                agent_key)
+                    key_to_hash[agent_key].add(sh)
+                self.hash_to_agent_key[stmt_type][role][sh] = agent_keys
+
+    def _get_parents(self, agent_key):
+        if agent_key is None:
+            return set()
+        parents = self._parents.get(agent_key)
+        if parents is None:
+            parents = set(self.ontology.get_parents(*agent_key))
+            self._parents[agent_key] = parents
+        return parents
+
+    def get_less_specifics(self, stmt_hash):
+        """Return hashes of statements that a statement can possibly refine.
+
+        Parameters
+        ----------
+        stmt_hash : int
+            The hash of an indexed statement.
+
+        Returns
+        -------
+        set
+            The set of hashes of indexed statements which the given
+            statement can possibly refine.
+        """
+        stmt_type = self.stmt_types[stmt_hash]
         relevants = None
         # We now iterate over all the agent roles in the given statement
         # type
-        for role, hash_to_agent_key_for_role in hash_to_agent_key.items():
+        for role, hash_to_agent_key_for_role in \
+                self.hash_to_agent_key[stmt_type].items():
+            key_to_hash = self.agent_key_to_hash[stmt_type][role]
             # We get all the agent keys in all other statements that the
-            # agent
-            # in this role in this statement can be a refinement.
-            for agent_key in hash_to_agent_key_for_role[sh]:
-                relevant_keys = get_relevant_keys(
-                    agent_key,
-                    all_keys_by_role[role],
-                    ontology)
+            # agent in this role in this statement can be a refinement of.
+            for agent_key in hash_to_agent_key_for_role[stmt_hash]:
+                relevant_keys = ({None, agent_key} |
+                                 self._get_parents(agent_key))
                 # We now get the actual statement hashes that these other
                 # potentially refined agent keys appear in in the given role
                 role_relevant_stmt_hashes = set.union(
-                    *[agent_key_to_hash[role][rel]
-                      for rel in relevant_keys]) - {sh}
+                    *[key_to_hash[rel] for rel in relevant_keys
+                      if rel in key_to_hash]) - {stmt_hash}
                 # In the first iteration, we initialize the set with the
                 # relevant statement hashes
                 if relevants is None:
@@ -1062,11 +1627,55 @@ def ontology_refinement_filter_by_stmt_type(stmts_by_hash, ontology):
                 # the relevant sets per role
                 else:
                     relevants &= role_relevant_stmt_hashes
-        # These hashes are now the ones that this statement needs
-        # to be compared against. Importantly, the relationship is in
-        # a well-defined direction so we don't need to test both ways.
-        stmts_to_compare[sh] = relevants
-    return stmts_to_compare
+        return relevants
+
+    def get_more_specifics(self, stmt_hash):
+        """Return hashes of statements that can possibly refine a statement.
+
+        This is the inverse of :py:meth:`get_less_specifics`, i.e., the
+        hash of a statement X is returned here if and only if the given
+        statement's hash is returned by `get_less_specifics` for X.
+
+        Parameters
+        ----------
+        stmt_hash : int
+            The hash of an indexed statement.
+
+        Returns
+        -------
+        set
+            The set of hashes of indexed statements which can possibly
+            refine the given statement.
+        """
+        stmt_type = self.stmt_types[stmt_hash]
+        relevants = None
+        for role, hash_to_agent_key_for_role in \
+                self.hash_to_agent_key[stmt_type].items():
+            key_to_hash = self.agent_key_to_hash[stmt_type][role]
+            children_keys = self._children_keys[stmt_type][role]
+            # These are the agent keys in other statements for which an
+            # agent key of this statement in this role is relevant
+            agent_keys = hash_to_agent_key_for_role[stmt_hash]
+            if None in agent_keys:
+                allowed_keys = set(key_to_hash)
+            else:
+                allowed_keys = set(agent_keys)
+                for agent_key in agent_keys:
+                    allowed_keys |= children_keys.get(agent_key, set())
+            role_relevant_stmt_hashes = set()
+            for allowed_key in allowed_keys:
+                for sh in key_to_hash.get(allowed_key, set()):
+                    # In list-like roles, all the agent keys of the other
+                    # statement need to be allowed
+                    if sh not in role_relevant_stmt_hashes and \
+                            hash_to_agent_key_for_role[sh] <= allowed_keys:
+                        role_relevant_stmt_hashes.add(sh)
+            role_relevant_stmt_hashes.discard(stmt_hash)
+            if relevants is None:
+                relevants = role_relevant_stmt_hashes
+            else:
+                relevants &= role_relevant_stmt_hashes
+        return relevants
 
 
 def bio_ontology_refinement_filter(stmts_by_hash, stmts_to_compare):
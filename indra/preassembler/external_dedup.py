@@ -0,0 +1,184 @@
+"""De-duplication of statement corpora that don't fit into memory.
+
+Statements are streamed from an iterable (for instance, from a set of
+statement files using :py:func:`iter_stmts_from_files`) and are partitioned
+into files in a temporary directory based on their shallow (matches key)
+hash. Since duplicates always end up in the same partition, each partition
+can then be de-duplicated independently, and partitions that would not fit
+into the given memory budget are recursively partitioned further.
+"""
+__all__ = ['combine_duplicates_external', 'iter_stmts_from_files']
+
+import os
+import pickle
+import logging
+import tempfile
+from indra.statements import iter_stmts_from_json_file
+from indra.preassembler import Preassembler, default_matches_fun
+
+logger = logging.getLogger(__name__)
+
+
+# A rough estimate of how many bytes of memory the statements in a pickle
+# file take up when loaded, per byte of the file.
+PICKLE_EXPANSION_FACTOR = 8
+
+
+def combine_duplicates_external(stmts, matches_fun=None, max_memory=2**30,
+                                n_partitions=64, tmp_dir=None):
+    """Yield unique statements with evidence combined across duplicates.
+
+    The result is the same as that of
+    :py:meth:`indra.preassembler.Preassembler.combine_duplicate_stmts`
+    (up to the order in which the unique statements are returned),
+    but only a single partition of the statements needs to be in
+    memory at any time.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statements.Statement]
+        An iterable of statements to de-duplicate, typically a generator
+        such as the one returned by :py:func:`iter_stmts_from_files`.
+    matches_fun : Optional[function]
+        A function which takes a Statement object as argument and
+        returns a string key that is used for duplicate recognition. If
+        not provided, the built-in matches_key method of each Statement is
+        used.
+    max_memory : Optional[int]
+        The approximate number of bytes of memory that buffered and loaded
+        statements are allowed to take up. Default: 1 GB
+    n_partitions : Optional[int]
+        The number of partitions the statements are split into on disk at
+        each level of partitioning. Default: 64
+    tmp_dir : Optional[str]
+        A directory in which the temporary directory holding the partitions
+        is created. If not provided, the system default is used.
+
+    Yields
+    ------
+    indra.statements.Statement
+        Unique statements with accumulated evidence across duplicates.
+    """
+    matches_fun = matches_fun if matches_fun else default_matches_fun
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as part_dir:
+        part_files = _partition_stmts(stmts, part_dir, 'p', 0, matches_fun,
+                                      max_memory, n_partitions)
+        for part_file in part_files:
+            yield from _combine_partition(part_file, 1, matches_fun,
+                                          max_memory, n_partitions)
+
+
+def iter_stmts_from_files(fnames):
+    """Yield statements from a list of statement files one by one.
+
+    Parameters
+    ----------
+    fnames : list[str]
+        A list of paths to statement files. Files ending with .jsonl are
+        read line by line, files ending with .json are read as a JSON list
+        of statements (either one optionally gzipped, ending with .gz),
+        and any other files are assumed to be pickle files containing a
+        list of statements, as produced by
+        :py:func:`indra.tools.assemble_corpus.dump_statements`.
+
+    Yields
+    ------
+    indra.statements.Statement
+        Statements loaded from the files.
+    """
+    for fname in fnames:
+        logger.info('Loading statements from %s' % fname)
+        if fname.endswith(('.json', '.jsonl', '.json.gz', '.jsonl.gz')):
+            yield from iter_stmts_from_json_file(fname)
+        else:
+            with open(fname, 'rb') as fh:
+                stmts = pickle.load(fh)
+            if isinstance(stmts, dict):
+                stmts = [stmt for stmts_for_key in stmts.values()
+                         for stmt in stmts_for_key]
+            yield from stmts
+
+
+def _get_partition(stmt, level, matches_fun, n_partitions):
+    # We use different digits of the hash at each level of partitioning
+    # so that a partition can be split further. At the first level, we
+    # refresh the hash in case it was cached with a different matches_fun.
+    stmt_hash = stmt.get_hash(shallow=True, refresh=(level == 0),
+                              matches_fun=matches_fun)
+    return (stmt_hash // (n_partitions ** level)) % n_partitions
+
+
+def _partition_stmts(stmts, part_dir, prefix, level, matches_fun,
+                     max_memory, n_partitions):
+    """Write statements into partition files and return the file paths."""
+    part_files = [os.path.join(part_dir, '%s_%d.pkl' % (prefix, idx))
+                  for idx in range(n_partitions)]
+    buffers = [[] for _ in range(n_partitions)]
+    # We don't know the size of each statement in memory without
+    # serializing it, so we use the size of the pickle of each statement
+    # which we need to produce anyway.
+    buffered_bytes = 0
+    n_stmts = 0
+    for stmt in stmts:
+        part = _get_partition(stmt, level, matches_fun, n_partitions)
+        stmt_pkl = pickle.dumps(stmt, protocol=pickle.HIGHEST_PROTOCOL)
+        buffers[part].append(stmt_pkl)
+        buffered_bytes += len(stmt_pkl)
+        n_stmts += 1
+        if buffered_bytes >= max_memory // 2:
+            _flush_buffers(buffers, part_files)
+            buffered_bytes = 0
+    _flush_buffers(buffers, part_files)
+    logger.info('Partitioned %d statements into %d partitions at level %d'
+                % (n_stmts, n_partitions, level))
+    return [part_file for part_file in part_files
+            if os.path.exists(part_file)]
+
+
+def _flush_buffers(buffers, part_files):
+    for buffer, part_file in zip(buffers, part_files):
+        if buffer:
+            with open(part_file, 'ab') as fh:
+                for stmt_pkl in buffer:
+                    fh.write(stmt_pkl)
+            buffer.clear()
+
+
+def _iter_partition(part_file):
+    with open(part_file, 'rb') as fh:
+        while True:
+            try:
+                yield pickle.load(fh)
+            except EOFError:
+                break
+
+
+def _combine_partition(part_file, level, matches_fun, max_memory,
+                       n_partitions):
+    """Yield the unique statements in a partition, splitting it if needed."""
+    part_size = os.path.getsize(part_file)
+    # If the partition is expected to be too large to be loaded into memory,
+    # we split it into sub-partitions, unless we've run out of hash digits
+    # to split on, in which case it's likely that the partition consists of
+    # many duplicates of the same statements that we have to load together.
+    if part_size * PICKLE_EXPANSION_FACTOR > max_memory and \
+            n_partitions ** level < 16 ** 14:
+        logger.info('Splitting partition %s of size %d' %
+                    (part_file, part_size))
+        prefix = os.path.basename(part_file)[:-len('.pkl')]
+        sub_part_files = \
+            _partition_stmts(_iter_partition(part_file),
+                             os.path.dirname(part_file), prefix, level,
+                             matches_fun, max_memory, n_partitions)
+        os.remove(part_file)
+        for sub_part_file in sub_part_files:
+            yield from _combine_partition(sub_part_file, level + 1,
+                                          matches_fun, max_memory,
+                                          n_partitions)
+        return
+    stmts = list(_iter_partition(part_file))
+    os.remove(part_file)
+    # Since the ontology is not used for combining duplicates, we don't
+    # need to pass one here.
+    pa = Preassembler(None, matches_fun=matches_fun)
+    yield from pa.combine_duplicate_stmts(stmts)
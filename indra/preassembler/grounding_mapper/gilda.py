@@ -1,12 +1,23 @@
 """This module implements a client to the Gilda grounding web service,
-and contains functions to help apply it during the course of INDRA assembly."""
+and contains functions to help apply it during the course of INDRA assembly.
+
+Groundings are cached by text and context in a :py:class:`GroundingCache`
+so that each distinct text is only grounded once in a given context, and
+texts that aren't cached yet are sent to the web service in batches.
+"""
+import os
+import atexit
+import pickle
+import hashlib
 import logging
 import requests
 from copy import deepcopy
+from collections import OrderedDict
 from urllib.parse import urljoin
 from indra.ontology.standardize \
     import standardize_agent_name
 from indra.config import get_config, has_config
+from indra.util import atomic_replace
 from indra.pipeline import register_pipeline
 
 
@@ -16,7 +27,118 @@ grounding_service_url = get_config('GILDA_URL', failure_ok=True) \
     if has_config('GILDA_URL') else 'http://grounding.indra.bio/'
 
 
-def get_grounding(txt, context=None, mode='web'):
+class GroundingCache(object):
+    """A least recently used cache of Gilda groundings.
+
+    Groundings are cached by the text that was grounded, a hash of the
+    context it was grounded in and where it was grounded, i.e., the URL of
+    the web service or the local gilda package.
+
+    Parameters
+    ----------
+    max_size : Optional[int]
+        The largest number of groundings cached, the least recently used
+        ones being evicted first. Nothing is cached if this is 0.
+        Default: 100000
+    path : Optional[str]
+        The path to a file in which the cache is saved by `save` and from
+        which it is loaded, if the file exists, when the cache is created.
+        If not given, the cache is only kept in memory.
+    """
+    def __init__(self, max_size=100000, path=None):
+        self.max_size = max_size
+        self.path = path
+        self._groundings = OrderedDict()
+        # Whether groundings were added since the cache was last loaded or
+        # saved
+        self._changed = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._groundings)
+
+    def __contains__(self, key):
+        return key in self._groundings
+
+    @staticmethod
+    def get_key(txt, context=None, mode='web'):
+        """Return the key under which a grounding is cached."""
+        context_hash = hashlib.md5(context.encode('utf-8')).hexdigest() \
+            if context else None
+        service = grounding_service_url if mode == 'web' else 'local'
+        return service, txt, context_hash
+
+    def get(self, key):
+        """Return a cached grounding and its results, None if not cached."""
+        value = self._groundings.get(key)
+        if value is not None:
+            self._groundings.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        """Cache a grounding and its results, evicting old ones if needed."""
+        if not self.max_size:
+            return
+        self._groundings[key] = value
+        self._groundings.move_to_end(key)
+        self._changed = True
+        while len(self._groundings) > self.max_size:
+            self._groundings.popitem(last=False)
+
+    def clear(self):
+        """Remove all groundings from the cache."""
+        self._groundings.clear()
+
+    def load(self):
+        """Load the cached groundings saved in the cache's file."""
+        try:
+            with open(self.path, 'rb') as fh:
+                groundings = pickle.load(fh)
+        except Exception as e:
+            logger.warning('Could not load Gilda groundings from %s: %s'
+                           % (self.path, e))
+            return
+        for key, value in groundings.items():
+            self.set(key, value)
+        self._changed = False
+        logger.info('Loaded %d Gilda groundings from %s'
+                    % (len(groundings), self.path))
+
+    def save(self):
+        """Save the cached groundings in the cache's file, if it has one.
+
+        The cache is only saved if groundings were added to it since it was
+        last loaded or saved.
+        """
+        if not self.path or not self._changed:
+            return
+        with atomic_replace(self.path) as tmp_path:
+            with open(tmp_path, 'wb') as fh:
+                pickle.dump(self._groundings, fh,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        self._changed = False
+
+
+#: The cache of groundings used by default, saved in the file given in the
+#: GILDA_CACHE_PATH config setting or environmental variable, if any. It is
+#: saved after grounding statements with `ground_statements` and when the
+#: interpreter exits.
+grounding_cache = GroundingCache(
+    path=get_config('GILDA_CACHE_PATH') if has_config('GILDA_CACHE_PATH')
+    else None)
+
+
+@atexit.register
+def _save_grounding_cache():
+    try:
+        grounding_cache.save()
+    except Exception as e:
+        logger.warning('Could not save Gilda groundings to %s: %s'
+                       % (grounding_cache.path, e))
+
+
+def get_grounding(txt, context=None, mode='web', cache=None):
     """Return the top Gilda grounding for a given text.
 
     Parameters
@@ -29,6 +151,9 @@ def get_grounding(txt, context=None, mode='web'):
         If 'web', the web service given in the GILDA_URL config setting or
         environmental variable is used. Otherwise, the gilda package is
         attempted to be imported and used. Default: web
+    cache : Optional[GroundingCache]
+        The cache in which groundings are looked up and saved. If not
+        given, the module's `grounding_cache` is used.
 
     Returns
     -------
@@ -38,20 +163,84 @@ def get_grounding(txt, context=None, mode='web'):
     list
         The list of ScoredMatches
     """
-    grounding = {}
+    grounding, results = get_groundings([(txt, context)], mode=mode,
+                                        cache=cache)[0]
+    # The cached grounding and results are copied so that they can be
+    # changed by the caller
+    return dict(grounding), deepcopy(results)
+
+
+def get_groundings(texts, mode='web', cache=None, batch_size=100):
+    """Return the top Gilda groundings for a list of texts and contexts.
+
+    Each distinct text and context is only grounded once, and only if its
+    grounding isn't cached. In web mode, the texts to ground are sent to
+    the web service in batches. New groundings are added to the cache but
+    the cache isn't saved, see `GroundingCache.save`.
+
+    Parameters
+    ----------
+    texts : list[tuple]
+        A list of texts to ground, each as a tuple of the text and its
+        context which can be None.
+    mode : Optional[str]
+        If 'web', the web service given in the GILDA_URL config setting or
+        environmental variable is used. Otherwise, the gilda package is
+        attempted to be imported and used. Default: web
+    cache : Optional[GroundingCache]
+        The cache in which groundings are looked up and saved. If not
+        given, the module's `grounding_cache` is used.
+    batch_size : Optional[int]
+        The largest number of texts sent to the web service in one request.
+        Default: 100
+
+    Returns
+    -------
+    list[tuple]
+        The grounding of each text as a tuple of a dict with the top
+        grounding (or an empty dict if no grounding was found) and the list
+        of ScoredMatches, in the order of the texts. These are shared by
+        texts with the same grounding and with the cache so they shouldn't
+        be changed.
+    """
+    cache = cache if cache is not None else grounding_cache
+    keys = [GroundingCache.get_key(txt, context, mode)
+            for txt, context in texts]
+    groundings = {}
+    to_ground = []
+    for key, (txt, context) in zip(keys, texts):
+        if key in groundings:
+            continue
+        value = cache.get(key)
+        groundings[key] = value
+        if value is None:
+            to_ground.append((key, txt, context))
+    if to_ground:
+        logger.debug('Grounding %d texts with Gilda' % len(to_ground))
+        for start in range(0, len(to_ground), batch_size):
+            batch = to_ground[start:start + batch_size]
+            all_results = _ground_batch([(txt, context)
+                                         for _, txt, context in batch], mode)
+            for (key, _, _), results in zip(batch, all_results):
+                grounding = {results[0]['term']['db']:
+                             results[0]['term']['id']} if results else {}
+                groundings[key] = (grounding, results)
+                cache.set(key, groundings[key])
+    return [groundings[key] for key in keys]
+
+
+def _ground_batch(texts, mode):
+    """Return the list of ScoredMatches of each of a list of texts."""
     if mode == 'web':
-        resp = requests.post(urljoin(grounding_service_url, 'ground'),
-                             json={'text': txt, 'context': context})
-        results = resp.json()
-        if results:
-            grounding = {results[0]['term']['db']: results[0]['term']['id']}
+        resp = requests.post(urljoin(grounding_service_url, 'ground_multi'),
+                             json=[{'text': txt, 'context': context}
+                                   for txt, context in texts])
+        resp.raise_for_status()
+        return resp.json()
     else:
         from gilda import ground
-        results = ground(txt, context)
-        if results:
-            grounding = {results[0].term.db: results[0].term.id}
-            results = [sm.to_json() for sm in results]
-    return grounding, results
+        return [[sm.to_json() for sm in ground(txt, context)]
+                for txt, context in texts]
 
 
 def get_gilda_models(mode='web'):
@@ -99,13 +288,18 @@ def ground_agent(agent, txt, context=None, mode='web'):
     """
     gr, results = get_grounding(txt, context, mode)
     if gr:
-        db_refs = {'TEXT': txt}
-        db_refs.update(gr)
-        agent.db_refs = db_refs
-        standardize_agent_name(agent, standardize_refs=True)
+        _set_grounding(agent, txt, gr)
     return results
 
 
+def _set_grounding(agent, txt, grounding):
+    """Set the grounding of an agent to the grounding of a text."""
+    db_refs = {'TEXT': txt}
+    db_refs.update(grounding)
+    agent.db_refs = db_refs
+    standardize_agent_name(agent, standardize_refs=True)
+
+
 def ground_statement(stmt, mode='web', ungrounded_only=False):
     """Set grounding for Agents in a given Statement using Gilda.
 
@@ -123,23 +317,39 @@ def ground_statement(stmt, mode='web', ungrounded_only=False):
         If True, only ungrounded Agents will be grounded, and ones that
         are already grounded will not be modified. Default: False
     """
+    for _, agent, txt, context in _get_texts_to_ground(stmt,
+                                                       ungrounded_only):
+        ground_agent(agent, txt, context, mode=mode)
+
+
+def _get_texts_to_ground(stmt, ungrounded_only=False):
+    """Return the agents of a Statement to ground and what to ground them by.
+
+    Each agent is returned with its index in the Statement's agent list,
+    its text and the context to ground it in.
+    """
     if stmt.evidence and stmt.evidence[0].text:
         context = stmt.evidence[0].text
     else:
         context = None
-    for agent in stmt.agent_list():
+    texts = []
+    for agent_idx, agent in enumerate(stmt.agent_list()):
         if agent is not None and 'TEXT' in agent.db_refs:
             txt = agent.db_refs['TEXT']
             gr = agent.get_grounding()
             if not ungrounded_only or gr[0] is None:
-                ground_agent(agent, txt, context, mode=mode)
+                texts.append((agent_idx, agent, txt, context))
+    return texts
 
 
 @register_pipeline
 def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
     """Set grounding for Agents in a list of Statements using Gilda.
 
-    This function modifies the original Statements/Agents in place.
+    The original Statements aren't modified. Statements with any Agent
+    whose grounding changes are copied and the copies are grounded, while
+    other Statements are returned as they are (copy-on-write). Each
+    distinct text and context is only grounded once, see `get_groundings`.
 
     Parameters
     ----------
@@ -161,12 +371,28 @@ def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
     Returns
     -------
     list[indra.statement.Statements]
-        The list of Statements that were changed in place by reference.
+        The list of grounded Statements, in the order of the original ones.
     """
     source_filter = set(sources) if sources else set()
-    grounded_stmts = deepcopy(stmts)
-    for stmt in grounded_stmts:
+    to_ground = []
+    for stmt_idx, stmt in enumerate(stmts):
         if not source_filter or (stmt.evidence and stmt.evidence[0].source_api
                                  in source_filter):
-            ground_statement(stmt, mode=mode, ungrounded_only=ungrounded_only)
+            for agent_idx, _, txt, context in \
+                    _get_texts_to_ground(stmt, ungrounded_only):
+                to_ground.append((stmt_idx, agent_idx, txt, context))
+    groundings = get_groundings([(txt, context)
+                                 for _, _, txt, context in to_ground],
+                                mode=mode)
+    # We save new groundings once for all the statements
+    grounding_cache.save()
+    grounded_stmts = list(stmts)
+    for (stmt_idx, agent_idx, txt, _), (gr, _) in zip(to_ground, groundings):
+        if not gr:
+            continue
+        # Statements are only copied once any of their agents is grounded
+        if grounded_stmts[stmt_idx] is stmts[stmt_idx]:
+            grounded_stmts[stmt_idx] = deepcopy(stmts[stmt_idx])
+        agent = grounded_stmts[stmt_idx].agent_list()[agent_idx]
+        _set_grounding(agent, txt, gr)
     return grounded_stmts
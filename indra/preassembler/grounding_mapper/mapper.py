@@ -4,7 +4,9 @@ __all__ = ['GroundingMapper', 'load_grounding_map', 'default_grounding_map',
 import os
 import csv
 import json
+import time
 import logging
+import multiprocessing
 from copy import deepcopy
 from indra.statements import Agent
 from indra.databases import hgnc_client
@@ -47,6 +49,12 @@ class GroundingMapper(object):
         is assumed to be the web service endpoint through which Gilda is used.
         If 'local', we assume that the gilda Python package is installed
         and will be used.
+
+    Attributes
+    ----------
+    timings : dict
+        The time in seconds each stage of the last call to `map_stmts` with
+        `by_signature` set to True took.
     """
     def __init__(self, grounding_map=None, agent_map=None, ignores=None,
                  misgrounding_map=None, use_adeft=True, gilda_mode=None):
@@ -62,6 +70,18 @@ class GroundingMapper(object):
         self.disamb_manager = DisambManager()
         self.gilda_mode = gilda_mode
         self._gilda_models = None
+        self.timings = {}
+
+    def __getstate__(self):
+        # The disambiguation manager holds a database connection so each
+        # process makes its own
+        state = self.__dict__.copy()
+        state['disamb_manager'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.disamb_manager = DisambManager()
 
     @property
     def gilda_models(self):
@@ -85,7 +105,8 @@ class GroundingMapper(object):
                 raise ValueError('HGNC:%s for key %s in the grounding map is '
                                  'not a valid ID' % (refs['HGNC'], key))
 
-    def map_stmts(self, stmts, do_rename=True):
+    def map_stmts(self, stmts, do_rename=True, by_signature=False,
+                  poolsize=None):
         """Return a new list of statements whose agents have been mapped
 
         Parameters
@@ -97,6 +118,18 @@ class GroundingMapper(object):
             If do_rename is True the priority for setting the name is
             FamPlex ID, HGNC symbol, then the gene name
             from Uniprot. Default: True
+        by_signature : Optional[bool]
+            If True, the distinct signatures, i.e., names and db_refs, of
+            the agents of all statements are collected first and the
+            grounding of each signature is mapped once, then applied to all
+            agents with that signature. Statements with agents that are
+            disambiguated with Adeft or Gilda, which depends on the
+            statement's evidence, are mapped one by one. The time each of
+            these stages takes is saved in `timings`. Default: False
+        poolsize : Optional[int]
+            If `by_signature` is True, the number of processes used to map
+            the statements with agents that are disambiguated. If None,
+            they are mapped in this process. Default: None
 
         Returns
         -------
@@ -104,12 +137,17 @@ class GroundingMapper(object):
             A list of statements given by mapping the agents from each
             statement in the input list
         """
+        if by_signature:
+            all_mapped_stmts = \
+                self._map_stmts_by_signature(stmts, do_rename, poolsize)
+        else:
+            all_mapped_stmts = (self.map_agents_for_stmt(stmt, do_rename)
+                                for stmt in stmts)
         # Make a copy of the stmts
         mapped_stmts = []
         num_skipped = 0
         # Iterate over the statements
-        for stmt in stmts:
-            mapped_stmt = self.map_agents_for_stmt(stmt, do_rename)
+        for mapped_stmt in all_mapped_stmts:
             # Check if we should skip the statement
             if mapped_stmt is not None:
                 mapped_stmts.append(mapped_stmt)
@@ -213,6 +251,149 @@ class GroundingMapper(object):
 
         return mapped_stmt
 
+    def _map_stmts_by_signature(self, stmts, do_rename, poolsize):
+        """Return the mapped statements, None for ones that are filtered out.
+
+        The grounding of each distinct agent signature is mapped once and
+        applied to all the agents with that signature.
+        """
+        self.timings = {}
+        ts = time.time()
+        adeft_txts = set(adeft_disambiguators) if self.use_adeft else set()
+        gilda_txts = set(self.gilda_models) if self.gilda_mode else set()
+        disamb_idxs = []
+        signatures = set()
+        for idx, stmt in enumerate(stmts):
+            agents = [agent for agent in stmt.agent_list()
+                      if agent is not None]
+            agent_sigs = [_get_agent_signature(agent) for agent in agents] + \
+                [_get_agent_signature(bc.agent) for agent in agents
+                 for bc in agent.bound_conditions]
+            # Statements with agents that can't be mapped by signature are
+            # mapped one by one along with the ones to disambiguate
+            if None in agent_sigs or any(
+                    self._needs_disambiguation(agent, adeft_txts, gilda_txts)
+                    for agent in agents):
+                disamb_idxs.append(idx)
+                continue
+            signatures.update(agent_sigs)
+        self.timings['collect'] = time.time() - ts
+        logger.info('Found %d distinct agent signatures and %d statements '
+                    'to disambiguate in %.2fs'
+                    % (len(signatures), len(disamb_idxs),
+                       self.timings['collect']))
+
+        ts = time.time()
+        mappings = {sig: self._map_signature(sig, do_rename)
+                    for sig in signatures}
+        self.timings['resolve'] = time.time() - ts
+        logger.info('Mapped %d agent signatures in %.2fs'
+                    % (len(mappings), self.timings['resolve']))
+
+        ts = time.time()
+        mapped_stmts = [None] * len(stmts)
+        disamb_stmts = [stmts[idx] for idx in disamb_idxs]
+        if poolsize is None or poolsize <= 1 or not disamb_stmts:
+            disamb_mapped = [self.map_agents_for_stmt(stmt, do_rename)
+                             for stmt in disamb_stmts]
+        else:
+            chunk_size = max(1, len(disamb_stmts) // (poolsize * 4))
+            chunks = [disamb_stmts[start:start + chunk_size]
+                      for start in range(0, len(disamb_stmts), chunk_size)]
+            with multiprocessing.Pool(
+                    poolsize, initializer=_init_grounding_mapper_worker,
+                    initargs=(self, do_rename)) as pool:
+                disamb_mapped = [mapped_stmt for chunk_mapped in
+                                 pool.imap(_map_stmts_worker, chunks)
+                                 for mapped_stmt in chunk_mapped]
+        for idx, mapped_stmt in zip(disamb_idxs, disamb_mapped):
+            mapped_stmts[idx] = mapped_stmt
+        self.timings['disambiguate'] = time.time() - ts
+        logger.info('Mapped %d statements to disambiguate in %.2fs'
+                    % (len(disamb_stmts), self.timings['disambiguate']))
+
+        ts = time.time()
+        disamb_idxs = set(disamb_idxs)
+        for idx, stmt in enumerate(stmts):
+            if idx not in disamb_idxs:
+                mapped_stmts[idx] = \
+                    self._apply_mappings(stmt, mappings, do_rename)
+        self.timings['apply'] = time.time() - ts
+        logger.info('Applied mapped groundings to %d statements in %.2fs'
+                    % (len(stmts) - len(disamb_idxs),
+                       self.timings['apply']))
+        return mapped_stmts
+
+    def _needs_disambiguation(self, agent, adeft_txts, gilda_txts):
+        """Return True if an agent would be disambiguated in its statement.
+
+        The conditions are the same as in `map_agents_for_stmt`.
+        """
+        agent_txts = {agent.db_refs[t] for t in {'TEXT', 'TEXT_NORM'}
+                      if t in agent.db_refs}
+        if agent_txts & adeft_txts:
+            return True
+        return bool(agent_txts & gilda_txts and
+                    not any(txt in self.grounding_map for txt in agent_txts))
+
+    def _map_signature(self, signature, do_rename):
+        """Return the mapping of the grounding of an agent signature.
+
+        The mapping is a tuple of whether statements with such an agent are
+        filtered out, and either the agent the signature is mapped to or
+        the mapped name and db_refs.
+        """
+        name, db_refs = signature
+        agent = Agent(name, db_refs=dict(db_refs))
+        agent_txts = {agent.db_refs[t] for t in {'TEXT', 'TEXT_NORM'}
+                      if t in agent.db_refs}
+        ignored = any(txt in self.ignores for txt in agent_txts)
+        new_agent = self.map_agent(agent, do_rename)
+        if new_agent is not agent:
+            return ignored, new_agent
+        return ignored, (agent.name, agent.db_refs)
+
+    def _apply_mappings(self, stmt, mappings, do_rename):
+        """Return a new Statement whose agents have been grounding mapped.
+
+        This gives the same result as `map_agents_for_stmt` for Statements
+        whose agents aren't disambiguated, using the mappings of agent
+        signatures.
+        """
+        def apply_mapping(agent):
+            sig = _get_agent_signature(agent)
+            if sig not in mappings:
+                # Agents that were mapped to one in the agent map can have
+                # bound conditions with agents that weren't collected
+                mappings[sig] = self._map_signature(sig, do_rename)
+            ignored, mapping = mappings[sig]
+            if isinstance(mapping, Agent):
+                return ignored, deepcopy(mapping)
+            agent.name, db_refs = mapping
+            agent.db_refs = deepcopy(db_refs)
+            return ignored, agent
+
+        mapped_stmt = deepcopy(stmt)
+        agent_list = mapped_stmt.agent_list()
+        for idx, agent in enumerate(agent_list):
+            if agent is None:
+                continue
+            ignored, new_agent = apply_mapping(agent)
+            if ignored:
+                return None
+            if len(new_agent.bound_conditions) == 0:
+                new_agent.bound_conditions = agent.bound_conditions
+            agent_list[idx] = new_agent
+        mapped_stmt.set_agent_list(agent_list)
+
+        for agent in agent_list:
+            if agent is not None:
+                for bc in agent.bound_conditions:
+                    _, bc.agent = apply_mapping(bc.agent)
+                    if not bc.agent:
+                        return None
+        return mapped_stmt
+
     def map_agent(self, agent, do_rename):
         """Return the given Agent with its grounding mapped.
 
@@ -392,6 +573,38 @@ class GroundingMapper(object):
         return mapped_stmts
 
 
+def _get_agent_signature(agent):
+    """Return the name and db_refs an agent's mapped grounding depends on.
+
+    Returns None if the agent's db_refs can't be part of a signature.
+    """
+    if agent is None:
+        return None
+    signature = (agent.name, tuple(agent.db_refs.items()))
+    try:
+        hash(signature)
+    except TypeError:
+        return None
+    return signature
+
+
+# The state of each grounding mapper worker process, which is set by
+# _init_grounding_mapper_worker when each worker process starts.
+_grounding_mapper_worker_state = {}
+
+
+def _init_grounding_mapper_worker(mapper, do_rename):
+    mapper.disamb_manager = DisambManager()
+    _grounding_mapper_worker_state['mapper'] = mapper
+    _grounding_mapper_worker_state['do_rename'] = do_rename
+
+
+def _map_stmts_worker(stmts):
+    mapper = _grounding_mapper_worker_state['mapper']
+    do_rename = _grounding_mapper_worker_state['do_rename']
+    return [mapper.map_agents_for_stmt(stmt, do_rename) for stmt in stmts]
+
+
 # TODO: handle the cases when there is more than one entry for the same
 # key (e.g., ROS, ER)
 def load_grounding_map(grounding_map_path, lineterminator='\r\n',
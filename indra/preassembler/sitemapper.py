@@ -123,7 +123,23 @@ class SiteMapper(ProtMapper):
         self.do_orthology_mapping = do_orthology_mapping
         self.do_isoform_mapping = do_isoform_mapping
 
-    def map_stmt_sites(self, stmt):
+    def map_stmt_sites(self, stmt, site_mappings=None):
+        """Return a MappedStatement if a Statement has invalid sites.
+
+        Parameters
+        ----------
+        stmt : :py:class:`indra.statements.Statement`
+            The statement to check for site errors.
+        site_mappings : Optional[dict]
+            A dict of sites as (UniProt ID, residue, position) tuples and
+            their MappedSites. Sites in the dict aren't mapped again.
+
+        Returns
+        -------
+        MappedStatement or None
+            A MappedStatement if the statement has any site known to be
+            invalid, otherwise None.
+        """
         stmt_copy = deepcopy(stmt)
         # For all statements, replace agents with invalid modifications
         mapped_sites = []
@@ -135,13 +151,19 @@ class SiteMapper(ProtMapper):
                 new_agent_list.append(agent)
                 continue
             # Otherwise do mapping
-            agent_mapped_sites, new_agent = self._map_agent_sites(agent)
+            agent_mapped_sites, new_agent = \
+                self._map_agent_sites(agent, site_mappings)
             mapped_sites += agent_mapped_sites
 
+            # The bound conditions of the agent are copied before they are
+            # changed so that the original statement isn't modified
+            if new_agent is agent and agent.bound_conditions:
+                new_agent = deepcopy(agent)
             # Site map agents in the bound conditions
             for ind in range(len(new_agent.bound_conditions)):
                 b = new_agent.bound_conditions[ind].agent
-                agent_mapped_sites, new_b = self._map_agent_sites(b)
+                agent_mapped_sites, new_b = \
+                    self._map_agent_sites(b, site_mappings)
                 mapped_sites += agent_mapped_sites
                 new_agent.bound_conditions[ind].agent = new_b
 
@@ -168,7 +190,8 @@ class SiteMapper(ProtMapper):
             # Check the modification on the appropriate agent
             old_mod = stmt._get_mod_condition()
             # Figure out if this site is invalid
-            stmt_mapped_site = self._map_agent_mod(agent_to_check, old_mod)
+            stmt_mapped_site = self._map_agent_mod(agent_to_check, old_mod,
+                                                   site_mappings)
             if stmt_mapped_site is not None:
                 # If we got a mapping for the site, we apply that mapping to the
                 # copy of the statement
@@ -203,6 +226,11 @@ class SiteMapper(ProtMapper):
         (:py:attr:`site_map`), and an instance of :py:class:`MappedStatement`
         is added to the list of mapped statements.
 
+        Sites are mapped in batch: the distinct (UniProt ID, residue,
+        position) sites of all the statements are collected and each is
+        mapped once. Valid statements are returned as they are and only the
+        statements with invalid sites are copied and rewritten.
+
         Parameters
         ----------
         stmts : list of :py:class:`indra.statement.Statement`
@@ -222,14 +250,28 @@ class SiteMapper(ProtMapper):
         valid_statements = []
         mapped_statements = []
 
-        for stmt in stmts:
-            # Check for errors in the position str
-            # TODO: this could also be used on agent conditions, here
-            # it's only applied to statement position arguments
-            if isinstance(stmt, (Modification, SelfModification)) and \
-                    not _valid_position_str(stmt.position):
-                continue
-            mapped_stmt = self.map_stmt_sites(stmt)
+        # Check for errors in the position str
+        # TODO: this could also be used on agent conditions, here
+        # it's only applied to statement position arguments
+        stmts = [stmt for stmt in stmts
+                 if not isinstance(stmt, (Modification, SelfModification))
+                 or _valid_position_str(stmt.position)]
+        stmt_sites = [self._get_stmt_sites(stmt) for stmt in stmts]
+        site_mappings = {}
+        for sites in stmt_sites:
+            for site in sites:
+                if site not in site_mappings:
+                    site_mappings[site] = self._map_site(*site)
+        logger.info('Mapped %d distinct sites of %d statements'
+                    % (len(site_mappings), len(stmts)))
+
+        for stmt, sites in zip(stmts, stmt_sites):
+            # Only statements with sites known to be invalid need mapping
+            if any(site_mappings[site] is not None and
+                   not site_mappings[site].not_invalid() for site in sites):
+                mapped_stmt = self.map_stmt_sites(stmt, site_mappings)
+            else:
+                mapped_stmt = None
             # If we got a MappedStatement as a return value, we add that to the
             # list of mapped statements, otherwise, the original Statement is
             # not invalid so we add it to the other list directly.
@@ -240,13 +282,39 @@ class SiteMapper(ProtMapper):
 
         return valid_statements, mapped_statements
 
-    def _map_agent_sites(self, agent):
+    def _get_stmt_sites(self, stmt):
+        """Return the sites that map_stmt_sites maps for a Statement.
+
+        Each site is a tuple of the UniProt ID of an agent and the residue
+        and position of one of its modifications or of the modification
+        made by the Statement.
+        """
+        sites = []
+        for agent in stmt.agent_list():
+            if agent is None:
+                continue
+            sites += [_get_site(agent, mod) for mod in agent.mods]
+            sites += [_get_site(bc.agent, mod)
+                      for bc in agent.bound_conditions
+                      if bc.agent is not None for mod in bc.agent.mods]
+        if isinstance(stmt, (Modification, SelfModification)) and \
+                stmt.residue is not None and stmt.position is not None:
+            agent_to_check = stmt.sub if isinstance(stmt, Modification) \
+                else stmt.enz
+            if agent_to_check is not None:
+                sites.append(_get_site(agent_to_check,
+                                       stmt._get_mod_condition()))
+        return [site for site in sites if site is not None]
+
+    def _map_agent_sites(self, agent, site_mappings=None):
         """Check an agent for invalid sites and update if necessary.
 
         Parameters
         ----------
         agent : :py:class:`indra.statements.Agent`
             Agent to check for invalid modification sites.
+        site_mappings : Optional[dict]
+            A dict of sites and their MappedSites which aren't mapped again.
 
         Returns
         -------
@@ -264,7 +332,7 @@ class SiteMapper(ProtMapper):
         # Now iterate over all the modifications and map each one
         for idx, mod_condition in enumerate(agent.mods):
             mapped_site = \
-                self._map_agent_mod(agent, mod_condition)
+                self._map_agent_mod(agent, mod_condition, site_mappings)
             # If we couldn't do the mapping or the mapped site isn't invalid
             # then we don't need to change the existing ModCondition
             if not mapped_site or mapped_site.not_invalid():
@@ -283,7 +351,7 @@ class SiteMapper(ProtMapper):
             mapped_sites.append(mapped_site)
         return mapped_sites, new_agent
 
-    def _map_agent_mod(self, agent, mod_condition):
+    def _map_agent_mod(self, agent, mod_condition, site_mappings=None):
         """Map a single modification condition on an agent.
 
         Parameters
@@ -292,6 +360,8 @@ class SiteMapper(ProtMapper):
             Agent to check for invalid modification sites.
         mod_condition : :py:class:`indra.statements.ModCondition`
             Modification to check for validity and map.
+        site_mappings : Optional[dict]
+            A dict of sites and their MappedSites which aren't mapped again.
 
         Returns
         -------
@@ -300,19 +370,20 @@ class SiteMapper(ProtMapper):
             agent, and if both the position and residue for the modification
             condition were available. Otherwise None is returned.
         """
-        # Get the UniProt ID of the agent, if not found, return
-        up_id = _get_uniprot_id(agent)
-        if not up_id:
-            logger.debug("No uniprot ID for %s" % agent.name)
-            return None
-        # If no site information for this residue, skip
-        if mod_condition.position is None or mod_condition.residue is None:
+        site = _get_site(agent, mod_condition)
+        if site is None:
             return None
+        if site_mappings is not None and site in site_mappings:
+            return site_mappings[site]
         # Otherwise, try to map it and return the mapped site
+        return self._map_site(*site)
+
+    def _map_site(self, up_id, residue, position):
+        """Return the MappedSite of a residue and position on a protein."""
         mapped_site = \
             self.map_to_human_ref(up_id, 'uniprot',
-                mod_condition.residue,
-                mod_condition.position,
+                residue,
+                position,
                 do_methionine_offset=self.do_methionine_offset,
                 do_orthology_mapping=self.do_orthology_mapping,
                 do_isoform_mapping=self.do_isoform_mapping)
@@ -349,6 +420,23 @@ def _get_uniprot_id(agent):
     return up_id
 
 
+def _get_site(agent, mod_condition):
+    """Return the site of a modification condition on an agent to map.
+
+    The site is a tuple of the UniProt ID of the agent and the residue and
+    position of the modification, or None if any of these are missing.
+    """
+    # Get the UniProt ID of the agent, if not found, return
+    up_id = _get_uniprot_id(agent)
+    if not up_id:
+        logger.debug("No uniprot ID for %s" % agent.name)
+        return None
+    # If no site information for this residue, skip
+    if mod_condition.position is None or mod_condition.residue is None:
+        return None
+    return up_id, mod_condition.residue, mod_condition.position
+
+
 def _valid_position_str(pos):
     # None positions are valid
     if pos is None:
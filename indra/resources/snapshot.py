@@ -0,0 +1,449 @@
+"""A binary snapshot of resource lookup tables that is memory-mapped.
+
+Many modules, e.g., the database clients, build lookup tables from the
+resource files in this folder when they are first used (see
+:py:class:`indra.util.LazyTables`). Parsing these files takes time and
+each process keeps its own copy of the tables in memory. Instead, the
+tables can be compiled once into a single snapshot file by running
+
+    python -m indra.resources.snapshot
+
+after which they are looked up directly in the memory-mapped snapshot, so
+they are available almost immediately and all processes share the same
+copy of the snapshot in the page cache of the operating system.
+
+In the snapshot, each table is stored with its keys and values serialized
+one after the other, in the order of the original dict, along with the
+offsets of each key and value and a hash table of the indices of the keys,
+so that a key is looked up by hashing it and comparing it with one or a
+few keys in the snapshot. The snapshot is only used if it was built with
+the same version of INDRA and its format, and is newer than the resource
+files in this folder, otherwise the tables are loaded from the resource
+files as usual.
+"""
+import os
+import sys
+import mmap
+import json
+import array
+import pickle
+import struct
+import logging
+import importlib
+import threading
+import zlib
+from collections.abc import Mapping
+from indra import __version__
+from indra.config import get_config
+from indra.util import atomic_replace
+from . import RESOURCES_PATH
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_PATH = os.path.join((get_config('INDRA_RESOURCES') or
+                              os.path.join(os.path.expanduser('~'),
+                                           '.indra')),
+                             'resource_tables.snapshot')
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+# The modules whose lazily loaded tables are put in the snapshot
+snapshot_modules = [
+    'indra.databases.hgnc_client',
+    'indra.databases.mesh_client',
+    'indra.databases.chebi_client',
+    'indra.databases.chembl_client',
+    'indra.databases.drugbank_client',
+    'indra.databases.mirbase_client',
+    'indra.sources.reach.processor',
+    'indra.sources.trips.processor',
+]
+
+# The fraction of its size after which a table whose lookups are counted
+# is copied into a dict, see SnapshotTable
+MATERIALIZE_RATIO = 0.125
+
+_magic = b'INDRATBL'
+_header_size = struct.Struct('<Q')
+
+
+class SnapshotTable(Mapping):
+    """A read-only dict of a table that is looked up in a snapshot.
+
+    Looking up a key in the snapshot takes about a microsecond, compared to
+    about 0.1 microseconds in a dict, but the table is shared by all
+    processes rather than copied into each. A table can optionally be
+    copied into a dict of the current process once it has been looked up
+    for a number of times that is a fraction of its size, given by
+    materialize_ratio if it isn't None, and the dict is used for the
+    lookups that follow.
+    This is only worth it for tables that are looked up very often by a
+    single process, so tables are never copied by default (see the
+    materialize argument of :py:class:`indra.util.LazyTables`).
+
+    Parameters
+    ----------
+    snapshot : ResourceSnapshot
+        The snapshot that contains the table.
+    name : str
+        The name of the table in the snapshot.
+    """
+    materialize_ratio = None
+
+    def __init__(self, snapshot, name):
+        self.snapshot = snapshot
+        self.name = name
+        info = snapshot.header['tables'][name]
+        self._buf = snapshot.buf
+        self._size = size = info['size']
+        self._key_type = info['key_type']
+        self._value_type = info['value_type']
+        start = snapshot.header['data_start'] + info['offset']
+        self._n_slots = n_slots = info['n_slots']
+        view = memoryview(self._buf)
+        self._slots = view[start:start + 8 * n_slots].cast('Q')
+        start += 8 * n_slots
+        self._key_offsets = view[start:start + 8 * (size + 1)].cast('Q')
+        start += 8 * (size + 1)
+        self._value_offsets = view[start:start + 8 * (size + 1)].cast('Q')
+        start += 8 * (size + 1)
+        self._keys_start = start
+        self._values_start = start + self._key_offsets[size]
+        self._lookups = 0
+        self._dict = None
+        # Functions called with the dict when the table is materialized
+        self.on_materialize = []
+
+    def __reduce__(self):
+        # When unpickled, e.g., in another process, the table is looked up
+        # in the snapshot again rather than copied
+        return _get_snapshot_table, (self.snapshot.path, self.name)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        if self._dict is not None:
+            yield from self._dict
+            return
+        for idx in range(self._size):
+            yield _decode_key(self._get_key(idx), self._key_type)
+
+    def __getitem__(self, key):
+        if self._dict is not None:
+            return self._dict[key]
+        if self.materialize_ratio is not None:
+            self._lookups += 1
+            if self._lookups > self._size * self.materialize_ratio:
+                return self.materialize()[key]
+        key_bytes = _encode_key(key, self._key_type)
+        if key_bytes is None:
+            raise KeyError(key)
+        # The slots are probed linearly from the hash of the key until the
+        # key or an empty slot is found
+        mask = self._n_slots - 1
+        slot = _hash_key(key_bytes) & mask
+        while True:
+            idx = self._slots[slot]
+            if not idx:
+                raise KeyError(key)
+            if self._get_key(idx - 1) == key_bytes:
+                return self._get_value(idx - 1)
+            slot = (slot + 1) & mask
+
+    def items(self):
+        if self._dict is not None:
+            yield from self._dict.items()
+            return
+        for idx in range(self._size):
+            yield (_decode_key(self._get_key(idx), self._key_type),
+                   self._get_value(idx))
+
+    def values(self):
+        if self._dict is not None:
+            yield from self._dict.values()
+            return
+        for idx in range(self._size):
+            yield self._get_value(idx)
+
+    def materialize(self):
+        """Return the table copied into a dict that is used from now on."""
+        if self._dict is None:
+            self._dict = dict(self.items())
+            for callback in self.on_materialize:
+                callback(self._dict)
+        return self._dict
+
+    def _get_key(self, idx):
+        return self._buf[self._keys_start + self._key_offsets[idx]:
+                         self._keys_start + self._key_offsets[idx + 1]]
+
+    def _get_value(self, idx):
+        value = self._buf[self._values_start + self._value_offsets[idx]:
+                          self._values_start + self._value_offsets[idx + 1]]
+        if self._value_type == 'str':
+            return value.decode('utf-8', 'surrogatepass')
+        return pickle.loads(value)
+
+
+class ResourceSnapshot(object):
+    """A snapshot of resource tables loaded from a file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the snapshot file.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as fh:
+            self.buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = _read_header(self.buf)
+        self._tables = {}
+
+    def get_table(self, name):
+        """Return a table in the snapshot or None if it isn't in it."""
+        if name not in self.header['tables']:
+            return None
+        if name not in self._tables:
+            self._tables[name] = SnapshotTable(self, name)
+        return self._tables[name]
+
+
+def build_snapshot(path=None, modules=None):
+    """Build a snapshot of the resource tables of the given modules.
+
+    Only tables that are dicts whose keys are strings or tuples of strings
+    are put in the snapshot, other tables are always loaded from their
+    resource files.
+
+    Parameters
+    ----------
+    path : Optional[str]
+        The path to the snapshot file. Default: SNAPSHOT_PATH
+    modules : Optional[list[str]]
+        The names of modules with LazyTables whose tables are put in the
+        snapshot. Default: snapshot_modules
+    """
+    path = path if path else SNAPSHOT_PATH
+    modules = modules if modules else snapshot_modules
+    tables = {}
+    for module_name in modules:
+        lazy_tables = importlib.import_module(module_name)._tables
+        loaded = {}
+        failed = set()
+        for name in lazy_tables:
+            if name in loaded or name in failed:
+                continue
+            try:
+                loaded.update(lazy_tables.load(name))
+            except Exception as e:
+                names = lazy_tables.get_names(name)
+                logger.warning('Could not load %s from %s, not putting them '
+                               'in the snapshot: %s'
+                               % (', '.join(names), module_name, e))
+                failed |= set(names)
+        for name, table in loaded.items():
+            table_name = '%s.%s' % (lazy_tables.name, name)
+            key_type = _get_key_type(table)
+            if key_type is None:
+                logger.info('Not putting %s in the snapshot' % table_name)
+                continue
+            tables[table_name] = (table, key_type)
+
+    header = {'format_version': SNAPSHOT_FORMAT_VERSION,
+              'indra_version': __version__,
+              'byteorder': sys.byteorder,
+              'tables': {}}
+    chunks = []
+    # The offsets of the tables are relative to the end of the header
+    offset = 0
+    for table_name, (table, key_type) in sorted(tables.items()):
+        value_type = 'str' if all(isinstance(value, str)
+                                  for value in table.values()) else 'pickle'
+        chunk, n_slots = _serialize_table(table, key_type, value_type)
+        header['tables'][table_name] = {'offset': offset,
+                                        'size': len(table),
+                                        'n_slots': n_slots,
+                                        'key_type': key_type,
+                                        'value_type': value_type}
+        chunks.append(chunk)
+        offset += len(chunk)
+        logger.info('Put %d entries of %s in the snapshot'
+                    % (len(table), table_name))
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_end = len(_magic) + _header_size.size + len(header_bytes)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with atomic_replace(path) as tmp_path:
+        with open(tmp_path, 'wb') as fh:
+            fh.write(_magic)
+            fh.write(_header_size.pack(len(header_bytes)))
+            fh.write(header_bytes)
+            fh.write(b'\0' * (_pad(header_end) - header_end))
+            for chunk in chunks:
+                fh.write(chunk)
+    logger.info('Saved a snapshot of %d tables into %s'
+                % (len(tables), path))
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(path=None):
+    """Return the snapshot of resource tables if it exists and is usable.
+
+    Parameters
+    ----------
+    path : Optional[str]
+        The path to the snapshot file. Default: SNAPSHOT_PATH
+
+    Returns
+    -------
+    ResourceSnapshot or None
+        The snapshot or None if there is no snapshot, or if it was built
+        with another version of INDRA or before the resource files were
+        last changed.
+    """
+    path = path if path else SNAPSHOT_PATH
+    with _snapshots_lock:
+        if path not in _snapshots:
+            _snapshots[path] = _load_snapshot(path)
+        return _snapshots[path]
+
+
+def _get_snapshot_table(path, name):
+    snapshot = get_snapshot(path)
+    if snapshot is None or snapshot.get_table(name) is None:
+        raise ValueError('The table %s is not in a usable snapshot at %s'
+                         % (name, path))
+    return snapshot.get_table(name)
+
+
+def _load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = ResourceSnapshot(path)
+    except Exception as e:
+        logger.warning('Could not load the resource snapshot from %s: %s'
+                       % (path, e))
+        return None
+    header = snapshot.header
+    if header.get('format_version') != SNAPSHOT_FORMAT_VERSION or \
+            header.get('indra_version') != __version__ or \
+            header.get('byteorder') != sys.byteorder:
+        logger.warning('The resource snapshot at %s was built with another '
+                       'version of INDRA and is not used, run python -m '
+                       'indra.resources.snapshot to rebuild it.' % path)
+        return None
+    if _get_resources_mtime() > os.path.getmtime(path):
+        logger.warning('The resource snapshot at %s is older than the '
+                       'resource files and is not used, run python -m '
+                       'indra.resources.snapshot to rebuild it.' % path)
+        return None
+    logger.info('Using the resource snapshot at %s' % path)
+    return snapshot
+
+
+def _get_resources_mtime():
+    # Compiled Python files are written when the package is first imported
+    # so they aren't taken into account
+    mtimes = [os.path.getmtime(os.path.join(dirpath, fname))
+              for dirpath, dirnames, fnames in os.walk(RESOURCES_PATH)
+              for fname in fnames if not fname.endswith('.pyc')]
+    return max(mtimes) if mtimes else 0
+
+
+def _read_header(buf):
+    if buf[:len(_magic)] != _magic:
+        raise ValueError('Not a resource snapshot')
+    start = len(_magic)
+    header_size, = _header_size.unpack(buf[start:start + _header_size.size])
+    start += _header_size.size
+    header = json.loads(buf[start:start + header_size].decode('utf-8'))
+    header['data_start'] = _pad(start + header_size)
+    return header
+
+
+def _get_key_type(table):
+    if not isinstance(table, dict):
+        return None
+    if all(isinstance(key, str) for key in table):
+        return 'str'
+    # The elements of tuple keys are joined by null characters so they
+    # can't contain any, and all keys need to have the same length
+    if all(isinstance(key, tuple) and
+           all(isinstance(elem, str) and '\0' not in elem for elem in key)
+           for key in table) and len({len(key) for key in table}) == 1:
+        return 'tuple'
+    return None
+
+
+def _encode_key(key, key_type):
+    if key_type == 'str':
+        if not isinstance(key, str):
+            return None
+    else:
+        if not isinstance(key, tuple) or \
+                not all(isinstance(elem, str) for elem in key):
+            return None
+        key = '\0'.join(key)
+    return key.encode('utf-8', 'surrogatepass')
+
+
+def _decode_key(key_bytes, key_type):
+    key = key_bytes.decode('utf-8', 'surrogatepass')
+    if key_type == 'str':
+        return key
+    return tuple(key.split('\0'))
+
+
+def _hash_key(key_bytes):
+    # The hash needs to be the same in every process so we can't use the
+    # built-in hash, which is randomized for strings
+    return zlib.crc32(key_bytes)
+
+
+def _serialize_table(table, key_type, value_type):
+    """Return the serialized table and the number of slots of its index."""
+    keys = [_encode_key(key, key_type) for key in table]
+    if value_type == 'str':
+        values = [value.encode('utf-8', 'surrogatepass')
+                  for value in table.values()]
+    else:
+        values = [pickle.dumps(value, protocol=4) for value in table.values()]
+    # The index is a hash table with open addressing whose slots contain
+    # the index of a key plus one, or zero if they are empty. It is kept at
+    # most half full so that few slots are probed per lookup.
+    n_slots = 1
+    while n_slots < 2 * len(keys) + 1:
+        n_slots *= 2
+    mask = n_slots - 1
+    slots = array.array('Q', bytes(8 * n_slots))
+    for idx, key in enumerate(keys):
+        slot = _hash_key(key) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = idx + 1
+    key_offsets = array.array('Q', [0])
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+    value_offsets = array.array('Q', [0])
+    for value in values:
+        value_offsets.append(value_offsets[-1] + len(value))
+    table_bytes = b''.join([slots.tobytes(), key_offsets.tobytes(),
+                            value_offsets.tobytes()] + keys + values)
+    # Tables are padded so that the offset arrays of each table are aligned
+    table_bytes += b'\0' * (_pad(len(table_bytes)) - len(table_bytes))
+    return table_bytes, n_slots
+
+
+def _pad(size):
+    return size + (-size % 8)
+
+
+if __name__ == '__main__':
+    build_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -48,7 +48,7 @@ class IsiProcessor(object):
                 self._process_interaction(k, interaction, v['text'], self.pmid,
                                           self.extra_annotations)
         if self.add_grounding:
-            ground_statements(self.statements)
+            self.statements = ground_statements(self.statements)
 
     def _process_interaction(self, source_id, interaction, text, pmid,
                              extra_annotations):
@@ -5,7 +5,7 @@ import objectpath
 from collections import defaultdict
 
 from indra.statements import *
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 from indra.databases import go_client, uniprot_client
 from indra.ontology.standardize import \
     standardize_db_refs, standardize_agent_name, \
@@ -461,12 +461,12 @@ class ReachProcessor(object):
             elif ns == 'hgnc':
                 db_refs['HGNC'] = xr['id']
             elif ns == 'pfam':
-                fplx_id = famplex_map.get(('PF', xr['id']))
+                fplx_id = _tables.famplex_map.get(('PF', xr['id']))
                 if fplx_id:
                     db_refs['FPLX'] = fplx_id
                 db_refs['PF'] = xr['id']
             elif ns == 'interpro':
-                fplx_id = famplex_map.get(('IP', xr['id']))
+                fplx_id = _tables.famplex_map.get(('IP', xr['id']))
                 if fplx_id:
                     db_refs['FPLX'] = fplx_id
                 db_refs['IP'] = xr['id']
@@ -906,7 +906,12 @@ def _read_famplex_map():
     return famplex_map
 
 
-famplex_map = _read_famplex_map()
+_tables = LazyTables({'famplex_map': _read_famplex_map}, name=__name__)
+
+
+# The resource tables, e.g., famplex_map, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+famplex_map = LazyTable(_tables, 'famplex_map')
 
 
 def _read_reach_rule_regexps():
@@ -5,7 +5,7 @@ import itertools
 import collections
 from copy import deepcopy
 import xml.etree.ElementTree as ET
-from indra.util import read_unicode_csv
+from indra.util import read_unicode_csv, LazyTables, LazyTable
 from indra.statements import *
 from indra.databases import go_client, hgnc_client, uniprot_client
 from indra.util import UnicodeXMLTreeBuilder as UTB
@@ -2088,11 +2088,11 @@ def _get_db_mappings(dbname, dbid):
         dbname = 'NXP'
         dbid = 'FA:' + dbid
     db_mappings = []
-    be_id = famplex_map.get((dbname, dbid))
+    be_id = _tables.famplex_map.get((dbname, dbid))
     if be_id is not None:
         db_mappings.append(('FPLX', be_id))
     if dbname == 'NCIT':
-        target = ncit_map.get(dbid)
+        target = _tables.ncit_map.get(dbid)
         if target is not None:
             db_mappings.append((target[0], target[1]))
             if target[0] == 'UP':
@@ -2142,7 +2142,6 @@ def _read_ncit_map():
         ncit_map[ncit_id] = (target_ns, target_id)
     return ncit_map
 
-ncit_map = _read_ncit_map()
 
 def _read_famplex_map():
     fname = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -2156,4 +2155,12 @@ def _read_famplex_map():
         famplex_map[(source_ns, source_id)] = be_id
     return famplex_map
 
-famplex_map = _read_famplex_map()
+
+_tables = LazyTables({'ncit_map': _read_ncit_map,
+                      'famplex_map': _read_famplex_map}, name=__name__)
+
+
+# The resource tables, e.g., ncit_map, are loaded when they are first
+# used, either by the functions of this module or as its attributes
+ncit_map = LazyTable(_tables, 'ncit_map')
+famplex_map = LazyTable(_tables, 'famplex_map')
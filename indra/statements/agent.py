@@ -6,6 +6,7 @@ import logging
 from collections import OrderedDict as _o
 from indra.statements.statements import modtype_conditions, modtype_to_modclass
 from .concept import Concept
+from .util import cached_key
 from .resources import get_valid_residue, activity_types, amino_acids
 
 
@@ -69,12 +70,14 @@ class Agent(Concept):
         self.activity = activity
         self.location = location
 
+    @cached_key
     def matches_key(self):
         """Return a key to identify the identity and state of the Agent."""
         key = (self.entity_matches_key(),
                self.state_matches_key())
         return str(key)
 
+    @cached_key
     def entity_matches_key(self):
         """Return a key to identify the identity of the Agent not its state.
 
@@ -91,6 +94,7 @@ class Agent(Concept):
             return str((db_ns, db_id))
         return self.name
 
+    @cached_key
     def state_matches_key(self):
         """Return a key to identify the state of the Agent."""
         # NOTE: Making a set of the mod matches_keys might break if
@@ -106,6 +110,17 @@ class Agent(Concept):
                                       key=lambda x: x.agent.name)))
         return str(key)
 
+    def invalidate(self):
+        """Clear the cached matches keys of the Agent and its bound agents.
+
+        This needs to be called if the Agent is changed in place while
+        matches keys are cached, see
+        :py:func:`indra.statements.util.key_caching`.
+        """
+        super(Agent, self).invalidate()
+        for bc in self.bound_conditions:
+            bc.agent.invalidate()
+
     # Function to get the namespace to look in
     def get_grounding(self, ns_order=None):
         """Return a tuple of a preferred grounding namespace and ID.
@@ -0,0 +1,289 @@
+"""Columnar storage of statement corpora using Apache Arrow.
+
+A corpus is stored in a directory with three tables: one for statements,
+one for the agents of each statement and one for evidences. Rows of the
+agents and evidences tables refer to their statement via the statement's
+uuid and shallow (matches) hash. The tables are stored as Parquet files by
+default or as Arrow IPC files, which can be memory-mapped without copying or
+decompressing any data.
+
+Any subset of the columns of each table can be read with
+:py:func:`read_columnar_table`, for instance, only the agents and beliefs of
+statements without their evidences. Statements can also be filtered by
+type or agent grounding while reading; for Parquet files, this skips
+the row groups (chunks of statements written together) that can't contain
+matching statements.
+
+This module requires the pyarrow package, which is not imported by
+:py:mod:`indra.statements` itself.
+"""
+__all__ = ['stmts_to_columnar', 'stmts_from_columnar', 'read_columnar_table']
+
+import os
+import logging
+import pyarrow
+import pyarrow.fs
+import pyarrow.ipc
+import pyarrow.dataset
+import pyarrow.parquet
+from indra.statements.io import stmts_from_json, json_dumps, json_loads
+
+
+logger = logging.getLogger(__name__)
+
+
+table_schemas = {
+    'statements': pyarrow.schema([
+        ('uuid', pyarrow.string()),
+        ('stmt_hash', pyarrow.int64()),
+        ('type', pyarrow.string()),
+        ('belief', pyarrow.float64()),
+        ('supports', pyarrow.list_(pyarrow.string())),
+        ('supported_by', pyarrow.list_(pyarrow.string())),
+        # The JSON of the statement without evidence and supports
+        ('json', pyarrow.string()),
+    ]),
+    'agents': pyarrow.schema([
+        ('stmt_uuid', pyarrow.string()),
+        ('stmt_hash', pyarrow.int64()),
+        # The index of the agent in the statement's agent_list
+        ('agent_index', pyarrow.int32()),
+        ('name', pyarrow.string()),
+        # The preferred grounding of the agent
+        ('db_ns', pyarrow.string()),
+        ('db_id', pyarrow.string()),
+        # The JSON of all the groundings of the agent
+        ('db_refs', pyarrow.string()),
+    ]),
+    'evidences': pyarrow.schema([
+        ('stmt_uuid', pyarrow.string()),
+        ('stmt_hash', pyarrow.int64()),
+        ('source_hash', pyarrow.int64()),
+        ('source_api', pyarrow.string()),
+        ('source_id', pyarrow.string()),
+        ('pmid', pyarrow.string()),
+        ('text', pyarrow.string()),
+        ('json', pyarrow.string()),
+    ]),
+}
+
+
+format_extensions = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def stmts_to_columnar(stmts, path, format='parquet', chunk_size=10000,
+                      compression='snappy'):
+    """Write statements into a columnar statement store.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statements.Statement]
+        The statements to write. This can be any iterable, for instance, a
+        generator of statements, since statements are written in chunks.
+    path : str
+        The path to a directory in which the tables are written. The
+        directory is created if it doesn't exist.
+    format : Optional[str]
+        Either 'parquet' to write compressed Parquet files or 'arrow' to
+        write uncompressed Arrow IPC files that can be memory-mapped
+        without copying. Default: parquet
+    chunk_size : Optional[int]
+        The number of statements written at once. Each chunk becomes a
+        row group of the Parquet files, which is the unit of data that
+        filters can skip while reading. Default: 10000
+    compression : Optional[str]
+        The compression codec used for Parquet files. Default: snappy
+    """
+    if format not in format_extensions:
+        raise ValueError('Unknown columnar format: %s' % format)
+    os.makedirs(path, exist_ok=True)
+    writers = {}
+    for table, schema in table_schemas.items():
+        fname = os.path.join(path, table + format_extensions[format])
+        if format == 'parquet':
+            writers[table] = \
+                pyarrow.parquet.ParquetWriter(fname, schema,
+                                              compression=compression)
+        else:
+            writers[table] = pyarrow.ipc.new_file(fname, schema)
+    columns = _get_empty_columns()
+    n_stmts = 0
+    try:
+        for stmt in stmts:
+            _add_stmt_rows(stmt, columns)
+            n_stmts += 1
+            if n_stmts % chunk_size == 0:
+                _write_columns(columns, writers)
+                columns = _get_empty_columns()
+        _write_columns(columns, writers)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    logger.info('Wrote %d statements into %s' % (n_stmts, path))
+
+
+def read_columnar_table(path, table='statements', columns=None, filter=None,
+                        memory_map=True):
+    """Return a table from a columnar statement store.
+
+    Parameters
+    ----------
+    path : str
+        The path to the directory of the statement store.
+    table : Optional[str]
+        The name of the table to read, one of 'statements', 'agents' or
+        'evidences'. Default: statements
+    columns : Optional[list[str]]
+        The names of the columns to read. If not given, all the columns are
+        read.
+    filter : Optional[pyarrow.dataset.Expression]
+        A filter on the rows to read, for instance,
+        `pyarrow.dataset.field('source_api') == 'reach'`.
+    memory_map : Optional[bool]
+        If True, the table file is memory-mapped rather than read into
+        memory. Default: True
+
+    Returns
+    -------
+    pyarrow.Table
+        The table with the selected columns and rows.
+    """
+    if table not in table_schemas:
+        raise ValueError('Unknown table: %s' % table)
+    for format, extension in format_extensions.items():
+        fname = os.path.join(path, table + extension)
+        if os.path.exists(fname):
+            break
+    else:
+        raise FileNotFoundError('No %s table found in %s' % (table, path))
+    filesystem = pyarrow.fs.LocalFileSystem(use_mmap=memory_map)
+    dataset = pyarrow.dataset.dataset(
+        fname, format='parquet' if format == 'parquet' else 'ipc',
+        filesystem=filesystem)
+    return dataset.to_table(columns=columns, filter=filter)
+
+
+def stmts_from_columnar(path, stmt_types=None, agent_groundings=None,
+                        evidence=True, memory_map=True):
+    """Return statements loaded from a columnar statement store.
+
+    Parameters
+    ----------
+    path : str
+        The path to the directory of the statement store.
+    stmt_types : Optional[list[str]]
+        If given, only statements whose type name is in this list are
+        loaded.
+    agent_groundings : Optional[list[tuple(str, str)]]
+        If given, only statements with at least one agent whose preferred
+        grounding is one of the given (db_ns, db_id) tuples are loaded.
+    evidence : Optional[bool]
+        If False, the evidences of the statements are not loaded.
+        Default: True
+    memory_map : Optional[bool]
+        If True, the table files are memory-mapped rather than read into
+        memory. Default: True
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The loaded statements.
+    """
+    field = pyarrow.dataset.field
+    stmt_filter = None
+    if stmt_types is not None:
+        stmt_filter = field('type').isin(list(stmt_types))
+    if agent_groundings is not None:
+        agent_filter = None
+        for db_ns, db_id in agent_groundings:
+            expr = (field('db_ns') == db_ns) & (field('db_id') == db_id)
+            agent_filter = expr if agent_filter is None else \
+                (agent_filter | expr)
+        if agent_filter is None:
+            return []
+        agents = read_columnar_table(path, 'agents', columns=['stmt_uuid'],
+                                     filter=agent_filter,
+                                     memory_map=memory_map)
+        uuid_filter = \
+            field('uuid').isin(agents.column('stmt_uuid').unique())
+        stmt_filter = uuid_filter if stmt_filter is None else \
+            (stmt_filter & uuid_filter)
+    stmts_table = \
+        read_columnar_table(path, 'statements',
+                            columns=['uuid', 'belief', 'supports',
+                                     'supported_by', 'json'],
+                            filter=stmt_filter, memory_map=memory_map)
+    evidences = {}
+    if evidence:
+        ev_filter = None if stmt_filter is None else \
+            field('stmt_uuid').isin(stmts_table.column('uuid'))
+        ev_table = read_columnar_table(path, 'evidences',
+                                       columns=['stmt_uuid', 'json'],
+                                       filter=ev_filter,
+                                       memory_map=memory_map)
+        for stmt_uuid, ev_json in zip(ev_table.column('stmt_uuid').to_pylist(),
+                                      ev_table.column('json').to_pylist()):
+            evidences.setdefault(stmt_uuid, []).append(json_loads(ev_json))
+
+    def get_stmt_jsons():
+        for stmt_uuid, belief, supports, supported_by, stmt_json in \
+                zip(*[stmts_table.column(col).to_pylist()
+                      for col in stmts_table.column_names]):
+            stmt_json = json_loads(stmt_json)
+            stmt_json['belief'] = belief
+            stmt_json['evidence'] = evidences.get(stmt_uuid, [])
+            stmt_json['supports'] = supports
+            stmt_json['supported_by'] = supported_by
+            yield stmt_json
+    return stmts_from_json(get_stmt_jsons())
+
+
+def _get_empty_columns():
+    return {table: {col: [] for col in schema.names}
+            for table, schema in table_schemas.items()}
+
+
+def _add_stmt_rows(stmt, columns):
+    stmt_json = stmt.to_json()
+    stmt_uuid = stmt_json['id']
+    stmt_hash = int(stmt_json['matches_hash'])
+    stmt_cols = columns['statements']
+    stmt_cols['uuid'].append(stmt_uuid)
+    stmt_cols['stmt_hash'].append(stmt_hash)
+    stmt_cols['type'].append(stmt_json['type'])
+    stmt_cols['belief'].append(stmt_json.pop('belief'))
+    stmt_cols['supports'].append(stmt_json.pop('supports', []))
+    stmt_cols['supported_by'].append(stmt_json.pop('supported_by', []))
+    evidences = stmt_json.pop('evidence', [])
+    stmt_cols['json'].append(json_dumps(stmt_json))
+
+    agent_cols = columns['agents']
+    for agent_index, agent in enumerate(stmt.agent_list()):
+        if agent is None:
+            continue
+        db_ns, db_id = agent.get_grounding()
+        agent_cols['stmt_uuid'].append(stmt_uuid)
+        agent_cols['stmt_hash'].append(stmt_hash)
+        agent_cols['agent_index'].append(agent_index)
+        agent_cols['name'].append(agent.name)
+        agent_cols['db_ns'].append(db_ns)
+        agent_cols['db_id'].append(db_id)
+        agent_cols['db_refs'].append(json_dumps(agent.db_refs))
+
+    ev_cols = columns['evidences']
+    for ev_json in evidences:
+        ev_cols['stmt_uuid'].append(stmt_uuid)
+        ev_cols['stmt_hash'].append(stmt_hash)
+        ev_cols['source_hash'].append(ev_json.get('source_hash'))
+        ev_cols['source_api'].append(ev_json.get('source_api'))
+        ev_cols['source_id'].append(ev_json.get('source_id'))
+        ev_cols['pmid'].append(ev_json.get('pmid'))
+        ev_cols['text'].append(ev_json.get('text'))
+        ev_cols['json'].append(json_dumps(ev_json))
+
+
+def _write_columns(columns, writers):
+    for table, writer in writers.items():
+        writer.write_table(
+            pyarrow.Table.from_pydict(columns[table],
+                                      schema=table_schemas[table]))
@@ -1,5 +1,6 @@
 import logging
 from collections import OrderedDict as _o
+from .util import cached_key, uncache_keys
 
 
 logger = logging.getLogger(__name__)
@@ -24,13 +25,24 @@ class Concept(object):
     def matches(self, other):
         return self.matches_key() == other.matches_key()
 
+    @cached_key
     def matches_key(self):
         key = self.entity_matches_key()
         return str(key)
 
+    def invalidate(self):
+        """Clear the cached matches keys of the Concept.
+
+        This needs to be called if the Concept is changed in place while
+        matches keys are cached, see
+        :py:func:`indra.statements.util.key_caching`.
+        """
+        uncache_keys(self)
+
     def entity_matches(self, other):
         return self.entity_matches_key() == other.entity_matches_key()
 
+    @cached_key
     def entity_matches_key(self):
         # Get the grounding first
         db_ns, db_id = self.get_grounding()
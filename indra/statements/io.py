@@ -2,17 +2,31 @@ from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
 
 __all__ = ['stmts_from_json', 'stmts_from_json_file', 'stmts_to_json',
-           'stmts_to_json_file', 'draw_stmt_graph',
+           'stmts_to_json_file', 'iter_stmts_from_json_file',
+           'LazyStatement', 'draw_stmt_graph', 'json_loads', 'json_dumps',
            'UnresolvedUuidError', 'InputError']
 
+import re
+import gzip
 import json
 import logging
 from indra.statements.statements import Statement, Unresolved
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
 
+# The number of statements that are serialized before writing them to a file
+JSON_WRITE_CHUNK_SIZE = 1000
+# The number of characters read at once when streaming a JSON list from a file
+JSON_READ_CHUNK_SIZE = 2**20
+
+
 def stmts_from_json(json_in, on_missing_support='handle'):
     """Get a list of Statements from Statement jsons.
 
@@ -67,10 +81,14 @@ def stmts_from_json(json_in, on_missing_support='handle'):
 def stmts_from_json_file(fname, format='json'):
     """Return a list of statements loaded from a JSON file.
 
+    The file is read in a streaming fashion so that only the Statements,
+    and not the JSON they are loaded from, need to fit into memory.
+
     Parameters
     ----------
     fname : str
-        Path to the JSON file to load statements from.
+        Path to the JSON file to load statements from. If the path ends
+        with .gz, the file is assumed to be gzipped.
     format : Optional[str]
         One of 'json' to assume regular JSON formatting or
         'jsonl' assuming each statement is on a new line.
@@ -80,35 +98,90 @@ def stmts_from_json_file(fname, format='json'):
     list[indra.statements.Statement]
         The list of INDRA Statements loaded from the JSOn file.
     """
-    with open(fname, 'r') as fh:
-        if format == 'json':
-            return stmts_from_json(json.load(fh))
-        else:
-            return stmts_from_json([json.loads(line)
-                                    for line in fh.readlines()])
+    json_in = (json_loads(rec) if isinstance(rec, str) else rec
+               for rec in _iter_json_records(fname, format))
+    return stmts_from_json(json_in)
+
+
+def iter_stmts_from_json_file(fname, format=None, lazy=False):
+    """Yield statements from a JSON file one by one.
+
+    Unlike :py:func:`stmts_from_json_file`, this never holds more than one
+    Statement in memory at a time (apart from those held by the caller).
+    However, the uuids in the `supports` and `supported_by` lists of the
+    Statements are not resolved into Statement objects.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the JSON file to load statements from. If the path ends
+        with .gz, the file is assumed to be gzipped.
+    format : Optional[str]
+        One of 'json' to assume regular JSON formatting or
+        'jsonl' assuming each statement is on a new line. By default, the
+        format is 'jsonl' if the path ends with .jsonl or .jsonl.gz and
+        'json' otherwise.
+    lazy : Optional[bool]
+        If True, :py:class:`LazyStatement` objects are yielded which only
+        deserialize the Statement once it is accessed. Default: False
+
+    Yields
+    ------
+    indra.statements.Statement or LazyStatement
+        Statements loaded from the file.
+    """
+    for rec in _iter_json_records(fname, format):
+        if lazy:
+            yield LazyStatement(rec)
+            continue
+        try:
+            yield Statement._from_json(json_loads(rec)
+                                       if isinstance(rec, str) else rec)
+        except Exception as e:
+            logger.warning("Error creating statement: %s" % e)
 
 
 def stmts_to_json_file(stmts, fname, format='json', **kwargs):
     """Serialize a list of INDRA Statements into a JSON file.
 
+    The Statements are serialized and written in chunks so that the
+    JSON of all the Statements doesn't need to be in memory at once.
+
     Parameters
     ----------
-    stmts : list[indra.statement.Statements]
-        The list of INDRA Statements to serialize into the JSON file.
+    stmts : iterable[indra.statement.Statements]
+        The Statements to serialize into the JSON file. This can be any
+        iterable, for instance, a generator of Statements or of
+        :py:class:`LazyStatement` objects.
     fname : str
-        Path to the JSON file to serialize Statements into.
+        Path to the JSON file to serialize Statements into. If the path ends
+        with .gz, the file is gzipped.
     format : Optional[str]
         One of 'json' to use regular JSON with indent=1 formatting or
         'jsonl' to put each statement on a new line without indents.
     """
-    sj = stmts_to_json(stmts, **kwargs)
-    with open(fname, 'w') as fh:
+    with _open_file(fname, 'w') as fh:
         if format == 'json':
-            json.dump(sj, fh, indent=1)
-        else:
-            for json_stmt in sj:
-                json.dump(json_stmt, fh)
-                fh.write('\n')
+            fh.write('[')
+        chunk = []
+        n_stmts = 0
+        for stmt in stmts:
+            if format == 'json':
+                # This is equivalent to json.dump on the list of all
+                # statements with indent=1
+                chunk.append('\n ' if n_stmts == 0 else ',\n ')
+                chunk.append(json.dumps(_stmt_to_json(stmt, 'json', **kwargs),
+                                        indent=1).replace('\n', '\n '))
+            else:
+                chunk.append(_stmt_to_json(stmt, 'jsonl', **kwargs))
+                chunk.append('\n')
+            n_stmts += 1
+            if n_stmts % JSON_WRITE_CHUNK_SIZE == 0:
+                fh.write(''.join(chunk))
+                chunk = []
+        if format == 'json':
+            chunk.append('\n]' if n_stmts else ']')
+        fh.write(''.join(chunk))
 
 
 def stmts_to_json(stmts_in, use_sbo=False, matches_fun=None):
@@ -222,6 +295,253 @@ def draw_stmt_graph(stmts):
     plt.show()
 
 
+class LazyStatement(object):
+    """A Statement that is only deserialized from JSON once it is accessed.
+
+    The type and matches hash of the Statement are available without
+    deserializing the Statement. Accessing any other attribute or method
+    deserializes the Statement and delegates to it. Note that
+    LazyStatements aren't instances of the Statement class, the
+    deserialized Statement is available as the `stmt` attribute.
+
+    Parameters
+    ----------
+    json_in : str or dict
+        The JSON string (as in a JSON lines file) or JSON dict of a
+        Statement.
+
+    Attributes
+    ----------
+    type : str
+        The name of the type of the Statement.
+    matches_hash : int or None
+        The matches hash of the Statement, if it was serialized.
+    """
+    def __init__(self, json_in):
+        self._json = json_in
+        self._stmt = None
+        stmt_type = matches_hash = None
+        if isinstance(json_in, str):
+            # We only look at the raw JSON string, which is unambiguous as
+            # long as the type is the first key and no other matches hash
+            # appears (e.g., in evidence annotations)
+            type_match = _stmt_type_re.match(json_in)
+            hash_matches = _matches_hash_re.findall(json_in)
+            if type_match and len(hash_matches) <= 1:
+                stmt_type = type_match.group(1)
+                matches_hash = hash_matches[0] if hash_matches else None
+            else:
+                json_in = json_loads(json_in)
+        if isinstance(json_in, dict):
+            stmt_type = json_in.get('type')
+            matches_hash = json_in.get('matches_hash')
+        self.type = stmt_type
+        try:
+            self.matches_hash = int(matches_hash) \
+                if matches_hash is not None else None
+        except ValueError:
+            self.matches_hash = None
+
+    @property
+    def stmt(self):
+        """Return the deserialized Statement."""
+        if self._stmt is None:
+            json_stmt = self._json if isinstance(self._json, dict) else \
+                json_loads(self._json)
+            self._stmt = Statement._from_json(json_stmt)
+            # Once deserialized, the Statement may be changed so we don't
+            # keep the JSON around
+            self._json = None
+        return self._stmt
+
+    def is_loaded(self):
+        """Return True if the Statement was deserialized."""
+        return self._stmt is not None
+
+    def get_hash(self, shallow=True, refresh=False, matches_fun=None):
+        """Return the hash of the Statement, see Statement.get_hash."""
+        if shallow and not refresh and matches_fun is None and \
+                self._stmt is None and self.matches_hash is not None:
+            return self.matches_hash
+        return self.stmt.get_hash(shallow=shallow, refresh=refresh,
+                                  matches_fun=matches_fun)
+
+    def to_json(self, use_sbo=False, matches_fun=None):
+        """Return the JSON dict of the Statement, see Statement.to_json."""
+        if self._stmt is None and not use_sbo and matches_fun is None:
+            return self._json if isinstance(self._json, dict) else \
+                json_loads(self._json)
+        return self.stmt.to_json(use_sbo=use_sbo, matches_fun=matches_fun)
+
+    def __getattr__(self, name):
+        # This is only called for attributes not set on the object itself.
+        # Private attributes are excluded to avoid recursion in case the
+        # object isn't initialized, e.g., when unpickling.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.stmt, name)
+
+    def __str__(self):
+        return str(self.stmt)
+
+    def __repr__(self):
+        return repr(self.stmt)
+
+
+_stmt_type_re = re.compile(r'\{\s*"type"\s*:\s*"(\w+)"')
+_matches_hash_re = re.compile(r'"matches_hash"\s*:\s*"(-?\d+)"')
+
+
+def _stmt_to_json(stmt, format, **kwargs):
+    # Statements that haven't been deserialized don't have to be serialized
+    if isinstance(stmt, LazyStatement) and not stmt.is_loaded() and \
+            not kwargs.get('use_sbo') and not kwargs.get('matches_fun'):
+        if format == 'jsonl' and isinstance(stmt._json, str):
+            return stmt._json
+        json_stmt = stmt.to_json()
+    else:
+        json_stmt = stmt.to_json(**kwargs)
+    return json_stmt if format == 'json' else json_dumps(json_stmt)
+
+
+def _open_file(fname, mode):
+    if fname.endswith('.gz'):
+        return gzip.open(fname, mode + 't', encoding='utf-8')
+    return open(fname, mode, encoding='utf-8')
+
+
+def json_loads(s):
+    """Return the object deserialized from a JSON string.
+
+    orjson is used if it is installed, falling back to the json module for
+    input that orjson doesn't accept.
+
+    Parameters
+    ----------
+    s : str or bytes
+        A JSON string.
+
+    Returns
+    -------
+    object
+        The deserialized object.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        # orjson doesn't support some non-standard values such as NaN that
+        # the json module accepts
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
+
+
+def json_dumps(obj):
+    """Return the JSON string of an object.
+
+    orjson is used if it is installed, falling back to the json module for
+    objects that orjson can't serialize.
+
+    Parameters
+    ----------
+    obj : object
+        A JSON-serializable object.
+
+    Returns
+    -------
+    str
+        The JSON string of the object.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj,
+                                option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        # orjson doesn't support some types such as subclasses of float
+        # that the json module accepts
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+def _iter_json_records(fname, format=None):
+    """Yield JSON strings from a JSON lines file or dicts from a JSON list."""
+    if format is None:
+        format = 'jsonl' if re.search(r'\.jsonl(\.gz)?$', fname) else 'json'
+    with _open_file(fname, 'r') as fh:
+        if format == 'json':
+            yield from _iter_json_list(fh)
+        else:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    yield line
+
+
+_json_separator_re = re.compile(r'[\s,]*')
+
+
+def _iter_json_list(fh):
+    """Yield the elements of a JSON list in a file one by one.
+
+    Elements are decoded with the raw_decode method of the json module,
+    which finds where each element ends. If orjson is installed and the
+    file is formatted like those written by :py:func:`stmts_to_json_file`,
+    where each element ends with a closing brace indented by one space on
+    its own line, elements are instead cut at that line and decoded with
+    orjson, which is faster. Since an object ends where its braces are
+    balanced, an element decoded this way is the one raw_decode would find.
+    Once an element can't be decoded this way, e.g., because the file is
+    formatted differently, the rest of the file is decoded with raw_decode.
+    """
+    decoder = json.JSONDecoder()
+    # Whether elements are cut at the line that closes them, see above
+    split_lines = orjson is not None
+    buf = ''
+    pos = 0
+    in_list = False
+    eof = False
+    while True:
+        pos = _json_separator_re.match(buf, pos).end()
+        if pos < len(buf):
+            if not in_list:
+                if buf[pos] != '[':
+                    raise ValueError('Expected a JSON list of statements')
+                in_list = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            if split_lines and buf[pos] == '{':
+                end = buf.find('\n }', pos)
+                if end >= 0:
+                    try:
+                        json_obj = orjson.loads(buf[pos:end + 3])
+                    except orjson.JSONDecodeError:
+                        pass
+                    else:
+                        pos = end + 3
+                        yield json_obj
+                        continue
+            # If we can't decode the next element, it is likely incomplete
+            # and we need to read more of the file, unless we already
+            # reached the end of it
+            try:
+                json_obj, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                split_lines = False
+                yield json_obj
+                continue
+        elif eof:
+            raise ValueError('Unexpected end of JSON file')
+        chunk = fh.read(JSON_READ_CHUNK_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
 class UnresolvedUuidError(Exception):
     pass
 
@@ -222,12 +222,14 @@ __all__ = [
 
     # Functions and values
     'stmts_from_json', 'get_unresolved_support_uuids', 'stmts_to_json',
-    'stmts_from_json_file', 'stmts_to_json_file', 'get_valid_residue',
+    'stmts_from_json_file', 'stmts_to_json_file',
+    'iter_stmts_from_json_file', 'LazyStatement', 'get_valid_residue',
     'draw_stmt_graph', 'get_all_descendants','make_statement_camel',
     'amino_acids', 'amino_acids_reverse', 'activity_types',
     'modtype_to_modclass',
     'modclass_to_modtype', 'modtype_conditions', 'modtype_to_inverse',
-    'modclass_to_inverse', 'get_statement_by_name', 'make_hash', 'stmt_type',
+    'modclass_to_inverse', 'get_statement_by_name', 'make_hash', 'key_caching',
+    'stmt_type',
     'default_ns_order', 'mk_str'
     ]
 
@@ -299,6 +301,20 @@ class Statement(object):
     def matches(self, other):
         return self.matches_key() == other.matches_key()
 
+    def invalidate(self):
+        """Clear the cached matches keys of the Statement and its agents.
+
+        This needs to be called if the Statement or any of its agents are
+        changed in place while matches keys are cached, see
+        :py:func:`indra.statements.util.key_caching`.
+        """
+        uncache_keys(self)
+        for ag_name in self._agent_order:
+            ag_attr = getattr(self, ag_name)
+            for ag in (ag_attr if isinstance(ag_attr, list) else [ag_attr]):
+                if ag is not None:
+                    ag.invalidate()
+
     def get_hash(self, shallow=True, refresh=False, matches_fun=None):
         """Get a hash for this Statement.
 
@@ -648,6 +664,7 @@ class Modification(Statement):
         else:
             self.position = position
 
+    @cached_key
     def matches_key(self):
         if self.enz is None:
             enz_key = None
@@ -819,6 +836,7 @@ class SelfModification(Statement):
              (type(self).__name__, self.enz, res_str, pos_str))
         return s
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.enz.matches_key(),
                str(self.residue), str(self.position))
@@ -1049,6 +1067,7 @@ class RegulateActivity(Statement):
         state.pop('subj_activity', None)
         self.__dict__.update(state)
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.subj.matches_key(),
                self.obj.matches_key(), str(self.obj_activity),
@@ -1271,6 +1290,7 @@ class ActiveForm(Statement):
         self.activity = activity
         self.is_active = is_active
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.agent.matches_key(),
                str(self.activity), str(self.is_active))
@@ -1407,6 +1427,7 @@ class HasActivity(Statement):
         self.activity = activity
         self.has_activity = has_activity
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.agent.matches_key(),
                str(self.activity), str(self.has_activity))
@@ -1478,6 +1499,7 @@ class Gef(Statement):
         self.gef = gef
         self.ras = ras
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.gef.matches_key(),
                self.ras.matches_key())
@@ -1568,6 +1590,7 @@ class Gap(Statement):
         self.gap = gap
         self.ras = ras
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.gap.matches_key(),
                self.ras.matches_key())
@@ -1653,6 +1676,7 @@ class Complex(Statement):
         super(Complex, self).__init__(evidence)
         self.members = members
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), tuple(m.matches_key()
                                             for m in self.sorted_members()))
@@ -1777,6 +1801,7 @@ class Translocation(Statement):
         matches = matches and (self.to_location == other.to_location)
         return matches
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True), self.agent.matches_key(),
                str(self.from_location), str(self.to_location))
@@ -1820,6 +1845,7 @@ class RegulateAmount(Statement):
                              type(self).__name__)
         self.obj = obj
 
+    @cached_key
     def matches_key(self):
         if self.subj is None:
             subj_key = None
@@ -2006,6 +2032,7 @@ class Influence(Statement):
             self.subj.equals(other.subj) and self.obj.equals(other.obj)
         return equals
 
+    @cached_key
     def matches_key(self):
         # With polarities, here, the goal is to match overall polarity
         # if both polarities are given, i.e. +/+ matches -/-. Also, if only
@@ -2126,6 +2153,7 @@ class Association(Complex):
                              '%d were given.' % len(members))
         super().__init__(members, evidence)
 
+    @cached_key
     def matches_key(self):
         key = (stmt_type(self, True),
                tuple(m.matches_key() for m in self.sorted_members()),
@@ -2275,6 +2303,7 @@ class Conversion(Statement):
         if isinstance(obj_to, Agent):
             self.obj_to = [obj_to]
 
+    @cached_key
     def matches_key(self):
         keys = [stmt_type(self, True)]
         keys += [self.subj.matches_key() if self.subj else None]
@@ -2396,6 +2425,7 @@ class Event(Statement):
                 polarity=None, adjectives=None)
         self.context = context
 
+    @cached_key
     def matches_key(self):
         mk = (self.concept.matches_key(),)
         return str(mk)
@@ -3,9 +3,11 @@ from builtins import dict, str
 from future.utils import python_2_unicode_compatible
 
 
-__all__ = ['make_hash']
+__all__ = ['make_hash', 'key_caching', 'cached_key', 'uncache_keys']
 
 
+import functools
+import contextlib
 from hashlib import md5
 
 
@@ -13,4 +15,71 @@ def make_hash(s, n_bytes):
     """Make the hash from a matches key."""
     raw_h = int(md5(s.encode('utf-8')).hexdigest()[:n_bytes], 16)
     # Make it a signed int.
-    return 16**n_bytes//2 - raw_h
\ No newline at end of file
+    return 16**n_bytes//2 - raw_h
+
+
+# The state of key caching. While caching is enabled, the cache maps the id
+# of each object whose keys were computed to the object itself (which keeps
+# its id from being reused within the block) and a dict of its keys. The
+# cache is dropped when the outermost caching block ends so no keys are
+# left behind on the objects themselves.
+_key_cache_state = {'depth': 0, 'cache': None}
+
+
+@contextlib.contextmanager
+def key_caching():
+    """Cache the matches keys of Statements and Agents within a block of code.
+
+    Within this context, the matches keys of Statements and Agents (and
+    other Concepts) are computed once per object and then reused. Key
+    caching assumes that the objects aren't changed within the block, or
+    if they are changed in place, that the `invalidate` method of the
+    changed objects is called. Keys cached within the block are never
+    used after the block ends.
+
+    Examples
+    --------
+    >>> from indra.statements import Agent, Phosphorylation
+    >>> stmt = Phosphorylation(Agent('MAP2K1'), Agent('MAPK1'))
+    >>> with key_caching():
+    ...     stmt.matches_key() == stmt.matches_key()
+    True
+    """
+    if _key_cache_state['depth'] == 0:
+        _key_cache_state['cache'] = {}
+    _key_cache_state['depth'] += 1
+    try:
+        yield
+    finally:
+        _key_cache_state['depth'] -= 1
+        if _key_cache_state['depth'] == 0:
+            _key_cache_state['cache'] = None
+
+
+def cached_key(fun):
+    """Decorate a key method of a class to be cached within key_caching."""
+    name = fun.__qualname__
+
+    @functools.wraps(fun)
+    def wrapper(self):
+        cache = _key_cache_state['cache']
+        if cache is None:
+            return fun(self)
+        entry = cache.get(id(self))
+        if entry is None:
+            entry = (self, {})
+            cache[id(self)] = entry
+        keys = entry[1]
+        key = keys.get(name)
+        if key is None:
+            key = fun(self)
+            keys[name] = key
+        return key
+    return wrapper
+
+
+def uncache_keys(obj):
+    """Remove the cached keys of an object if key caching is enabled."""
+    cache = _key_cache_state['cache']
+    if cache is not None:
+        cache.pop(id(obj), None)
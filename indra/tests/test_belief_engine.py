@@ -4,7 +4,7 @@ from nose.tools import raises
 from indra.statements import *
 from indra.belief import BeliefEngine, load_default_probs, _get_belief_package,\
     sample_statements, evidence_random_noise_prior, tag_evidence_subtype, \
-    SimpleScorer
+    SimpleScorer, _get_hierarchy_index, _get_support_closures
 from indra.belief import wm_scorer, BayesianScorer
 
 default_probs = load_default_probs()
@@ -377,6 +377,29 @@ def test_bayesian_scorer():
     assert scorer.subtype_probs['eidos']['rule2'] == 0.75
 
 
+def test_score_statements():
+    sources = ['reach', 'trips', 'biopax', 'assertion', 'signor']
+    stmts = []
+    for i in range(50):
+        evs = [Evidence(source_api=sources[(i * j) % len(sources)],
+                        annotations={'source_sub_id': ['pid', 'x'][j % 2]},
+                        epistemics={'negated': (i + j) % 7 == 0})
+               for j in range(i % 11)]
+        stmts.append(Phosphorylation(None, Agent('a'), evidence=evs))
+    extra_evs = [[ev4] * (i % 3) for i in range(len(stmts))]
+    scorers = [SimpleScorer(),
+               SimpleScorer(subtype_probs={'biopax': {'pid': 0.3}}),
+               BayesianScorer({'reach': [5, 3]}, {'biopax': {'x': [3, 4]}})]
+    for scorer in scorers:
+        # The batch scores have to be identical, not just close
+        assert scorer.score_statements(stmts) == \
+            [scorer.score_statement(st) for st in stmts]
+        assert scorer.score_statements(stmts, extra_evs) == \
+            [scorer.score_statement(st, evs)
+             for st, evs in zip(stmts, extra_evs)]
+    assert scorers[0].score_statements([]) == []
+
+
 @raises(AssertionError)
 def test_cycle():
     st1 = Phosphorylation(Agent('B'), Agent('A1'))
@@ -389,5 +412,31 @@ def test_cycle():
     engine.set_hierarchy_probs([st1, st2])
 
 
+def test_support_closures_sparse():
+    # Many small separate hierarchies, each with a general statement
+    # supported by two specific ones
+    stmts = []
+    for idx in range(3000):
+        general = Phosphorylation(None, Agent('A%d' % idx))
+        for kinase in ['K', 'L']:
+            specific = Phosphorylation(Agent('%s%d' % (kinase, idx)),
+                                       Agent('A%d' % idx))
+            specific.supports = [general]
+            general.supported_by.append(specific)
+            stmts.append(specific)
+        stmts.append(general)
+    matches_fun = BeliefEngine().matches_fun
+    index, ids, targets = _get_hierarchy_index(stmts, matches_fun)
+    closures = _get_support_closures(index, ids, targets, matches_fun)
+    for st in stmts:
+        closure = [index[stmt_id] for stmt_id in
+                   closures[ids[matches_fun(st)]]]
+        assert closure == st.supports
+    # The memory taken by the closures grows with the number of supporting
+    # statements, not with the square of the number of statements
+    assert sum(closure.nbytes for closure in closures.values()) <= \
+        8 * len(stmts)
+
+
 def assert_close_enough(b1, b2):
     assert abs(b1 - b2) < 1e-6, 'Got %.6f, Expected: %.6f' % (b1, b2)
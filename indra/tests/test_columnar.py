@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import pyarrow.dataset
+from indra.statements import *
+from indra.statements.columnar import stmts_to_columnar, \
+    stmts_from_columnar, read_columnar_table
+
+
+def _get_stmts():
+    braf = Agent('BRAF', db_refs={'HGNC': '1097', 'TEXT': 'B-Raf'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    mek = Agent('MEK', db_refs={'FPLX': 'MEK'})
+    evs = [Evidence(source_api='reach', pmid=str(i), text='text %d' % i)
+           for i in range(3)]
+    stmts = [Phosphorylation(braf, mek, 'S', '218', evidence=evs[:2]),
+             Phosphorylation(braf, mek, evidence=evs[2:]),
+             Activation(kras, braf),
+             Complex([kras, braf, mek], evidence=evs[:1])]
+    stmts[0].supports = [stmts[1]]
+    stmts[1].supported_by = [stmts[0]]
+    stmts[2].belief = 0.5
+    return stmts
+
+
+def test_columnar_round_trip():
+    stmts = _get_stmts()
+    for format in ['parquet', 'arrow']:
+        path = tempfile.mkdtemp()
+        try:
+            stmts_to_columnar(stmts, path, format=format, chunk_size=2)
+            loaded = stmts_from_columnar(path)
+            assert [s.to_json() for s in loaded] == \
+                [s.to_json() for s in stmts]
+            assert loaded[0].supports[0] is loaded[1]
+        finally:
+            shutil.rmtree(path)
+
+
+def test_columnar_filters():
+    stmts = _get_stmts()
+    path = tempfile.mkdtemp()
+    try:
+        stmts_to_columnar(stmts, path)
+        loaded = stmts_from_columnar(path, stmt_types=['Phosphorylation'],
+                                     evidence=False)
+        assert [s.uuid for s in loaded] == [s.uuid for s in stmts[:2]]
+        assert not any(s.evidence for s in loaded)
+        loaded = stmts_from_columnar(path, agent_groundings=[('HGNC', '6407')])
+        assert [s.uuid for s in loaded] == [s.uuid for s in stmts[2:]]
+        assert len(loaded[1].evidence) == 1
+        loaded = stmts_from_columnar(path, stmt_types=['Complex'],
+                                     agent_groundings=[('FPLX', 'MEK')])
+        assert [s.uuid for s in loaded] == [stmts[3].uuid]
+        # Reading only some columns of a table
+        table = read_columnar_table(
+            path, 'statements', columns=['stmt_hash', 'belief'],
+            filter=pyarrow.dataset.field('belief') < 1)
+        assert table.column_names == ['stmt_hash', 'belief']
+        assert table.column('stmt_hash').to_pylist() == \
+            [stmts[2].get_hash()]
+        table = read_columnar_table(path, 'agents', columns=['name'])
+        assert table.num_rows == 9
+    finally:
+        shutil.rmtree(path)
@@ -1,3 +1,4 @@
+import os
 from indra.preassembler.grounding_mapper import default_mapper as gm
 from indra.preassembler.grounding_mapper import GroundingMapper
 from indra.preassembler.grounding_mapper.analysis import *
@@ -132,6 +133,48 @@ def test_ignore():
     assert len(mapped_stmts) == 0
 
 
+def test_map_stmts_by_signature():
+    def get_agent(txt, **db_refs):
+        return Agent(txt, db_refs=dict(TEXT=txt, **db_refs))
+    akt = get_agent('Akt')
+    akt.bound_conditions = [BoundCondition(get_agent('ERK1'))]
+    stmts = [Phosphorylation(get_agent('Akt'), get_agent('ERK1')),
+             Phosphorylation(akt, get_agent('foo')),
+             Phosphorylation(None, get_agent('p-Akt')),
+             Phosphorylation(get_agent('ERK1', UP='P28482'),
+                             get_agent('FA')),
+             Complex([get_agent('Akt'), get_agent('ERK1'),
+                      Agent('x', db_refs={'FPLX': 'AKT'})])]
+    mapped_stmts = gm.map_stmts(stmts)
+    for poolsize in [None, 2]:
+        mapped_by_sig = gm.map_stmts(stmts, by_signature=True,
+                                     poolsize=poolsize)
+        assert [stmt.to_json() for stmt in mapped_by_sig] == \
+            [stmt.to_json() for stmt in mapped_stmts]
+        assert set(gm.timings) == {'collect', 'resolve', 'disambiguate',
+                                   'apply'}
+    assert len(mapped_stmts) == 4
+    assert mapped_stmts[0].enz.db_refs['FPLX'] == 'AKT'
+    assert mapped_stmts[1].enz.bound_conditions[0].agent.db_refs['UP'] == \
+        'P27361'
+    assert mapped_stmts[2].sub.mods[0].mod_type == 'phosphorylation'
+    # The original statements aren't changed
+    assert stmts[0].enz.name == 'Akt'
+    # Agents with the same signature are mapped to distinct objects
+    assert mapped_stmts[0].sub is not mapped_stmts[3].agent_list()[1]
+
+
+def test_pickle_grounding_mapper():
+    import pickle
+    from indra.preassembler.grounding_mapper.disambiguate import \
+        DisambManager
+    mapper = pickle.loads(pickle.dumps(gm))
+    # Each copy of the mapper has its own disambiguation manager
+    assert isinstance(mapper.disamb_manager, DisambManager)
+    assert mapper.disamb_manager is not gm.disamb_manager
+    assert mapper.grounding_map == gm.grounding_map
+
+
 def test_renaming():
     akt_indra = Agent('pkbA', db_refs={'TEXT': 'Akt', 'FPLX': 'AKT',
                                        'UP': 'P31749'})
@@ -446,6 +489,78 @@ def test_get_gilda_models():
     assert 'NDR1' in models
 
 
+def test_gilda_grounding_cache():
+    import json
+    import tempfile
+    import threading
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from indra.preassembler.grounding_mapper import gilda
+    received = []
+
+    # A local stand-in for the grounding service that grounds each text to
+    # the FamPlex entry of the same name
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            inputs = json.loads(
+                self.rfile.read(int(self.headers['Content-Length'])))
+            received.append((self.path, inputs))
+            results = [[{'term': {'db': 'FPLX', 'id': inp['text'].upper()},
+                         'score': 1.0}] for inp in inputs]
+            data = json.dumps(results).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url, cache = gilda.grounding_service_url, gilda.grounding_cache
+    cache_path = os.path.join(tempfile.mkdtemp(), 'gilda_cache.pkl')
+    gilda.grounding_service_url = 'http://127.0.0.1:%d/' % server.server_port
+    gilda.grounding_cache = gilda.GroundingCache(path=cache_path)
+    try:
+        stmts = [Phosphorylation(Agent('x', db_refs={'TEXT': 'mek'}),
+                                 Agent('y', db_refs={'TEXT': 'erk'}))
+                 for _ in range(5)]
+        stmts.append(Phosphorylation(None, Agent('z')))
+        grounded_stmts = ground_statements(stmts)
+        # Each distinct text is grounded once, in a single request
+        assert len(received) == 1, received
+        assert received[0][0] == '/ground_multi'
+        assert [inp['text'] for inp in received[0][1]] == ['mek', 'erk']
+        assert grounded_stmts[0].enz.db_refs == {'TEXT': 'mek',
+                                                 'FPLX': 'MEK'}
+        assert grounded_stmts[4].sub.db_refs == {'TEXT': 'erk',
+                                                 'FPLX': 'ERK'}
+        # The original statements are unchanged and only the statements
+        # that were grounded are copied
+        assert stmts[0].enz.db_refs == {'TEXT': 'mek'}
+        assert grounded_stmts[0] is not stmts[0]
+        assert grounded_stmts[5] is stmts[5]
+        # Cached groundings aren't requested again, also after loading
+        # the cache from its file
+        gilda.grounding_cache = gilda.GroundingCache(path=cache_path)
+        assert len(gilda.grounding_cache) == 2
+        grounded_stmts = ground_statements(stmts)
+        assert len(received) == 1
+        assert grounded_stmts[0].enz.db_refs['FPLX'] == 'MEK'
+        # Grounding single agents doesn't save the cache each time
+        mtime = os.path.getmtime(cache_path)
+        os.utime(cache_path, (mtime - 10, mtime - 10))
+        gilda.ground_agent(Agent('x'), 'raf')
+        assert os.path.getmtime(cache_path) == mtime - 10
+        gilda.grounding_cache.save()
+        assert len(gilda.GroundingCache(path=cache_path)) == 3
+    finally:
+        gilda.grounding_service_url = url
+        gilda.grounding_cache = cache
+        server.shutdown()
+
+
 @attr('nonpublic')
 def test_gilda_disambiguation():
     gm.gilda_mode = 'web'
@@ -1651,6 +1651,35 @@ def test_signed_path():
     assert stmts6 == [[st2, st7], [st5], [st8]]
 
 
+def test_check_model_grouped_parallel():
+    ia = IndraNetAssembler(statements)
+    signed_model = ia.make_model(graph_type='signed')
+    smc = SignedGraphModelChecker(signed_model, test_statements)
+
+    def get_summary(results):
+        return [(stmt.uuid, res.result_code, res.paths)
+                for stmt, res in results]
+    summary = get_summary(smc.check_model())
+    for kwargs in [{'group_by_target': True}, {'poolsize': 2},
+                   {'poolsize': 2, 'group_by_target': True}]:
+        assert get_summary(smc.check_model(**kwargs)) == summary, kwargs
+        assert sorted(get_summary(smc.iter_check_model(**kwargs))) == \
+            sorted(summary), kwargs
+    # Filter functions are inherited by the forked workers so they can be
+    # closures
+    excluded = 'D'
+    filtered_summary = get_summary(smc.check_model(
+        agent_filter_func=lambda agent: agent.name != excluded))
+    assert get_summary(smc.check_model(
+        agent_filter_func=lambda agent: agent.name != excluded,
+        poolsize=2)) == filtered_summary
+    # Sources are only cached across groups if enabled
+    assert smc._sources_cache is None
+    smc.sources_cache_size = 4
+    assert get_summary(smc.check_model()) == summary
+    assert len(smc._sources_cache._target_sources) <= 4
+
+
 def test_pybel_path():
     pba = PybelAssembler(statements)
     pybel_model = pba.make_model()
@@ -1996,6 +2025,72 @@ def test_get_nodes_to_agents():
     assert pmc.nodes_to_agents['GSK3B_S9_p_obs'].mods[0].position == '9'
 
 
+def test_cached_im():
+    import tempfile
+    a, b, c, d = [Agent(name) for name in ['A', 'B', 'C', 'D']]
+    model_stmts = [Phosphorylation(a, b), Activation(b, c),
+                   Phosphorylation(c, d), Inhibition(d, a)]
+    test_stmts = [Phosphorylation(a, d)]
+    cache_dir = tempfile.mkdtemp()
+
+    def get_checker(stmts):
+        pmc = PysbModelChecker(PysbAssembler(stmts).make_model(), test_stmts)
+        pmc.im_cache_dir = cache_dir
+        pmc.incremental_im = True
+        # Small models are always updated rather than regenerated
+        pmc.max_im_update_fraction = 1
+        return pmc
+
+    def get_im_data(im):
+        return list(im.nodes(data=True)), list(im.edges(data=True))
+
+    # Influence maps aren't saved by default
+    pmc = PysbModelChecker(PysbAssembler(model_stmts).make_model(),
+                           test_stmts)
+    assert pmc.im_cache_dir is None and not pmc.incremental_im
+    # Generated from the whole model
+    pmc = get_checker(model_stmts[:3])
+    im = pmc.get_im()
+    assert get_im_data(im) == get_im_data(pmc.generate_im(pmc.model))
+    assert len(os.listdir(cache_dir)) == 1
+    # Loaded from the cache
+    pmc = get_checker(model_stmts[:3])
+    im = pmc.get_im()
+    assert get_im_data(im) == get_im_data(pmc.generate_im(pmc.model))
+    assert len(os.listdir(cache_dir)) == 1
+    # Updated for an added rule and a removed rule from the influence map
+    # loaded by the same model checker
+    for stmts in [model_stmts, model_stmts[1:]]:
+        model = PysbAssembler(stmts).make_model()
+        im = pmc.generate_cached_im(model)
+        assert get_im_data(im) == get_im_data(pmc.generate_im(model))
+    assert len(os.listdir(cache_dir)) == 3
+    # A new model checker generates the influence map of a model not seen
+    # before from the whole model
+    pmc = get_checker(model_stmts[2:])
+    im = pmc.get_im()
+    assert get_im_data(im) == get_im_data(pmc.generate_im(pmc.model))
+    assert len(os.listdir(cache_dir)) == 4
+
+    # Influence maps that aren't cached are generated by generate_im so
+    # subclasses can override it
+    class CountingModelChecker(PysbModelChecker):
+        def generate_im(self, model):
+            self.n_generated += 1
+            return super().generate_im(model)
+
+    pmc = CountingModelChecker(PysbAssembler(model_stmts).make_model(),
+                               test_stmts)
+    pmc.n_generated = 0
+    pmc.get_im()
+    assert pmc.n_generated == 1
+    pmc.im_cache_dir = cache_dir
+    pmc.incremental_im = True
+    pmc.max_im_update_fraction = 1
+    pmc.generate_cached_im(PysbAssembler(model_stmts[1:3]).make_model())
+    assert pmc.n_generated == 2
+
+
 # TODO Add tests for autophosphorylation
 # TODO Add test for transphosphorylation
 
@@ -327,3 +327,168 @@ def test_world_ontology_add_entry():
     ont.add_entry(new_node, examples=['floods'])
     assert ont.isa('WM', new_node, 'WM', nat_dis)
     ont_yml = ont.dump_yml_str()
+
+
+def test_transitive_closure_index():
+    import os
+    import tempfile
+    import networkx
+    from indra.ontology.transitive_closure import TransitiveClosureIndex
+    g = networkx.DiGraph()
+    g.add_edge('A', 'B', type='isa')
+    g.add_edge('B', 'C', type='partof')
+    g.add_edge('C', 'D', type='isa')
+    g.add_edge('D', 'C', type='isa')
+    g.add_edge('A', 'E', type='xref')
+    index = TransitiveClosureIndex.from_graph(g)
+    assert index.has_path('A', 'B', {'isa'})
+    assert not index.has_path('A', 'C', {'isa'})
+    assert index.has_path('A', 'D', {'isa', 'partof'})
+    assert index.has_path('C', 'D', {'isa'})
+    assert index.has_path('D', 'C', {'isa'})
+    # Nodes in cycles have paths to themselves
+    assert index.has_path('C', 'C', {'isa'})
+    assert not index.has_path('A', 'A', {'isa', 'partof'})
+    assert not index.has_path('A', 'E', {'isa', 'partof'})
+    assert index.has_path('A', 'E', {'xref'}) is None
+    assert sorted(index.get_reachable('A', {'isa', 'partof'})) == \
+        ['B', 'C', 'D']
+    assert sorted(index.get_reachable('C', {'isa', 'partof'},
+                                      reverse=True)) == ['A', 'B', 'D']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fname = os.path.join(tmp_dir, 'closure.npz')
+        index.save(fname)
+        loaded = TransitiveClosureIndex.load(fname)
+    assert loaded.labels == index.labels
+    assert loaded.fingerprint == index.fingerprint
+    assert sorted(loaded.get_reachable('A', {'isa', 'partof'})) == \
+        ['B', 'C', 'D']
+
+
+def test_ontology_closure_up_to_date():
+    import os
+    import tempfile
+    from indra.ontology.ontology_graph import IndraOntology
+
+    class TestOntology(IndraOntology):
+        def initialize(self):
+            self._initialized = True
+
+    ont = TestOntology()
+    ont.add_edge('X:A', 'X:B', type='isa')
+    ont.add_edge('X:B', 'X:C', type='isa')
+    ont.add_edge('X:C', 'X:B', type='isa')
+    ont.add_edge('X:D', 'X:D', type='isa')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, 'closure.npz')
+        ont._build_transitive_closure(cache_file)
+        # The index agrees with searching the graph, including for nodes
+        # that are in cycles
+        for source in ont.nodes:
+            for target in ont.nodes:
+                source_ns, source_id = ont.get_ns_id(source)
+                target_ns, target_id = ont.get_ns_id(target)
+                path = ont._transitive_rel(source_ns, source_id,
+                                           ont.child_rel, {'isa'},
+                                           (target_ns, target_id))
+                assert ont.isa(source_ns, source_id, target_ns, target_id) \
+                    == (ont.get_ns_id(target) in path), (source, target)
+        assert ont.isa('X', 'B', 'X', 'B')
+        assert ont.isa('X', 'D', 'X', 'D')
+        assert not ont.isa('X', 'A', 'X', 'A')
+        # Changing the edges drops the index, and an edit that keeps the
+        # numbers of nodes and edges gives a different fingerprint so that
+        # the cached index isn't used
+        ont.remove_edge('X:A', 'X:B')
+        assert ont._closure_index is None
+        ont.add_edge('X:A', 'X:D', type='isa')
+        ont._build_transitive_closure(cache_file)
+        assert not ont.isa('X', 'A', 'X', 'B')
+        assert ont.isa('X', 'A', 'X', 'D')
+        ont2 = TestOntology()
+        ont2.add_edges_from(ont.edges(data=True))
+        ont2.edges['X:A', 'X:D']['type'] = 'partof'
+        ont2._build_transitive_closure(cache_file)
+        assert not ont2.isa('X', 'A', 'X', 'D')
+        assert ont2.partof('X', 'A', 'X', 'D')
+
+
+def test_compact_graph():
+    import os
+    import pickle
+    import tempfile
+    import networkx
+    from indra.ontology.compact_graph import CompactGraph
+    from indra.ontology.ontology_graph import IndraOntology
+    g = networkx.DiGraph()
+    g.add_nodes_from([('HGNC:1', {'name': 'A'}), ('FPLX:B', {'name': 'B'}),
+                      ('UP:P1', {})])
+    g.add_edge('HGNC:1', 'FPLX:B', type='isa')
+    g.add_edge('HGNC:1', 'UP:P1', type='xref', source='hgnc')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'compact')
+        CompactGraph.from_graph(g).save(path)
+        cg = CompactGraph.load(path)
+        assert 'UP:P1' in cg
+        assert 'UP:P2' not in cg
+        assert cg.get_node_property('HGNC:1', 'name') == 'A'
+        assert cg.get_node_property('UP:P1', 'name') is None
+        assert list(cg.successors('HGNC:1', {'isa'})) == ['FPLX:B']
+        assert list(cg.predecessors('UP:P1', {'xref'})) == ['HGNC:1']
+        assert sorted(cg.edges(data=True)) == sorted(g.edges(data=True))
+
+        ont = IndraOntology()
+        ont._set_compact_graph(cg)
+        assert ont.get_parents('HGNC', '1') == [('FPLX', 'B')]
+        assert ont.get_mappings('HGNC', '1') == [('UP', 'P1')]
+        assert ont.get_id_from_name('FPLX', 'B') == ('FPLX', 'B')
+        assert ont._compact_graph is not None
+        ont = pickle.loads(pickle.dumps(ont))
+        assert ont.get_name('HGNC', '1') == 'A'
+        # Using networkx APIs materializes the graph
+        assert sorted(ont.nodes(data=True)) == sorted(g.nodes(data=True))
+        assert ont._compact_graph is None
+        assert ont.edges['HGNC:1', 'UP:P1']['source'] == 'hgnc'
+        # So do networkx algorithms and changes to the graph
+        ont = IndraOntology()
+        ont._set_compact_graph(CompactGraph.load(path))
+        assert networkx.descendants(ont, 'HGNC:1') == {'FPLX:B', 'UP:P1'}
+        ont = IndraOntology()
+        ont._set_compact_graph(CompactGraph.load(path))
+        ont.add_edge('FPLX:B', 'FPLX:C', type='isa')
+        assert ont.number_of_edges() == 3
+        assert ont.isa('HGNC', '1', 'FPLX', 'C')
+
+
+def test_bio_ontology_compact_cache():
+    import os
+    import tempfile
+    from indra.ontology.bio import ontology as bio_ontology_module
+    from indra.ontology.bio.ontology import BioOntology
+    cache_file, compact_cache_dir = bio_ontology_module.CACHE_FILE, \
+        bio_ontology_module.COMPACT_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bio_ontology_module.CACHE_FILE = os.path.join(tmp_dir, 'ont.pkl')
+        bio_ontology_module.COMPACT_CACHE_DIR = \
+            os.path.join(tmp_dir, 'compact')
+        try:
+            ont = BioOntology()
+            ont.add_node('HGNC:1', name='A')
+            with open(bio_ontology_module.CACHE_FILE, 'wb') as fh:
+                fh.write(b'pickle')
+            ont._dump_compact_cache()
+            assert BioOntology()._load_compact_cache()
+            # The compact cache isn't used with another pickle cache or
+            # another version of the ontology
+            with open(bio_ontology_module.CACHE_FILE, 'wb') as fh:
+                fh.write(b'another pickle')
+            assert not BioOntology()._load_compact_cache()
+            ont._dump_compact_cache()
+            ont = BioOntology()
+            assert ont._load_compact_cache()
+            assert ont.get_name('HGNC', '1') == 'A'
+            ont.version = 'other'
+            assert not ont._load_compact_cache()
+        finally:
+            bio_ontology_module.CACHE_FILE = cache_file
+            bio_ontology_module.COMPACT_CACHE_DIR = compact_cache_dir
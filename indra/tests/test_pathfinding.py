@@ -1,9 +1,14 @@
+from collections import deque
+
 import numpy as np
 import networkx as nx
 
 from indra.explanation.pathfinding.pathfinding import bfs_search, \
     shortest_simple_paths, bfs_search_multiple_nodes, open_dijkstra_search, \
-    simple_paths_with_constraints
+    simple_paths_with_constraints, find_sources, SourcesCache, _bfs_search
+from indra.explanation.pathfinding.util import get_sorted_neighbors
+from indra.explanation.pathfinding.compiled_graph import CompiledGraph
+from indra.explanation.pathfinding.edge_filter import EdgeFilterIndex
 from indra.explanation.model_checker.model_checker import \
     signed_edges_to_signed_nodes
 
@@ -170,15 +175,64 @@ def test_bfs():
     assert len(paths) == len(expected_paths), len(paths)
     assert set(paths) == expected_paths, 'sets of paths not equal'
 
-    # Test memory limit; a very low number should yield one path
-    error = False
+    # Test memory limit; a very low number should yield one path and then
+    # end the search
     gen = bfs_search(dg, 'D1', depth_limit=5, reverse=True, max_memory=16)
     _ = next(gen)
-    try:
-        _ = next(gen)
-    except (RuntimeError, StopIteration):
-        error = True
-    assert error
+    assert next(gen, None) is None
+
+
+def _tuple_bfs(g, source_node, depth_limit, max_per_node):
+    # The breadth first search that stores each path as a tuple
+    queue = deque([(source_node,)])
+    visited = {source_node}
+    while queue:
+        cur_path = queue.popleft()
+        yielded_neighbors = 0
+        for neighb in get_sorted_neighbors(g, cur_path[-1], False):
+            if neighb in visited:
+                continue
+            visited.add(neighb)
+            new_path = cur_path + (neighb,)
+            if len(new_path) > depth_limit + 1:
+                continue
+            yield new_path
+            yielded_neighbors += 1
+            queue.append(new_path)
+            if max_per_node and yielded_neighbors >= max_per_node:
+                break
+
+
+def test_bfs_parent_pointers():
+    g = nx.gnm_random_graph(200, 1000, seed=0, directed=True)
+    for u, v in g.edges:
+        g.edges[u, v]['belief'] = ((u * 31 + v * 17) % 100) / 100
+    for depth_limit, max_per_node in [(1, None), (3, None), (4, 2)]:
+        paths = list(bfs_search(g, 0, depth_limit=depth_limit,
+                                max_per_node=max_per_node))
+        assert paths == list(_tuple_bfs(g, 0, depth_limit, max_per_node))
+    # A small memory limit ends the search without an error after a part
+    # of the paths was yielded
+    limited_paths = list(bfs_search(g, 0, depth_limit=4, max_per_node=None,
+                                    max_memory=2000))
+    all_paths = list(bfs_search(g, 0, depth_limit=4, max_per_node=None))
+    assert 0 < len(limited_paths) < len(all_paths)
+    assert limited_paths == all_paths[:len(limited_paths)]
+
+    # Paths as long as the depth limit are not extended so the neighbors of
+    # their last node are never looked up. Node n of this infinite binary
+    # tree is at depth log2(n + 1).
+    expanded = []
+
+    def get_neighbors(node):
+        expanded.append(node)
+        return [2 * node + 1, 2 * node + 2]
+
+    paths = list(_bfs_search(0, get_neighbors, None, None, None, False, 3,
+                             None, None, None, None, None, None, 2 ** 30))
+    assert len(paths) == 2 + 4 + 8
+    assert max(len(path) for path in paths) == 4
+    assert expanded == list(range(7))
 
 
 def test_signed_bfs():
@@ -191,6 +245,18 @@ def test_signed_bfs():
     assert len(paths) == 13, len(paths)
 
 
+def test_sources_cache():
+    seg, sng, all_ns = _setup_signed_graph()
+    cache = SourcesCache(sng, max_targets=1)
+    nodes = list(sng.nodes)
+    for target in [('D1', INT_PLUS), ('D1', INT_MINUS)]:
+        for sources in [nodes, nodes[:5], [('A1', INT_PLUS)], []]:
+            assert cache.find_sources(target, sources) == \
+                list(find_sources(sng, target, sources))
+        # Only the sources of the most recent target are kept
+        assert list(cache._target_sources) == [target]
+
+
 def test_shortest_simple_paths_mod_unsigned():
     dg, all_ns = _setup_unsigned_graph()
     dg.add_edge('B1', 'A3', belief=0.7, weight=-np.log(0.7))  # Add long path
@@ -394,6 +460,43 @@ def test_bfs_strict_mesh_id_filtering():
     assert set(paths) == expected
 
 
+def test_edge_filter_index():
+    dg = _setup_unsigned_graph()[0]
+    edge_hashes = dg.graph['hashes']
+    edge_filter = EdgeFilterIndex.from_graph(
+        dg, mesh_hashes={'D000001': [11, 12], 'D000002': [21]})
+    hashes = edge_filter.get_hashes(['D000001', 'D000002'])
+    assert hashes == {11, 12, 21}
+    assert edge_filter.get_allowed_edges(hashes) == \
+        {('A1', 'B1'), ('B1', 'C1'), ('B2', 'C1')}
+    assert edge_filter.get_ref_counts([12, 22, 13]) == \
+        {('B1', 'C1'): 2, ('B3', 'C1'): 1}
+    ref_counts_function = edge_filter.get_ref_counts_function([12, 13])
+    assert ref_counts_function(dg, 'B1', 'C1') == (1, 2)
+    assert ref_counts_function(dg, 'Z1', 'A1') == (0, 0)
+    view = edge_filter.get_filtered_view(dg, [11, 12])
+    assert set(view.edges) == {('A1', 'B1'), ('B1', 'C1')}
+
+    # Searches using the index find the same paths as those checking
+    # every edge
+    for hashes in [[11, 12, 13], [21, 22, 23, 24, 25]]:
+        def allow_edge(u, v):
+            return set(hashes) & set(edge_hashes.get((u, v), []))
+        assert set(bfs_search(dg, 'C1', depth_limit=6, reverse=True,
+                              strict_mesh_id_filtering=True, hashes=hashes,
+                              edge_filter=edge_filter)) == \
+            set(bfs_search(dg, 'C1', depth_limit=6, reverse=True,
+                           strict_mesh_id_filtering=True, hashes=hashes,
+                           allow_edge=allow_edge))
+        paths = list(open_dijkstra_search(dg, 'C1', reverse=True,
+                                          hashes=hashes,
+                                          edge_filter=edge_filter))
+        assert len(paths) == 8
+    # Weighting edges by hashes doesn't change the graph's edge data
+    assert all(set(data) == {'belief', 'weight'}
+               for _, _, data in dg.edges(data=True))
+
+
 def test_open_dijksta():
     dg, all_ns = _setup_unsigned_graph()
     dg.add_edge('A3', 'B1', belief=0.7, weight=-np.log(0.7))
@@ -509,6 +612,38 @@ def test_open_dijksta():
     ]
 
 
+def test_compiled_graph():
+    dg, all_ns = _setup_unsigned_graph()
+    seg, sng, _ = _setup_signed_graph()
+    cdg = CompiledGraph.from_graph(dg)
+    csng = CompiledGraph.from_graph(sng)
+    assert cdg.number_of_nodes() == dg.number_of_nodes()
+    assert cdg.number_of_edges() == dg.number_of_edges()
+    assert 'C1' in cdg and 'X' not in cdg
+
+    for g, cg, source, kwargs in [
+            (dg, cdg, 'C1', {'reverse': True, 'depth_limit': 5}),
+            (dg, cdg, 'A1', {'depth_limit': 3, 'node_filter': ['hgnc']}),
+            (sng, csng, ('D1', INT_PLUS), {'reverse': True, 'depth_limit': 5,
+                                           'node_filter': all_ns,
+                                           'sign': INT_PLUS})]:
+        assert list(bfs_search(cg, source, **kwargs)) == \
+            list(bfs_search(g, source, **kwargs))
+        for reverse in [False, True]:
+            assert list(open_dijkstra_search(cg, source, reverse=reverse,
+                                             weight='weight')) == \
+                list(open_dijkstra_search(g, source, reverse=reverse,
+                                          weight='weight'))
+
+    for weight in [None, 'weight']:
+        for g, cg, source, target in [
+                (dg, cdg, 'Z1', 'D1'),
+                (sng, csng, ('Z1', INT_PLUS), ('D1', INT_MINUS))]:
+            assert list(shortest_simple_paths(cg, source, target,
+                                              weight=weight)) == \
+                list(shortest_simple_paths(g, source, target, weight=weight))
+
+
 def test_simple_paths_with_constraints():
     dg, all_ns = _setup_unsigned_graph()
     # Add more edges to create more paths
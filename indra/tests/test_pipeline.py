@@ -1,4 +1,6 @@
-from indra.pipeline import AssemblyPipeline, RunnableArgument
+import tempfile
+from indra.pipeline import AssemblyPipeline, RunnableArgument, StepCache
+from indra.pipeline.cache import get_statements_fingerprint
 from indra.pipeline.pipeline import jsonify_arg_input
 from indra.tests.test_assemble_corpus import st1, st2, st3, st4
 from indra.tools.assemble_corpus import *
@@ -7,7 +9,8 @@ from indra.preassembler.custom_preassembly import location_matches, \
 from indra.belief.wm_scorer import *
 from indra.belief import BeliefScorer
 from indra.ontology.world import world_ontology
-from indra.statements import Activation
+from indra.statements import Activation, Agent, BoundCondition, Evidence, \
+    Phosphorylation
 
 
 stmts = [st1, st2, st3, st4]
@@ -38,6 +41,129 @@ def test_running_pipeline():
     assert len(assembled_stmts2) == 2
 
 
+def test_running_pipeline_stream():
+    ap = AssemblyPipeline.from_json_file(test_json)
+    ap.insert(1, filter_by_type, Activation, invert=True)
+    ap.append(filter_top_level)
+    ap.append(filter_no_hypothesis)
+    assert ap.is_streamable(ap.steps[0])
+    assert not ap.is_streamable(ap.steps[2])
+    assembled_stmts = ap.run(stmts)
+    timings = ap.timings
+    assert [timing['function'] for timing in timings] == \
+        [step['function'] for step in ap.steps]
+    # The statements are passed through the filters in small chunks
+    ap.stream_chunk_size = 1
+    assembled_stmts_stream = ap.run(stmts, stream=True)
+    assert [st.get_hash() for st in assembled_stmts_stream] == \
+        [st.get_hash() for st in assembled_stmts]
+    assert [(timing['function'], timing['n_in'], timing['n_out'])
+            for timing in ap.timings] == \
+        [(timing['function'], timing['n_in'], timing['n_out'])
+         for timing in timings]
+
+
+def test_pipeline_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = StepCache(cache_dir)
+        steps = [{'function': 'filter_no_hypothesis'},
+                 {'function': 'filter_grounded_only'}]
+        ap = AssemblyPipeline(steps, cache=cache)
+        assembled_stmts = ap.run(stmts)
+        assert len(ap.timings) == 2
+        # The results of both steps are loaded from the cache
+        ap = AssemblyPipeline(steps, cache=cache)
+        assert [st.uuid for st in ap.run(stmts)] == \
+            [st.uuid for st in assembled_stmts]
+        assert not ap.timings
+        # Only the changed last step is run
+        ap = AssemblyPipeline(steps[:1] + [{'function': 'filter_top_level'}],
+                              cache=cache)
+        ap.run(stmts, stream=True)
+        assert [timing['function'] for timing in ap.timings] == \
+            ['filter_top_level']
+        # Statements that are different aren't loaded from the cache
+        ap = AssemblyPipeline(steps, cache=cache)
+        ap.run(stmts[:2])
+        assert len(ap.timings) == 2
+
+
+def test_statements_fingerprint():
+    def get_stmts(text='x'):
+        mek = Agent('MAP2K1', db_refs={'HGNC': '6840'})
+        erk = Agent('MAPK1', db_refs={'HGNC': '6871'})
+        st1 = Phosphorylation(mek, erk,
+                              evidence=[Evidence('reach', text=text)])
+        st2 = Phosphorylation(mek, erk, 'T', '185',
+                              evidence=[Evidence('sparser')])
+        st1.supported_by = [st2]
+        st2.supports = [st1]
+        return [st1, st2]
+    # The same statements built twice have the same fingerprint, also after
+    # their hashes and matches keys are computed
+    stmts1 = get_stmts()
+    fingerprint = get_statements_fingerprint(stmts1)
+    stmts2 = get_stmts()
+    for stmt in stmts2:
+        stmt.get_hash(shallow=False)
+        stmt.matches_key()
+    assert get_statements_fingerprint(stmts2) == fingerprint
+    assert get_statements_fingerprint(get_stmts('y')) != fingerprint
+    assert get_statements_fingerprint(stmts1[:1]) != fingerprint
+    # Hashes cached in linked statements, e.g., with a custom matches key
+    # function, are neither used nor changed
+    stmts3 = get_stmts()
+    custom_hash = stmts3[1].get_hash(matches_fun=lambda stmt: 'x')
+    assert get_statements_fingerprint(stmts3[:1]) == \
+        get_statements_fingerprint(stmts1[:1])
+    assert stmts3[1].get_hash() == custom_hash
+
+
+def test_running_pipeline_n_jobs():
+    steps = [{'function': 'filter_by_type', 'args': [{'stmt_type':
+                                                      'Activation'}],
+              'kwargs': {'invert': True}},
+             {'function': 'filter_no_hypothesis', 'kwargs': {'n_jobs': 2,
+                                                             'chunk_size': 1}},
+             {'function': 'map_grounding', 'kwargs': {'n_jobs': 2}},
+             {'function': 'map_sequence', 'kwargs': {'n_jobs': 2,
+                                                     'chunk_size': 1}}]
+    ap = AssemblyPipeline(steps)
+    # Steps run in worker processes aren't fused when streaming
+    assert ap.is_streamable(steps[0])
+    assert not ap.is_streamable(steps[1])
+    assembled_stmts = ap.run(stmts, stream=True)
+    for step in steps:
+        step.get('kwargs', {}).pop('n_jobs', None)
+    assembled_stmts_serial = AssemblyPipeline(steps).run(stmts)
+    assert [st.get_hash() for st in assembled_stmts] == \
+        [st.get_hash() for st in assembled_stmts_serial]
+
+
+def test_filter_n_jobs_returns_given_stmts():
+    st_gen = Phosphorylation(Agent('MEK'), Agent('ERK'))
+    st_spec = Phosphorylation(Agent('MEK'), Agent('ERK'), 'S')
+    st_gen.supported_by = [st_spec]
+    st_spec.supports = [st_gen]
+    stmts_in = [st_spec, st_gen, st1, st2, st3]
+    # Filtered statements aren't copies so they still support each other
+    stmts_out = filter_top_level(stmts_in, n_jobs=2, chunk_size=1)
+    assert [id(st) for st in stmts_out] == \
+        [id(st) for st in filter_top_level(stmts_in)]
+    stmts_out = filter_by_type(stmts_in, Phosphorylation, n_jobs=2)
+    assert stmts_out[0] is st_spec and stmts_out[1] is st_gen
+    assert stmts_out[0].supports[0] is stmts_out[1]
+    # Filters that change statements in place change the given ones
+    erk = Agent('MAPK1', db_refs={'HGNC': '6871'},
+                bound_conditions=[BoundCondition(Agent('x'))])
+    st_bound = Phosphorylation(Agent('MAP2K1', db_refs={'HGNC': '6840'}),
+                               erk)
+    stmts_out = filter_grounded_only([st_bound], remove_bound=True,
+                                     n_jobs=2)
+    assert stmts_out == [st_bound]
+    assert not st_bound.sub.bound_conditions
+
+
 def test_pipeline_methods():
     ap = AssemblyPipeline()
     assert len(ap) == 0
@@ -1,7 +1,9 @@
 import os
+import tempfile
 
 from indra.preassembler import Preassembler, render_stmt_graph, \
-    flatten_evidence, flatten_stmts, bio_ontology_refinement_filter
+    flatten_evidence, flatten_stmts, bio_ontology_refinement_filter, \
+    get_possible_contradicts
 from indra.sources import reach
 from indra.statements import *
 from indra.ontology.bio import bio_ontology
@@ -715,6 +717,25 @@ def test_find_contradicts_refinement():
                                       {st1.uuid, st3.uuid})
 
 
+def test_find_contradicts_poolsize():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    braf = Agent('BRAF', db_refs={'HGNC': '1097'})
+    stmts = [Activation(braf, ras), Inhibition(braf, kras),
+             Inhibition(braf, hras), Inhibition(hras, braf),
+             Phosphorylation(braf, ras, 'S', '1'),
+             Dephosphorylation(braf, kras, 'S', '2')]
+    pa = Preassembler(bio_ontology, stmts)
+    # Only statements whose agents are related can contradict
+    pairs = get_possible_contradicts(pa.stmts, [0], [1, 2, 3],
+                                     bio_ontology)
+    assert pairs == [(0, 1), (0, 2)]
+    contradicts = pa.find_contradicts(poolsize=2)
+    assert [(s1.uuid, s2.uuid) for s1, s2 in contradicts] == \
+        [(stmts[0].uuid, stmts[1].uuid), (stmts[0].uuid, stmts[2].uuid)]
+
+
 def test_preassemble_related_complex():
     ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
     kras = Agent('KRAS', db_refs={'HGNC': '6407'})
@@ -1086,3 +1107,136 @@ def test_refinement_filters():
     pa.combine_related(filters=[filter_all, filter_empty,
                                 bio_ontology_refinement_filter])
     assert pa._comparison_counter == 0, pa._comparison_counter
+
+
+def test_combine_related_poolsize():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    stmts = [Phosphorylation(Agent('x'), ras),
+             Phosphorylation(Agent('x'), kras),
+             Phosphorylation(Agent('x'), kras, 'S'),
+             Phosphorylation(Agent('x'), hras),
+             Activation(Agent('x'), ras),
+             Activation(Agent('x'), kras)]
+    pa = Preassembler(bio_ontology, stmts)
+    unique_stmts = pa.combine_duplicates()
+    maps = pa._generate_id_maps(unique_stmts)
+    assert len(maps) == 5, maps
+    # With a size cutoff of 1, all statement types are sent to workers
+    pa_par = Preassembler(bio_ontology, stmts)
+    unique_stmts = pa_par.combine_duplicates()
+    maps_par = pa_par._generate_id_maps(unique_stmts, poolsize=2,
+                                        size_cutoff=1)
+    assert maps_par == maps, maps_par
+    assert pa_par._comparison_counter == pa._comparison_counter
+    # With a large size cutoff, all comparisons are done locally
+    pa_loc = Preassembler(bio_ontology, stmts)
+    unique_stmts = pa_loc.combine_duplicates()
+    maps_loc = pa_loc._generate_id_maps(unique_stmts, poolsize=2,
+                                        size_cutoff=100)
+    assert maps_loc == maps, maps_loc
+    # Make sure the supports/supported_by hierarchy is the same too
+    pa_par = Preassembler(bio_ontology, stmts)
+    top_level = pa_par.combine_related(poolsize=2, size_cutoff=1)
+    assert len(top_level) == 3, top_level
+
+
+def test_combine_related_incremental():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    st1 = Phosphorylation(Agent('x'), ras, evidence=[Evidence(text='a')])
+    st2 = Phosphorylation(Agent('x'), kras, evidence=[Evidence(text='b')])
+    st3 = Phosphorylation(Agent('x'), kras, 'S', evidence=[Evidence(text='c')])
+    st4 = Phosphorylation(Agent('x'), kras, evidence=[Evidence(text='d')])
+    st5 = Phosphorylation(Agent('x'), hras, evidence=[Evidence(text='e')])
+    st6 = Phosphorylation(Agent('x'), ras, evidence=[Evidence(text='a')])
+    pa = Preassembler(bio_ontology, [st2])
+    top_level = pa.combine_related()
+    assert len(top_level) == 1
+    # This adds a more generic and a more specific statement
+    top_level = pa.combine_related_incremental([st1, st3])
+    assert len(top_level) == 1, top_level
+    assert top_level[0].residue == 'S'
+    assert len(pa.unique_stmts) == 3
+    # This adds a duplicate with new evidence, a duplicate with existing
+    # evidence and a new statement
+    top_level = pa.combine_related_incremental([st4, st5, st6])
+    assert len(pa.unique_stmts) == 4
+    assert len(top_level) == 2, top_level
+    stmts_by_hash = {st.get_hash(): st for st in pa.unique_stmts}
+    assert len(stmts_by_hash[st2.get_hash()].evidence) == 2
+    assert len(stmts_by_hash[st1.get_hash()].evidence) == 1
+    assert len(stmts_by_hash[st1.get_hash()].supported_by) == 0
+    assert len(stmts_by_hash[st1.get_hash()].supports) == 3
+
+    # The result should be the same as assembling everything at once
+    pa_all = Preassembler(bio_ontology, [st1, st2, st3, st4, st5, st6])
+    top_level_all = pa_all.combine_related()
+    assert {st.get_hash() for st in top_level} == \
+        {st.get_hash() for st in top_level_all}
+    for stmt in pa_all.unique_stmts:
+        inc_stmt = stmts_by_hash[stmt.get_hash()]
+        assert {st.get_hash() for st in stmt.supports} == \
+            {st.get_hash() for st in inc_stmt.supports}
+        assert {st.get_hash() for st in stmt.supported_by} == \
+            {st.get_hash() for st in inc_stmt.supported_by}
+
+    # Finding refinements with filters drops the index of an earlier run
+    pa = Preassembler(bio_ontology, [st2, st3])
+    pa.combine_related()
+    assert pa._refinement_index is not None
+    pa._generate_id_maps(pa.unique_stmts[:1],
+                         filters=[bio_ontology_refinement_filter])
+    assert pa._refinement_index is None
+    top_level = pa.combine_related_incremental([st1])
+    assert len(top_level) == 1 and top_level[0].residue == 'S'
+    assert len(pa._refinement_index) == 3
+
+
+def test_merge_ev_key_keeps_annotations():
+    from indra.preassembler import _get_merge_ev_key
+    ev = Evidence(text='a', annotations={'prior_uuids': ['x'], 'y': 1})
+    key = _get_merge_ev_key(ev)
+    assert ev.annotations == {'prior_uuids': ['x'], 'y': 1}
+    assert key == Evidence(text='a', annotations={'y': 1}).matches_key()
+
+
+def test_combine_duplicates_external():
+    from indra.preassembler.external_dedup import \
+        combine_duplicates_external, iter_stmts_from_files
+    from indra.statements import stmts_to_json_file
+    from indra.util import fast_deepcopy
+    stmts = []
+    for idx in range(100):
+        sub = Agent('x%d' % (idx % 10))
+        stmts.append(Phosphorylation(Agent('a'), sub,
+                                     evidence=[Evidence(text='%d' % idx)]))
+    # An exact duplicate of evidence that should be removed
+    stmts.append(Phosphorylation(Agent('a'), Agent('x0'),
+                                 evidence=[Evidence(text='0')]))
+    # Combining duplicates changes the annotations of evidences in place
+    # so we work with copies of the statements
+    pa = Preassembler(bio_ontology)
+    unique_stmts = pa.combine_duplicate_stmts(fast_deepcopy(stmts))
+    assert len(unique_stmts) == 10
+
+    # We use a very small memory limit to force partitions to be split
+    ext_unique_stmts = list(combine_duplicates_external(fast_deepcopy(stmts),
+                                                        max_memory=1000,
+                                                        n_partitions=4))
+    assert len(ext_unique_stmts) == 10
+    assert {st.get_hash(): len(st.evidence) for st in unique_stmts} == \
+        {st.get_hash(): len(st.evidence) for st in ext_unique_stmts}
+
+    # Now stream the same statements from two files
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fnames = [os.path.join(tmp_dir, 'external_dedup_test.jsonl'),
+                  os.path.join(tmp_dir, 'external_dedup_test.json')]
+        stmts_to_json_file(stmts[:50], fnames[0], format='jsonl')
+        stmts_to_json_file(stmts[50:], fnames[1])
+        ext_unique_stmts = list(combine_duplicates_external(
+            iter_stmts_from_files(fnames)))
+    assert {st.get_hash(): len(st.evidence) for st in unique_stmts} == \
+        {st.get_hash(): len(st.evidence) for st in ext_unique_stmts}
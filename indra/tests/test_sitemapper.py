@@ -212,6 +212,29 @@ def test_site_map_within_bound_condition():
     validate_mapk1(mapped_s.obj.bound_conditions[0].agent)
 
 
+def test_map_sites_batched():
+    # Statements with only valid sites are returned as they are and the
+    # original statements aren't modified
+    (mapk1_invalid, mapk3_invalid) = get_invalid_mapks()
+    mapk1_valid = Agent('MAPK1',
+                        mods=[ModCondition('phosphorylation', 'T', '185')],
+                        db_refs={'UP': 'P28482'})
+    mapk3_invalid.bound_conditions = [BoundCondition(mapk1_invalid)]
+    st1 = Phosphorylation(mapk1_valid, Agent('MAPK3', db_refs={'UP':
+                                                              'P27361'}),
+                          'Y', '204')
+    st2 = Activation(mapk1_valid, mapk3_invalid, 'kinase')
+    st3 = Phosphorylation(mapk1_valid, mapk1_invalid, 'Y', '185')
+    stmt_jsons = [st.to_json() for st in (st1, st2, st3)]
+    valid, mapped = sm.map_sites([st1, st2, st3])
+    assert len(valid) == 1
+    assert valid[0] is st1
+    assert [ms.original_stmt for ms in mapped] == [st2, st3]
+    validate_mapk1(mapped[0].mapped_stmt.obj.bound_conditions[0].agent)
+    assert mapped[1].mapped_stmt.position == '187'
+    assert [st.to_json() for st in (st1, st2, st3)] == stmt_jsons
+
+
 def test_invalid_position():
     stmt = Phosphorylation._from_json({
         'enz': {'name': 'CFD'},
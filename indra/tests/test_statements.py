@@ -2049,3 +2049,32 @@ def test_real_agent_list():
     agents = Phosphorylation(None, x).real_agent_list()
     assert len(agents) == 1
     assert agents[0] == x
+
+
+def test_key_caching():
+    braf = Agent('BRAF', db_refs={'HGNC': '1097'})
+    mek = Agent('MAP2K1', db_refs={'HGNC': '6840'},
+                bound_conditions=[BoundCondition(Agent('KRAS'))])
+    stmt = Phosphorylation(braf, mek, 'S', '218')
+    key = stmt.matches_key()
+    with key_caching():
+        assert stmt.matches_key() == key
+        # Changes made in place are only picked up after invalidation
+        mek.bound_conditions[0].agent.db_refs['HGNC'] = '6407'
+        assert stmt.matches_key() == key
+        stmt.invalidate()
+        new_key = stmt.matches_key()
+        assert new_key != key
+        # Generic copies don't carry over the cache
+        assert stmt.make_generic_copy().matches_key() == new_key
+        # Nested blocks share the same cache
+        with key_caching():
+            assert stmt.matches_key() == new_key
+    # No cached keys are left on the objects after the block
+    assert all(not attr.startswith('_key')
+               for obj in [stmt, braf, mek] for attr in obj.__dict__)
+    # Keys cached in an earlier block are not reused
+    mek.bound_conditions[0].agent.db_refs['HGNC'] = '5173'
+    assert stmt.matches_key() not in {key, new_key}
+    with key_caching():
+        assert stmt.matches_key() not in {key, new_key}
@@ -1,7 +1,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
+import os
 import json
 import datetime
+import tempfile
 import jsonschema
 from indra.statements import *
 from .test_json_schema import schema
@@ -384,3 +386,68 @@ def test_file_serialization_json_lines():
     stmts_to_json_file([stmt], 'test_indra_stmts.json', format='jsonl')
     stmts = stmts_from_json_file('test_indra_stmts.json', format='jsonl')
     assert stmts[0].matches(stmt)
+
+
+def test_file_serialization_streaming():
+    from indra.statements import io
+    stmts = [Phosphorylation(Agent('a%d' % i), Agent('b'), 'S', str(i),
+                             evidence=[ev]) for i in range(25)]
+    stmts[0].supports = [stmts[1]]
+    stmts[1].supported_by = [stmts[0]]
+    chunk_sizes = io.JSON_WRITE_CHUNK_SIZE, io.JSON_READ_CHUNK_SIZE
+    io.JSON_WRITE_CHUNK_SIZE, io.JSON_READ_CHUNK_SIZE = 10, 100
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # The output has to be the same as when dumping all the JSON at
+            # once
+            fname = os.path.join(tmp_dir, 'test_indra_stmts.json')
+            stmts_to_json_file(iter(stmts), fname)
+            with open(fname, 'r') as fh:
+                assert fh.read() == json.dumps(stmts_to_json(stmts),
+                                               indent=1)
+            for fname in ['test_indra_stmts.json',
+                          'test_indra_stmts.jsonl.gz']:
+                fmt = 'jsonl' if '.jsonl' in fname else 'json'
+                fname = os.path.join(tmp_dir, fname)
+                stmts_to_json_file(stmts, fname, format=fmt)
+                loaded = stmts_from_json_file(fname, format=fmt)
+                assert [s.get_hash() for s in loaded] == \
+                    [s.get_hash() for s in stmts]
+                assert loaded[0].supports[0] is loaded[1]
+                streamed = list(iter_stmts_from_json_file(fname))
+                assert [s.get_hash() for s in streamed] == \
+                    [s.get_hash() for s in stmts]
+                # Streamed statements can't be linked to each other
+                assert streamed[0].supports == [stmts[1].uuid]
+            # Lists that are formatted differently are streamed the same
+            fname = os.path.join(tmp_dir, 'test_indra_stmts_compact.json')
+            with open(fname, 'w') as fh:
+                json.dump(stmts_to_json(stmts), fh)
+            streamed = list(iter_stmts_from_json_file(fname))
+            assert [s.get_hash() for s in streamed] == \
+                [s.get_hash() for s in stmts]
+    finally:
+        io.JSON_WRITE_CHUNK_SIZE, io.JSON_READ_CHUNK_SIZE = chunk_sizes
+
+
+def test_file_serialization_lazy():
+    stmts = [Phosphorylation(Agent('a%d' % i), Agent('b'), 'S', str(i),
+                             evidence=[ev]) for i in range(5)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jsonl_fname = os.path.join(tmp_dir, 'test_indra_stmts.jsonl')
+        stmts_to_json_file(stmts, jsonl_fname, format='jsonl')
+        lazy_stmts = list(iter_stmts_from_json_file(jsonl_fname, lazy=True))
+        assert all(isinstance(s, LazyStatement) for s in lazy_stmts)
+        assert [s.get_hash() for s in lazy_stmts] == \
+            [s.get_hash() for s in stmts]
+        assert lazy_stmts[0].type == 'Phosphorylation'
+        assert not any(s.is_loaded() for s in lazy_stmts)
+        # Accessing an attribute deserializes the statement
+        assert lazy_stmts[2].position == '2'
+        assert lazy_stmts[2].is_loaded()
+        assert lazy_stmts[2].stmt.matches(stmts[2])
+        # Lazy statements can be written back out
+        json_fname = os.path.join(tmp_dir, 'test_indra_stmts.json')
+        stmts_to_json_file(lazy_stmts, json_fname)
+        assert [s.get_hash() for s in stmts_from_json_file(json_fname)] == \
+            [s.get_hash() for s in stmts]
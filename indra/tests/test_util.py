@@ -1,3 +1,7 @@
+import os
+import pickle
+import tempfile
+from unittest import mock
 from io import BytesIO
 import xml.etree.ElementTree as ET
 
@@ -5,6 +9,9 @@ from indra.statements import Statement
 
 from indra.util import unicode_strs
 from indra.util import UnicodeXMLTreeBuilder as UTB
+from indra.util import LazyTables, LazyTable
+from indra.resources import snapshot
+from indra.resources.snapshot import build_snapshot, get_snapshot
 from indra.util.statement_presentation import _get_relation_keyed_stmts
 
 
@@ -29,3 +36,113 @@ def test_conversion_keying():
     list(_get_relation_keyed_stmts(stmt_list))
     return
 
+
+
+def test_lazy_tables():
+    loaded = []
+
+    def load_pair():
+        loaded.append('pair')
+        return {'a': 1}, {1: 'a'}
+
+    tables = LazyTables({('forward', 'reverse'): load_pair,
+                         'single': lambda: loaded.append('single') or [1]})
+    assert 'forward' in tables and 'single' in tables
+    assert 'other' not in tables
+    assert not loaded
+    # Tables that are loaded together are loaded once
+    assert tables.reverse[1] == 'a'
+    assert tables.forward['a'] == 1
+    assert loaded == ['pair']
+    assert tables.single == [1]
+    assert loaded == ['pair', 'single']
+    try:
+        tables.other
+        assert False
+    except AttributeError:
+        pass
+
+
+def test_lazy_table():
+    loaded = []
+    tables = LazyTables({'squares': lambda: loaded.append('squares') or
+                         {x: x * x for x in range(5)}})
+    squares = LazyTable(tables, 'squares')
+    assert not loaded
+    assert squares[2] == 4 and 3 in squares and len(squares) == 5
+    assert squares.get(5) is None
+    assert dict(squares.items()) == squares.table == squares
+    assert sorted(squares) == list(range(5))
+    assert loaded == ['squares']
+    # Module attributes bound to lazy tables are available without a module
+    # __getattr__, which requires Python 3.7
+    from indra.databases import drugbank_client
+    assert isinstance(drugbank_client.drugbank_names, LazyTable)
+    assert drugbank_client.drugbank_names.table is \
+        drugbank_client._tables.drugbank_names
+
+
+def test_resource_snapshot():
+    path = os.path.join(tempfile.mkdtemp(), 'resource_tables.snapshot')
+    build_snapshot(path, ['indra.databases.mirbase_client',
+                          'indra.databases.drugbank_client'])
+    snapshot = get_snapshot(path)
+    assert snapshot is not None
+    from indra.databases import mirbase_client, drugbank_client
+    for lazy_tables, name in [(mirbase_client._tables, 'mirbase_id_to_name'),
+                              (drugbank_client._tables, 'db_to_drugbank')]:
+        table = lazy_tables.load(name)[name]
+        snapshot_table = snapshot.get_table('%s.%s' % (lazy_tables.name,
+                                                      name))
+        assert len(snapshot_table) == len(table)
+        assert list(snapshot_table.items()) == list(table.items())
+        for key in list(table)[::100]:
+            assert snapshot_table[key] == table[key]
+        assert snapshot_table.get('xxx') is None
+        assert pickle.loads(pickle.dumps(snapshot_table)) is snapshot_table
+    assert snapshot.get_table('indra.databases.mirbase_client.xxx') is None
+
+
+def test_resource_snapshot_materialize():
+    path = os.path.join(tempfile.mkdtemp(), 'resource_tables.snapshot')
+    build_snapshot(path, ['indra.databases.mirbase_client'])
+    from indra.databases import mirbase_client
+    name = 'mirbase_id_to_name'
+    table = mirbase_client._tables.load(name)[name]
+    snapshot_table = get_snapshot(path).get_table(
+        'indra.databases.mirbase_client.%s' % name)
+    materialized = []
+    snapshot_table.on_materialize.append(materialized.append)
+    # Tables are always looked up in the snapshot by default
+    keys = list(table)
+    for key in keys:
+        assert snapshot_table[key] == table[key]
+    assert not materialized
+    # Tables that opt in are copied into a dict once they have been looked
+    # up for an eighth of their size
+    tables = LazyTables({name: lambda: table},
+                        name='indra.databases.mirbase_client',
+                        materialize=[name])
+    with mock.patch.object(snapshot, 'SNAPSHOT_PATH', path):
+        snapshot_table = tables.mirbase_id_to_name
+    assert snapshot_table.materialize_ratio == 0.125
+    for key in keys[:len(keys) // 8]:
+        assert snapshot_table[key] == table[key]
+    assert not materialized
+    assert snapshot_table[keys[-1]] == table[keys[-1]]
+    assert materialized == [table]
+    assert tables.mirbase_id_to_name is materialized[0]
+    assert snapshot_table.get('xxx') is None
+    assert list(snapshot_table.items()) == list(table.items())
+
+
+def test_resource_snapshot_mtime():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.makedirs(os.path.join(tmp_dir, 'famplex'))
+        fname = os.path.join(tmp_dir, 'famplex', 'entities.csv')
+        with open(fname, 'w') as fh:
+            fh.write('x')
+        os.utime(fname, (1e9, 2e9))
+        # Files in subfolders of the resources are taken into account
+        with mock.patch.object(snapshot, 'RESOURCES_PATH', tmp_dir):
+            assert snapshot._get_resources_mtime() == 2e9
@@ -14,7 +14,8 @@ from copy import deepcopy, copy
 from indra.statements import *
 from indra.belief import BeliefEngine
 from indra.util import read_unicode_csv
-from indra.pipeline import register_pipeline
+from indra.pipeline import register_pipeline, streamable
+from indra.pipeline.parallel import map_chunks
 from indra.mechlinker import MechLinker
 from indra.databases import hgnc_client
 from indra.ontology.bio import bio_ontology
@@ -88,7 +89,9 @@ def load_statements(fname, as_dict=False):
 @register_pipeline
 def map_grounding(stmts_in, do_rename=True, grounding_map=None,
                   misgrounding_map=None, agent_map=None, ignores=None, use_adeft=True,
-                  gilda_mode=None, grounding_map_policy='replace', **kwargs):
+                  gilda_mode=None, grounding_map_policy='replace',
+                  by_signature=False, poolsize=None, n_jobs=None,
+                  chunk_size=None, **kwargs):
     """Map grounding using the GroundingMapper.
 
     Parameters
@@ -120,6 +123,19 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     grounding_map_policy : Optional[str]
         If a grounding map is provided, use the policy to extend or replace
         a default grounding map. Default: 'replace'.
+    by_signature : Optional[bool]
+        If True, the grounding of each distinct agent name and db_refs is
+        mapped once and applied to all agents with the same name and
+        db_refs. See GroundingMapper.map_stmts. Default: False
+    poolsize : Optional[int]
+        If by_signature is True, the number of processes used to map
+        statements with agents that are disambiguated. Default: None
+    n_jobs : Optional[int]
+        The number of processes used to map chunks of statements, see
+        :py:func:`indra.pipeline.parallel.map_chunks`. The grounding mapper
+        is set up once in each process. Default: None
+    chunk_size : Optional[int]
+        The number of statements in each chunk if n_jobs is given.
 
     Returns
     -------
@@ -129,6 +145,8 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     from indra.preassembler.grounding_mapper import GroundingMapper,\
         default_agent_map, default_grounding_map, default_ignores, \
         default_misgrounding_map
+    from indra.preassembler.grounding_mapper.mapper import \
+        _init_grounding_mapper_worker
     logger.info('Mapping grounding on %d statements...' % len(stmts_in))
     ignores = ignores if ignores else default_ignores
     gm = grounding_map
@@ -143,7 +161,18 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     gm = GroundingMapper(gm, agent_map=agent_map,
                          misgrounding_map=misgm, ignores=ignores,
                          use_adeft=use_adeft, gilda_mode=gilda_mode)
-    stmts_out = gm.map_stmts(stmts_in, do_rename=do_rename)
+    if n_jobs is not None and n_jobs > 1:
+        chunks_out = map_chunks(_map_grounding_chunk, stmts_in,
+                                kwargs={'mapper': gm, 'do_rename': do_rename,
+                                        'by_signature': by_signature},
+                                n_jobs=n_jobs, chunk_size=chunk_size,
+                                initializer=_init_grounding_mapper_worker,
+                                initargs=(gm, do_rename))
+        stmts_out = [stmt for chunk_out in chunks_out for stmt in chunk_out]
+    else:
+        stmts_out = gm.map_stmts(stmts_in, do_rename=do_rename,
+                                 by_signature=by_signature,
+                                 poolsize=poolsize)
     # Patch wrong locations in Translocation statements
     for stmt in stmts_out:
         if isinstance(stmt, Translocation):
@@ -157,6 +186,11 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     return stmts_out
 
 
+def _map_grounding_chunk(stmts, mapper, do_rename, by_signature):
+    return mapper.map_stmts(stmts, do_rename=do_rename,
+                            by_signature=by_signature)
+
+
 @register_pipeline
 def merge_groundings(stmts_in):
     """Gather and merge original grounding information from evidences.
@@ -314,7 +348,8 @@ def merge_deltas(stmts_in):
 
 @register_pipeline
 def map_sequence(stmts_in, do_methionine_offset=True,
-                 do_orthology_mapping=True, do_isoform_mapping=True, **kwargs):
+                 do_orthology_mapping=True, do_isoform_mapping=True,
+                 n_jobs=None, chunk_size=None, **kwargs):
     """Map sequences using the SiteMapper.
 
     Parameters
@@ -343,6 +378,11 @@ def map_sequence(stmts_in, do_methionine_offset=True,
         SITEMAPPER_CACHE_PATH, defined in your INDRA config or the environment.
         If False, no cache is used. For more details on the cache, see the
         SiteMapper class definition.
+    n_jobs : Optional[int]
+        The number of processes used to map chunks of statements, see
+        :py:func:`indra.pipeline.parallel.map_chunks`. Default: None
+    chunk_size : Optional[int]
+        The number of statements in each chunk if n_jobs is given.
     save : Optional[str]
         The name of a pickle file to save the results (stmts_out) into.
 
@@ -358,7 +398,15 @@ def map_sequence(stmts_in, do_methionine_offset=True,
                     do_methionine_offset=do_methionine_offset,
                     do_orthology_mapping=do_orthology_mapping,
                     do_isoform_mapping=do_isoform_mapping)
-    valid, mapped = sm.map_sites(stmts_in)
+    valid = []
+    mapped = []
+    # Valid and mapped statements are put together across chunks so that
+    # they are in the same order as when mapped all at once
+    for chunk_valid, chunk_mapped in map_chunks(
+            _map_sites_chunk, stmts_in, kwargs={'mapper': sm},
+            n_jobs=n_jobs, chunk_size=chunk_size):
+        valid += chunk_valid
+        mapped += chunk_mapped
     correctly_mapped_stmts = []
     for ms in mapped:
         correctly_mapped = all([mm.has_mapping() for mm in ms.mapped_mods])
@@ -373,6 +421,10 @@ def map_sequence(stmts_in, do_methionine_offset=True,
     return stmts_out
 
 
+def _map_sites_chunk(stmts, mapper):
+    return mapper.map_sites(stmts)
+
+
 @register_pipeline
 def run_preassembly(stmts_in, return_toplevel=True, poolsize=None,
                     size_cutoff=None, belief_scorer=None, ontology=None,
@@ -394,13 +446,12 @@ def run_preassembly(stmts_in, return_toplevel=True, poolsize=None,
     poolsize : Optional[int]
         The number of worker processes to use to parallelize the
         comparisons performed by the function. If None (default), no
-        parallelization is performed. NOTE: Parallelization is only
-        available on Python 3.4 and above.
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        Statement types with size_cutoff or more statements to compare are
+        sent to worker processes, while smaller groups are compared in the
+        parent process. Default value is 100. Not relevant when
+        parallelization is not used.
     belief_scorer : Optional[indra.belief.BeliefScorer]
         Instance of BeliefScorer class to use in calculating Statement
         probabilities. If None is provided (default), then the default
@@ -522,11 +573,15 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
         If True, only the top-level statements are returned. If False,
         all statements are returned irrespective of level of specificity.
         Default: True
+    poolsize : Optional[int]
+        The number of worker processes to use to parallelize the
+        comparisons performed by the function. If None (default), no
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        Statement types with size_cutoff or more statements to compare are
+        sent to worker processes, while smaller groups are compared in the
+        parent process. Default value is 100. Not relevant when
+        parallelization is not used.
     flatten_evidence : Optional[bool]
         If True, evidences are collected and flattened via supports/supported_by
         links. Default: False
@@ -546,9 +601,11 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
     logger.info('Combining related on %d statements...' %
                 len(preassembler.unique_stmts))
     return_toplevel = kwargs.get('return_toplevel', True)
+    poolsize = kwargs.get('poolsize', None)
     size_cutoff = kwargs.get('size_cutoff', 100)
     filters = kwargs.get('filters', None)
     stmts_out = preassembler.combine_related(return_toplevel=False,
+                                             poolsize=poolsize,
                                              size_cutoff=size_cutoff,
                                              filters=filters)
     # Calculate beliefs
@@ -577,6 +634,7 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_by_type(stmts_in, stmt_type, invert=False, **kwargs):
     """Filter to a given statement type.
 
@@ -688,6 +746,7 @@ def _any_bound_condition_fails_criterion(agent, criterion):
 
 
 @register_pipeline
+@streamable(in_place='remove_bound')
 def filter_grounded_only(stmts_in, score_threshold=None, remove_bound=False,
                          **kwargs):
     """Filter to statements that have grounded agents.
@@ -767,6 +826,7 @@ def _agent_is_gene(agent, specific_only):
 
 
 @register_pipeline
+@streamable(in_place='remove_bound')
 def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
                       **kwargs):
     """Filter to statements containing genes only.
@@ -819,6 +879,7 @@ def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
 
 
 @register_pipeline
+@streamable
 def filter_belief(stmts_in, belief_cutoff, **kwargs):
     """Filter to statements with belief above a given cutoff.
 
@@ -864,6 +925,7 @@ def filter_belief(stmts_in, belief_cutoff, **kwargs):
 
 
 @register_pipeline
+@streamable(in_place='remove_bound')
 def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
                      remove_bound=False, invert=False, **kwargs):
     """Return statements that contain genes given in a list.
@@ -971,6 +1033,7 @@ def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
 
 
 @register_pipeline
+@streamable
 def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
     """Return Statements that refer to concepts/agents given as a list of names.
 
@@ -1039,6 +1102,7 @@ def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
                       match_suffix=False, **kwargs):
     """Filter to Statements whose agents are grounded to a matching entry.
@@ -1118,6 +1182,7 @@ def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
 
 
 @register_pipeline
+@streamable(in_place='remove_bound')
 def filter_human_only(stmts_in, remove_bound=False, **kwargs):
     """Filter out statements that are grounded, but not to a human gene.
 
@@ -1171,6 +1236,7 @@ def filter_human_only(stmts_in, remove_bound=False, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_direct(stmts_in, **kwargs):
     """Filter to statements that are direct interactions
 
@@ -1219,6 +1285,7 @@ def filter_direct(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_no_hypothesis(stmts_in, **kwargs):
     """Filter to statements that are not marked as hypothesis in epistemics.
 
@@ -1255,6 +1322,7 @@ def filter_no_hypothesis(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_no_negated(stmts_in, **kwargs):
     """Filter to statements that are not marked as negated in epistemics.
 
@@ -1291,6 +1359,7 @@ def filter_no_negated(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_evidence_source(stmts_in, source_apis, policy='one', **kwargs):
     """Filter to statements that have evidence from a given set of sources.
 
@@ -1336,6 +1405,7 @@ def filter_evidence_source(stmts_in, source_apis, policy='one', **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_top_level(stmts_in, **kwargs):
     """Filter to statements that are at the top-level of the hierarchy.
 
@@ -1517,6 +1587,7 @@ def get_unreachable_mods(stmts_in):
 
 
 @register_pipeline
+@streamable(in_place='remove_bound')
 def filter_mutation_status(stmts_in, mutations, deletions, **kwargs):
     """Filter statements based on existing mutations/deletions
 
@@ -1584,6 +1655,7 @@ def filter_mutation_status(stmts_in, mutations, deletions, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_enzyme_kinase(stmts_in, **kwargs):
     """Filter Phosphorylations to ones where the enzyme is a known kinase.
 
@@ -1621,6 +1693,7 @@ def filter_enzyme_kinase(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_mod_nokinase(stmts_in, **kwargs):
     """Filter non-phospho Modifications to ones with a non-kinase enzyme.
 
@@ -1659,6 +1732,7 @@ def filter_mod_nokinase(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_transcription_factor(stmts_in, **kwargs):
     """Filter out RegulateAmounts where subject is not a transcription factor.
 
@@ -1696,6 +1770,7 @@ def filter_transcription_factor(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def filter_uuid_list(stmts_in, uuids, invert=True, **kwargs):
     """Filter to Statements corresponding to given UUIDs
 
@@ -1893,6 +1968,7 @@ def reduce_activities(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable
 def strip_agent_context(stmts_in, **kwargs):
     """Strip any context on agents within each statement.
 
@@ -1928,6 +2004,7 @@ def strip_agent_context(stmts_in, **kwargs):
 
 
 @register_pipeline
+@streamable(in_place=True)
 def standardize_names_groundings(stmts):
     """Standardize the names of Concepts with respect to an ontology.
 
@@ -1940,7 +2017,8 @@ def standardize_names_groundings(stmts):
     stmts : list[indra.statements.Statement]
         A list of statements whose Concept names should be standardized.
     """
-    print('Standardize names to groundings')
+    logger.info('Standardizing names to groundings on %d statements...' %
+                len(stmts))
     for stmt in stmts:
         for concept in stmt.agent_list():
             db_ns, db_id = concept.get_grounding()
@@ -1973,6 +2051,7 @@ def dump_stmt_strings(stmts, fname):
 
 
 @register_pipeline
+@streamable
 def rename_db_ref(stmts_in, ns_from, ns_to, **kwargs):
     """Rename an entry in the db_refs of each Agent.
 
@@ -2057,6 +2136,7 @@ def align_statements(stmts1, stmts2, keyfun=None):
 
 
 @register_pipeline
+@streamable
 def filter_complexes_by_size(stmts_in, members_allowed=5):
     """Filter out Complexes if the number of members exceeds specified allowed
     number.
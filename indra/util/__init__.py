@@ -1,10 +1,14 @@
+import os
 import sys
 import csv
 import gzip
 import zlib
+import shutil
 import logging
+import threading
 from io import BytesIO
-from functools import wraps
+from contextlib import contextmanager
+from functools import wraps, partial
 from datetime import datetime
 import xml.etree.ElementTree as ET
 try:  # Python 3
@@ -254,3 +258,225 @@ def batch_iter(iterator, batch_size, return_func=None, padding=None):
             yield gen
         else:
             yield return_func(gen)
+
+
+@contextmanager
+def atomic_replace(path):
+    """Return a context in which a file or directory replacing a path is
+    written.
+
+    The file or directory is written at a temporary path given by the
+    context, and is moved to the given path when the context exits without
+    an error, so that other processes never read it partially written. If
+    writing fails, the temporary file or directory is removed and the
+    given path is left as it was. A file or directory left at the
+    temporary path, e.g., by a process that was killed, is removed first.
+    Note that an existing directory at the path is removed right before it
+    is replaced, so only files are replaced atomically.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file or directory to replace.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     fname = os.path.join(tmp_dir, 'x.txt')
+    ...     with atomic_replace(fname) as tmp_fname:
+    ...         with open(tmp_fname, 'w') as fh:
+    ...             _ = fh.write('x')
+    ...     print(open(fname).read())
+    x
+    """
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    _remove_path(tmp_path)
+    try:
+        yield tmp_path
+        if os.path.isdir(tmp_path) and os.path.isdir(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+    finally:
+        _remove_path(tmp_path)
+
+
+def _remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+class LazyTables(object):
+    """Resource tables that are loaded when they are first accessed.
+
+    This allows modules that provide large resource tables, e.g., the
+    database clients, to be imported without reading their resource files
+    until the tables are actually used. Each table is loaded once and then
+    accessed as a plain attribute.
+
+    If the tables have a name and a snapshot of resource tables was built
+    (see :py:mod:`indra.resources.snapshot`), tables that are in the
+    snapshot are read from it instead of being loaded from their resource
+    files.
+
+    Parameters
+    ----------
+    loaders : dict
+        A dict whose keys are names of tables and whose values are
+        functions that return the table with that name. Tables that are
+        loaded together can be given by a tuple of names as key, in which
+        case the function returns a tuple of tables in the same order.
+    name : Optional[str]
+        The name of the tables in the resource snapshot, typically the
+        name of the module they belong to. If not given, the tables are
+        always loaded from their resource files.
+    materialize : Optional[collection[str]]
+        The names of tables that are copied from the snapshot into dicts
+        once they are looked up often (see
+        :py:class:`indra.resources.snapshot.SnapshotTable`). Other tables
+        are always looked up in the snapshot, which is shared by all
+        processes. Default: None
+
+    Examples
+    --------
+    >>> tables = LazyTables({'squares': lambda: {x: x * x for x in range(5)},
+    ...                      ('evens', 'odds'): lambda: ([0, 2], [1, 3])})
+    >>> tables.squares[3]
+    9
+    >>> 'odds' in tables
+    True
+    """
+    def __init__(self, loaders, name=None, materialize=None):
+        self._loaders = {}
+        for names, loader in loaders.items():
+            names = (names,) if isinstance(names, str) else tuple(names)
+            for table_name in names:
+                self._loaders[table_name] = (names, loader)
+        self.name = name
+        self.materialize = set(materialize) if materialize else set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._loaders
+
+    def __iter__(self):
+        return iter(self._loaders)
+
+    def __getattr__(self, name):
+        # This is only called for tables that haven't been loaded yet since
+        # loaded tables are set as attributes of the instance
+        loaders = self.__dict__.get('_loaders', {})
+        if name not in loaders:
+            raise AttributeError(name)
+        with self._lock:
+            # Another thread may have loaded the table in the meantime
+            if name not in self.__dict__:
+                table = self._get_snapshot_table(name)
+                if table is not None:
+                    setattr(self, name, table)
+                    if table.materialize_ratio is not None:
+                        # Once the table is copied into a dict because it's
+                        # looked up often, the dict is used directly
+                        table.on_materialize.append(
+                            partial(setattr, self, name))
+                else:
+                    for table_name, table in self.load(name).items():
+                        setattr(self, table_name, table)
+        return self.__dict__[name]
+
+    def get_names(self, name):
+        """Return the names of the tables that are loaded with a table."""
+        return self._loaders[name][0]
+
+    def load(self, name):
+        """Return a table, and those loaded with it, from resource files.
+
+        Parameters
+        ----------
+        name : str
+            The name of the table to load.
+
+        Returns
+        -------
+        dict
+            The loaded tables keyed by name.
+        """
+        names, loader = self._loaders[name]
+        tables = loader()
+        if len(names) == 1:
+            tables = (tables,)
+        return dict(zip(names, tables))
+
+    def _get_snapshot_table(self, name):
+        if self.name is None:
+            return None
+        from indra.resources.snapshot import get_snapshot, MATERIALIZE_RATIO
+        snapshot = get_snapshot()
+        if snapshot is None:
+            return None
+        table = snapshot.get_table('%s.%s' % (self.name, name))
+        if table is not None and name in self.materialize:
+            table.materialize_ratio = MATERIALIZE_RATIO
+        return table
+
+
+class LazyTable(object):
+    """A proxy of a table of :py:class:`LazyTables` that loads it when used.
+
+    Modules with lazy resource tables bind their names to such proxies so
+    that the tables can be used as module attributes, e.g.,
+    hgnc_client.hgnc_names, without being loaded when the module is
+    imported. Attribute access, item access, membership tests, iteration
+    and len are passed on to the table.
+
+    Parameters
+    ----------
+    tables : LazyTables
+        The tables the table belongs to.
+    name : str
+        The name of the table.
+
+    Examples
+    --------
+    >>> tables = LazyTables({'squares': lambda: {x: x * x for x in range(5)}})
+    >>> squares = LazyTable(tables, 'squares')
+    >>> squares[3], squares.get(5), len(squares)
+    (9, None, 5)
+    """
+    def __init__(self, tables, name):
+        self._tables = tables
+        self._name = name
+
+    @property
+    def table(self):
+        """Return the table, loading it if it hasn't been loaded yet."""
+        return getattr(self._tables, self._name)
+
+    def __getattr__(self, name):
+        # Private and special attributes are those of the proxy, e.g., while
+        # it's copied or pickled
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.table, name)
+
+    def __getitem__(self, key):
+        return self.table[key]
+
+    def __contains__(self, key):
+        return key in self.table
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyTable):
+            other = other.table
+        return self.table == other
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self._name)
@@ -36,6 +36,8 @@ def main():
                       # Utilities
                       'graph': ['pygraphviz'],
                       'plot': ['matplotlib'],
+                      'fast_json': ['orjson'],
+                      'columnar': ['pyarrow'],
                       'isi': ['nltk', 'unidecode'],
                       'api': ['flask', 'flask_restx', 'flask_cors',
                               'docstring-parser']